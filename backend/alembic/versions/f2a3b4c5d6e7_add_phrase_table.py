@@ -0,0 +1,76 @@
+"""add phrase_table_versions and phrase_table_entries
+
+アプリ同梱の定型文について、事前にAIで生成した各丁寧さレベルの変換結果を
+バージョン単位で保存するテーブルを追加する。/api/v1/ai/convert は公開済みの
+最新バージョンをメモリに読み込み、該当する入力にはAI APIを呼び出さずに応答する。
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a3b4c5d6e7"
+down_revision: Union[str, Sequence[str], None] = "e1f2a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """バージョンテーブル・変換結果テーブルとインデックスを作成する。"""
+    op.create_table(
+        "phrase_table_versions",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("prompt_version", sa.String(length=20), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_phrase_table_versions_published_at",
+        "phrase_table_versions",
+        ["published_at"],
+        unique=False,
+    )
+
+    op.create_table(
+        "phrase_table_entries",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("version_id", sa.Integer(), nullable=False),
+        sa.Column("input_text", sa.Text(), nullable=False),
+        sa.Column("politeness_level", sa.String(length=20), nullable=False),
+        sa.Column("converted_text", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["version_id"], ["phrase_table_versions.id"], ondelete="CASCADE"),
+        sa.CheckConstraint(
+            "politeness_level IN ('casual', 'normal', 'polite')",
+            name="check_phrase_table_politeness_level",
+        ),
+        sa.UniqueConstraint(
+            "version_id",
+            "input_text",
+            "politeness_level",
+            name="uq_phrase_table_entries_version_input_level",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """upgrade() の逆順で変換結果テーブル・バージョンテーブルを削除する。"""
+    op.drop_table("phrase_table_entries")
+    op.drop_index("idx_phrase_table_versions_published_at", table_name="phrase_table_versions")
+    op.drop_table("phrase_table_versions")
@@ -17,15 +17,22 @@ Example:
 """
 
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 
-from fastapi import HTTPException, Security, status
+from fastapi import Header, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.config import settings
 from app.core.security import is_valid_api_key
 from app.db.session import async_session_maker, get_db
+from app.utils.request_deadline import DEADLINE_HEADER_NAME, parse_deadline, set_deadline
+from app.utils.request_priority import (
+    PRIORITY_HEADER_NAME,
+    RequestPriority,
+    resolve_priority,
+    set_priority,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -140,3 +147,58 @@ async def require_api_key(
             detail="Invalid or missing API key.",
             headers={"WWW-Authenticate": API_KEY_HEADER_NAME},
         )
+
+
+def request_priority(default: RequestPriority) -> Callable[..., Awaitable[RequestPriority]]:
+    """AI呼び出しの優先度を設定する依存性関数を生成する。
+
+    エンドポイントの既定の優先度と X-Request-Priority ヘッダー（"interactive" /
+    "regenerate" / "bulk"。既定より下げる指定のみ有効）からリクエストの優先度を決め、
+    処理中のコンテキストに設定する。AIClient はこの優先度でプロバイダーの
+    同時実行数の枠を待つ順序を決める。
+
+    Args:
+        default: エンドポイントの既定の優先度
+
+    Returns:
+        Callable: 優先度を設定して返す依存性関数
+
+    Example:
+        ::
+
+            @router.post("/convert/batch")
+            async def convert_text_batch(
+                _priority: RequestPriority = Depends(request_priority(RequestPriority.BULK)),
+            ):
+                ...
+    """
+
+    async def _set_request_priority(
+        priority_header: str | None = Header(None, alias=PRIORITY_HEADER_NAME),
+    ) -> RequestPriority:
+        priority = resolve_priority(default, priority_header)
+        set_priority(priority)
+        return priority
+
+    return _set_request_priority
+
+
+async def request_deadline(
+    deadline_header: str | None = Header(None, alias=DEADLINE_HEADER_NAME),
+) -> float | None:
+    """端末が応答を待つ残り時間からリクエストのデッドラインを設定する依存性関数。
+
+    X-Request-Deadline-Ms ヘッダー（残りミリ秒）をデッドラインに変換し、処理中の
+    コンテキストに設定する。AIClient は AI_CALL_DEADLINE_SECONDS とこの残り時間の
+    短い方をAI API呼び出しの時間の上限とする。ヘッダーがない・解釈できない場合は
+    サーバー側の上限のみを適用する。
+
+    Args:
+        deadline_header: X-Request-Deadline-Ms ヘッダーの値（未指定の場合None）
+
+    Returns:
+        float | None: デッドライン（time.monotonic() の値）。未指定の場合None
+    """
+    deadline = parse_deadline(deadline_header)
+    set_deadline(deadline)
+    return deadline
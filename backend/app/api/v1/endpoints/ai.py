@@ -9,39 +9,92 @@ TASK-0027: AI変換エンドポイント実装
 """
 
 import asyncio
+import json
 import logging
+import time
 import uuid
+from collections.abc import AsyncIterator, Coroutine
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import TypeVar
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_session_factory, require_api_key
+from app.api.deps import (
+    get_session_factory,
+    request_deadline,
+    request_priority,
+    require_api_key,
+)
 from app.core.config import settings
-from app.core.rate_limit import AI_RATE_LIMIT, limiter
-from app.crud.crud_ai_conversion import create_conversion_log
+from app.core.rate_limit import (
+    AI_BATCH_RATE_LIMIT,
+    AI_RATE_LIMIT,
+    batch_item_cost,
+    count_batch_items,
+    limiter,
+)
+from app.crud.crud_ai_conversion import (
+    ConversionLogEntry,
+    bulk_create_conversion_logs,
+    create_conversion_log,
+)
 from app.schemas.ai_conversion import (
+    AIBatchConversionRequest,
+    AIBatchConversionResponse,
     AIConversionRequest,
     AIConversionResponse,
     AIRegenerateRequest,
+    AIVariantsRequest,
+    AIVariantsResponse,
 )
 from app.utils import ai_client as ai_client_module
+from app.utils import metrics
+from app.utils.conversion_cache import build_cache_key, conversion_cache
+from app.utils.conversion_log_writer import conversion_log_writer
 from app.utils.exceptions import (
     AIConversionException,
     AIProviderException,
     AIRateLimitException,
     AITimeoutException,
+    ClientDisconnectedException,
 )
+from app.utils.local_converter import local_converter
+from app.utils.phrase_table import phrase_table
+from app.utils.request_priority import RequestPriority
+from app.utils.similarity_index import similarity_index
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 router = APIRouter()
 
 # バックグラウンドでのログ書き込み1回あたりの許容時間（秒）。
 # 接続プール待ちやcommitがハングしても、応答済みのリクエストを無期限にブロックしないための上限。
 BACKGROUND_LOG_TIMEOUT_SECONDS: float = 5.0
 
+# 変換結果キャッシュから応答した場合にログへ記録するプロバイダー名
+# （AI APIを呼び出していないことを区別し、キャッシュによる節約効果を集計できるようにする）
+CACHE_AI_PROVIDER = "cache"
+
+# 類似入力索引（わずかな違いしかない過去の入力の変換結果）から応答した場合に
+# ログへ記録するプロバイダー名
+SIMILAR_AI_PROVIDER = "similar"
+
+# ローカル変換（定型句辞書・語尾の規則）で応答した場合にログへ記録するプロバイダー名
+LOCAL_AI_PROVIDER = "local"
+
+# 定型文変換テーブル（事前にAIで生成した変換結果）から応答した場合にログへ記録するプロバイダー名
+PHRASE_TABLE_AI_PROVIDER = "phrase_table"
+
+
+# ストリーミング応答（Server-Sent Events）のヘッダー。
+# リバースプロキシ（nginx等）によるバッファリングを無効化し、断片を即座に端末へ届ける。
+SSE_RESPONSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 @dataclass(frozen=True)
 class ErrorInfo:
@@ -69,6 +122,11 @@ ERROR_DEFINITIONS: dict[type[Exception], ErrorInfo] = {
         message="AI変換APIのレート制限に達しました。しばらく待ってから再度お試しください。",
         status_code=429,
     ),
+    ClientDisconnectedException: ErrorInfo(
+        code="CLIENT_CLOSED_REQUEST",
+        message="応答前に接続が切断されたため、AI変換を中止しました。",
+        status_code=499,
+    ),
     AIConversionException: ErrorInfo(
         code="AI_API_ERROR",
         message="AI変換APIからのレスポンスに失敗しました。しばらく待ってから再度お試しください。",
@@ -84,12 +142,38 @@ DEFAULT_ERROR = ErrorInfo(
 )
 
 
+def _error_payload(error_info: ErrorInfo) -> dict[str, object]:
+    """エラー情報を応答の `error` フィールド形式に変換する"""
+    return {
+        "code": error_info.code,
+        "message": error_info.message,
+        "status_code": error_info.status_code,
+    }
+
+
+class _RenderedJSONResponse(JSONResponse):
+    """レンダリング済みのJSON（bytes）をそのまま本文にする JSONResponse"""
+
+    def render(self, content: bytes) -> bytes:  # type: ignore[override]
+        return content
+
+
+@lru_cache(maxsize=32)
+def _render_error_body(error_info: ErrorInfo) -> bytes:
+    """エラー応答の本文をレンダリングする（ErrorInfo は固定値のため結果を再利用する）"""
+    return JSONResponse(
+        content={"success": False, "data": None, "error": _error_payload(error_info)}
+    ).body
+
+
 def _create_error_response(error_info: ErrorInfo) -> JSONResponse:
     """
     統一エラーレスポンスを生成
 
     【機能概要】: エラーレスポンスを統一形式で生成
-    【実装方針】: success, data, errorフィールドを含むJSON形式
+    【実装方針】: success, data, errorフィールドを含むJSON形式。
+                  本文は ErrorInfo ごとにレンダリング済みのものを使い、
+                  エラーのたびにJSONを組み立て直さない
 
     Args:
         error_info: エラー情報（コード、メッセージ、ステータスコード）
@@ -97,17 +181,8 @@ def _create_error_response(error_info: ErrorInfo) -> JSONResponse:
     Returns:
         JSONResponse: 統一形式のエラーレスポンス
     """
-    return JSONResponse(
-        status_code=error_info.status_code,
-        content={
-            "success": False,
-            "data": None,
-            "error": {
-                "code": error_info.code,
-                "message": error_info.message,
-                "status_code": error_info.status_code,
-            },
-        },
+    return _RenderedJSONResponse(
+        content=_render_error_body(error_info), status_code=error_info.status_code
     )
 
 
@@ -124,9 +199,11 @@ async def _persist_conversion_log(
     error_message: str | None = None,
 ) -> None:
     """
-    独立した短命セッションでAI変換ログを永続化する
+    AI変換ログを永続化する
 
-    【機能概要】: FastAPIの`BackgroundTasks`経由（応答返却後）に呼び出され、
+    【機能概要】: FastAPIの`BackgroundTasks`経由（応答返却後）に呼び出される。
+                  一括書き込み（conversion_log_writer）が動作中の場合はそのキューに積み、
+                  まとめて書き込ませる。動作中でない場合（lifespan を経由しない場合など）は
                   session_factoryから新規に取得した独立したセッションでログを
                   書き込みcommitする。
     【実装方針】: リクエストスコープのセッション（get_db_session）は応答返却後には
@@ -148,6 +225,20 @@ async def _persist_conversion_log(
         is_success: 成功フラグ
         error_message: エラーメッセージ（失敗時のみ）
     """
+    if conversion_log_writer.running:
+        conversion_log_writer.submit(
+            ConversionLogEntry(
+                input_text=input_text,
+                output_text=output_text,
+                politeness_level=politeness_level,
+                conversion_time_ms=conversion_time_ms,
+                ai_provider=ai_provider,
+                session_id=session_id,
+                is_success=is_success,
+                error_message=error_message,
+            )
+        )
+        return
 
     async def _write() -> None:
         session = session_factory()
@@ -252,12 +343,213 @@ async def _log_conversion_error_background(
     )
 
 
+async def _persist_conversion_logs_bulk(
+    session_factory: async_sessionmaker[AsyncSession],
+    entries: list[ConversionLogEntry],
+) -> None:
+    """
+    独立した短命セッションで複数のAI変換ログを一括で永続化する
+
+    【機能概要】: 一括変換（/convert/batch）の全項目のログを、応答返却後に
+                  1回の複数行INSERTと1回のcommitで書き込む。
+    【実装方針】: 一括書き込み（conversion_log_writer）が動作中の場合はそのキューに積む。
+                  動作中でない場合は _persist_conversion_log と同じく新規セッションを使い、
+                  BACKGROUND_LOG_TIMEOUT_SECONDS でタイムアウトさせる。
+                  失敗時は警告ログのみとし例外を再送出しない。
+
+    Args:
+        session_factory: 独立したセッションを生成するファクトリ
+        entries: 書き込むログエントリ
+    """
+    if conversion_log_writer.running:
+        for entry in entries:
+            conversion_log_writer.submit(entry)
+        return
+
+    async def _write() -> None:
+        session = session_factory()
+        try:
+            await bulk_create_conversion_logs(session, entries)
+            await session.commit()
+        finally:
+            await session.close()
+
+    try:
+        await asyncio.wait_for(_write(), timeout=BACKGROUND_LOG_TIMEOUT_SECONDS)
+    except Exception:
+        logger.warning(
+            "Failed to persist %d AI conversion logs in background; dropping these log entries.",
+            len(entries),
+            exc_info=True,
+        )
+
+
+def _format_sse(event: str, data: dict[str, object]) -> str:
+    """
+    Server-Sent Events の1イベントを生成
+
+    Args:
+        event: イベント名（delta / done / error）
+        data: JSONとして送信するデータ
+
+    Returns:
+        str: SSE形式の文字列
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _build_conversion_cache_key(input_text: str, politeness_level: str, ai_provider: str) -> str:
+    """
+    変換結果キャッシュのキーを生成（/convert と /convert/stream で共通）
+
+    Args:
+        input_text: 入力テキスト
+        politeness_level: 丁寧さレベル
+        ai_provider: 使用するAIプロバイダー名
+
+    Returns:
+        str: キャッシュキー
+    """
+    return build_cache_key(
+        input_text,
+        politeness_level,
+        ai_provider,
+        ai_client_module.model_for_provider(ai_provider),
+        ai_client_module.PROMPT_VERSION,
+    )
+
+
+def _similarity_scope(ai_provider: str) -> str:
+    """類似入力索引の照合範囲（変換結果キャッシュのキーと同じくプロバイダー・モデル・プロンプト）"""
+    model = ai_client_module.model_for_provider(ai_provider)
+    return f"{ai_provider}:{model}:{ai_client_module.PROMPT_VERSION}"
+
+
+async def _lookup_cached_conversion(
+    input_text: str, politeness_level: str, ai_provider: str, cache_key: str | None
+) -> tuple[str, int, str] | None:
+    """
+    過去の変換結果を再利用できる入力の変換結果を返す
+
+    【実装方針】: 変換結果キャッシュ（完全一致）、類似入力索引の順に確認する。
+                  キャッシュが無効（cache_key が None）の場合は類似入力索引も使用しない
+
+    Args:
+        input_text: 入力テキスト
+        politeness_level: 丁寧さレベル
+        ai_provider: 使用するAIプロバイダー名
+        cache_key: 変換結果キャッシュのキー（キャッシュが無効な場合はNone）
+
+    Returns:
+        tuple[str, int, str] | None: (変換後テキスト, 処理時間ms, ログに記録するプロバイダー名)。
+            再利用できる変換結果がない場合はNone
+    """
+    if cache_key is None:
+        return None
+    start = time.perf_counter()
+    converted_text = await conversion_cache.get(cache_key)
+    served_provider = CACHE_AI_PROVIDER
+    if converted_text is None and settings.SIMILARITY_INDEX_ENABLED:
+        match = similarity_index.lookup(
+            input_text,
+            politeness_level,
+            settings.SIMILARITY_INDEX_THRESHOLD,
+            _similarity_scope(ai_provider),
+        )
+        converted_text = match.converted_text if match is not None else None
+        served_provider = SIMILAR_AI_PROVIDER
+    if converted_text is None:
+        return None
+    return converted_text, int((time.perf_counter() - start) * 1000), served_provider
+
+
+async def _store_conversion(
+    cache_key: str | None,
+    input_text: str,
+    politeness_level: str,
+    ai_provider: str,
+    converted_text: str,
+) -> None:
+    """
+    AIで変換した結果を変換結果キャッシュと類似入力索引に保存する（キャッシュが無効な場合は何もしない）
+
+    Args:
+        cache_key: 変換結果キャッシュのキー（キャッシュが無効な場合はNone）
+        input_text: 入力テキスト
+        politeness_level: 丁寧さレベル
+        ai_provider: 使用したAIプロバイダー名
+        converted_text: 変換後テキスト
+    """
+    if cache_key is None:
+        return
+    await conversion_cache.set(cache_key, converted_text)
+    if settings.SIMILARITY_INDEX_ENABLED:
+        similarity_index.add(
+            input_text, politeness_level, converted_text, _similarity_scope(ai_provider)
+        )
+
+
+def _convert_locally(input_text: str, politeness_level: str) -> tuple[str, int] | None:
+    """
+    ローカル変換（定型句辞書・語尾の規則）を試みる
+
+    【実装方針】: LOCAL_CONVERSION_ENABLED が無効な場合、変換できない場合、
+                  確信度が LOCAL_CONVERSION_MIN_CONFIDENCE 未満の場合はNoneを返し、
+                  呼び出し側はAIで変換する
+
+    Args:
+        input_text: 入力テキスト
+        politeness_level: 丁寧さレベル
+
+    Returns:
+        tuple[str, int] | None: (変換後テキスト, 処理時間ms)。採用しない場合はNone
+    """
+    if not settings.LOCAL_CONVERSION_ENABLED:
+        return None
+    start = time.perf_counter()
+    result = local_converter.convert(input_text, politeness_level)
+    if result is None:
+        metrics.local_conversions.labels("miss").inc()
+        return None
+    if result.confidence < settings.LOCAL_CONVERSION_MIN_CONFIDENCE:
+        metrics.local_conversions.labels("low_confidence").inc()
+        return None
+    metrics.local_conversions.labels("hit").inc()
+    return result.converted_text, int((time.perf_counter() - start) * 1000)
+
+
+def _convert_without_ai(input_text: str, politeness_level: str) -> tuple[str, int, str] | None:
+    """
+    AI APIを呼び出さずに変換できる入力を変換する
+
+    【実装方針】: 定型文変換テーブル（事前にAIで生成した変換結果）、ローカル変換の順に試す
+
+    Args:
+        input_text: 入力テキスト
+        politeness_level: 丁寧さレベル
+
+    Returns:
+        tuple[str, int, str] | None: (変換後テキスト, 処理時間ms, ログに記録するプロバイダー名)。
+            どちらでも変換できない場合はNone
+    """
+    start = time.perf_counter()
+    converted_text = phrase_table.lookup(input_text, politeness_level)
+    if converted_text is not None:
+        processing_time_ms = int((time.perf_counter() - start) * 1000)
+        return converted_text, processing_time_ms, PHRASE_TABLE_AI_PROVIDER
+    local = _convert_locally(input_text, politeness_level)
+    if local is not None:
+        return *local, LOCAL_AI_PROVIDER
+    return None
+
+
 def _get_error_info(error: Exception) -> ErrorInfo:
     """
     例外からエラー情報を取得
 
     【機能概要】: 例外の型に応じたエラー情報を返す
-    【実装方針】: ERROR_DEFINITIONSマッピングを使用
+    【実装方針】: ERROR_DEFINITIONSマッピングを使用。定義のない例外は基底クラスの定義を使う
+                  （例: AILocalOverloadException は AIRateLimitException と同じ応答）
 
     Args:
         error: 発生した例外
@@ -265,7 +557,215 @@ def _get_error_info(error: Exception) -> ErrorInfo:
     Returns:
         ErrorInfo: 対応するエラー情報
     """
-    return ERROR_DEFINITIONS.get(type(error), DEFAULT_ERROR)
+    for error_type in type(error).__mro__:
+        error_info = ERROR_DEFINITIONS.get(error_type)
+        if error_info is not None:
+            return error_info
+    return DEFAULT_ERROR
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    """端末が接続を切断するまで待つ（リクエスト本文の受信後に届くのは切断通知のみ）"""
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _cancel_on_disconnect(request: Request, awaitable: Coroutine[object, object, _T]) -> _T:
+    """
+    AI変換を実行し、応答前に端末が切断した場合は中止する
+
+    【機能概要】: 端末が待受を諦めて切断した後に、応答の届かないAI API呼び出しへ
+                  プロバイダーの同時実行数の枠・レート制限・課金を使い続けないようにする
+    【実装方針】:
+      - 変換を別タスクで実行し、ASGIの切断通知（http.disconnect）と競わせる
+      - 切断を先に検知した場合は変換タスクをキャンセルし（処理中のAI API呼び出しも
+        キャンセルされ、同時実行数の枠は解放される）、終了を待ってから
+        ClientDisconnectedException を送出する
+      - 変換タスク内で記録された実際に応答したプロバイダーのみを呼び出し元のコンテキストへ
+        戻す（その他のコンテキスト変数は変換タスク内に留める）
+
+    Args:
+        request: FastAPIリクエストオブジェクト
+        awaitable: AI変換のコルーチン
+
+    Returns:
+        変換結果
+
+    Raises:
+        ClientDisconnectedException: 変換の完了前に端末が切断した場合
+    """
+    call = asyncio.create_task(_with_served_provider(awaitable))
+    disconnect = asyncio.create_task(_wait_for_disconnect(request))
+    try:
+        done, _ = await asyncio.wait((call, disconnect), return_when=asyncio.FIRST_COMPLETED)
+        if call not in done and disconnect.exception() is None:
+            call.cancel()
+            await asyncio.gather(call, return_exceptions=True)
+            metrics.ai_client_disconnects.labels(metrics.route_label(request.scope)).inc()
+            raise ClientDisconnectedException("Client disconnected; AI call cancelled")
+        result, served_provider = await call
+    finally:
+        disconnect.cancel()
+        call.cancel()
+    if served_provider is not None:
+        ai_client_module.set_served_provider(served_provider)
+    return result
+
+
+async def _with_served_provider(
+    awaitable: Coroutine[object, object, _T],
+) -> tuple[_T, str | None]:
+    """AI変換を実行し、変換結果と実際に応答したプロバイダーを返す"""
+    result = await awaitable
+    return result, ai_client_module.consume_served_provider()
+
+
+@dataclass(frozen=True)
+class _BatchItemOutcome:
+    """一括変換の1項目（重複を除いた入力）の変換結果"""
+
+    converted_text: str | None
+    processing_time_ms: int | None
+    ai_provider: str
+    error: Exception | None = None
+
+
+def _convert_batch_without_ai(
+    keys: list[tuple[str, str]],
+) -> dict[tuple[str, str], _BatchItemOutcome]:
+    """
+    一括変換の各項目（重複を除く）を定型文変換テーブル・ローカル変換で変換する
+
+    Args:
+        keys: (入力テキスト, 丁寧さレベル) の一覧
+
+    Returns:
+        dict[tuple[str, str], _BatchItemOutcome]: AI APIを呼び出さずに変換できた項目の結果
+    """
+    outcomes: dict[tuple[str, str], _BatchItemOutcome] = {}
+    for key in dict.fromkeys(keys):
+        precomputed = _convert_without_ai(*key)
+        if precomputed is not None:
+            outcomes[key] = _BatchItemOutcome(*precomputed)
+    return outcomes
+
+
+async def _convert_batch_item(
+    input_text: str,
+    politeness_level: str,
+    semaphore: asyncio.Semaphore,
+) -> _BatchItemOutcome:
+    """
+    一括変換の1項目を convert_text で変換する（同時実行数は semaphore で制限）
+
+    失敗しても例外は送出せず、エラーを結果に格納して返す。
+    """
+    ai_provider = settings.DEFAULT_AI_PROVIDER
+    async with semaphore:
+        try:
+            converted_text, processing_time_ms = await ai_client_module.ai_client.convert_text(
+                input_text=input_text,
+                politeness_level=politeness_level,
+            )
+        except (
+            AITimeoutException,
+            AIProviderException,
+            AIRateLimitException,
+            AIConversionException,
+        ) as e:
+            logger.error(f"AI batch item error ({_get_error_info(e).code}): {e}")
+            return _BatchItemOutcome(None, None, ai_provider, e)
+        except Exception as e:
+            logger.exception(f"Unexpected error during AI batch item conversion: {e}")
+            return _BatchItemOutcome(None, None, ai_provider, e)
+
+    served_provider = ai_client_module.consume_served_provider() or ai_provider
+    return _BatchItemOutcome(converted_text, processing_time_ms, served_provider)
+
+
+async def _convert_batch_packed(
+    input_texts: list[str],
+    politeness_level: str,
+    semaphore: asyncio.Semaphore,
+) -> list[_BatchItemOutcome]:
+    """
+    同じ丁寧さレベルの複数項目を1回のプロンプトで変換する
+
+    まとめた変換に失敗した場合（応答の解釈失敗を含む）は、項目ごとの変換に切り替える。
+    """
+    ai_provider = settings.DEFAULT_AI_PROVIDER
+    try:
+        async with semaphore:
+            converted_texts, processing_time_ms = (
+                await ai_client_module.ai_client.convert_texts_packed(
+                    input_texts=input_texts,
+                    politeness_level=politeness_level,
+                )
+            )
+            served_provider = ai_client_module.consume_served_provider() or ai_provider
+    except Exception as e:
+        logger.warning(
+            f"Packed AI conversion failed for {len(input_texts)} items; "
+            f"falling back to per-item conversion: {e}"
+        )
+        return list(
+            await asyncio.gather(
+                *(
+                    _convert_batch_item(input_text, politeness_level, semaphore)
+                    for input_text in input_texts
+                )
+            )
+        )
+
+    return [
+        _BatchItemOutcome(converted_text, processing_time_ms, served_provider)
+        for converted_text in converted_texts
+    ]
+
+
+async def _convert_batch_misses(
+    misses: list[tuple[str, str]],
+    pack: bool,
+) -> dict[tuple[str, str], _BatchItemOutcome]:
+    """
+    キャッシュにない (入力テキスト, 丁寧さレベル) の組をまとめて変換する
+
+    【実装方針】: AI API呼び出しの同時実行数を AI_BATCH_CONCURRENCY で制限する。
+                  pack が True の場合は丁寧さレベルごとに AI_BATCH_PACK_SIZE 件ずつ
+                  1回のプロンプトにまとめる。
+
+    Args:
+        misses: 変換する (入力テキスト, 丁寧さレベル) の組（重複なし）
+        pack: 複数項目を1回のプロンプトにまとめるか
+
+    Returns:
+        dict: (入力テキスト, 丁寧さレベル) → 変換結果
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.AI_BATCH_CONCURRENCY))
+
+    if not pack:
+        outcomes = await asyncio.gather(
+            *(_convert_batch_item(text, level, semaphore) for text, level in misses)
+        )
+        return dict(zip(misses, outcomes, strict=True))
+
+    chunk_size = max(1, settings.AI_BATCH_PACK_SIZE)
+    chunks: list[tuple[str, list[str]]] = []
+    for level in dict.fromkeys(level for _, level in misses):
+        texts = [text for text, item_level in misses if item_level == level]
+        chunks.extend(
+            (level, texts[start : start + chunk_size]) for start in range(0, len(texts), chunk_size)
+        )
+
+    chunk_outcomes = await asyncio.gather(
+        *(_convert_batch_packed(texts, level, semaphore) for level, texts in chunks)
+    )
+    results: dict[tuple[str, str], _BatchItemOutcome] = {}
+    for (level, texts), outcomes in zip(chunks, chunk_outcomes, strict=True):
+        results.update(
+            ((text, level), outcome) for text, outcome in zip(texts, outcomes, strict=True)
+        )
+    return results
 
 
 @router.post(
@@ -281,11 +781,17 @@ async def convert_text(
     background_tasks: BackgroundTasks,
     session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
     _: None = Depends(require_api_key),
+    _priority: RequestPriority = Depends(request_priority(RequestPriority.INTERACTIVE)),
+    _deadline: float | None = Depends(request_deadline),
 ) -> JSONResponse:
     """
     【機能概要】: AI変換エンドポイント
     【実装方針】:
-      - AIClientを使用してテキストを変換
+      - 定型文変換テーブルに該当する場合、ローカル変換（定型句辞書・語尾の規則）の
+        確信度が閾値以上の場合、変換結果キャッシュにヒットした場合、および類似入力索引に
+        類似度が閾値以上の入力がある場合はAIClientを呼び出さずに応答する
+      - AIClientを使用してテキストを変換する。X-Request-Deadline-Ms ヘッダーで端末の残り待ち時間が
+        指定された場合はそれを超えてAI APIを待たず、応答前に端末が切断した場合は呼び出しを中止する
       - 成功・失敗に関わらずログを記録するが、DBへの書き込みは応答返却後の
         BackgroundTasksへ委譲する（接続プール待ちやcommitのハングが応答をブロックしないため）
       - 例外に応じた適切なHTTPステータスコードを返却
@@ -308,13 +814,59 @@ async def convert_text(
     # 実際に使用されるAIプロバイダー（リクエストで明示指定できないため、常にデフォルト値）
     ai_provider = settings.DEFAULT_AI_PROVIDER
 
+    # 定型文変換テーブル・ローカル変換・変換結果キャッシュ・類似入力索引で変換できる入力は
+    # AI APIを呼び出さずに応答する
+    cache_key = (
+        _build_conversion_cache_key(input_text, politeness_level, ai_provider)
+        if settings.CONVERSION_CACHE_ENABLED
+        else None
+    )
+    reused = _convert_without_ai(input_text, politeness_level)
+    if reused is None:
+        reused = await _lookup_cached_conversion(
+            input_text, politeness_level, ai_provider, cache_key
+        )
+    if reused is not None:
+        converted_text, processing_time_ms, served_provider = reused
+        background_tasks.add_task(
+            _log_conversion_success_background,
+            session_factory,
+            input_text,
+            converted_text,
+            politeness_level,
+            processing_time_ms,
+            served_provider,
+            session_id,
+        )
+        return JSONResponse(
+            content={
+                "converted_text": converted_text,
+                "original_text": input_text,
+                "politeness_level": politeness_level,
+                "processing_time_ms": processing_time_ms,
+            }
+        )
+
     try:
         # AI変換を実行
-        converted_text, processing_time_ms = await ai_client_module.ai_client.convert_text(
-            input_text=input_text,
-            politeness_level=politeness_level,
+        converted_text, processing_time_ms = await _cancel_on_disconnect(
+            request,
+            ai_client_module.ai_client.convert_text(
+                input_text=input_text,
+                politeness_level=politeness_level,
+            ),
         )
 
+        # ヘッジ等により実際に応答したプロバイダーをログに記録する
+        served_provider = ai_client_module.consume_served_provider() or ai_provider
+
+        # 次回以降の同一・類似リクエストに備えて変換結果をキャッシュする
+        # （ヘッジ等で別のプロバイダーが応答した結果は、既定プロバイダーのキーに保存しない）
+        if served_provider == ai_provider:
+            await _store_conversion(
+                cache_key, input_text, politeness_level, ai_provider, converted_text
+            )
+
         # 成功時のログ記録は応答返却後にバックグラウンドで実行する
         # （DB障害・遅延があっても成功した変換結果は必ず返す）
         background_tasks.add_task(
@@ -324,7 +876,7 @@ async def convert_text(
             converted_text,
             politeness_level,
             processing_time_ms,
-            ai_provider,
+            served_provider,
             session_id,
         )
 
@@ -361,6 +913,11 @@ async def convert_text(
         )
         return _create_error_response(error_info)
 
+    except ClientDisconnectedException as e:
+        # 応答は端末に届かないため、AI変換のエラーとしては記録しない
+        logger.info(f"{e} ({request.url.path})")
+        return _create_error_response(_get_error_info(e))
+
     except Exception as e:
         # 予期しないエラー
         logger.exception(f"Unexpected error during AI conversion: {e}")
@@ -376,6 +933,166 @@ async def convert_text(
         return _create_error_response(DEFAULT_ERROR)
 
 
+@router.post(
+    "/convert/stream",
+    summary="AI変換API（ストリーミング）",
+    description=(
+        "入力文字列を指定の丁寧さレベルでAI変換し、生成されたテキスト断片を"
+        "Server-Sent Events（delta / done / error）で順次返します（レート制限: 10秒に1回）"
+    ),
+    response_class=StreamingResponse,
+)
+@limiter.limit(AI_RATE_LIMIT)
+async def convert_text_stream(
+    request: Request,
+    conversion_request: AIConversionRequest,
+    background_tasks: BackgroundTasks,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(require_api_key),
+    _priority: RequestPriority = Depends(request_priority(RequestPriority.INTERACTIVE)),
+    _deadline: float | None = Depends(request_deadline),
+) -> StreamingResponse:
+    """
+    【機能概要】: AI変換エンドポイント（ストリーミング）
+    【実装方針】:
+      - 端末の読み上げ開始を早めるため、プロバイダーのストリーミングAPIから受け取った
+        断片を `delta` イベントとして即座に転送する
+      - 完了時は `done` イベントで全文と総処理時間を返す。エラー時は `error` イベントで
+        /convert と同じエラーコードを返す（応答ヘッダー送信後のためHTTPステータスは200）
+      - 定型文変換テーブル・ローカル変換・変換結果キャッシュ・類似入力索引は /convert と共有する
+        （該当時は全文を1つの断片として返す）
+      - ストリーム完了後、総処理時間と全文でログを記録する（応答返却後にバックグラウンドで実行）。
+        端末が途中で切断した場合は失敗として記録する
+      - X-Request-Deadline-Ms ヘッダーの残り待ち時間はストリーム全体に適用する
+        （切断時はStreamingResponseが生成を中止し、AI APIのストリームもクローズされる）
+
+    Args:
+        request: FastAPIリクエストオブジェクト（レート制限用）
+        conversion_request: AI変換リクエストデータ
+        background_tasks: 応答返却後にログ書き込みを実行するためのタスクキュー
+        session_factory: バックグラウンドタスクが独立したセッションを生成するためのファクトリ
+
+    Returns:
+        StreamingResponse: text/event-stream 形式の応答
+    """
+    input_text = conversion_request.input_text
+    politeness_level = conversion_request.politeness_level.value
+    session_id = uuid.uuid4()
+    # 実際に使用されるAIプロバイダー（リクエストで明示指定できないため、常にデフォルト値）
+    ai_provider = settings.DEFAULT_AI_PROVIDER
+    cache_key = (
+        _build_conversion_cache_key(input_text, politeness_level, ai_provider)
+        if settings.CONVERSION_CACHE_ENABLED
+        else None
+    )
+
+    async def event_stream() -> AsyncIterator[str]:
+        start_time = time.perf_counter()
+        chunks: list[str] = []
+        log_provider = ai_provider
+        try:
+            reused = _convert_without_ai(input_text, politeness_level)
+            if reused is None:
+                reused = await _lookup_cached_conversion(
+                    input_text, politeness_level, ai_provider, cache_key
+                )
+            if reused is not None:
+                log_provider = reused[2]
+                chunks.append(reused[0])
+                yield _format_sse("delta", {"text": reused[0]})
+            else:
+                async for delta in ai_client_module.ai_client.stream_convert_text(
+                    input_text=input_text,
+                    politeness_level=politeness_level,
+                ):
+                    chunks.append(delta)
+                    yield _format_sse("delta", {"text": delta})
+                # サーキットが open の場合はもう一方のプロバイダーが応答している
+                log_provider = ai_client_module.consume_served_provider() or ai_provider
+
+        except (
+            AITimeoutException,
+            AIProviderException,
+            AIRateLimitException,
+            AIConversionException,
+        ) as e:
+            error_info = _get_error_info(e)
+            logger.error(f"AI streaming conversion error ({error_info.code}): {e}")
+            background_tasks.add_task(
+                _log_conversion_error_background,
+                session_factory,
+                input_text,
+                politeness_level,
+                ai_provider,
+                session_id,
+                e,
+            )
+            yield _format_sse("error", _error_payload(error_info))
+            return
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # 端末が途中で切断した（生成途中の結果は返せていないため失敗として記録する）
+            background_tasks.add_task(
+                _log_conversion_error_background,
+                session_factory,
+                input_text,
+                politeness_level,
+                ai_provider,
+                session_id,
+                ConnectionAbortedError("Client disconnected during streaming"),
+            )
+            raise
+
+        except Exception as e:
+            logger.exception(f"Unexpected error during AI streaming conversion: {e}")
+            background_tasks.add_task(
+                _log_conversion_error_background,
+                session_factory,
+                input_text,
+                politeness_level,
+                ai_provider,
+                session_id,
+                e,
+            )
+            yield _format_sse("error", _error_payload(DEFAULT_ERROR))
+            return
+
+        converted_text = "".join(chunks).strip()
+        processing_time_ms = int((time.perf_counter() - start_time) * 1000)
+
+        if log_provider == ai_provider:
+            await _store_conversion(
+                cache_key, input_text, politeness_level, ai_provider, converted_text
+            )
+
+        background_tasks.add_task(
+            _log_conversion_success_background,
+            session_factory,
+            input_text,
+            converted_text,
+            politeness_level,
+            processing_time_ms,
+            log_provider,
+            session_id,
+        )
+        yield _format_sse(
+            "done",
+            {
+                "converted_text": converted_text,
+                "original_text": input_text,
+                "politeness_level": politeness_level,
+                "processing_time_ms": processing_time_ms,
+            },
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_RESPONSE_HEADERS,
+        background=background_tasks,
+    )
+
+
 @router.post(
     "/regenerate",
     response_model=AIConversionResponse,
@@ -389,6 +1106,8 @@ async def regenerate_text(
     background_tasks: BackgroundTasks,
     session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
     _: None = Depends(require_api_key),
+    _priority: RequestPriority = Depends(request_priority(RequestPriority.REGENERATE)),
+    _deadline: float | None = Depends(request_deadline),
 ) -> JSONResponse:
     """
     【機能概要】: AI再変換エンドポイント
@@ -420,10 +1139,13 @@ async def regenerate_text(
 
     try:
         # AI再変換を実行
-        converted_text, processing_time_ms = await ai_client_module.ai_client.regenerate_text(
-            input_text=input_text,
-            politeness_level=politeness_level,
-            previous_result=previous_result,
+        converted_text, processing_time_ms = await _cancel_on_disconnect(
+            request,
+            ai_client_module.ai_client.regenerate_text(
+                input_text=input_text,
+                politeness_level=politeness_level,
+                previous_result=previous_result,
+            ),
         )
 
         # 成功時のログ記録は応答返却後にバックグラウンドで実行する
@@ -472,6 +1194,11 @@ async def regenerate_text(
         )
         return _create_error_response(error_info)
 
+    except ClientDisconnectedException as e:
+        # 応答は端末に届かないため、AI変換のエラーとしては記録しない
+        logger.info(f"{e} ({request.url.path})")
+        return _create_error_response(_get_error_info(e))
+
     except Exception as e:
         # 予期しないエラー
         logger.exception(f"Unexpected error during AI regeneration: {e}")
@@ -485,3 +1212,238 @@ async def regenerate_text(
             e,
         )
         return _create_error_response(DEFAULT_ERROR)
+
+
+@router.post(
+    "/variants",
+    response_model=AIVariantsResponse,
+    summary="AI変換候補一括生成API",
+    description=(
+        "1回のAI呼び出しで互いに異なる変換候補を複数返します。"
+        "再変換の繰り返しを置き換えます（レート制限: 10秒に1回）"
+    ),
+)
+@limiter.limit(AI_RATE_LIMIT)
+async def generate_variants(
+    request: Request,
+    variants_request: AIVariantsRequest,
+    background_tasks: BackgroundTasks,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(require_api_key),
+    _priority: RequestPriority = Depends(request_priority(RequestPriority.REGENERATE)),
+    _deadline: float | None = Depends(request_deadline),
+) -> JSONResponse:
+    """
+    【機能概要】: AI変換候補一括生成エンドポイント
+    【実装方針】:
+      - AIClientのgenerate_variantsで1回のAPI呼び出しから複数候補を生成する
+      - 候補はサーバー側で解釈・重複除去済みのため、クライアントは追加の通信なしに
+        候補を切り替えられる（/regenerate の往復とレート制限待ちを省く）
+      - ログは先頭の候補を変換結果として1件記録する（応答返却後にバックグラウンドで実行）
+      - 例外に応じた適切なHTTPステータスコードを返却
+
+    Args:
+        request: FastAPIリクエストオブジェクト（レート制限用）
+        variants_request: AI変換候補一括生成リクエストデータ
+        background_tasks: 応答返却後にログ書き込みを実行するためのタスクキュー
+        session_factory: バックグラウンドタスクが独立したセッションを生成するためのファクトリ
+
+    Returns:
+        AIVariantsResponse: AI変換候補一括生成レスポンス
+    """
+    input_text = variants_request.input_text
+    politeness_level = variants_request.politeness_level.value
+    session_id = uuid.uuid4()
+    # 実際に使用されるAIプロバイダー（リクエストで明示指定できないため、常にデフォルト値）
+    ai_provider = settings.DEFAULT_AI_PROVIDER
+
+    try:
+        variants, processing_time_ms = await _cancel_on_disconnect(
+            request,
+            ai_client_module.ai_client.generate_variants(
+                input_text=input_text,
+                politeness_level=politeness_level,
+                count=variants_request.count,
+                previous_result=variants_request.previous_result,
+            ),
+        )
+
+        background_tasks.add_task(
+            _log_conversion_success_background,
+            session_factory,
+            input_text,
+            variants[0],
+            politeness_level,
+            processing_time_ms,
+            ai_provider,
+            session_id,
+        )
+
+        response_data = {
+            "variants": variants,
+            "original_text": input_text,
+            "politeness_level": politeness_level,
+            "processing_time_ms": processing_time_ms,
+        }
+
+        return JSONResponse(content=response_data)
+
+    except (
+        AITimeoutException,
+        AIProviderException,
+        AIRateLimitException,
+        AIConversionException,
+    ) as e:
+        error_info = _get_error_info(e)
+        logger.error(f"AI variants error ({error_info.code}): {e}")
+        background_tasks.add_task(
+            _log_conversion_error_background,
+            session_factory,
+            input_text,
+            politeness_level,
+            ai_provider,
+            session_id,
+            e,
+        )
+        return _create_error_response(error_info)
+
+    except ClientDisconnectedException as e:
+        # 応答は端末に届かないため、AI変換のエラーとしては記録しない
+        logger.info(f"{e} ({request.url.path})")
+        return _create_error_response(_get_error_info(e))
+
+    except Exception as e:
+        logger.exception(f"Unexpected error during AI variants generation: {e}")
+        background_tasks.add_task(
+            _log_conversion_error_background,
+            session_factory,
+            input_text,
+            politeness_level,
+            ai_provider,
+            session_id,
+            e,
+        )
+        return _create_error_response(DEFAULT_ERROR)
+
+
+@router.post(
+    "/convert/batch",
+    response_model=AIBatchConversionResponse,
+    summary="AI一括変換API",
+    description=(
+        "複数の項目（入力文字列と丁寧さレベルの組）をまとめてAI変換します。"
+        "文字盤の定型文の一括変換などに使用します"
+        f"（レート制限: 項目数の合計が{settings.BATCH_RATE_LIMIT_SECONDS}秒に"
+        f"{settings.BATCH_RATE_LIMIT_ITEMS}件まで）"
+    ),
+)
+@limiter.limit(AI_BATCH_RATE_LIMIT, cost=batch_item_cost)
+async def convert_text_batch(
+    request: Request,
+    batch_request: AIBatchConversionRequest,
+    background_tasks: BackgroundTasks,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    _: None = Depends(require_api_key),
+    _priority: RequestPriority = Depends(request_priority(RequestPriority.BULK)),
+    _deadline: float | None = Depends(request_deadline),
+    _item_count: int = Depends(count_batch_items),
+) -> JSONResponse:
+    """
+    【機能概要】: AI一括変換エンドポイント
+    【実装方針】:
+      - 項目ごとに定型文変換テーブル・ローカル変換・変換結果キャッシュ・類似入力索引を確認し、
+        いずれにも該当しなかった項目のみAI APIを呼び出す
+      - 同じ (入力, 丁寧さレベル) の項目は1回だけ変換する
+      - AI APIの同時呼び出し数は AI_BATCH_CONCURRENCY で制限する
+        （1リクエストで多数の呼び出しを同時に発行し、プロバイダーのレート制限に達しないため）
+      - pack=True の場合は同じ丁寧さレベルの項目を1回のプロンプトにまとめる
+      - 項目ごとの失敗は results[].error に格納し、応答全体は常に200で返す
+      - レート制限は /convert とは別枠で、項目数をコストとして数える
+      - 全項目のログは応答返却後に1回の一括INSERTで記録する
+
+    Args:
+        request: FastAPIリクエストオブジェクト（レート制限用）
+        batch_request: AI一括変換リクエストデータ
+        background_tasks: 応答返却後にログ書き込みを実行するためのタスクキュー
+        session_factory: バックグラウンドタスクが独立したセッションを生成するためのファクトリ
+
+    Returns:
+        AIBatchConversionResponse: AI一括変換レスポンス
+    """
+    start_time = time.perf_counter()
+    session_id = uuid.uuid4()
+    ai_provider = settings.DEFAULT_AI_PROVIDER
+    keys = [(item.input_text, item.politeness_level.value) for item in batch_request.items]
+
+    # 定型文変換テーブル・ローカル変換・変換結果キャッシュ・類似入力索引を確認する
+    # （該当した項目はAI APIを呼び出さない）
+    outcomes = _convert_batch_without_ai(keys)
+    cache_keys: dict[tuple[str, str], str] = {}
+    unique_keys = (
+        [key for key in dict.fromkeys(keys) if key not in outcomes]
+        if settings.CONVERSION_CACHE_ENABLED
+        else []
+    )
+    for key in unique_keys:
+        cache_keys[key] = _build_conversion_cache_key(*key, ai_provider)
+        cached = await _lookup_cached_conversion(*key, ai_provider, cache_keys[key])
+        if cached is not None:
+            outcomes[key] = _BatchItemOutcome(*cached)
+
+    misses = [key for key in dict.fromkeys(keys) if key not in outcomes]
+    try:
+        converted = await _cancel_on_disconnect(
+            request, _convert_batch_misses(misses, batch_request.pack)
+        )
+    except ClientDisconnectedException as e:
+        logger.info(f"{e} ({request.url.path})")
+        return _create_error_response(_get_error_info(e))
+    outcomes.update(converted)
+
+    # 新たに変換できた結果をキャッシュする
+    # （サーキットブレーカーの切り替え等で別のプロバイダーが応答した結果は保存しない）
+    for key, outcome in converted.items():
+        if outcome.error is None and key in cache_keys and outcome.ai_provider == ai_provider:
+            await _store_conversion(cache_keys[key], *key, ai_provider, outcome.converted_text)
+
+    results = []
+    log_entries = []
+    for index, (input_text, politeness_level) in enumerate(keys):
+        outcome = outcomes[(input_text, politeness_level)]
+        error_payload = None
+        if outcome.error is not None:
+            error_payload = _error_payload(_get_error_info(outcome.error))
+        results.append(
+            {
+                "index": index,
+                "original_text": input_text,
+                "politeness_level": politeness_level,
+                "converted_text": outcome.converted_text,
+                "processing_time_ms": outcome.processing_time_ms,
+                "error": error_payload,
+            }
+        )
+        log_entries.append(
+            ConversionLogEntry(
+                input_text=input_text,
+                output_text=outcome.converted_text or "",
+                politeness_level=politeness_level,
+                conversion_time_ms=outcome.processing_time_ms,
+                ai_provider=outcome.ai_provider,
+                session_id=session_id,
+                is_success=outcome.error is None,
+                error_message=None if outcome.error is None else str(outcome.error),
+            )
+        )
+
+    background_tasks.add_task(_persist_conversion_logs_bulk, session_factory, log_entries)
+
+    failed = sum(1 for result in results if result["error"] is not None)
+    return JSONResponse(
+        content={
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "processing_time_ms": int((time.perf_counter() - start_time) * 1000),
+        }
+    )
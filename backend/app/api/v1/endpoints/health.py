@@ -10,14 +10,24 @@ TASK-0029: ヘルスチェックエンドポイント実装（GET /api/v1/health
 
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db_session
 from app.core.config import settings
-from app.schemas.health import HealthErrorResponse, HealthResponse
+from app.schemas.health import (
+    CircuitBreakerStatus,
+    ConcurrencyLimitStatus,
+    ConversionCacheStatus,
+    HealthErrorResponse,
+    HealthResponse,
+    HTTPPoolStatus,
+    ReadinessResponse,
+)
 from app.utils import ai_client as ai_client_module
+from app.utils.conversion_cache import conversion_cache
+from app.utils.warmup import warmup
 
 router = APIRouter()
 
@@ -51,6 +61,81 @@ def get_ai_provider_status() -> str:
     return "none"
 
 
+def get_conversion_cache_status() -> ConversionCacheStatus | None:
+    """
+    【機能概要】: AI変換結果キャッシュの統計を取得するヘルパー関数
+    【設計方針】: キャッシュが無効な場合はNoneを返し、レスポンスに統計を含めない
+
+    Returns:
+        ConversionCacheStatus | None: キャッシュ統計（無効時はNone）
+    """
+    if not settings.CONVERSION_CACHE_ENABLED:
+        return None
+    return ConversionCacheStatus(**conversion_cache.describe())
+
+
+def get_circuit_breaker_status() -> dict[str, CircuitBreakerStatus] | None:
+    """
+    【機能概要】: AIプロバイダーごとのサーキットブレーカー状態を取得するヘルパー関数
+    【設計方針】: サーキットブレーカーが無効な場合はNoneを返し、レスポンスに含めない
+
+    Returns:
+        dict[str, CircuitBreakerStatus] | None: プロバイダー名 → 状態（無効時はNone）
+    """
+    if not settings.AI_CIRCUIT_BREAKER_ENABLED:
+        return None
+    return {
+        provider: CircuitBreakerStatus(**status)
+        for provider, status in ai_client_module.ai_client.describe_providers().items()
+    }
+
+
+def get_http_pool_status() -> dict[str, HTTPPoolStatus]:
+    """
+    【機能概要】: AIプロバイダーごとのHTTP接続プールの状態を取得するヘルパー関数
+    【設計方針】: 初期化済み（APIキーが設定された）プロバイダーの接続プールのみを返す
+
+    Returns:
+        dict[str, HTTPPoolStatus]: プロバイダー名 → 接続プールの状態
+    """
+    return {
+        provider: HTTPPoolStatus(**status)
+        for provider, status in ai_client_module.ai_client.describe_http_pools().items()
+    }
+
+
+def get_concurrency_limit_status() -> dict[str, ConcurrencyLimitStatus] | None:
+    """
+    【機能概要】: AIプロバイダーごとの同時実行数制限の状態を取得するヘルパー関数
+    【設計方針】: 同時実行数制限が無効な場合はNoneを返し、レスポンスに含めない
+
+    Returns:
+        dict[str, ConcurrencyLimitStatus] | None: プロバイダー名 → 状態（無効時はNone）
+    """
+    if not settings.AI_CONCURRENCY_LIMIT_ENABLED:
+        return None
+    return {
+        provider: ConcurrencyLimitStatus(**status)
+        for provider, status in ai_client_module.ai_client.describe_concurrency_limits().items()
+    }
+
+
+def get_health_status(ai_providers: dict[str, CircuitBreakerStatus] | None) -> str:
+    """
+    【機能概要】: ヘルスチェックステータスを決定するヘルパー関数
+    【設計方針】: いずれかのプロバイダーのサーキットが open の場合は一部機能低下（"degraded"）
+
+    Args:
+        ai_providers: get_circuit_breaker_status() の結果
+
+    Returns:
+        str: "ok" または "degraded"
+    """
+    if ai_providers and any(status.state == "open" for status in ai_providers.values()):
+        return "degraded"
+    return "ok"
+
+
 @router.get(
     "",
     response_model=HealthResponse,
@@ -64,7 +149,10 @@ async def health_check(
 ) -> HealthResponse:
     """
     【機能概要】: ヘルスチェックエンドポイント - システム稼働状況とデータベース接続確認
-    【実装方針】: DB接続確認、AIプロバイダー確認、タイムスタンプ、バージョン情報を含む
+    【実装方針】: DB接続確認、AIプロバイダー確認、タイムスタンプ、バージョン情報、
+                  変換結果キャッシュ統計、プロバイダーごとのサーキットブレーカー状態、
+                  HTTP接続プールの状態と同時実行数制限の状態を含む。
+                  サーキットが open のプロバイダーがある場合、statusは"degraded"になる
 
     Args:
         db: データベースセッション（依存性注入）
@@ -83,13 +171,18 @@ async def health_check(
 
         # AIプロバイダー確認
         ai_provider = get_ai_provider_status()
+        ai_providers = get_circuit_breaker_status()
 
         return HealthResponse(
-            status="ok",
+            status=get_health_status(ai_providers),
             database="connected",
             ai_provider=ai_provider,
             version=settings.VERSION,
             timestamp=timestamp,
+            conversion_cache=get_conversion_cache_status(),
+            ai_providers=ai_providers,
+            ai_http_pools=get_http_pool_status(),
+            ai_concurrency=get_concurrency_limit_status(),
         )
     except Exception as e:
         error_message = (
@@ -104,3 +197,33 @@ async def health_check(
             timestamp=error_timestamp,
         )
         raise HTTPException(status_code=500, detail=error_response.model_dump()) from e
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    responses={
+        200: {"description": "ウォームアップ完了（リクエストを受け付け可能）"},
+        503: {"description": "ウォームアップ中", "model": ReadinessResponse},
+    },
+)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """
+    【機能概要】: レディネスエンドポイント - 起動時のウォームアップが完了したかを返す
+    【実装方針】: ウォームアップ完了まではHTTP 503を返す。DBへの問い合わせは行わない
+                  （DB接続の確認は /api/v1/health で行う）
+
+    Args:
+        response: ステータスコードを設定するレスポンス
+
+    Returns:
+        ReadinessResponse: レディネス状態とウォームアップの結果
+    """
+    state = warmup.describe()
+    if not warmup.ready:
+        response.status_code = 503
+    return ReadinessResponse(
+        status="ready" if warmup.ready else "warming_up",
+        database_connections=state["database_connections"],
+        providers=state["providers"],
+    )
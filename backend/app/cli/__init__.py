@@ -0,0 +1,5 @@
+"""
+コマンドラインジョブ パッケージ
+
+運用時に `python -m app.cli.<ジョブ名>` で実行する管理用ジョブを提供する。
+"""
@@ -0,0 +1,570 @@
+"""
+疑似AIプロバイダーサーバー
+
+【機能概要】: Anthropic Messages API・OpenAI Chat Completions API と互換の応答を返す
+              ローカルのASGIサーバー。ANTHROPIC_BASE_URL / OPENAI_BASE_URL をこのサーバーに
+              向けることで、ネットワークやAPIキーなしで実際のSDK・httpx・リトライ・
+              同時実行数制限の処理経路を通した負荷試験ができる
+【実装方針】:
+  - 応答までの時間は固定値・対数正規分布・二峰性分布（一部の応答だけが遅い）から選ぶ
+  - 429（retry-after 付き）・タイムアウト（応答しない）・接続エラー（応答の途中で切断）を
+    指定した割合で発生させる。requests_per_minute を指定した場合はレート制限ヘッダーを
+    返し、上限を超えた呼び出しを429にする
+  - ストリーミング（stream=true）は各プロバイダーのServer-Sent Events形式で返す
+  - 変換結果は入力文に丁寧さに応じた語尾を付けた決定的な文字列とする
+    （一括変換・複数候補のJSON配列の指示にも応答する）
+【使い方】:
+  python -m app.cli.fake_provider --port 8900 --latency lognormal --median-ms 800
+  ANTHROPIC_BASE_URL=http://127.0.0.1:8900 OPENAI_BASE_URL=http://127.0.0.1:8900/v1
+  （APIキーには任意の文字列を設定する）
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, MutableMapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Literal
+
+Scope = MutableMapping[str, object]
+Message = MutableMapping[str, object]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+LatencyDistribution = Literal["fixed", "lognormal", "bimodal"]
+
+ANTHROPIC_PATH = "/v1/messages"
+OPENAI_PATH = "/v1/chat/completions"
+
+# 丁寧さの指示（システムプロンプト）に含まれる語 → 変換結果に付ける語尾
+_POLITENESS_SUFFIXES: tuple[tuple[str, str], ...] = (
+    ("カジュアル", "だよ"),
+    ("非常に丁寧", "でございます"),
+)
+_DEFAULT_SUFFIX = "です"
+
+_INPUT_LINE = re.compile(r"^(?:元の)?入力文: (.+)$", re.MULTILINE)
+_NUMBERED_LINE = re.compile(r"^\d+\. (.+)$", re.MULTILINE)
+_VARIANT_COUNT = re.compile(r"変換候補を(\d+)個")
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """
+    応答までの時間の分布
+
+    Attributes:
+        distribution: "fixed"（常に median_ms）/ "lognormal"（中央値 median_ms・
+                      対数の標準偏差 sigma）/ "bimodal"（slow_ratio の割合で中央値
+                      slow_median_ms の対数正規分布、それ以外は lognormal と同じ）
+    """
+
+    distribution: LatencyDistribution = "lognormal"
+    median_ms: float = 800.0
+    sigma: float = 0.5
+    slow_ratio: float = 0.05
+    slow_median_ms: float = 6000.0
+
+    def sample(self, rng: random.Random) -> float:
+        """応答までの時間（秒）を1つ選ぶ"""
+        median_ms = self.median_ms
+        if self.distribution == "fixed":
+            return max(0.0, median_ms) / 1000
+        if self.distribution == "bimodal" and rng.random() < self.slow_ratio:
+            median_ms = self.slow_median_ms
+        return rng.lognormvariate(math.log(max(median_ms, 1e-3)), self.sigma) / 1000
+
+
+@dataclass(frozen=True)
+class FakeProviderConfig:
+    """
+    疑似プロバイダーの設定
+
+    Attributes:
+        latency: 応答までの時間の分布（ストリーミングでは最終断片までの時間）
+        rate_limit_ratio: 429を返す呼び出しの割合
+        timeout_ratio: 応答せずに hang_seconds 秒待たせる呼び出しの割合
+        connection_error_ratio: 応答ヘッダーの送信後に接続を切る呼び出しの割合
+        hang_seconds: タイムアウトを注入した呼び出しを待たせる秒数
+        retry_after_seconds: 429に付ける retry-after（秒）
+        requests_per_minute: 1分あたりの呼び出し数の上限
+                             （None の場合はレート制限ヘッダーを返さない）
+        stream_first_chunk_ratio: ストリーミングで最初の断片を返すまでの時間（応答時間に対する割合）
+        stream_chunk_chars: ストリーミングの1断片の文字数
+        seed: 乱数のシード（None の場合は実行ごとに異なる）
+    """
+
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    rate_limit_ratio: float = 0.0
+    timeout_ratio: float = 0.0
+    connection_error_ratio: float = 0.0
+    hang_seconds: float = 60.0
+    retry_after_seconds: float = 1.0
+    requests_per_minute: int | None = None
+    stream_first_chunk_ratio: float = 0.3
+    stream_chunk_chars: int = 4
+    seed: int | None = None
+
+
+def fake_conversion(system_prompt: str, user_prompt: str, n: int = 1) -> list[str]:
+    """
+    プロンプトから決定的な疑似変換結果を作る
+
+    Args:
+        system_prompt: システムプロンプト（丁寧さの指示を含む）
+        user_prompt: ユーザーメッセージ
+        n: 返す候補の数（OpenAI の n パラメータ）
+
+    Returns:
+        list[str]: 応答本文（n 件）
+    """
+    suffix = next(
+        (suffix for keyword, suffix in _POLITENESS_SUFFIXES if keyword in system_prompt),
+        _DEFAULT_SUFFIX,
+    )
+
+    def convert(text: str) -> str:
+        return f"{text.strip().rstrip('。')}{suffix}。"
+
+    if "JSON形式の文字列配列" in user_prompt:
+        variant_count = _VARIANT_COUNT.search(user_prompt)
+        if variant_count is not None:
+            base = convert(_first_input(user_prompt))
+            items = [base] + [f"{base}（{i}）" for i in range(2, int(variant_count.group(1)) + 1)]
+        else:
+            items = [convert(text) for text in _NUMBERED_LINE.findall(user_prompt)]
+        return [json.dumps(items, ensure_ascii=False)] * n
+
+    converted = convert(_first_input(user_prompt))
+    return [converted] + [f"{converted}（{i}）" for i in range(2, n + 1)]
+
+
+def _first_input(user_prompt: str) -> str:
+    match = _INPUT_LINE.search(user_prompt)
+    return match.group(1) if match else user_prompt.strip().splitlines()[0]
+
+
+def _message_text(content: Any) -> str:  # noqa: ANN401
+    """メッセージの content（文字列またはブロックのリスト）から本文を取り出す"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return ""
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+class FakeProviderApp:
+    """Anthropic・OpenAI 互換の応答を返すASGIアプリケーション"""
+
+    def __init__(self, config: FakeProviderConfig | None = None) -> None:
+        self.config = config or FakeProviderConfig()
+        self._rng = random.Random(self.config.seed)  # noqa: S311
+        self._ids = itertools.count(1)
+        self._recent_requests: deque[float] = deque()
+        self.request_count = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path, method = scope["path"], scope["method"]
+        if method != "POST" or path not in (ANTHROPIC_PATH, OPENAI_PATH):
+            # 接続の事前確立（HEAD）等、API以外のリクエストには404を返す
+            await self._send_json(send, 404, {"error": "not found"})
+            return
+
+        provider = "anthropic" if path == ANTHROPIC_PATH else "openai"
+        body = json.loads(await self._read_body(receive) or b"{}")
+        self.request_count += 1
+
+        limited, rate_headers = self._rate_limit(provider)
+        fault = self._choose_fault()
+        if limited or fault == "rate_limit":
+            await self._send_rate_limited(send, provider, rate_headers)
+            return
+        if fault == "timeout":
+            await asyncio.sleep(self.config.hang_seconds)
+            await self._send_json(send, 504, {"error": "upstream timeout"}, rate_headers)
+            return
+
+        latency = self.config.latency.sample(self._rng)
+        if body.get("stream"):
+            await self._stream(send, provider, body, latency, rate_headers, fault)
+            return
+        await asyncio.sleep(latency)
+        if fault == "connection_error":
+            # 応答ヘッダーだけを送り、本文を送らずに終了する（ASGIサーバーは接続を閉じ、
+            # クライアントには接続エラーとして見える）
+            await self._start_response(send, 200, "application/json", rate_headers)
+            return
+        await self._send_json(send, 200, self._completion(provider, body), rate_headers)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    def _choose_fault(self) -> str | None:
+        """注入する障害を割合に従って選ぶ（None の場合は正常に応答する）"""
+        draw = self._rng.random()
+        for fault, ratio in (
+            ("rate_limit", self.config.rate_limit_ratio),
+            ("timeout", self.config.timeout_ratio),
+            ("connection_error", self.config.connection_error_ratio),
+        ):
+            if draw < ratio:
+                return fault
+            draw -= ratio
+        return None
+
+    def _rate_limit(self, provider: str) -> tuple[bool, dict[str, str]]:
+        """
+        1分あたりの上限に対する残り呼び出し数を数え、レート制限ヘッダーを作る
+
+        Returns:
+            tuple[bool, dict[str, str]]: (上限を超えたか, 応答に付けるヘッダー)
+        """
+        limit = self.config.requests_per_minute
+        if limit is None:
+            return False, {}
+        now = time.monotonic()
+        while self._recent_requests and self._recent_requests[0] <= now - 60:
+            self._recent_requests.popleft()
+        limited = len(self._recent_requests) >= limit
+        if not limited:
+            self._recent_requests.append(now)
+        remaining = limit - len(self._recent_requests)
+        reset_seconds = 60 - (now - self._recent_requests[0]) if self._recent_requests else 0.0
+        if provider == "anthropic":
+            reset_at = datetime.fromtimestamp(time.time() + reset_seconds, timezone.utc)
+            return limited, {
+                "anthropic-ratelimit-requests-limit": str(limit),
+                "anthropic-ratelimit-requests-remaining": str(remaining),
+                "anthropic-ratelimit-requests-reset": reset_at.isoformat().replace("+00:00", "Z"),
+            }
+        return limited, {
+            "x-ratelimit-limit-requests": str(limit),
+            "x-ratelimit-remaining-requests": str(remaining),
+            "x-ratelimit-reset-requests": f"{reset_seconds:.3f}s",
+        }
+
+    def _completion(self, provider: str, body: dict[str, Any]) -> dict[str, object]:
+        """非ストリーミングの応答本文を組み立てる"""
+        system_prompt, user_prompt = self._prompts(provider, body)
+        n = int(body.get("n") or 1) if provider == "openai" else 1
+        texts = fake_conversion(system_prompt, user_prompt, n)
+        input_tokens = _estimate_tokens(system_prompt + user_prompt)
+        output_tokens = sum(_estimate_tokens(text) for text in texts)
+        request_id = next(self._ids)
+        if provider == "anthropic":
+            return {
+                "id": f"msg_fake_{request_id}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get("model", "fake"),
+                "content": [{"type": "text", "text": texts[0]}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "cache_creation_input_tokens": 0,
+                    "cache_read_input_tokens": 0,
+                },
+            }
+        return {
+            "id": f"chatcmpl-fake-{request_id}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [
+                {
+                    "index": index,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+                for index, text in enumerate(texts)
+            ],
+            "usage": {
+                "prompt_tokens": input_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+                "prompt_tokens_details": {"cached_tokens": 0},
+            },
+        }
+
+    def _prompts(self, provider: str, body: dict[str, Any]) -> tuple[str, str]:
+        """リクエストから (システムプロンプト, 最後のユーザーメッセージ) を取り出す"""
+        messages = [m for m in body.get("messages") or [] if isinstance(m, dict)]
+        system_prompt = _message_text(body.get("system")) if provider == "anthropic" else ""
+        system_prompt += "".join(
+            _message_text(m.get("content")) for m in messages if m.get("role") == "system"
+        )
+        users = [_message_text(m.get("content")) for m in messages if m.get("role") == "user"]
+        return system_prompt, users[-1] if users else ""
+
+    async def _stream(
+        self,
+        send: Send,
+        provider: str,
+        body: dict[str, Any],
+        latency: float,
+        headers: dict[str, str],
+        fault: str | None,
+    ) -> None:
+        """
+        Server-Sent Events で断片を返す
+
+        最初の断片まで latency × stream_first_chunk_ratio 秒待ち、残りの断片は
+        最終断片が latency 秒後になるよう等間隔で返す。接続エラーを注入した場合は
+        最初の断片の後で（応答を完了せずに）終了する
+        """
+        system_prompt, user_prompt = self._prompts(provider, body)
+        text = fake_conversion(system_prompt, user_prompt)[0]
+        size = max(1, self.config.stream_chunk_chars)
+        chunks = [text[start : start + size] for start in range(0, len(text), size)]
+        first_delay = latency * self.config.stream_first_chunk_ratio
+        interval = (latency - first_delay) / max(1, len(chunks) - 1)
+        input_tokens = _estimate_tokens(system_prompt + user_prompt)
+        output_tokens = _estimate_tokens(text)
+        request_id = next(self._ids)
+        model = body.get("model", "fake")
+
+        await self._start_response(send, 200, "text/event-stream", headers)
+        await asyncio.sleep(first_delay)
+        if provider == "anthropic":
+            events = self._anthropic_events(request_id, model, chunks, input_tokens, output_tokens)
+        else:
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            events = self._openai_events(
+                request_id, model, chunks, input_tokens, output_tokens, include_usage
+            )
+        sent_deltas = 0
+        for event, is_delta in events:
+            if is_delta and sent_deltas:
+                if fault == "connection_error":
+                    return
+                await asyncio.sleep(interval)
+            sent_deltas += is_delta
+            await send({"type": "http.response.body", "body": event.encode(), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    def _anthropic_events(
+        self,
+        request_id: int,
+        model: object,
+        chunks: Sequence[str],
+        input_tokens: int,
+        output_tokens: int,
+    ) -> list[tuple[str, bool]]:
+        """Anthropic Messages API のストリーミングイベント（本文, 断片か）を作る"""
+
+        def event(name: str, data: dict[str, object]) -> tuple[str, bool]:
+            payload = json.dumps({"type": name, **data}, ensure_ascii=False)
+            return f"event: {name}\ndata: {payload}\n\n", name == "content_block_delta"
+
+        return [
+            event(
+                "message_start",
+                {
+                    "message": {
+                        "id": f"msg_fake_{request_id}",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": model,
+                        "content": [],
+                        "stop_reason": None,
+                        "stop_sequence": None,
+                        "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+                    }
+                },
+            ),
+            event(
+                "content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}}
+            ),
+            *(
+                event(
+                    "content_block_delta",
+                    {"index": 0, "delta": {"type": "text_delta", "text": chunk}},
+                )
+                for chunk in chunks
+            ),
+            event("content_block_stop", {"index": 0}),
+            event(
+                "message_delta",
+                {
+                    "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                    "usage": {"output_tokens": output_tokens},
+                },
+            ),
+            event("message_stop", {}),
+        ]
+
+    def _openai_events(
+        self,
+        request_id: int,
+        model: object,
+        chunks: Sequence[str],
+        input_tokens: int,
+        output_tokens: int,
+        include_usage: bool,
+    ) -> list[tuple[str, bool]]:
+        """OpenAI Chat Completions API のストリーミングチャンク（本文, 断片か）を作る"""
+        created = int(time.time())
+
+        def chunk_event(choices: list[dict[str, object]], **extra: object) -> str:
+            data = {
+                "id": f"chatcmpl-fake-{request_id}",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        events = [
+            (
+                chunk_event(
+                    [
+                        {
+                            "index": 0,
+                            "delta": {"role": "assistant", "content": chunk},
+                            "finish_reason": None,
+                        }
+                    ]
+                ),
+                True,
+            )
+            for chunk in chunks
+        ]
+        events.append((chunk_event([{"index": 0, "delta": {}, "finish_reason": "stop"}]), False))
+        if include_usage:
+            usage = {
+                "prompt_tokens": input_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            }
+            events.append((chunk_event([], usage=usage), False))
+        events.append(("data: [DONE]\n\n", False))
+        return events
+
+    async def _send_rate_limited(self, send: Send, provider: str, headers: dict[str, str]) -> None:
+        retry_after = self.config.retry_after_seconds
+        headers = {**headers, "retry-after": f"{retry_after:g}"}
+        message = "Rate limit exceeded (fake provider)"
+        if provider == "anthropic":
+            body = {"type": "error", "error": {"type": "rate_limit_error", "message": message}}
+        else:
+            body = {
+                "error": {
+                    "message": message,
+                    "type": "requests",
+                    "param": None,
+                    "code": "rate_limit_exceeded",
+                }
+            }
+        await self._send_json(send, 429, body, headers)
+
+    async def _send_json(
+        self,
+        send: Send,
+        status: int,
+        body: dict[str, object],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        await self._start_response(send, status, "application/json", headers or {})
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        await send({"type": "http.response.body", "body": payload})
+
+    @staticmethod
+    async def _start_response(
+        send: Send, status: int, content_type: str, headers: dict[str, str]
+    ) -> None:
+        raw_headers = [(b"content-type", content_type.encode())] + [
+            (name.encode(), value.encode()) for name, value in headers.items()
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+
+
+def build_config(args: argparse.Namespace) -> FakeProviderConfig:
+    """コマンドライン引数から設定を作る"""
+    return FakeProviderConfig(
+        latency=LatencyProfile(
+            distribution=args.latency,
+            median_ms=args.median_ms,
+            sigma=args.sigma,
+            slow_ratio=args.slow_ratio,
+            slow_median_ms=args.slow_median_ms,
+        ),
+        rate_limit_ratio=args.rate_limit_ratio,
+        timeout_ratio=args.timeout_ratio,
+        connection_error_ratio=args.connection_error_ratio,
+        hang_seconds=args.hang_seconds,
+        retry_after_seconds=args.retry_after,
+        requests_per_minute=args.requests_per_minute,
+        seed=args.seed,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    疑似プロバイダーサーバーを起動する
+
+    Args:
+        argv: コマンドライン引数（省略時は sys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli.fake_provider")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", choices=["fixed", "lognormal", "bimodal"], default="lognormal")
+    parser.add_argument("--median-ms", type=float, default=800.0)
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    parser.add_argument("--slow-median-ms", type=float, default=6000.0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    parser.add_argument("--timeout-ratio", type=float, default=0.0)
+    parser.add_argument("--connection-error-ratio", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--requests-per-minute", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    uvicorn.run(FakeProviderApp(build_config(args)), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""
+定型文変換テーブル生成ジョブ
+
+【機能概要】: 定型文の一覧をAIClientで各丁寧さレベルに変換し、phrase_table_versions /
+              phrase_table_entries に新しいバージョンとして保存・公開する。
+              稼働中のワーカーは PHRASE_TABLE_RELOAD_INTERVAL_SECONDS 以内に新しい
+              バージョンを読み込む
+【実装方針】:
+  - AI API呼び出しの同時実行数は AI_BATCH_CONCURRENCY で制限する
+  - AI API呼び出しは一括処理の優先度（RequestPriority.BULK）で行い、同じプロバイダーを
+    使う端末からの変換を待たせない
+  - 変換に失敗した定型文があった場合は、欠けたテーブルで公開済みのテーブルを
+    置き換えないよう、未公開のバージョンとして保存して終了コード1を返す
+【使い方】:
+  python -m app.cli.phrase_table build app/data/preset_phrases.txt [--no-publish]
+  python -m app.cli.phrase_table publish <バージョン>
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+from app.core.config import settings
+from app.crud.crud_phrase_table import (
+    PhraseTableRow,
+    create_phrase_table_version,
+    publish_phrase_table_version,
+)
+from app.db.session import async_session_maker, engine
+from app.utils import ai_client as ai_client_module
+from app.utils.conversion_cache import normalize_input_text
+from app.utils.phrase_table import POLITENESS_LEVELS
+from app.utils.request_priority import RequestPriority, set_priority
+
+logger = logging.getLogger(__name__)
+
+
+def read_phrases(path: Path) -> list[str]:
+    """
+    定型文の一覧ファイルを読み込む（1行1件。空行と # で始まる行は無視し、重複は除く）
+
+    Args:
+        path: 定型文の一覧ファイル
+
+    Returns:
+        list[str]: 正規化した定型文
+    """
+    phrases = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        phrase = normalize_input_text(line)
+        if phrase and not phrase.startswith("#"):
+            phrases.append(phrase)
+    return list(dict.fromkeys(phrases))
+
+
+async def generate_phrase_table_rows(
+    phrases: Sequence[str],
+) -> tuple[list[PhraseTableRow], list[tuple[str, str]]]:
+    """
+    定型文を各丁寧さレベルにAIで変換する
+
+    Args:
+        phrases: 定型文
+
+    Returns:
+        tuple[list[PhraseTableRow], list[tuple[str, str]]]:
+            (変換結果, 変換に失敗した (定型文, 丁寧さレベル))
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.AI_BATCH_CONCURRENCY))
+
+    async def convert(phrase: str, level: str) -> PhraseTableRow | None:
+        async with semaphore:
+            try:
+                converted_text, _ = await ai_client_module.ai_client.convert_text(
+                    input_text=phrase, politeness_level=level
+                )
+            except Exception as e:
+                logger.warning(f"Failed to convert phrase ({level}): {e}")
+                return None
+        return PhraseTableRow(phrase, level, converted_text)
+
+    pairs = [(phrase, level) for phrase in phrases for level in POLITENESS_LEVELS]
+    results = await asyncio.gather(*(convert(*pair) for pair in pairs))
+    rows = [row for row in results if row is not None]
+    failures = [pair for pair, row in zip(pairs, results, strict=True) if row is None]
+    return rows, failures
+
+
+async def build(path: Path, publish: bool) -> int:
+    """
+    定型文変換テーブルを生成して保存する
+
+    Args:
+        path: 定型文の一覧ファイル
+        publish: 保存と同時に公開するか
+
+    Returns:
+        int: 終了コード（変換に失敗した定型文があった場合は1）
+    """
+    phrases = read_phrases(path)
+    rows, failures = await generate_phrase_table_rows(phrases)
+    publish = publish and not failures
+    provider = settings.DEFAULT_AI_PROVIDER
+    async with async_session_maker() as session:
+        version = await create_phrase_table_version(
+            session,
+            rows,
+            model=ai_client_module.model_for_provider(provider),
+            prompt_version=ai_client_module.PROMPT_VERSION,
+            publish=publish,
+        )
+        await session.commit()
+
+    state = "published" if publish else "saved (not published)"
+    print(f"Phrase table version {version.id} {state}: {len(rows)} conversions")
+    if failures:
+        print(f"{len(failures)} conversions failed; publish after checking the table.")
+        return 1
+    return 0
+
+
+async def publish(version_id: int) -> int:
+    """
+    既存のバージョンを公開する
+
+    Args:
+        version_id: 公開するバージョン
+
+    Returns:
+        int: 終了コード（バージョンが存在しない場合は1）
+    """
+    async with async_session_maker() as session:
+        published = await publish_phrase_table_version(session, version_id)
+        await session.commit()
+    if not published:
+        print(f"Phrase table version {version_id} does not exist")
+        return 1
+    print(f"Phrase table version {version_id} published")
+    return 0
+
+
+async def _run(args: argparse.Namespace) -> int:
+    # 生成ジョブのAI API呼び出しは一括変換と同じ優先度で同時実行数の枠を待つ
+    set_priority(RequestPriority.BULK)
+    try:
+        if args.command == "build":
+            return await build(args.phrases, publish=args.publish)
+        return await publish(args.version)
+    finally:
+        await ai_client_module.ai_client.aclose()
+        await engine.dispose()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    コマンドラインから実行する
+
+    Args:
+        argv: コマンドライン引数（省略時は sys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli.phrase_table")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="generate and store a new table version")
+    build_parser.add_argument("phrases", type=Path, help="phrase list (one phrase per line)")
+    build_parser.add_argument(
+        "--no-publish", dest="publish", action="store_false", help="store without publishing"
+    )
+    publish_parser = commands.add_parser("publish", help="publish an existing table version")
+    publish_parser.add_argument("version", type=int)
+
+    logging.basicConfig(level=logging.INFO)
+    return asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
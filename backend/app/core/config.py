@@ -4,6 +4,7 @@
 環境変数から設定を読み込み、型安全に管理する。
 """
 
+from functools import lru_cache
 from typing import Literal
 
 from pydantic import model_validator
@@ -16,6 +17,12 @@ DEV_POSTGRES_PASSWORD = "your_secure_password_here"  # noqa: S105
 EnvironmentName = Literal["development", "test", "staging", "production"]
 
 
+@lru_cache(maxsize=4)
+def parse_api_keys(api_keys: str) -> tuple[str, ...]:
+    """API_KEYS をキーのタプルに分割する（全リクエストで参照されるため、分割結果は再利用する）"""
+    return tuple(key.strip() for key in api_keys.split(",") if key.strip())
+
+
 class Settings(BaseSettings):
     """アプリケーション設定クラス"""
 
@@ -67,6 +74,14 @@ class Settings(BaseSettings):
     # 運用する場合は Redis 等の共有ストレージURIを指定すること（例: "redis://host:6379"）。
     RATE_LIMIT_STORAGE_URI: str = ""
 
+    # 一括変換API（/api/v1/ai/convert/batch）のレート制限。
+    # 1リクエストあたり「項目数」をコストとして数え、
+    # BATCH_RATE_LIMIT_ITEMS 項目 / BATCH_RATE_LIMIT_SECONDS 秒 / IP を上限とする。
+    # 1リクエストの最大項目数（150）以上に設定すること（未満だと最大件数のリクエストが
+    # 常に拒否される）。
+    BATCH_RATE_LIMIT_ITEMS: int = 150
+    BATCH_RATE_LIMIT_SECONDS: int = 600
+
     # 信頼するリバースプロキシの段数。
     # 0 の場合: X-Forwarded-For を信頼せず、接続元IP（request.client）でレート制限する。
     # N>=1 の場合: 自身が運用するプロキシ N 段を信頼し、X-Forwarded-For の右からN番目を
@@ -80,10 +95,15 @@ class Settings(BaseSettings):
     # AI変換機能設定（OpenAI）
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL: str = "gpt-4o-mini"
+    # 接続先のURL（未設定の場合はSDKの既定値。ローカルの疑似プロバイダー
+    # python -m app.cli.fake_provider で負荷試験する場合は "http://127.0.0.1:8900/v1"）
+    OPENAI_BASE_URL: str | None = None
 
     # AI変換機能設定（Anthropic）
     ANTHROPIC_API_KEY: str | None = None
     ANTHROPIC_MODEL: str = "claude-sonnet-4-6"
+    # 接続先のURL（未設定の場合はSDKの既定値。疑似プロバイダーでは "http://127.0.0.1:8900"）
+    ANTHROPIC_BASE_URL: str | None = None
     DEFAULT_AI_PROVIDER: str = "anthropic"
 
     # AI API呼び出し1試行あたりのタイムアウト秒数（SDKクライアントに直接渡す値）。
@@ -98,12 +118,188 @@ class Settings(BaseSettings):
     # デフォルト1: 最大1回まで再試行する（初回+1回、合計最大2試行）。
     AI_MAX_RETRIES: int = 1
 
+    # リトライ予算（プロセス内のすべてのAI API呼び出しで共有）。
+    # 直近 AI_RETRY_BUDGET_WINDOW_SECONDS 秒間のリトライ数が呼び出し数の AI_RETRY_BUDGET_RATIO 倍に
+    # 達したらリトライしない（障害時に全リクエストがリトライして送信量が倍増するのを防ぐ）。
+    # 呼び出しが少ない時間帯でも、ウィンドウ内で AI_RETRY_BUDGET_MIN_RETRIES 回まではリトライする。
+    AI_RETRY_BUDGET_ENABLED: bool = True
+    AI_RETRY_BUDGET_RATIO: float = 0.1
+    AI_RETRY_BUDGET_WINDOW_SECONDS: float = 10.0
+    AI_RETRY_BUDGET_MIN_RETRIES: int = 3
+
     # AI呼び出し1リクエスト全体（リトライ試行すべてを含む）に課す最大所要秒数。
     # フロントエンド（Dio）のconnect/receiveタイムアウト（各10秒）と整合させ、
     # クライアントが待受を諦めた後もバックエンドがAI APIへの課金呼び出しを
     # 継続してしまう事態を防ぐ。超過時はタイムアウトエラーとして扱われる。
     AI_CALL_DEADLINE_SECONDS: float = 10.0
 
+    # AI APIへのHTTP接続設定（Anthropic / OpenAI のSDKクライアントで共通、プロバイダーごとに
+    # 独立した接続プールを持つ）。バースト時に毎回TLS接続を張り直さないよう、
+    # アイドル接続を保持して再利用する。
+    # 接続プールの最大接続数（プロバイダーごと）
+    AI_HTTP_MAX_CONNECTIONS: int = 20
+    # 再利用のために保持するアイドル接続数の上限（プロバイダーごと）
+    AI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    # アイドル接続を保持する秒数
+    AI_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    # HTTP/2で1接続に複数リクエストを多重化する（h2パッケージが必要。
+    # 未インストールの場合は警告ログを出してHTTP/1.1で接続する）
+    AI_HTTP2_ENABLED: bool = True
+
+    # 同一 (入力文字列, 丁寧さレベル, プロバイダー) の同時変換リクエストを1回のAI API呼び出しに
+    # 集約する（single-flight）。複数端末が同じ定型文を同時に送信した場合の重複課金を防ぐ。
+    AI_SINGLE_FLIGHT_ENABLED: bool = True
+
+    # OpenAI のプロンプトキャッシュを使う（丁寧さレベルごとの prompt_cache_key を付ける）。
+    # Anthropic の cache_control はシステムプロンプトが最小長の1024トークンに満たないため付けない。
+    # キャッシュから読み込んだトークン数は /metrics の kotonoha_ai_tokens_total で確認できる。
+    AI_PROMPT_CACHE_ENABLED: bool = True
+
+    # 一括変換API（/api/v1/ai/convert/batch）の設定
+    # 同時に実行するAI API呼び出し数の上限（1リクエストあたり）
+    AI_BATCH_CONCURRENCY: int = 4
+    # まとめて変換（pack=true）時に1回のプロンプトへ詰める項目数の上限
+    AI_BATCH_PACK_SIZE: int = 10
+
+    # サーキットブレーカー設定（プロバイダーごと、/api/v1/ai/convert が対象）
+    # 直近 AI_CIRCUIT_WINDOW_SIZE 件（AI_CIRCUIT_MIN_CALLS 件以上）のエラー率または低速呼び出し率が
+    # しきい値以上になると、そのプロバイダーを AI_CIRCUIT_OPEN_SECONDS 秒間遮断し、もう一方の
+    # プロバイダー（APIキー設定時）へ即座に切り替える。切替先がない場合は待たずに503を返す。
+    # AI_CIRCUIT_OPEN_SECONDS は AI_CALL_DEADLINE_SECONDS より長くすること
+    # （遮断前に開始した呼び出しの結果が試行結果と混ざらないようにするため）。
+    AI_CIRCUIT_BREAKER_ENABLED: bool = True
+    AI_CIRCUIT_WINDOW_SIZE: int = 20
+    AI_CIRCUIT_MIN_CALLS: int = 5
+    AI_CIRCUIT_FAILURE_RATE_THRESHOLD: float = 0.5
+    # 低速とみなす所要時間（秒）と、遮断する低速呼び出し率
+    AI_CIRCUIT_SLOW_CALL_SECONDS: float = 8.0
+    AI_CIRCUIT_SLOW_CALL_RATE_THRESHOLD: float = 0.8
+    # 遮断を維持する秒数（経過後は AI_CIRCUIT_HALF_OPEN_MAX_CALLS 件まで試行して回復を確認する）
+    AI_CIRCUIT_OPEN_SECONDS: float = 30.0
+    AI_CIRCUIT_HALF_OPEN_MAX_CALLS: int = 1
+
+    # 適応的同時実行数制限（プロバイダーごと、AI API呼び出しのすべてが対象）
+    # 同時に実行するAI API呼び出し数を制限し、上限を成功のたびに少しずつ増やし、
+    # レート制限（429）で AI_CONCURRENCY_RATE_LIMIT_BACKOFF 倍、応答時間の悪化（基準応答時間の
+    # AI_CONCURRENCY_LATENCY_TOLERANCE 倍超、またはタイムアウト）で
+    # AI_CONCURRENCY_LATENCY_BACKOFF 倍に減らす。上限に達した呼び出しは待ち行列で待ち、
+    # AI_CALL_DEADLINE_SECONDS までに完了する見込みがなくなった場合は429を返す。
+    # 現在の上限と待ち行列の長さは /api/v1/health で確認できる。
+    AI_CONCURRENCY_LIMIT_ENABLED: bool = True
+    AI_CONCURRENCY_INITIAL_LIMIT: int = 8
+    AI_CONCURRENCY_MIN_LIMIT: int = 1
+    AI_CONCURRENCY_MAX_LIMIT: int = 64
+    AI_CONCURRENCY_RATE_LIMIT_BACKOFF: float = 0.5
+    AI_CONCURRENCY_LATENCY_BACKOFF: float = 0.9
+    AI_CONCURRENCY_LATENCY_TOLERANCE: float = 2.5
+    # 待ち行列に入れられる呼び出し数の上限（満杯の場合は待たずに429を返す）
+    AI_CONCURRENCY_MAX_QUEUE: int = 100
+
+    # レート制限ヘッダーに基づく送信調整（プロバイダーごと、AI API呼び出しのすべてが対象）
+    # 応答ごとのレート制限ヘッダー（残りリクエスト数・トークン数とリセット時刻）から残り予算を求め、
+    # 枯渇しそうな場合は回復を待ってから送信する。待ち時間が AI_RATE_LIMIT_MAX_WAIT_SECONDS
+    # （またはデッドラインまでの残り時間）を超える場合は、AI APIを呼び出さずに429を返す。
+    AI_RATE_LIMIT_BUDGET_ENABLED: bool = True
+    AI_RATE_LIMIT_MAX_WAIT_SECONDS: float = 2.0
+    # 1回の呼び出しで消費する見込みのトークン数（入力 + 出力）
+    AI_RATE_LIMIT_ESTIMATED_TOKENS: int = 400
+    # 他のワーカーが送信中の呼び出し分として残しておく、上限に対する割合
+    AI_RATE_LIMIT_HEADROOM_RATIO: float = 0.05
+
+    # ヘッジ設定（/api/v1/ai/convert のテールレイテンシ対策、オプトイン）
+    # 有効時、DEFAULT_AI_PROVIDERの応答が遅い場合にもう一方のプロバイダーへ同じプロンプトを
+    # 送信し、先に成功した結果を採用する（両方のAPIキーが設定されている場合のみ動作）。
+    # 発火した分だけAI APIの呼び出しが増えるため、デフォルトは無効。
+    AI_HEDGING_ENABLED: bool = False
+    # ヘッジ発火までの待ち時間に使う、プライマリの直近応答時間のパーセンタイル（0〜100）
+    AI_HEDGING_PERCENTILE: float = 95.0
+    # パーセンタイル算出に必要な最小サンプル数（不足時はAI_HEDGING_DEFAULT_DELAY_SECONDSを使用）
+    AI_HEDGING_MIN_SAMPLES: int = 20
+    # 応答時間を保持する直近の件数（プロバイダーごと）
+    AI_HEDGING_LATENCY_WINDOW: int = 200
+    # サンプル不足時の待ち時間（秒）
+    AI_HEDGING_DEFAULT_DELAY_SECONDS: float = 3.0
+    # 待ち時間の下限（秒）。平常時の応答にまでヘッジが発火しないようにする。
+    AI_HEDGING_MIN_DELAY_SECONDS: float = 1.0
+
+    # AI変換結果キャッシュ設定
+    # 同一入力・同一丁寧さレベル（・同一プロバイダー/モデル/プロンプト）の変換結果を再利用し、
+    # AI API呼び出しを省略する。/api/v1/ai/convert のみが対象（再変換は常にAIを呼び出す）。
+    CONVERSION_CACHE_ENABLED: bool = True
+    # プロセス内メモリ使用時の最大保持件数（超過時は最も古く参照されたものから破棄）
+    CONVERSION_CACHE_MAX_ENTRIES: int = 1024
+    # 変換結果の有効期限（秒）。デフォルトは24時間。
+    CONVERSION_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    # 変換結果キャッシュの保存先URI（RATE_LIMIT_STORAGE_URIと同形式）。
+    # 空文字列（デフォルト）: プロセス内メモリ（ワーカーごとに独立）。
+    # マルチワーカー/マルチインスタンス構成で共有する場合は "redis://host:6379" 等を指定する。
+    CONVERSION_CACHE_STORAGE_URI: str = ""
+    # 類似入力索引: 句点・全角/半角・空白等のわずかな違いしかない過去の入力の変換結果を再利用する
+    # （完全一致のキャッシュにヒットしなかった場合に照合する。CONVERSION_CACHE_ENABLED が
+    # 無効な場合は使用しない）。プロセス内メモリに保持する。
+    SIMILARITY_INDEX_ENABLED: bool = True
+    # 再利用する類似度（文字2-gramのJaccard係数）の下限。
+    # /metrics の kotonoha_similarity_best_score で照合結果の分布を確認して調整する。
+    SIMILARITY_INDEX_THRESHOLD: float = 0.9
+    # 最大保持件数（超過時は最も古く参照されたものから破棄）
+    SIMILARITY_INDEX_MAX_ENTRIES: int = 2048
+
+    # ローカル変換（定型句辞書・語尾の規則）設定
+    # 有効な場合、/api/v1/ai/convert・/convert/stream・/convert/batch で確信度が閾値以上の
+    # 入力をAI APIを呼び出さずに変換し、ログの ai_provider に "local" を記録する。
+    LOCAL_CONVERSION_ENABLED: bool = True
+    # ローカル変換を採用する確信度の下限（0.0〜1.0）。
+    # 定型句の完全一致は 1.0、「名詞+ください/ほしい」は 0.9、動詞て形の依頼は 0.8。
+    LOCAL_CONVERSION_MIN_CONFIDENCE: float = 0.9
+
+    # 定型文変換テーブル設定
+    # 有効な場合、公開済みの最新の定型文変換テーブル（python -m app.cli.phrase_table で生成）を
+    # 起動時にメモリへ読み込み、該当する入力にはAI APIを呼び出さずに応答する
+    # （ログの ai_provider は "phrase_table"）。
+    PHRASE_TABLE_ENABLED: bool = True
+    # 公開バージョンを確認し、新しいバージョンが公開されていれば読み込み直す間隔（秒）。
+    # 0以下で無効（起動時のみ読み込む）。
+    PHRASE_TABLE_RELOAD_INTERVAL_SECONDS: float = 60.0
+    # 1回の読み込みの許容時間（秒）。超過・失敗時は読み込み済みのバージョンを使い続ける。
+    PHRASE_TABLE_LOAD_TIMEOUT_SECONDS: float = 5.0
+
+    # AI変換ログの一括書き込み設定
+    # 有効な場合、ログをプロセス内のキューに積み、バックグラウンドタスクが
+    # CONVERSION_LOG_BATCH_SIZE 件ごと、または CONVERSION_LOG_FLUSH_INTERVAL_MS ミリ秒ごとに
+    # 1回の複数行INSERTでまとめて書き込む（リクエストごとのセッション取得・commitを省く）。
+    CONVERSION_LOG_WRITER_ENABLED: bool = True
+    CONVERSION_LOG_BATCH_SIZE: int = 100
+    CONVERSION_LOG_FLUSH_INTERVAL_MS: int = 500
+    # キューの最大件数。DB障害等で書き込みが滞り上限に達した場合、新しいログは破棄して
+    # 件数のみ記録する（メモリ使用量を抑え、変換処理を妨げないため）。
+    CONVERSION_LOG_QUEUE_MAX_SIZE: int = 10000
+
+    # エラーログ（error_logs）の非同期書き込み設定
+    # 有効な場合、例外ハンドラーはDB書き込みを待たずに応答し、ログは
+    # ERROR_LOG_FLUSH_INTERVAL_SECONDS 秒ごとにまとめて書き込まれる。
+    ERROR_LOG_SINK_ENABLED: bool = True
+    ERROR_LOG_FLUSH_INTERVAL_SECONDS: float = 2.0
+    # 書き込みを待つログの最大件数（超過分は破棄して件数のみ記録する）
+    ERROR_LOG_BUFFER_MAX_ENTRIES: int = 1000
+    # 同じエラー（エラータイプ・エンドポイント・HTTPメソッド・エラーコード）を
+    # 1回の書き込み間隔あたりに記録する件数。超過分は省略件数をまとめた1行にする。
+    ERROR_LOG_SAMPLES_PER_INTERVAL: int = 5
+
+    # メトリクス（/metrics、Prometheusのテキスト形式）を有効にするか。
+    # 計測値は認証なしで返すため、公開範囲はリバースプロキシ等で監視系に限定すること。
+    METRICS_ENABLED: bool = True
+
+    # 起動時のウォームアップ（DB接続とAIプロバイダーへの接続を事前に確立する）。
+    # 完了するまでレディネス（/api/v1/health/ready）は503を返す。
+    WARMUP_ENABLED: bool = True
+    # 起動時に確立するDB接続数（接続プールに保持される）
+    WARMUP_DB_CONNECTIONS: int = 2
+    # ウォームアップの最大所要秒数（超過時は打ち切って起動を継続する）
+    WARMUP_TIMEOUT_SECONDS: float = 10.0
+    # キープウォームの間隔（秒）。この間リクエストがなかったプロバイダーへの接続と
+    # DB接続を再確立する。AI_HTTP_KEEPALIVE_EXPIRY_SECONDS より短くすること（0以下で無効）
+    KEEP_WARM_INTERVAL_SECONDS: float = 30.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -134,7 +330,7 @@ class Settings(BaseSettings):
     @property
     def API_KEYS_LIST(self) -> list[str]:  # noqa: N802
         """有効な端末APIキーのリスト（空要素は除外）"""
-        return [key.strip() for key in self.API_KEYS.split(",") if key.strip()]
+        return list(parse_api_keys(self.API_KEYS))
 
     @model_validator(mode="after")
     def validate_production_settings(self) -> "Settings":
@@ -2,7 +2,8 @@
 グローバル例外ハンドラーモジュール
 
 【機能概要】: FastAPIアプリケーション全体で発生する例外を統一的に処理
-【実装方針】: エラーログのデータベース保存、適切なHTTPレスポンス返却
+【実装方針】: エラーログのデータベース保存（app.utils.error_log_sink による非同期一括書き込み）、
+              適切なHTTPレスポンス返却
 
 TASK-0031: グローバルエラーハンドラー・例外処理実装
 🔵 NFR-301（基本機能継続利用）、NFR-304（データベースエラーハンドリング）に基づく
@@ -10,6 +11,7 @@ TASK-0031: グローバルエラーハンドラー・例外処理実装
 
 import logging
 import traceback
+from dataclasses import asdict
 
 from fastapi import Request, status
 from fastapi.exceptions import RequestValidationError
@@ -17,12 +19,36 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
+from app.crud.crud_error_log import ErrorLogEntry
 from app.db.session import async_session_maker
 from app.models.error_logs import ErrorLog
+from app.utils.error_log_sink import error_log_sink
 
 logger = logging.getLogger(__name__)
 
 
+def _build_error_log_entry(
+    error_type: str,
+    error_message: str,
+    error_code: str | None,
+    endpoint: str,
+    http_method: str,
+    stack_trace: str | None = None,
+) -> ErrorLogEntry:
+    """
+    【機能概要】: 保存するエラーログの値を作成する
+    【実装方針】: メッセージ・エンドポイントの長さを制限し、スタックトレースは開発環境のみ保存する
+    """
+    return ErrorLogEntry(
+        error_type=error_type,
+        error_message=error_message[:500],  # メッセージ長を制限
+        error_code=error_code,
+        endpoint=endpoint[:255] if endpoint else None,
+        http_method=http_method,
+        stack_trace=stack_trace if settings.ENVIRONMENT == "development" else None,
+    )
+
+
 async def log_error_to_db(
     error_type: str,
     error_message: str,
@@ -47,15 +73,10 @@ async def log_error_to_db(
     """
     try:
         async with async_session_maker() as session:
-            error_log = ErrorLog(
-                error_type=error_type,
-                error_message=error_message[:500],  # メッセージ長を制限
-                error_code=error_code,
-                endpoint=endpoint[:255] if endpoint else None,
-                http_method=http_method,
-                stack_trace=stack_trace if settings.ENVIRONMENT == "development" else None,
+            entry = _build_error_log_entry(
+                error_type, error_message, error_code, endpoint, http_method, stack_trace
             )
-            session.add(error_log)
+            session.add(ErrorLog(**asdict(entry)))
             await session.commit()
             logger.debug(f"Error logged to database: {error_type}")
     except Exception as e:
@@ -63,6 +84,44 @@ async def log_error_to_db(
         logger.error(f"Failed to log error to database: {e}")
 
 
+async def record_error(
+    error_type: str,
+    error_message: str,
+    error_code: str | None,
+    endpoint: str,
+    http_method: str,
+    stack_trace: str | None = None,
+) -> None:
+    """
+    【機能概要】: 例外ハンドラーからエラー情報を記録する
+    【実装方針】: エラーログ非同期書き込み（error_log_sink）が動作中の場合はそこに渡し、
+                  DB書き込みを待たずに戻る（DB障害時にエラー応答まで遅くならないため）。
+                  動作中でない場合（lifespan を経由しない場合など）は log_error_to_db で
+                  直接保存する。
+
+    Args:
+        error_type: エラータイプ名（例外クラス名）
+        error_message: エラーメッセージ
+        error_code: エラーコード（オプション）
+        endpoint: エラー発生エンドポイント
+        http_method: HTTPメソッド
+        stack_trace: スタックトレース（開発環境のみ保存）
+    """
+    entry = _build_error_log_entry(
+        error_type, error_message, error_code, endpoint, http_method, stack_trace
+    )
+    if error_log_sink.submit(entry):
+        return
+    await log_error_to_db(
+        error_type=error_type,
+        error_message=error_message,
+        error_code=error_code,
+        endpoint=endpoint,
+        http_method=http_method,
+        stack_trace=stack_trace,
+    )
+
+
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """
     【機能概要】: 未処理例外のグローバルハンドラー
@@ -83,8 +142,8 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
 
     logger.error(f"Unhandled exception: {error_type} - {error_message}\n{stack_trace}")
 
-    # エラーログをデータベースに保存
-    await log_error_to_db(
+    # エラーログを記録（非同期書き込みが動作中の場合はDB書き込みを待たない）
+    await record_error(
         error_type=error_type,
         error_message=error_message,
         error_code="INTERNAL_ERROR",
@@ -164,7 +223,7 @@ async def database_exception_handler(
 
     logger.error(f"Database error at {request.url.path}: {error_message}")
 
-    await log_error_to_db(
+    await record_error(
         error_type="SQLAlchemyError",
         error_message=error_message,
         error_code="DATABASE_ERROR",
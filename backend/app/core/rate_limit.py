@@ -17,6 +17,7 @@ from slowapi.errors import RateLimitExceeded
 from starlette.responses import JSONResponse
 
 from app.core.config import settings
+from app.utils import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -42,17 +43,19 @@ def get_client_ip(request: Request) -> str:
     proxy_count = settings.TRUSTED_PROXY_COUNT
 
     if proxy_count > 0:
-        forwarded_for = request.headers.get("X-Forwarded-For", "")
-        # カンマ区切りで複数IPが連なる。末尾が最も自身に近いプロキシが付与した値。
-        parts = [ip.strip() for ip in forwarded_for.split(",") if ip.strip()]
-        if parts:
-            # 右からproxy_count番目（チェーンより短ければ最左）を採用
-            index = min(proxy_count, len(parts))
-            return parts[-index]
+        forwarded_for = request.headers.get("X-Forwarded-For")
+        if forwarded_for:
+            # カンマ区切りで複数IPが連なる。末尾が最も自身に近いプロキシが付与した値。
+            parts = [ip for ip in map(str.strip, forwarded_for.split(",")) if ip]
+            if parts:
+                # 右からproxy_count番目（チェーンより短ければ最左）を採用
+                return parts[-min(proxy_count, len(parts))]
 
     # X-Forwarded-Forを信頼しない、または値が無い場合は接続元IPを使用
-    if request.client and request.client.host:
-        return request.client.host
+    # （request.client は呼び出しごとに Address を作るため、scope の値を直接参照する）
+    client = request.scope.get("client")
+    if client and client[0]:
+        return client[0]
 
     # 最終フォールバック
     return "unknown"
@@ -62,6 +65,55 @@ def get_client_ip(request: Request) -> str:
 AI_RATE_LIMIT = f"{settings.RATE_LIMIT_TIMES}/{settings.RATE_LIMIT_SECONDS}seconds"
 
 
+# 一括変換APIのレート制限（項目数をコストとして数える）
+AI_BATCH_RATE_LIMIT = (
+    f"{settings.BATCH_RATE_LIMIT_ITEMS}/{settings.BATCH_RATE_LIMIT_SECONDS}seconds"
+)
+
+
+# 一括変換リクエストの項目数を受け渡す request.state の属性名
+BATCH_ITEM_COUNT_STATE = "batch_item_count"
+
+
+async def count_batch_items(request: Request) -> int:
+    """
+    【機能概要】: 一括変換リクエストの項目数を数え、レート制限のコストとして記録する
+    【実装方針】: 依存性関数として slowapi のレート制限判定（エンドポイント関数の呼び出し時）
+                  より前に実行される。リクエストボディをJSONとして読み、items の件数を
+                  request.state に記録する。解釈できない場合は1とする
+                  （ボディの検証エラーはFastAPIが422で返す）。
+
+    Args:
+        request: FastAPIリクエストオブジェクト
+
+    Returns:
+        int: 項目数（1以上）
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    items = body.get("items") if isinstance(body, dict) else None
+    count = max(1, len(items)) if isinstance(items, list) else 1
+    setattr(request.state, BATCH_ITEM_COUNT_STATE, count)
+    return count
+
+
+def batch_item_cost(request: Request) -> int:
+    """
+    【機能概要】: 一括変換リクエストのレート制限コスト（項目数）を返す
+    【実装方針】: count_batch_items が request.state に記録した項目数を参照する。
+                  記録されていない場合は1とする。
+
+    Args:
+        request: FastAPIリクエストオブジェクト
+
+    Returns:
+        int: レート制限のコスト（1以上）
+    """
+    return getattr(request.state, BATCH_ITEM_COUNT_STATE, 1)
+
+
 def resolve_storage_uri() -> str | None:
     """設定値からLimiterに渡すstorage_uriを解決する。
 
@@ -146,9 +198,13 @@ async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded)
     Returns:
         JSONResponse: 429エラーレスポンス
     """
-    # Retry-After値（制限ウィンドウ秒数）と制限回数を設定から取得
-    retry_after = settings.RATE_LIMIT_SECONDS
-    limit = settings.RATE_LIMIT_TIMES
+    metrics.rate_limit_rejections.labels(metrics.route_label(request.scope)).inc()
+
+    # Retry-After値（制限ウィンドウ秒数）と制限回数は超過した制限から取得する
+    # （/convert/batch は項目数単位の別枠の制限のため、設定値を直接使うと誤った値になる）
+    rate_limit_item = exc.limit.limit
+    retry_after = rate_limit_item.get_expiry()
+    limit = rate_limit_item.amount
 
     # エラーレスポンス（api-endpoints.mdの仕様に準拠）
     error_response = {
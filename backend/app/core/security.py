@@ -2,22 +2,44 @@
 セキュリティモジュール
 
 【機能概要】: JWT認証、パスワードハッシュ化など認証・認可機能を提供
-【実装方針】: jose, passlib を使用した標準的なセキュリティ実装
+【実装方針】: jose, bcrypt を使用した標準的なセキュリティ実装。
+              APIキー検証（全リクエストで使用）以外は利用箇所が限られるため、
+              jose / bcrypt は各関数の初回呼び出し時に読み込む（起動時のimportを軽くする）
 """
 
 import hmac
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any
 
-import bcrypt
-from jose import jwt
-
-from app.core.config import settings
+from app.core.config import parse_api_keys, settings
 
 # JWT暗号化アルゴリズム
 ALGORITHM = "HS256"
 
 
+@lru_cache(maxsize=4)
+def _allowed_key_bytes(api_keys: str) -> tuple[bytes, ...]:
+    """
+    【機能概要】: 設定された端末APIキーを照合用の bytes に変換する
+    【実装方針】: API_KEYS の値ごとに結果を再利用し、リクエストごとの分割・エンコードを省く。
+                  UTF-8 にエンコードできないキーはどの入力とも一致しないため除外する。
+
+    Args:
+        api_keys: settings.API_KEYS（カンマ区切り）
+
+    Returns:
+        tuple[bytes, ...]: 照合に使うキーのUTF-8表現
+    """
+    allowed = []
+    for key in parse_api_keys(api_keys):
+        try:
+            allowed.append(key.encode("utf-8"))
+        except UnicodeEncodeError:
+            continue
+    return tuple(allowed)
+
+
 def is_valid_api_key(api_key: str | None) -> bool:
     """
     【機能概要】: 端末APIキーが有効かどうかを検証する
@@ -39,11 +61,7 @@ def is_valid_api_key(api_key: str | None) -> bool:
         return False
     # 設定された全キーと定数時間・bytes比較し、短絡評価による時間差や型起因の例外を避ける
     valid = False
-    for allowed in settings.API_KEYS_LIST:
-        try:
-            allowed_bytes = allowed.encode("utf-8")
-        except (UnicodeEncodeError, AttributeError):
-            continue
+    for allowed_bytes in _allowed_key_bytes(settings.API_KEYS):
         if hmac.compare_digest(candidate, allowed_bytes):
             valid = True
     return valid
@@ -71,6 +89,8 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
+    from jose import jwt
+
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -88,6 +108,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: パスワードが一致する場合True
     """
+    import bcrypt
+
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
@@ -102,4 +124,6 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: ハッシュ化されたパスワード
     """
+    import bcrypt
+
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
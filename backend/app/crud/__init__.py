@@ -5,8 +5,29 @@ CRUD操作モジュール
 【実装方針】: 各モデルに対応するCRUD操作を提供
 """
 
-from app.crud.crud_ai_conversion import create_conversion_log
+from app.crud.crud_ai_conversion import (
+    ConversionLogEntry,
+    bulk_create_conversion_logs,
+    create_conversion_log,
+)
+from app.crud.crud_error_log import ErrorLogEntry, bulk_create_error_logs
+from app.crud.crud_phrase_table import (
+    PhraseTableRow,
+    create_phrase_table_version,
+    get_phrase_table_rows,
+    get_published_phrase_table_version,
+    publish_phrase_table_version,
+)
 
 __all__ = [
     "create_conversion_log",
+    "ConversionLogEntry",
+    "bulk_create_conversion_logs",
+    "ErrorLogEntry",
+    "bulk_create_error_logs",
+    "PhraseTableRow",
+    "create_phrase_table_version",
+    "publish_phrase_table_version",
+    "get_published_phrase_table_version",
+    "get_phrase_table_rows",
 ]
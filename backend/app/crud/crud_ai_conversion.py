@@ -7,11 +7,35 @@ TASK-0027: AI変換エンドポイント実装
 """
 
 import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.ai_conversion_logs import AIConversionLog
 
+# 一括INSERTで値を指定しない列（DB側で採番・既定値を設定する）
+_SERVER_GENERATED_COLUMNS = frozenset({"id", "created_at"})
+
+
+@dataclass(frozen=True)
+class ConversionLogEntry:
+    """
+    AI変換ログ1件分の入力値（create_conversion_log の引数と同じ項目）
+
+    一括INSERT（bulk_create_conversion_logs）の入力として使う。
+    """
+
+    input_text: str
+    output_text: str
+    politeness_level: str
+    conversion_time_ms: int | None = None
+    ai_provider: str = "anthropic"
+    session_id: uuid.UUID | None = None
+    is_success: bool = True
+    error_message: str | None = None
+
 
 async def create_conversion_log(
     db: AsyncSession,
@@ -70,3 +94,53 @@ async def create_conversion_log(
     await db.refresh(log)
 
     return log
+
+
+async def bulk_create_conversion_logs(
+    db: AsyncSession,
+    entries: Sequence[ConversionLogEntry],
+) -> int:
+    """
+    AI変換ログを一括で作成する
+
+    【機能概要】: 複数のAI変換ログを1回の複数行INSERTで保存する
+    【実装方針】: 各エントリは create_conversion_log と同じく AIConversionLog.create_log で
+                  検証・ハッシュ化した上で列の値に変換し、ORMの一括INSERT
+                  （executemany。asyncpgでは複数行のINSERTにまとめられる）で書き込む。
+                  採番されたIDは返さない（ログは書き込み専用のため）。
+                  コミットは create_conversion_log と同様に呼び出し元に委ねる。
+
+    Args:
+        db: データベースセッション
+        entries: 作成するログエントリ
+
+    Returns:
+        int: 書き込んだ行数
+
+    Raises:
+        ValueError: politeness_levelが無効な値のエントリが含まれる場合
+    """
+    if not entries:
+        return 0
+
+    columns = [
+        column.key
+        for column in AIConversionLog.__table__.columns
+        if column.key not in _SERVER_GENERATED_COLUMNS
+    ]
+    rows = []
+    for entry in entries:
+        log = AIConversionLog.create_log(
+            input_text=entry.input_text,
+            output_text=entry.output_text,
+            politeness_level=entry.politeness_level,
+            conversion_time_ms=entry.conversion_time_ms,
+            ai_provider=entry.ai_provider,
+            session_id=entry.session_id,
+            is_success=entry.is_success,
+            error_message=entry.error_message,
+        )
+        rows.append({key: getattr(log, key) for key in columns})
+
+    await db.execute(insert(AIConversionLog), rows)
+    return len(rows)
@@ -0,0 +1,53 @@
+"""
+エラーログCRUD操作
+
+【機能概要】: エラーログ（error_logs）のデータベース操作
+【実装方針】: 非同期SQLAlchemyセッションを使用した一括INSERT
+"""
+
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.error_logs import ErrorLog
+
+
+@dataclass(frozen=True)
+class ErrorLogEntry:
+    """
+    エラーログ1件分の値（ErrorLog の列のうちDB側で設定しないもの）
+
+    文字数の制限やスタックトレースの保存可否は、作成する側（app.core.exceptions）で適用済みとする。
+    """
+
+    error_type: str
+    error_message: str
+    error_code: str | None = None
+    endpoint: str | None = None
+    http_method: str | None = None
+    stack_trace: str | None = None
+
+
+async def bulk_create_error_logs(
+    db: AsyncSession,
+    entries: Sequence[ErrorLogEntry],
+) -> int:
+    """
+    エラーログを一括で作成する
+
+    【機能概要】: 複数のエラーログを1回の複数行INSERTで保存する
+    【実装方針】: コミットは呼び出し元に委ねる
+
+    Args:
+        db: データベースセッション
+        entries: 作成するログエントリ
+
+    Returns:
+        int: 書き込んだ行数
+    """
+    if not entries:
+        return 0
+    await db.execute(insert(ErrorLog), [asdict(entry) for entry in entries])
+    return len(entries)
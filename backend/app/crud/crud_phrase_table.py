@@ -0,0 +1,129 @@
+"""
+定型文変換テーブルCRUD操作モジュール
+
+【機能概要】: 定型文変換テーブルのバージョン作成・公開と、公開済みバージョンの読み込みを提供
+【実装方針】: 配信対象は最も新しく公開（published_at を設定）されたバージョン。
+              コミットは他のCRUD操作と同様に呼び出し元に委ねる
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.phrase_table import PhraseTableEntry, PhraseTableVersion
+
+
+@dataclass(frozen=True)
+class PhraseTableRow:
+    """定型文変換テーブルの1件分（定型文・丁寧さレベル・変換結果）"""
+
+    input_text: str
+    politeness_level: str
+    converted_text: str
+
+
+async def create_phrase_table_version(
+    db: AsyncSession,
+    rows: Sequence[PhraseTableRow],
+    model: str,
+    prompt_version: str,
+    publish: bool = True,
+) -> PhraseTableVersion:
+    """
+    定型文変換テーブルの新しいバージョンを作成する
+
+    Args:
+        db: データベースセッション
+        rows: 変換結果
+        model: 変換結果を生成したモデル名
+        prompt_version: 変換結果を生成したプロンプトのバージョン
+        publish: 作成と同時に公開するか
+
+    Returns:
+        PhraseTableVersion: 作成されたバージョン
+    """
+    version = PhraseTableVersion(
+        model=model,
+        prompt_version=prompt_version,
+        entry_count=len(rows),
+        published_at=func.current_timestamp() if publish else None,
+    )
+    db.add(version)
+    await db.flush()
+    await db.refresh(version)
+
+    if rows:
+        await db.execute(
+            insert(PhraseTableEntry),
+            [
+                {
+                    "version_id": version.id,
+                    "input_text": row.input_text,
+                    "politeness_level": row.politeness_level,
+                    "converted_text": row.converted_text,
+                }
+                for row in rows
+            ],
+        )
+    return version
+
+
+async def publish_phrase_table_version(db: AsyncSession, version_id: int) -> bool:
+    """
+    既存のバージョンを公開する（過去のバージョンを再公開すると切り戻しになる）
+
+    Args:
+        db: データベースセッション
+        version_id: 公開するバージョン
+
+    Returns:
+        bool: バージョンが存在し公開できたか
+    """
+    result = await db.execute(
+        update(PhraseTableVersion)
+        .where(PhraseTableVersion.id == version_id)
+        .values(published_at=func.current_timestamp())
+    )
+    return result.rowcount > 0
+
+
+async def get_published_phrase_table_version(db: AsyncSession) -> int | None:
+    """
+    配信対象のバージョン（最も新しく公開されたもの）を取得する
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        int | None: バージョン番号（公開済みのバージョンがない場合はNone）
+    """
+    result = await db.execute(
+        select(PhraseTableVersion.id)
+        .where(PhraseTableVersion.published_at.is_not(None))
+        .order_by(PhraseTableVersion.published_at.desc(), PhraseTableVersion.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_phrase_table_rows(db: AsyncSession, version_id: int) -> list[PhraseTableRow]:
+    """
+    バージョンの変換結果をすべて取得する
+
+    Args:
+        db: データベースセッション
+        version_id: バージョン番号
+
+    Returns:
+        list[PhraseTableRow]: 変換結果
+    """
+    result = await db.execute(
+        select(
+            PhraseTableEntry.input_text,
+            PhraseTableEntry.politeness_level,
+            PhraseTableEntry.converted_text,
+        ).where(PhraseTableEntry.version_id == version_id)
+    )
+    return [PhraseTableRow(*row) for row in result.all()]
@@ -18,5 +18,8 @@ from app.models.ai_conversion_logs import AIConversionLog  # noqa: F401
 # 🔵 TASK-0024: AI変換ログテーブル実装・プライバシー対応
 from app.models.error_logs import ErrorLog  # noqa: F401
 
+# 【定型文変換テーブルモデル】: 定型文の事前生成した変換結果をバージョン単位で保存するモデル
+from app.models.phrase_table import PhraseTableEntry, PhraseTableVersion  # noqa: F401
+
 # 【エクスポート定義】: モジュールから公開するシンボルを定義
-__all__ = ["Base", "AIConversionLog", "ErrorLog"]
+__all__ = ["Base", "AIConversionLog", "ErrorLog", "PhraseTableVersion", "PhraseTableEntry"]
@@ -30,11 +30,14 @@ Example:
 """
 
 import logging
+import time
 from collections.abc import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from app.core.config import settings
+from app.utils import metrics
 
 # ============================================================================
 # 接続プール設定定数
@@ -58,6 +61,24 @@ POOL_TIMEOUT: int = 30
 
 logger = logging.getLogger(__name__)
 
+# ============================================================================
+# 接続プール（取得待ち時間の計測）
+# ============================================================================
+
+_POOL_CHECKOUT_WAIT = metrics.db_pool_checkout_wait.labels()
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """接続の取得にかかった時間（プールの空き待ちを含む）をメトリクスに記録する接続プール"""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
 # ============================================================================
 # 非同期エンジン・セッションメーカー
 # ============================================================================
@@ -65,6 +86,7 @@ logger = logging.getLogger(__name__)
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
+    poolclass=TimedAsyncAdaptedQueuePool,
     pool_pre_ping=True,
     pool_size=POOL_SIZE,
     max_overflow=MAX_OVERFLOW,
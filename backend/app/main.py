@@ -11,13 +11,22 @@ from typing import AsyncIterator
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from slowapi.errors import RateLimitExceeded
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_session_factory
 from app.api.v1.api import api_router
-from app.api.v1.endpoints.health import get_ai_provider_status, get_current_timestamp
+from app.api.v1.endpoints.health import (
+    get_ai_provider_status,
+    get_circuit_breaker_status,
+    get_conversion_cache_status,
+    get_current_timestamp,
+    get_health_status,
+    get_http_pool_status,
+)
 from app.core.config import settings
 from app.core.exceptions import (
     database_exception_handler,
@@ -26,8 +35,13 @@ from app.core.exceptions import (
 )
 from app.core.logging_config import get_logger, setup_logging
 from app.core.rate_limit import limiter, rate_limit_exceeded_handler
-from app.db.session import get_db
+from app.db.session import engine, get_db
 from app.schemas.health import HealthErrorResponse, HealthResponse, RootResponse
+from app.utils.conversion_log_writer import conversion_log_writer
+from app.utils.error_log_sink import error_log_sink
+from app.utils.metrics import RequestMetricsMiddleware, registry
+from app.utils.phrase_table import phrase_table
+from app.utils.warmup import warmup
 
 # ロギング設定を初期化
 setup_logging()
@@ -44,9 +58,25 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info(f"Starting {settings.PROJECT_NAME}...")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"API Version: {settings.VERSION}")
+    # AI変換ログの一括書き込みを開始
+    if settings.CONVERSION_LOG_WRITER_ENABLED:
+        conversion_log_writer.start(get_session_factory())
+    # エラーログの非同期書き込みを開始
+    if settings.ERROR_LOG_SINK_ENABLED:
+        error_log_sink.start(get_session_factory())
+    # DB接続とAIプロバイダーへの接続を事前に確立（完了までレディネスは準備中）
+    await warmup.run(engine)
+    warmup.start_keep_warm(engine)
+    # 公開済みの定型文変換テーブルを読み込み、新しいバージョンの公開を監視する
+    await phrase_table.start(get_session_factory())
     yield
     # 終了時の処理
     logger.info(f"Shutting down {settings.PROJECT_NAME}...")
+    await warmup.stop()
+    await phrase_table.stop()
+    # キューに残ったAI変換ログを書き込んでから停止
+    await conversion_log_writer.stop()
+    await error_log_sink.stop()
     # AIクライアントのHTTPリソースを明示的にクローズ
     from app.utils import ai_client as ai_client_module
 
@@ -110,6 +140,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# リクエスト所要時間のメトリクス（/metrics で公開）
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 # APIルーターを登録
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -162,13 +196,17 @@ async def health_check(
 
         # AIプロバイダー確認
         ai_provider = get_ai_provider_status()
+        ai_providers = get_circuit_breaker_status()
 
         return HealthResponse(
-            status="ok",
+            status=get_health_status(ai_providers),
             database="connected",
             ai_provider=ai_provider,
             version=settings.VERSION,
             timestamp=timestamp,
+            conversion_cache=get_conversion_cache_status(),
+            ai_providers=ai_providers,
+            ai_http_pools=get_http_pool_status(),
         )
     except Exception as e:
         error_message = (
@@ -183,3 +221,22 @@ async def health_check(
             timestamp=error_timestamp,
         )
         raise HTTPException(status_code=500, detail=error_response.model_dump()) from e
+
+
+# Prometheusのテキスト形式のContent-Type
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint() -> PlainTextResponse:
+    """
+    【機能概要】: メトリクスエンドポイント - Prometheusのテキスト形式で計測値を返す
+    【実装方針】: METRICS_ENABLED が無効な場合は404を返す。
+                  公開範囲はリバースプロキシ等で監視系のネットワークに限定すること
+
+    Returns:
+        PlainTextResponse: メトリクス（text/plain; version=0.0.4）
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(registry.render(), media_type=METRICS_CONTENT_TYPE)
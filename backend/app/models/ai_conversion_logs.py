@@ -76,7 +76,8 @@ class AIConversionLog(Base):
     # 【オプションフィールド】: 変換処理時間（ミリ秒）
     conversion_time_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
-    # 【オプションフィールド】: AIプロバイダー名（デフォルト: "anthropic"）
+    # 【オプションフィールド】: AIプロバイダー名（デフォルト: "anthropic"）。
+    # AIを呼び出さずに応答した場合は "cache"（変換結果キャッシュ）または "local"（ローカル変換）
     ai_provider: Mapped[str | None] = mapped_column(String(50), nullable=True, default="anthropic")
 
     # 【必須フィールド】: 成功・失敗フラグ（デフォルト: True）
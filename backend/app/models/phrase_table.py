@@ -0,0 +1,122 @@
+"""
+定型文変換テーブルモデルモジュール
+
+【機能概要】: アプリが同梱する定型文の各丁寧さレベルの変換結果（事前にAIで生成したもの）を
+              バージョン単位で保存するSQLAlchemyモデル
+【実装方針】: 生成ジョブ（app.cli.phrase_table）が新しいバージョンとその変換結果を書き込み、
+              公開（published_at の設定）したバージョンのうち最も新しく公開されたものを
+              各ワーカーが読み込む。過去のバージョンを再公開すると切り戻せる
+【セキュリティ】: 保存するのはアプリ同梱の定型文のみ（利用者の入力は保存しない）
+"""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class PhraseTableVersion(Base):
+    """
+    【機能概要】: 定型文変換テーブルのバージョン
+    【実装方針】: published_at が設定されたバージョンのみ配信対象とする
+    """
+
+    __tablename__ = "phrase_table_versions"
+
+    __table_args__ = (
+        # 【published_atインデックス】: 最新の公開バージョン検索用
+        Index("idx_phrase_table_versions_published_at", "published_at"),
+    )
+
+    # 【主キー】: バージョン番号（自動採番）
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    # 【必須フィールド】: 変換結果を生成したモデル名（記録用）
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    # 【必須フィールド】: 変換結果を生成したプロンプトのバージョン（記録用）
+    prompt_version: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # 【必須フィールド】: 変換結果の件数
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # 【自動生成フィールド】: バージョン作成日時
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+    )
+
+    # 【オプションフィールド】: 公開日時（未公開の場合はNULL）
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        """モデルインスタンスの文字列表現を返す"""
+        return (
+            f"<PhraseTableVersion(id={self.id}, "
+            f"entry_count={self.entry_count}, "
+            f"published_at={self.published_at})>"
+        )
+
+
+class PhraseTableEntry(Base):
+    """
+    【機能概要】: 定型文1件・丁寧さレベル1つ分の変換結果
+    【実装方針】: input_text は normalize_input_text で正規化した定型文を保存する
+    """
+
+    __tablename__ = "phrase_table_entries"
+
+    __table_args__ = (
+        # 【丁寧さレベル制約】: casual, normal, polite のみ許可
+        CheckConstraint(
+            "politeness_level IN ('casual', 'normal', 'polite')",
+            name="check_phrase_table_politeness_level",
+        ),
+        # 【一意制約】: 同一バージョン内で (定型文, 丁寧さレベル) は1件のみ
+        UniqueConstraint(
+            "version_id",
+            "input_text",
+            "politeness_level",
+            name="uq_phrase_table_entries_version_input_level",
+        ),
+    )
+
+    # 【主キー】: 自動生成される整数型のID
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    # 【必須フィールド】: 所属するバージョン（バージョン削除時に連動して削除）
+    version_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("phrase_table_versions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # 【必須フィールド】: 正規化した定型文
+    input_text: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # 【必須フィールド】: 丁寧さレベル（casual/normal/polite）
+    politeness_level: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # 【必須フィールド】: 変換結果
+    converted_text: Mapped[str] = mapped_column(Text, nullable=False)
+
+    def __repr__(self) -> str:
+        """モデルインスタンスの文字列表現を返す"""
+        return (
+            f"<PhraseTableEntry(id={self.id}, "
+            f"version_id={self.version_id}, "
+            f"politeness_level='{self.politeness_level}')>"
+        )
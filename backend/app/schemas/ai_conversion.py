@@ -22,6 +22,15 @@ INPUT_TEXT_MAX_LENGTH: int = 500
 # 原因になるため、入力文字列の上限（500文字）より余裕を持たせた1000文字を上限とする。
 PREVIOUS_RESULT_MAX_LENGTH: int = 1000
 
+# 変換候補一括生成（/variants）で一度に生成できる候補数
+VARIANTS_MIN_COUNT: int = 2
+VARIANTS_MAX_COUNT: int = 5
+VARIANTS_DEFAULT_COUNT: int = 3
+
+# 一括変換（/convert/batch）の1リクエストあたりの最大項目数
+# （文字盤1枚分の定型文 50件 × 丁寧さレベル 3段階）
+BATCH_MAX_ITEMS: int = 150
+
 # エラーメッセージ定数
 ERROR_INPUT_TEXT_REQUIRED: str = "入力文字列は必須です"
 ERROR_INPUT_TEXT_EMPTY: str = "入力文字列が空です"
@@ -240,3 +249,205 @@ class AIRegenerateRequest(BaseModel):
         if len(trimmed) > PREVIOUS_RESULT_MAX_LENGTH:
             raise ValueError(ERROR_PREVIOUS_RESULT_MAX_LENGTH)
         return trimmed
+
+
+class AIVariantsRequest(BaseModel):
+    """AI変換候補一括生成リクエストスキーマ
+
+    1回のAI API呼び出しで互いに異なる変換候補を複数生成するためのリクエスト。
+    /regenerate を繰り返す代わりに使用し、クライアント側で候補を切り替える。
+
+    Attributes:
+        input_text: 変換元テキスト（2文字以上500文字以下）
+        politeness_level: 丁寧さレベル
+        count: 生成する候補数（2〜5、デフォルト3）
+        previous_result: 候補から除外する前回の変換結果（任意）
+
+    Examples:
+        >>> request = AIVariantsRequest(
+        ...     input_text="水 ぬるく",
+        ...     politeness_level=PolitenessLevel.POLITE,
+        ...     count=3,
+        ... )
+    """
+
+    input_text: str = Field(
+        ...,
+        min_length=INPUT_TEXT_MIN_LENGTH,
+        max_length=INPUT_TEXT_MAX_LENGTH,
+        description=f"変換元テキスト（{INPUT_TEXT_MIN_LENGTH}文字以上{INPUT_TEXT_MAX_LENGTH}文字以下）",
+        examples=["ありがとう"],
+    )
+    politeness_level: PolitenessLevel = Field(
+        ...,
+        description="丁寧さレベル",
+        examples=["polite"],
+    )
+    count: int = Field(
+        VARIANTS_DEFAULT_COUNT,
+        ge=VARIANTS_MIN_COUNT,
+        le=VARIANTS_MAX_COUNT,
+        description=f"生成する候補数（{VARIANTS_MIN_COUNT}〜{VARIANTS_MAX_COUNT}）",
+        examples=[VARIANTS_DEFAULT_COUNT],
+    )
+    previous_result: str | None = Field(
+        None,
+        max_length=PREVIOUS_RESULT_MAX_LENGTH,
+        description=f"候補から除外する前回の変換結果（任意、{PREVIOUS_RESULT_MAX_LENGTH}文字以下）",
+        examples=["ありがとうございます"],
+    )
+
+    @field_validator("input_text", mode="before")
+    @classmethod
+    def validate_and_trim_input_text(cls, v: object) -> str:
+        """入力文字列のバリデーションとトリム"""
+        return validate_input_text(v)
+
+    @field_validator("previous_result", mode="before")
+    @classmethod
+    def trim_previous_result(cls, v: object) -> str | None:
+        """前回結果のトリム（空文字・空白のみは未指定として扱う）"""
+        if v is None:
+            return None
+        trimmed = str(v).strip()
+        return trimmed or None
+
+
+class AIVariantsResponse(BaseModel):
+    """AI変換候補一括生成レスポンススキーマ
+
+    Attributes:
+        variants: 互いに重複しない変換候補（要求数より少ない場合がある）
+        original_text: 元の入力文字列
+        politeness_level: 適用された丁寧さレベル
+        processing_time_ms: 変換処理時間（ミリ秒）
+    """
+
+    variants: list[str] = Field(
+        ...,
+        description="互いに重複しない変換候補（重複除去により要求数より少ない場合がある）",
+        examples=[["ありがとうございます", "感謝いたします", "お礼申し上げます"]],
+    )
+    original_text: str = Field(
+        ...,
+        description="元の入力文字列",
+        examples=["ありがとう"],
+    )
+    politeness_level: PolitenessLevel = Field(
+        ...,
+        description="適用された丁寧さレベル",
+        examples=["polite"],
+    )
+    processing_time_ms: int = Field(
+        ...,
+        description="変換処理時間（ミリ秒）",
+        examples=[1800],
+    )
+
+
+class AIBatchConversionItem(BaseModel):
+    """一括変換の1項目
+
+    Attributes:
+        input_text: 変換する入力文字列（2文字以上500文字以下）
+        politeness_level: 丁寧さレベル（casual/normal/polite）
+    """
+
+    input_text: str = Field(
+        ...,
+        min_length=INPUT_TEXT_MIN_LENGTH,
+        max_length=INPUT_TEXT_MAX_LENGTH,
+        description=f"変換する入力文字列（{INPUT_TEXT_MIN_LENGTH}文字以上{INPUT_TEXT_MAX_LENGTH}文字以下）",
+        examples=["ありがとう"],
+    )
+    politeness_level: PolitenessLevel = Field(
+        ...,
+        description="丁寧さレベル（casual/normal/polite）",
+        examples=["polite"],
+    )
+
+    @field_validator("input_text", mode="before")
+    @classmethod
+    def validate_and_trim_input_text(cls, v: object) -> str:
+        """入力文字列のバリデーションとトリム"""
+        return validate_input_text(v)
+
+
+class AIBatchConversionRequest(BaseModel):
+    """AI一括変換リクエストスキーマ
+
+    文字盤の定型文など、複数の項目（入力文字列と丁寧さレベルの組）をまとめて変換する。
+
+    Attributes:
+        items: 変換する項目（1〜150件）
+        pack: True の場合、同じ丁寧さレベルの項目を1回のプロンプトにまとめて変換する
+              （AI API呼び出し回数を減らす。解釈に失敗した場合は項目ごとの変換に切り替える）
+
+    Examples:
+        >>> request = AIBatchConversionRequest(
+        ...     items=[AIBatchConversionItem(input_text="水 ぬるく", politeness_level="polite")],
+        ... )
+    """
+
+    items: list[AIBatchConversionItem] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_MAX_ITEMS,
+        description=f"変換する項目（1〜{BATCH_MAX_ITEMS}件）",
+    )
+    pack: bool = Field(
+        False,
+        description="同じ丁寧さレベルの項目を1回のプロンプトにまとめて変換するか",
+    )
+
+
+class AIBatchItemError(BaseModel):
+    """一括変換の項目ごとのエラー情報
+
+    Attributes:
+        code: エラーコード（/convert のエラーコードと同じ）
+        message: エラーメッセージ
+        status_code: 単独の /convert で同じエラーが起きた場合のHTTPステータスコード
+    """
+
+    code: str = Field(..., description="エラーコード", examples=["AI_API_TIMEOUT"])
+    message: str = Field(..., description="エラーメッセージ")
+    status_code: int = Field(..., description="対応するHTTPステータスコード", examples=[504])
+
+
+class AIBatchItemResult(BaseModel):
+    """一括変換の項目ごとの結果
+
+    Attributes:
+        index: リクエストの items 内の位置（0始まり）
+        original_text: 元の入力文字列
+        politeness_level: 適用された丁寧さレベル
+        converted_text: 変換後の文字列（失敗時はNone）
+        processing_time_ms: 変換処理時間（ミリ秒、失敗時はNone）
+        error: エラー情報（成功時はNone）
+    """
+
+    index: int = Field(..., description="items 内の位置（0始まり）", examples=[0])
+    original_text: str = Field(..., description="元の入力文字列", examples=["ありがとう"])
+    politeness_level: PolitenessLevel = Field(..., description="適用された丁寧さレベル")
+    converted_text: str | None = Field(None, description="変換後の文字列（失敗時はnull）")
+    processing_time_ms: int | None = Field(None, description="変換処理時間（ミリ秒）")
+    error: AIBatchItemError | None = Field(None, description="エラー情報（成功時はnull）")
+
+
+class AIBatchConversionResponse(BaseModel):
+    """AI一括変換レスポンススキーマ
+
+    項目ごとの成否は results[].error で判定する（一部の項目が失敗しても200を返す）。
+
+    Attributes:
+        results: 項目ごとの結果（リクエストの items と同じ順序）
+        succeeded: 成功した項目数
+        failed: 失敗した項目数
+        processing_time_ms: 一括変換全体の処理時間（ミリ秒）
+    """
+
+    results: list[AIBatchItemResult] = Field(..., description="項目ごとの結果（items と同じ順序）")
+    succeeded: int = Field(..., description="成功した項目数", examples=[20])
+    failed: int = Field(..., description="失敗した項目数", examples=[0])
+    processing_time_ms: int = Field(..., description="全体の処理時間（ミリ秒）", examples=[4200])
@@ -36,6 +36,82 @@ class RootResponse(BaseModel):
     version: str = Field(..., description="APIのバージョン情報", examples=["1.0.0"])
 
 
+class ConversionCacheStatus(BaseModel):
+    """
+    【機能概要】: AI変換結果キャッシュの統計（ヘルスチェックレスポンスに含める）
+    【実装方針】: ヒット/ミス件数からキャッシュによるAI API呼び出しの節約効果を確認できるようにする
+
+    Attributes:
+        backend (str): キャッシュの保存先（"memory" または "redis"）
+        hits (int): キャッシュヒット件数（AI API呼び出しを省略した件数）
+        misses (int): キャッシュミス件数
+        stores (int): キャッシュへの保存件数
+        errors (int): キャッシュ操作の失敗件数
+        hit_rate (float): ヒット率（0.0〜1.0）
+    """
+
+    backend: str = Field(..., description="キャッシュの保存先", examples=["memory"])
+    hits: int = Field(..., description="キャッシュヒット件数", examples=[42])
+    misses: int = Field(..., description="キャッシュミス件数", examples=[8])
+    stores: int = Field(..., description="キャッシュへの保存件数", examples=[8])
+    errors: int = Field(..., description="キャッシュ操作の失敗件数", examples=[0])
+    hit_rate: float = Field(..., description="ヒット率（0.0〜1.0）", examples=[0.84])
+
+
+class CircuitBreakerStatus(BaseModel):
+    """
+    【機能概要】: AIプロバイダーのサーキットブレーカー状態（ヘルスチェックレスポンスに含める）
+    【実装方針】: 障害中のプロバイダーが遮断されているか、遮断に近づいているかを確認できるようにする
+
+    Attributes:
+        state (str): サーキットの状態（"closed", "open", "half_open"）
+        calls (int): 判定ウィンドウ内の呼び出し件数
+        failure_rate (float): 判定ウィンドウ内のエラー率（0.0〜1.0）
+        slow_call_rate (float): 判定ウィンドウ内の低速呼び出し率（0.0〜1.0）
+    """
+
+    state: str = Field(
+        ..., description="サーキットの状態", examples=["closed", "open", "half_open"]
+    )
+    calls: int = Field(..., description="判定ウィンドウ内の呼び出し件数", examples=[20])
+    failure_rate: float = Field(..., description="エラー率（0.0〜1.0）", examples=[0.05])
+    slow_call_rate: float = Field(..., description="低速呼び出し率（0.0〜1.0）", examples=[0.0])
+
+
+class HTTPPoolStatus(BaseModel):
+    """
+    【機能概要】: AIプロバイダーへのHTTP接続プールの状態（ヘルスチェックレスポンスに含める）
+    【実装方針】: 接続が再利用されているか（接続数に対して送信リクエスト数が十分多いか）を確認できるようにする
+
+    Attributes:
+        http2 (bool): HTTP/2で接続しているか
+        connections (int): 接続プールが保持している接続数
+        idle_connections (int): うちアイドル状態の接続数
+        requests (int): 送信したリクエスト数（累計）
+    """
+
+    http2: bool = Field(..., description="HTTP/2で接続しているか", examples=[False])
+    connections: int = Field(..., description="接続プールが保持している接続数", examples=[2])
+    idle_connections: int = Field(..., description="アイドル状態の接続数", examples=[1])
+    requests: int = Field(..., description="送信したリクエスト数（累計）", examples=[120])
+
+
+class ConcurrencyLimitStatus(BaseModel):
+    """
+    【機能概要】: AIプロバイダーへの同時実行数制限の状態（ヘルスチェックレスポンスに含める）
+    【実装方針】: レート制限や応答時間の悪化で上限が縮んでいるか、呼び出しが待たされているかを確認できるようにする
+
+    Attributes:
+        limit (int): 現在の同時実行数の上限
+        in_flight (int): 実行中の呼び出し数
+        queue_depth (int): 枠が空くのを待っている呼び出し数
+    """
+
+    limit: int = Field(..., description="現在の同時実行数の上限", examples=[8])
+    in_flight: int = Field(..., description="実行中の呼び出し数", examples=[3])
+    queue_depth: int = Field(..., description="枠が空くのを待っている呼び出し数", examples=[0])
+
+
 class HealthResponse(BaseModel):
     """
     【機能概要】: ヘルスチェックエンドポイント（GET /health）のレスポンススキーマ（正常時）
@@ -50,6 +126,12 @@ class HealthResponse(BaseModel):
         ai_provider (str): 有効なAIプロバイダー（"anthropic", "openai", "none"）
         version (str): APIのバージョン情報（例: "1.0.0"）
         timestamp (str): ヘルスチェック実行時刻（ISO 8601形式）
+        conversion_cache (ConversionCacheStatus | None): AI変換結果キャッシュの統計（無効時はNone）
+        ai_providers (dict[str, CircuitBreakerStatus] | None): APIキーが設定されたプロバイダーごとの
+            サーキットブレーカー状態（サーキットブレーカー無効時はNone）
+        ai_http_pools (dict[str, HTTPPoolStatus]): プロバイダーごとのHTTP接続プールの状態
+        ai_concurrency (dict[str, ConcurrencyLimitStatus] | None): プロバイダーごとの
+            同時実行数制限の状態（同時実行数制限無効時はNone）
     """
 
     # 【フィールド定義】: ヘルスチェックステータス
@@ -85,6 +167,56 @@ class HealthResponse(BaseModel):
         examples=["2025-11-20T12:34:56Z"],
     )
 
+    # 【フィールド定義】: AI変換結果キャッシュの統計
+    # 【データ型】: ConversionCacheStatus（キャッシュ無効時はNone）
+    conversion_cache: ConversionCacheStatus | None = Field(
+        None, description="AI変換結果キャッシュの統計（キャッシュ無効時はnull）"
+    )
+
+    # 【フィールド定義】: プロバイダーごとのサーキットブレーカー状態
+    # 【データ型】: プロバイダー名 → CircuitBreakerStatus（サーキットブレーカー無効時はNone）
+    ai_providers: dict[str, CircuitBreakerStatus] | None = Field(
+        None,
+        description="プロバイダーごとのサーキットブレーカー状態（無効時はnull）",
+    )
+
+    # 【フィールド定義】: プロバイダーごとのHTTP接続プールの状態
+    # 【データ型】: プロバイダー名 → HTTPPoolStatus（初期化済みのプロバイダーのみ）
+    ai_http_pools: dict[str, HTTPPoolStatus] = Field(
+        default_factory=dict,
+        description="プロバイダーごとのHTTP接続プールの状態",
+    )
+
+    # 【フィールド定義】: プロバイダーごとの同時実行数制限の状態
+    # 【データ型】: プロバイダー名 → ConcurrencyLimitStatus（同時実行数制限無効時はNone）
+    ai_concurrency: dict[str, ConcurrencyLimitStatus] | None = Field(
+        None,
+        description="プロバイダーごとの同時実行数制限の状態（無効時はnull）",
+    )
+
+
+class ReadinessResponse(BaseModel):
+    """
+    【機能概要】: レディネスエンドポイント（GET /api/v1/health/ready）のレスポンススキーマ
+    【実装方針】: 起動時のウォームアップが完了するまで "warming_up"（HTTP 503）を返し、
+                  ロードバランサーが接続確立前のワーカーへリクエストを振り分けないようにする
+
+    Attributes:
+        status (str): "ready"（ウォームアップ完了）または "warming_up"（ウォームアップ中）
+        database_connections (int): ウォームアップで確立したDB接続数
+        providers (dict[str, bool]): プロバイダー名 → ウォームアップで接続できたか
+    """
+
+    status: str = Field(..., description="レディネス状態", examples=["ready", "warming_up"])
+    database_connections: int = Field(
+        ..., description="ウォームアップで確立したDB接続数", examples=[2]
+    )
+    providers: dict[str, bool] = Field(
+        ...,
+        description="プロバイダー名 → ウォームアップで接続できたか",
+        examples=[{"anthropic": True}],
+    )
+
 
 class HealthErrorResponse(BaseModel):
     """
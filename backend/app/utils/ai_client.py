@@ -13,25 +13,98 @@ TASK-0026: 外部AI API連携実装（Claude/GPT プロキシ）
 """
 
 import asyncio
+import contextvars
 import importlib
+import json
 import logging
+import random
+import re
 import time
-from collections.abc import Awaitable, Callable
-from typing import Literal, TypeVar
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine, Hashable
+from contextlib import aclosing, asynccontextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Generic, Literal, TypeVar
 
 from app.core.config import settings
+from app.utils import metrics
+from app.utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from app.utils.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterConfig,
+    ConcurrencyLimitExceeded,
+)
+from app.utils.conversion_cache import normalize_input_text
 from app.utils.exceptions import (
     AIConversionException,
+    AILocalOverloadException,
     AIProviderException,
     AIRateLimitException,
     AITimeoutException,
 )
+from app.utils.http_transport import HTTPTransportManager
+from app.utils.latency_window import LatencyWindow
+from app.utils.rate_limit_budget import RateLimitBudget
+from app.utils.request_deadline import current_deadline, remaining_seconds
+from app.utils.request_priority import RequestPriority, current_priority, set_priority
+from app.utils.retry_budget import RetryBudget
+
+if TYPE_CHECKING:
+    import httpx
+    from anthropic import AsyncAnthropic
+    from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
 # 丁寧さレベルの型定義
 PolitenessLevel = Literal["casual", "normal", "polite"]
 
+# プロンプトのバージョン。変換結果キャッシュのキーに含まれるため、
+# プロンプト文面を変更した場合は必ず更新すること（古い変換結果の再利用を防ぐ）。
+PROMPT_VERSION = "2"
+
+# 丁寧さレベルごとの変換指示（システムプロンプトに含める）
+_POLITENESS_INSTRUCTIONS: dict[str, str] = {
+    "casual": (
+        "カジュアルで親しみやすい表現に変換してください。" "タメ口や砕けた言い回しを使用します。"
+    ),
+    "normal": "標準的な丁寧さの「です・ます」調の表現に変換してください。",
+    "polite": (
+        "非常に丁寧で敬意を込めた敬語表現に変換してください。" "尊敬語・謙譲語を適切に使用します。"
+    ),
+}
+
+# 丁寧さレベルごとのシステムプロンプト。プロバイダーのプロンプトキャッシュが効くよう、
+# リクエストごとに変わる入力文を含めない固定の文面とし、メッセージの先頭に置く
+_SYSTEM_PROMPTS: dict[str, str] = {
+    level: (
+        "あなたは日本語の文章を適切な丁寧さレベルに変換する専門家です。\n"
+        "文字盤コミュニケーション支援アプリの利用者が入力した短い日本語文を、"
+        "意味を変えずに指定の丁寧さへ変換します。\n\n"
+        f"丁寧さの指定: {instruction}\n\n"
+        "守ること:\n"
+        "- 入力文の意味・意図を変えず、内容を付け足さない\n"
+        "- 出力は指示された形式のみとし、説明や追加情報は書かない"
+    )
+    for level, instruction in _POLITENESS_INSTRUCTIONS.items()
+}
+
+# 変換結果のみを出力させる指示（ユーザーメッセージの末尾に置く）
+_OUTPUT_SENTENCE_ONLY = "変換後の文のみを出力してください。説明や追加情報は不要です。"
+
+# 端末のデッドラインに合わせて短くするSDKのタイムアウトの下限（秒）。
+# 期限切れ直前でもSDKに0以下のタイムアウトを渡さないよう、下限を設ける
+_MIN_REQUEST_TIMEOUT_SECONDS = 0.05
+
+# SDKクライアントが未生成であることを表す値（APIキー未設定時の None と区別する）
+_NOT_BUILT = object()
+
+# AIClientが扱うプロバイダー（ヘッジ・フェイルオーバー時の切替先の候補順）
+SUPPORTED_PROVIDERS: tuple[str, ...] = ("anthropic", "openai")
+
+# 直近の convert_text で実際に応答したプロバイダー（呼び出し元のコンテキストに記録する）。
+# ヘッジ等により指定と異なるプロバイダーが応答した場合に、ログへ正しい値を残すために使う。
+_SERVED_PROVIDER: ContextVar[str | None] = ContextVar("ai_served_provider", default=None)
+
 # _call_with_retry の戻り値型変数
 _T = TypeVar("_T")
 
@@ -133,6 +206,43 @@ def _is_retryable_exception(error: Exception) -> bool:
     return bool(rate_types and isinstance(error, rate_types))
 
 
+def _backoff_delay(attempt: int) -> float:
+    """リトライ前の待ち時間（秒）。0〜0.5 × 2^attempt 秒の一様乱数（full jitter）
+
+    同時に失敗した呼び出しのリトライが同じ時刻に集中しないよう、待ち時間全体を乱数にする。
+    """
+    return random.uniform(0, 0.5 * (2**attempt))  # noqa: S311 - 暗号用途ではない
+
+
+def _is_rate_limit_exception(error: Exception) -> bool:
+    """例外がプロバイダーのレート制限（RateLimitError / 429）か判定する"""
+    _, rate_types = _provider_exception_types()
+    if rate_types and isinstance(error, rate_types):
+        return True
+    return getattr(error, "status_code", None) == 429
+
+
+def _mark_local_overload(error: BaseException) -> None:
+    """例外を「自プロセスの制限により打ち切った呼び出し」の例外として印を付ける
+
+    リトライ予算の枯渇時のように、プロバイダーの例外をそのまま送出する場合に使う。
+    """
+    error._local_overload = True  # type: ignore[attr-defined]
+
+
+def _is_local_overload(error: BaseException | None) -> bool:
+    """例外（またはその原因）が自プロセスの制限による打ち切りか判定する。
+
+    AILocalOverloadException と _mark_local_overload で印を付けた例外が該当する。
+    アプリ例外へのマッピング（raise ... from e）後も判定できるよう __cause__ をたどる。
+    """
+    while error is not None:
+        if isinstance(error, AILocalOverloadException) or getattr(error, "_local_overload", False):
+            return True
+        error = error.__cause__
+    return False
+
+
 def _map_provider_exception(error: Exception, provider_label: str) -> Exception:
     """プロバイダーSDKの例外を、対応するアプリ例外へマッピングする。
 
@@ -200,6 +310,318 @@ def _extract_openai_text(response: object) -> str:
     return content.strip()
 
 
+def _extract_anthropic_stream_delta(event: object) -> str:
+    """Anthropicのストリーミングイベントからテキスト断片を取り出す（断片以外は空文字）"""
+    if getattr(event, "type", None) != "content_block_delta":
+        return ""
+    text = getattr(getattr(event, "delta", None), "text", None)
+    return text if isinstance(text, str) else ""
+
+
+def _extract_openai_stream_delta(chunk: object) -> str:
+    """OpenAIのストリーミングチャンクからテキスト断片を取り出す（断片以外は空文字）"""
+    choices = getattr(chunk, "choices", None)
+    if not choices:
+        return ""
+    content = getattr(getattr(choices[0], "delta", None), "content", None)
+    return content if isinstance(content, str) else ""
+
+
+def _usage_counts(provider: str, usage: object) -> tuple[dict[str, int], int | None]:
+    """
+    プロバイダーの usage からトークン数を取り出す
+
+    Returns:
+        (入力側の種類 → トークン数, 出力トークン数)。入力側の種類は
+        "input"（キャッシュを使わなかった入力）, "cache_read", "cache_write"
+    """
+    if provider == "anthropic":
+        prompt_counts = {
+            "input": getattr(usage, "input_tokens", None),
+            "cache_read": getattr(usage, "cache_read_input_tokens", None),
+            "cache_write": getattr(usage, "cache_creation_input_tokens", None),
+        }
+        output = getattr(usage, "output_tokens", None)
+    else:
+        # OpenAI の prompt_tokens はキャッシュから読み込んだトークンを含む
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+        cached = cached if isinstance(cached, int) else 0
+        prompt_counts = {
+            "input": prompt_tokens - cached if isinstance(prompt_tokens, int) else None,
+            "cache_read": cached,
+        }
+        output = getattr(usage, "completion_tokens", None)
+    counts = {kind: value for kind, value in prompt_counts.items() if isinstance(value, int)}
+    return counts, output if isinstance(output, int) else None
+
+
+def _record_usage(
+    provider: str, usage: object, *, prompt: bool = True, output: bool = True
+) -> None:
+    """
+    プロバイダーの usage（キャッシュから読み込んだトークン数を含む）をメトリクスに記録する
+
+    Args:
+        provider: プロバイダー名
+        usage: レスポンスの usage（ない場合・数値でない項目は記録しない）
+        prompt: 入力側のトークン数を記録するか
+        output: 出力トークン数を記録するか
+    """
+    if usage is None:
+        return
+    prompt_counts, output_tokens = _usage_counts(provider, usage)
+    if prompt:
+        for kind, tokens in prompt_counts.items():
+            if tokens > 0:
+                metrics.ai_tokens.labels(provider, kind).inc(tokens)
+    if output and output_tokens:
+        metrics.ai_tokens.labels(provider, "output").inc(output_tokens)
+
+
+def _record_stream_usage(provider: str, event: object) -> None:
+    """ストリーミングのイベントに含まれる usage をメトリクスに記録する"""
+    if provider != "anthropic":
+        _record_usage(provider, getattr(event, "usage", None))
+        return
+    # Anthropic: 入力側は message_start、出力トークン数は message_delta に含まれる
+    event_type = getattr(event, "type", None)
+    if event_type == "message_start":
+        usage = getattr(getattr(event, "message", None), "usage", None)
+        _record_usage(provider, usage, output=False)
+    elif event_type == "message_delta":
+        _record_usage(provider, getattr(event, "usage", None), prompt=False)
+
+
+async def _next_stream_event(iterator: AsyncIterator[object], remaining: float) -> object:
+    """ストリームの次のイベントを残り時間内で待つ。
+
+    Args:
+        iterator: プロバイダーSDKのストリーム
+        remaining: デッドラインまでの残り秒数
+
+    Returns:
+        次のイベント
+
+    Raises:
+        StopAsyncIteration: ストリーム終端
+        TimeoutError: デッドライン超過（"timeout" を含むメッセージ。AITimeoutExceptionへマッピングされる）
+    """
+    try:
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        return await asyncio.wait_for(iterator.__anext__(), timeout=remaining)
+    except asyncio.TimeoutError as exc:
+        raise TimeoutError("AI call timeout: deadline exceeded while streaming") from exc
+
+
+# 候補リストを箇条書きで返された場合に除去する行頭記号（"1." "2)" "・" "-" 等）
+_LIST_MARKER_PATTERN = re.compile(r"^\s*(?:\d+[.)．、]|[-*・●])\s*")
+
+
+def _parse_variant_list(text: str) -> list[str]:
+    """複数候補を求めたレスポンス本文から候補文字列のリストを取り出す。
+
+    JSON配列（前後に説明文やコードフェンスが付いていても可）を優先して解釈し、
+    解釈できない場合は1行1候補の箇条書きとして扱う。
+
+    Args:
+        text: AIレスポンスの本文
+
+    Returns:
+        list[str]: 候補文字列のリスト（空要素は除外、重複除去は行わない）
+    """
+    start, end = text.find("["), text.rfind("]")
+    if 0 <= start < end:
+        try:
+            parsed = json.loads(text[start : end + 1])
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, list):
+            return [item.strip() for item in parsed if isinstance(item, str) and item.strip()]
+
+    candidates = []
+    for line in text.splitlines():
+        line = _LIST_MARKER_PATTERN.sub("", line).strip().strip("\"'「」")
+        if line and not line.startswith("```"):
+            candidates.append(line)
+    return candidates
+
+
+def _dedupe_variants(candidates: list[str], exclude: str | None = None) -> list[str]:
+    """候補を表記ゆれ（全角/半角・空白）を無視して重複除去する。
+
+    Args:
+        candidates: 候補文字列のリスト（先頭ほど優先）
+        exclude: 候補から除外する文字列（前回の変換結果など）
+
+    Returns:
+        list[str]: 出現順を保った重複のない候補リスト
+    """
+    seen = {normalize_input_text(exclude)} if exclude else set()
+    variants = []
+    for candidate in candidates:
+        key = normalize_input_text(candidate)
+        if key and key not in seen:
+            seen.add(key)
+            variants.append(candidate)
+    return variants
+
+
+def consume_served_provider() -> str | None:
+    """直近の convert_text で実際に応答したプロバイダーを取り出す（取り出し後はクリア）。
+
+    convert_text は戻り値の互換性（(変換後テキスト, 処理時間)）を保つため、応答した
+    プロバイダーを呼び出し元のコンテキストに記録する。同一タスク内の後続呼び出しに
+    値が残らないよう、読み出しと同時にクリアする。
+
+    Returns:
+        str | None: プロバイダー名（未記録の場合はNone）
+    """
+    provider = _SERVED_PROVIDER.get()
+    _SERVED_PROVIDER.set(None)
+    return provider
+
+
+def set_served_provider(provider: str | None) -> None:
+    """実際に応答したプロバイダーを現在のコンテキストに記録する。
+
+    変換を別タスクで実行した呼び出し元が、タスク内で取り出した値を自身のコンテキストへ
+    引き継ぐために使う。
+
+    Args:
+        provider: プロバイダー名
+    """
+    _SERVED_PROVIDER.set(provider)
+
+
+def model_for_provider(provider: str) -> str:
+    """プロバイダー名から使用するモデル名を解決する。
+
+    Args:
+        provider: AIプロバイダー名（"anthropic" or "openai"）
+
+    Returns:
+        str: モデル名（未知のプロバイダーの場合は空文字）
+    """
+    if provider == "anthropic":
+        return settings.ANTHROPIC_MODEL
+    if provider == "openai":
+        return settings.OPENAI_MODEL
+    return ""
+
+
+def _shared_call_context(priority: RequestPriority) -> contextvars.Context:
+    """
+    single-flight の共有呼び出しを実行するコンテキストを作る
+
+    最初の呼び出し元のコンテキストを引き継がず、優先度は集約キーに含めた優先度とする。
+    デッドラインは設定しない: 各呼び出し元は自身のデッドラインまでしか待たず、
+    最後の呼び出し元が離脱した時点で共有呼び出しは中止されるため、共有呼び出しは
+    呼び出し元のうち最も遅いデッドラインまで実行される
+
+    Args:
+        priority: 共有呼び出しの優先度
+
+    Returns:
+        contextvars.Context: 共有呼び出し用のコンテキスト
+    """
+    context = contextvars.Context()
+    context.run(set_priority, priority)
+    return context
+
+
+class _InFlightCall(Generic[_T]):
+    """単一フライト中の共有呼び出し（共有タスクと待機者数）"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[_T]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class _SingleFlight:
+    """
+    同一キーの同時呼び出しを1回の呼び出しに集約する（single-flight）
+
+    【機能概要】: 教室などで複数端末が同じ定型文を同時にタップした場合でも、
+                  AI APIへの呼び出しを1回にまとめ、全員が同じ結果を受け取る
+    【実装方針】:
+      - 最初の呼び出し元が共有タスクを起動し、後続の呼び出し元は同じタスクを待つ
+      - 各呼び出し元は asyncio.shield 越しに待機するため、1人の切断（キャンセル）が
+        他の待機者の共有呼び出しを巻き添えにしない
+      - 各呼び出し元は指定された時間（自身のデッドラインまでの残り時間）までしか待たない
+      - 全待機者がいなくなった場合（キャンセル・待ち時間切れ）のみ共有タスクをキャンセルする
+        （無駄な課金呼び出しの防止）
+      - 共有タスクの例外は全待機者にそのまま伝播する
+      - 完了・キャンセルした呼び出しは即座に登録解除し、以降の呼び出しは新規に実行する
+      - 共有タスクは呼び出し元が渡したコンテキストで実行する（最初の呼び出し元のデッドライン
+        等が、相乗りした他の呼び出し元の結果を左右しないようにするため）
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _InFlightCall] = {}
+        # 既存の呼び出しに相乗りした回数（AI API呼び出しを節約できた回数）
+        self.coalesced_calls = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[], Coroutine[object, object, _T]],
+        context: contextvars.Context | None = None,
+        timeout: float | None = None,
+    ) -> _T:
+        """キーごとに集約して factory() を実行し、その結果を返す。
+
+        Args:
+            key: 集約キー（同じキーの同時呼び出しは1回にまとめられる）
+            factory: 共有呼び出しのコルーチンを生成する 0 引数 callable
+            context: 共有呼び出しを実行するコンテキスト（省略時は最初の呼び出し元のコピー）
+            timeout: この呼び出し元が結果を待つ上限（秒。省略時は無制限）
+
+        Returns:
+            共有呼び出しの結果
+
+        Raises:
+            共有呼び出しが送出した例外。呼び出し元自身がキャンセルされた場合は CancelledError、
+            timeout までに結果が得られない場合は asyncio.TimeoutError。
+        """
+        call = self._calls.get(key)
+        if call is None:
+            # create_task の context 引数は Python 3.11 以降のため、コンテキスト内でタスクを作る
+            # （タスクは作成時のコンテキストのコピーで実行される）
+            if context is None:
+                task = asyncio.ensure_future(factory())
+            else:
+                task = context.run(asyncio.ensure_future, factory())
+            call = _InFlightCall(task)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task, key=key, call=call: self._forget(key, call))
+        else:
+            self.coalesced_calls += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.task), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if call.waiters == 1 and not call.task.done():
+                # 最後の待機者が離脱した: 結果を待つ者がいないため共有呼び出しを中止する
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, call: _InFlightCall) -> None:
+        """共有呼び出しの登録を解除する（別の呼び出しが登録済みの場合は何もしない）"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
 class AIClient:
     """
     AI APIクライアント（Claude/GPT統合）
@@ -222,46 +644,109 @@ class AIClient:
         """
         AIClientの初期化
 
-        【初期化処理】: APIキーが設定されている場合のみクライアントを初期化
+        【初期化処理】: SDKクライアントは初回参照時に生成する（anthropic / openai / httpx の
+                        読み込みをアプリのimport時に行わない）。APIキーが設定されていない
+                        プロバイダーのクライアントはNoneになる
         """
-        self.anthropic_client = None
-        self.openai_client = None
-        # 明示生成した httpx クライアントを保持し、shutdown 時にクローズする
+        self._anthropic_client: object = _NOT_BUILT
+        self._openai_client: object = _NOT_BUILT
+        # 同一入力の同時変換を1回のAPI呼び出しに集約する
+        self._single_flight = _SingleFlight()
+        # プロバイダーごとの直近の応答時間（ヘッジ発火までの待ち時間の算出に使用。初回参照時に生成）
+        self._latency: dict[str, LatencyWindow] = {}
+        # プロバイダーごとのサーキットブレーカー（初回参照時に生成）
+        self._breakers: dict[str, CircuitBreaker] = {}
+        # プロバイダーごとの適応的同時実行数制限（初回参照時に生成）
+        self._limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+        # プロバイダーごとのレート制限予算（応答ヘッダーから更新。初回参照時に生成）
+        self._rate_limit_budgets: dict[str, RateLimitBudget] = {}
+        # すべてのプロバイダー呼び出しで共有するリトライ予算（初回参照時に生成）
+        self._retry_budget: RetryBudget | None = None
+        # (プロバイダー, 成功したか) ごとの呼び出しメトリクス（初回に生成して再利用する）
+        self._bound_call_metrics: dict[
+            tuple[str, bool], tuple[metrics.HistogramChild, metrics.HistogramChild]
+        ] = {}
+        # ヘッジ（セカンダリへの同時送信）を発火した回数と、セカンダリが勝った回数
+        self.hedged_calls = 0
+        self.hedge_wins = 0
+        # 両プロバイダーのSDKクライアントに渡す httpx クライアント（接続プール）を管理する。
+        # shutdown 時に aclose() でまとめてクローズする
+        self._transport = HTTPTransportManager(on_response=self._observe_rate_limit_headers)
         self._anthropic_http_client = None
 
-        # Anthropic クライアント初期化
-        if settings.ANTHROPIC_API_KEY:
-            try:
-                import httpx
-                from anthropic import AsyncAnthropic
-
-                # httpxクライアントを明示的に作成（プロキシ設定を無視）
-                http_client = httpx.AsyncClient(timeout=settings.AI_API_TIMEOUT)
-                self._anthropic_http_client = http_client
-                self.anthropic_client = AsyncAnthropic(
-                    api_key=settings.ANTHROPIC_API_KEY,
-                    http_client=http_client,
-                )
-                logger.info("Anthropic client initialized")
-            except ImportError:
-                logger.warning("anthropic package not installed")
-            except Exception as e:
-                logger.error(f"Failed to initialize Anthropic client: {e}")
-
-        # OpenAI クライアント初期化
-        if settings.OPENAI_API_KEY:
-            try:
-                from openai import AsyncOpenAI
+    @property
+    def anthropic_client(self) -> "AsyncAnthropic | None":
+        """Anthropic APIクライアント（APIキー未設定・初期化失敗時はNone。初回参照時に生成）"""
+        if self._anthropic_client is _NOT_BUILT:
+            self._anthropic_client = self._build_anthropic_client()
+        return self._anthropic_client
+
+    @anthropic_client.setter
+    def anthropic_client(self, client: "AsyncAnthropic | None") -> None:
+        self._anthropic_client = client
+
+    @anthropic_client.deleter
+    def anthropic_client(self) -> None:
+        self._anthropic_client = _NOT_BUILT
+
+    @property
+    def openai_client(self) -> "AsyncOpenAI | None":
+        """OpenAI APIクライアント（APIキー未設定・初期化失敗時はNone。初回参照時に生成）"""
+        if self._openai_client is _NOT_BUILT:
+            self._openai_client = self._build_openai_client()
+        return self._openai_client
+
+    @openai_client.setter
+    def openai_client(self, client: "AsyncOpenAI | None") -> None:
+        self._openai_client = client
+
+    @openai_client.deleter
+    def openai_client(self) -> None:
+        self._openai_client = _NOT_BUILT
+
+    def _build_anthropic_client(self) -> "AsyncAnthropic | None":
+        """APIキーが設定されている場合のみ Anthropic クライアントを生成する"""
+        if not settings.ANTHROPIC_API_KEY:
+            return None
+        try:
+            from anthropic import AsyncAnthropic
+
+            # 接続プールを設定したhttpxクライアントを明示的に渡す（プロキシ設定を無視）
+            http_client = self._transport.client_for("anthropic", settings.AI_API_TIMEOUT)
+            self._anthropic_http_client = http_client
+            client = AsyncAnthropic(
+                api_key=settings.ANTHROPIC_API_KEY,
+                base_url=settings.ANTHROPIC_BASE_URL,
+                http_client=http_client,
+            )
+            logger.info("Anthropic client initialized")
+            return client
+        except ImportError:
+            logger.warning("anthropic package not installed")
+        except Exception as e:
+            logger.error(f"Failed to initialize Anthropic client: {e}")
+        return None
 
-                self.openai_client = AsyncOpenAI(
-                    api_key=settings.OPENAI_API_KEY,
-                    timeout=settings.AI_API_TIMEOUT,
-                )
-                logger.info("OpenAI client initialized")
-            except ImportError:
-                logger.warning("openai package not installed")
-            except Exception as e:
-                logger.error(f"Failed to initialize OpenAI client: {e}")
+    def _build_openai_client(self) -> "AsyncOpenAI | None":
+        """APIキーが設定されている場合のみ OpenAI クライアントを生成する"""
+        if not settings.OPENAI_API_KEY:
+            return None
+        try:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL,
+                timeout=settings.AI_API_TIMEOUT,
+                http_client=self._transport.client_for("openai", settings.AI_API_TIMEOUT),
+            )
+            logger.info("OpenAI client initialized")
+            return client
+        except ImportError:
+            logger.warning("openai package not installed")
+        except Exception as e:
+            logger.error(f"Failed to initialize OpenAI client: {e}")
+        return None
 
     def _get_politeness_instruction(self, level: PolitenessLevel) -> str:
         """
@@ -278,18 +763,123 @@ class AIClient:
 
         🔵 REQ-902に基づく
         """
-        instructions = {
-            "casual": (
-                "カジュアルで親しみやすい表現に変換してください。"
-                "タメ口や砕けた言い回しを使用します。"
-            ),
-            "normal": "標準的な丁寧さの「です・ます」調の表現に変換してください。",
-            "polite": (
-                "非常に丁寧で敬意を込めた敬語表現に変換してください。"
-                "尊敬語・謙譲語を適切に使用します。"
-            ),
+        return _POLITENESS_INSTRUCTIONS.get(level, _POLITENESS_INSTRUCTIONS["normal"])
+
+    def _system_prompt(self, level: PolitenessLevel) -> str:
+        """
+        丁寧さレベルに応じたシステムプロンプト（全リクエストで共通の固定文面）を返す
+
+        Args:
+            level: 丁寧さレベル（無効なレベルはnormalにフォールバック）
+
+        Returns:
+            str: システムプロンプト
+        """
+        return _SYSTEM_PROMPTS.get(level, _SYSTEM_PROMPTS["normal"])
+
+    def _build_conversion_prompt(self, input_text: str) -> str:
+        """
+        変換用のユーザーメッセージを生成（通常変換・ストリーミング変換で共通）
+
+        丁寧さの指示はシステムプロンプトに含めるため、ここには入力文と出力形式のみを含める
+
+        Args:
+            input_text: 変換対象のテキスト
+
+        Returns:
+            str: プロバイダーに送信するユーザーメッセージ
+        """
+        return (
+            f"以下の日本語文を変換してください。\n\n入力文: {input_text}\n\n{_OUTPUT_SENTENCE_ONLY}"
+        )
+
+    def _anthropic_request(
+        self,
+        politeness_level: PolitenessLevel,
+        prompt: str,
+        max_tokens: int = 1024,
+        **options: object,
+    ) -> dict[str, object]:
+        """
+        Anthropic Messages API のリクエストを組み立てる
+
+        システムプロンプト（丁寧さレベルごとの固定文面）を先頭に置く。
+        cache_control は付けない（Anthropic がキャッシュする接頭辞の最小長
+        1024トークンに対しシステムプロンプトが大幅に短く、キャッシュされないため）
+
+        Args:
+            politeness_level: 丁寧さレベル
+            prompt: ユーザーメッセージ
+            max_tokens: 最大出力トークン数
+            **options: その他のパラメータ（stream 等）
+
+        Returns:
+            dict[str, object]: messages.create に渡すキーワード引数
+        """
+        return {
+            "model": settings.ANTHROPIC_MODEL,
+            "max_tokens": max_tokens,
+            "system": [{"type": "text", "text": self._system_prompt(politeness_level)}],
+            "messages": [{"role": "user", "content": prompt}],
+            **self._deadline_options(),
+            **options,
+        }
+
+    def _openai_request(
+        self,
+        politeness_level: PolitenessLevel,
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        **options: object,
+    ) -> dict[str, object]:
+        """
+        OpenAI Chat Completions API のリクエストを組み立てる
+
+        固定のシステムプロンプトを先頭に置き（OpenAI は先頭から一致する部分を自動で
+        キャッシュする）、丁寧さレベルごとの prompt_cache_key で同じキャッシュに振り分ける
+
+        Args:
+            politeness_level: 丁寧さレベル
+            prompt: ユーザーメッセージ
+            max_tokens: 最大出力トークン数
+            temperature: 生成のランダム性
+            **options: その他のパラメータ（n, stream 等）
+
+        Returns:
+            dict[str, object]: chat.completions.create に渡すキーワード引数
+        """
+        request: dict[str, object] = {
+            "model": settings.OPENAI_MODEL,
+            "messages": [
+                {"role": "system", "content": self._system_prompt(politeness_level)},
+                {"role": "user", "content": prompt},
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            **self._deadline_options(),
+            **options,
         }
-        return instructions.get(level, instructions["normal"])
+        if settings.AI_PROMPT_CACHE_ENABLED:
+            request["prompt_cache_key"] = f"kotonoha-v{PROMPT_VERSION}-{politeness_level}"
+        return request
+
+    def _deadline_options(self) -> dict[str, object]:
+        """
+        端末のデッドライン（app.utils.request_deadline）に合わせたSDKのタイムアウトを返す
+
+        デッドラインまでの残り時間が AI_API_TIMEOUT より短い場合のみ、リクエスト単位の
+        timeout で上書きする（端末が待受を諦めた後の応答を待たない）
+
+        Returns:
+            dict[str, object]: リクエストに追加するキーワード引数（上書き不要の場合は空）
+        """
+        if current_deadline() is None:
+            return {}
+        remaining = remaining_seconds(float(settings.AI_API_TIMEOUT))
+        if remaining >= settings.AI_API_TIMEOUT:
+            return {}
+        return {"timeout": max(remaining, _MIN_REQUEST_TIMEOUT_SECONDS)}
 
     async def convert_text_anthropic(
         self,
@@ -325,21 +915,16 @@ class AIClient:
 
         start_time = time.time()
 
-        instruction = self._get_politeness_instruction(politeness_level)
-        prompt = f"""以下の日本語文を{instruction}
-
-入力文: {input_text}
-
-変換後の文のみを出力してください。説明や追加情報は不要です。"""
+        request = self._anthropic_request(
+            politeness_level, self._build_conversion_prompt(input_text)
+        )
 
         try:
             response = await self._call_with_retry(
-                lambda: self.anthropic_client.messages.create(
-                    model=settings.ANTHROPIC_MODEL,
-                    max_tokens=1024,
-                    messages=[{"role": "user", "content": prompt}],
-                )
+                lambda: self.anthropic_client.messages.create(**request),
+                provider="anthropic",
             )
+            _record_usage("anthropic", getattr(response, "usage", None))
 
             converted_text = _extract_anthropic_text(response)
             conversion_time_ms = int((time.time() - start_time) * 1000)
@@ -397,28 +982,14 @@ class AIClient:
 
         start_time = time.time()
 
-        instruction = self._get_politeness_instruction(politeness_level)
-        prompt = f"""以下の日本語文を{instruction}
-
-入力文: {input_text}
-
-変換後の文のみを出力してください。説明や追加情報は不要です。"""
+        request = self._openai_request(politeness_level, self._build_conversion_prompt(input_text))
 
         try:
             response = await self._call_with_retry(
-                lambda: self.openai_client.chat.completions.create(
-                    model=settings.OPENAI_MODEL,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "あなたは日本語の文章を適切な丁寧さレベルに変換する専門家です。",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    max_tokens=1024,
-                    temperature=0.7,
-                )
+                lambda: self.openai_client.chat.completions.create(**request),
+                provider="openai",
             )
+            _record_usage("openai", getattr(response, "usage", None))
 
             converted_text = _extract_openai_text(response)
             conversion_time_ms = int((time.time() - start_time) * 1000)
@@ -455,6 +1026,15 @@ class AIClient:
           - provider引数でプロバイダーを明示的に指定可能
           - 指定がない場合はDEFAULT_AI_PROVIDERを使用
           - 無効なプロバイダーはAIProviderExceptionを送出
+          - AI_SINGLE_FLIGHT_ENABLED が有効な場合、同一 (入力, 丁寧さレベル, プロバイダー,
+            優先度) の同時呼び出しを1回のAPI呼び出しに集約する（処理時間は共有呼び出しの
+            所要時間）。各呼び出し元は AI_CALL_DEADLINE_SECONDS（端末のデッドラインの方が
+            短い場合はその残り時間）までしか待たず、超過時は AITimeoutException を送出する
+          - AI_HEDGING_ENABLED が有効な場合、指定プロバイダーの応答が遅いときに
+            もう一方のプロバイダーへ同じプロンプトを送信し、先に成功した結果を採用する
+          - AI_CIRCUIT_BREAKER_ENABLED が有効な場合、指定プロバイダーのサーキットが open なら
+            もう一方のプロバイダーへ即座に切り替える（切替先がなければ即座に失敗する）
+          - 実際に応答したプロバイダーは consume_served_provider() で取得できる
 
         Args:
             input_text: 変換対象のテキスト
@@ -465,18 +1045,545 @@ class AIClient:
             tuple[str, int]: (変換後テキスト, 処理時間ミリ秒)
 
         Raises:
-            AIProviderException: 無効なプロバイダー指定時
+            AIProviderException: 無効なプロバイダー指定時、全プロバイダーのサーキットが open の時
 
         🔵 api-endpoints.mdに基づく
         """
         provider = provider or settings.DEFAULT_AI_PROVIDER
+        if provider not in SUPPORTED_PROVIDERS:
+            raise AIProviderException(f"Unknown AI provider: {provider}")
 
+        if settings.AI_SINGLE_FLIGHT_ENABLED:
+            priority = current_priority()
+            budget = max(0.0, remaining_seconds(settings.AI_CALL_DEADLINE_SECONDS))
+            try:
+                converted_text, conversion_time_ms, served_provider = await self._single_flight.do(
+                    (provider, politeness_level, input_text, priority),
+                    lambda: self._convert_routed(input_text, politeness_level, provider),
+                    context=_shared_call_context(priority),
+                    timeout=budget,
+                )
+            except asyncio.TimeoutError as e:
+                raise AITimeoutException(
+                    f"AI call timeout: deadline of {budget:g}s exceeded while waiting"
+                ) from e
+        else:
+            converted_text, conversion_time_ms, served_provider = await self._convert_routed(
+                input_text, politeness_level, provider
+            )
+
+        _SERVED_PROVIDER.set(served_provider)
+        return converted_text, conversion_time_ms
+
+    async def _convert_routed(
+        self,
+        input_text: str,
+        politeness_level: PolitenessLevel,
+        provider: str,
+    ) -> tuple[str, int, str]:
+        """
+        変換をプロバイダーへ振り分ける
+
+        サーキットが open のプロバイダーを避けて振り分け先を決め、ヘッジ有効時は
+        セカンダリへの同時送信を含めて変換する。
+
+        Returns:
+            tuple[str, int, str]: (変換後テキスト, 処理時間ミリ秒, 実際に応答したプロバイダー)
+        """
+        provider = self._route_around_open_circuit(provider)
+        secondary = self._secondary_provider(provider)
+        if settings.AI_HEDGING_ENABLED and secondary is not None:
+            return await self._convert_hedged(input_text, politeness_level, provider, secondary)
+        return await self._convert_with(input_text, politeness_level, provider)
+
+    async def _convert_with(
+        self,
+        input_text: str,
+        politeness_level: PolitenessLevel,
+        provider: str,
+    ) -> tuple[str, int, str]:
+        """
+        指定プロバイダーで変換し、結果をサーキットブレーカーと応答時間に記録する
+
+        APIキー未設定（AIProviderException）・キャンセル・自プロセスの制限による打ち切り
+        （同時実行数制限・レート制限予算・リトライ予算。_is_local_overload）は
+        プロバイダーの障害ではないため、サーキットブレーカーの判定には含めない。
+        """
         if provider == "anthropic":
-            return await self.convert_text_anthropic(input_text, politeness_level)
-        elif provider == "openai":
-            return await self.convert_text_openai(input_text, politeness_level)
+            convert = self.convert_text_anthropic
         else:
-            raise AIProviderException(f"Unknown AI provider: {provider}")
+            convert = self.convert_text_openai
+
+        breaker = self.circuit_breaker(provider) if settings.AI_CIRCUIT_BREAKER_ENABLED else None
+        if breaker is not None and not breaker.acquire():
+            raise AIProviderException(f"{provider} circuit breaker is open")
+
+        start_time = time.monotonic()
+        try:
+            converted_text, conversion_time_ms = await convert(input_text, politeness_level)
+        except (asyncio.CancelledError, AIProviderException):
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception as e:
+            if breaker is not None:
+                if _is_local_overload(e):
+                    breaker.release()
+                else:
+                    breaker.record_failure(time.monotonic() - start_time)
+            raise
+
+        if breaker is not None:
+            breaker.record_success(time.monotonic() - start_time)
+        self._latency_window(provider).record(conversion_time_ms / 1000)
+        return converted_text, conversion_time_ms, provider
+
+    def _route_around_open_circuit(self, provider: str) -> str:
+        """
+        サーキットが open のプロバイダーを避けて振り分け先を決める
+
+        Returns:
+            str: 振り分け先のプロバイダー
+
+        Raises:
+            AIProviderException: 指定プロバイダーのサーキットが open で、切替先もない場合
+                                 （デッドラインまで待たずに即座に失敗させる）
+        """
+        if not settings.AI_CIRCUIT_BREAKER_ENABLED:
+            return provider
+        if self.circuit_breaker(provider).allows_requests:
+            return provider
+
+        fallback = self._secondary_provider(provider)
+        if fallback is None:
+            raise AIProviderException(
+                f"{provider} circuit breaker is open and no fallback provider is available"
+            )
+        logger.warning(f"{provider} circuit breaker is open; failing over to {fallback}")
+        return fallback
+
+    def _secondary_provider(self, provider: str) -> str | None:
+        """
+        指定プロバイダー以外で、クライアントが初期化済みかつサーキットが
+        呼び出しを受け付けるプロバイダーを返す
+        """
+        clients = {"anthropic": self.anthropic_client, "openai": self.openai_client}
+        for candidate in SUPPORTED_PROVIDERS:
+            if candidate == provider or clients.get(candidate) is None:
+                continue
+            if settings.AI_CIRCUIT_BREAKER_ENABLED and not (
+                self.circuit_breaker(candidate).allows_requests
+            ):
+                continue
+            return candidate
+        return None
+
+    def circuit_breaker(self, provider: str) -> CircuitBreaker:
+        """プロバイダーのサーキットブレーカーを返す（未生成の場合は設定値から生成する）"""
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                provider,
+                CircuitBreakerConfig(
+                    window_size=settings.AI_CIRCUIT_WINDOW_SIZE,
+                    min_calls=settings.AI_CIRCUIT_MIN_CALLS,
+                    failure_rate_threshold=settings.AI_CIRCUIT_FAILURE_RATE_THRESHOLD,
+                    slow_call_seconds=settings.AI_CIRCUIT_SLOW_CALL_SECONDS,
+                    slow_call_rate_threshold=settings.AI_CIRCUIT_SLOW_CALL_RATE_THRESHOLD,
+                    open_seconds=settings.AI_CIRCUIT_OPEN_SECONDS,
+                    half_open_max_calls=settings.AI_CIRCUIT_HALF_OPEN_MAX_CALLS,
+                ),
+            )
+            self._breakers[provider] = breaker
+        return breaker
+
+    def concurrency_limiter(self, provider: str) -> AdaptiveConcurrencyLimiter:
+        """プロバイダーの同時実行数制限を返す（未生成の場合は設定値から生成する）"""
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(
+                provider,
+                ConcurrencyLimiterConfig(
+                    initial_limit=settings.AI_CONCURRENCY_INITIAL_LIMIT,
+                    min_limit=settings.AI_CONCURRENCY_MIN_LIMIT,
+                    max_limit=settings.AI_CONCURRENCY_MAX_LIMIT,
+                    rate_limit_backoff=settings.AI_CONCURRENCY_RATE_LIMIT_BACKOFF,
+                    latency_backoff=settings.AI_CONCURRENCY_LATENCY_BACKOFF,
+                    latency_tolerance=settings.AI_CONCURRENCY_LATENCY_TOLERANCE,
+                    max_queue=settings.AI_CONCURRENCY_MAX_QUEUE,
+                ),
+            )
+            self._limiters[provider] = limiter
+        return limiter
+
+    @property
+    def retry_budget(self) -> RetryBudget:
+        """プロセス内で共有するリトライ予算（未生成の場合は設定値から生成する）"""
+        if self._retry_budget is None:
+            self._retry_budget = RetryBudget(
+                ratio=settings.AI_RETRY_BUDGET_RATIO,
+                window_seconds=settings.AI_RETRY_BUDGET_WINDOW_SECONDS,
+                min_retries=settings.AI_RETRY_BUDGET_MIN_RETRIES,
+            )
+        return self._retry_budget
+
+    def rate_limit_budget(self, provider: str) -> RateLimitBudget:
+        """プロバイダーのレート制限予算を返す（未生成の場合は生成する）"""
+        budget = self._rate_limit_budgets.get(provider)
+        if budget is None:
+            budget = RateLimitBudget(provider, settings.AI_RATE_LIMIT_HEADROOM_RATIO)
+            self._rate_limit_budgets[provider] = budget
+        return budget
+
+    def _observe_rate_limit_headers(self, provider: str, response: "httpx.Response") -> None:
+        """プロバイダーの応答のレート制限ヘッダーを予算に反映する（HTTPクライアントの応答フック）"""
+        if settings.AI_RATE_LIMIT_BUDGET_ENABLED:
+            self.rate_limit_budget(provider).update(response.headers, response.status_code)
+
+    def describe_concurrency_limits(self) -> dict[str, dict[str, int]]:
+        """
+        ヘルスチェック用に、初期化済みのプロバイダーの同時実行数制限の状態を返す
+
+        Returns:
+            dict[str, dict[str, int]]: プロバイダー名 → AdaptiveConcurrencyLimiter.describe() の結果
+        """
+        return {
+            provider: self.concurrency_limiter(provider).describe()
+            for provider in self._initialized_providers()
+        }
+
+    def describe_providers(self) -> dict[str, dict[str, object]]:
+        """
+        ヘルスチェック用に、APIキーが設定されたプロバイダーのサーキット状態を返す
+
+        Returns:
+            dict[str, dict[str, object]]: プロバイダー名 → CircuitBreaker.describe() の結果
+        """
+        clients = {"anthropic": self.anthropic_client, "openai": self.openai_client}
+        return {
+            provider: self.circuit_breaker(provider).describe()
+            for provider in SUPPORTED_PROVIDERS
+            if clients.get(provider) is not None
+        }
+
+    def describe_http_pools(self) -> dict[str, dict[str, object]]:
+        """
+        プロバイダーごとのHTTP接続プールの状態を返す
+
+        Returns:
+            dict[str, dict[str, object]]: プロバイダー名 → 状態
+                （http2, connections, idle_connections, requests）
+        """
+        return self._transport.describe()
+
+    async def warm_up(self) -> dict[str, bool]:
+        """
+        起動時のウォームアップ: 初回リクエストで生成されるオブジェクトを事前に生成し、
+        APIキーが設定されたプロバイダーへの接続を確立する
+
+        Returns:
+            dict[str, bool]: プロバイダー名 → 接続できたか
+        """
+        _provider_exception_types()
+        _retryable_exception_types()
+        for provider in self._initialized_providers():
+            self.circuit_breaker(provider)
+            self.concurrency_limiter(provider)
+            self._latency_window(provider)
+            self._call_metrics(provider, succeeded=True)
+            self._call_metrics(provider, succeeded=False)
+        return await self.warm_connections()
+
+    async def warm_connections(self, min_idle_seconds: float = 0.0) -> dict[str, bool]:
+        """
+        プロバイダーへの接続を確立する（接続プールのアイドル接続を補充する）
+
+        Args:
+            min_idle_seconds: 直近この秒数以内にリクエストを送信したプロバイダーは
+                              接続が保持されているため対象外とする（0の場合はすべて対象）
+
+        Returns:
+            dict[str, bool]: 対象のプロバイダー名 → 接続できたか
+        """
+        targets = {
+            provider: str(sdk_client.base_url)
+            for provider, sdk_client in self._initialized_providers().items()
+            if self._transport.idle_seconds(provider) >= min_idle_seconds
+        }
+        results = await asyncio.gather(
+            *(self._transport.warm(provider, url) for provider, url in targets.items())
+        )
+        return dict(zip(targets, results, strict=True))
+
+    def _initialized_providers(self) -> dict[str, object]:
+        """初期化済みのプロバイダー名 → SDKクライアント"""
+        clients = {"anthropic": self.anthropic_client, "openai": self.openai_client}
+        return {provider: client for provider, client in clients.items() if client is not None}
+
+    def _latency_window(self, provider: str) -> LatencyWindow:
+        """プロバイダーの応答時間ウィンドウを返す（未生成の場合は生成する）"""
+        window = self._latency.get(provider)
+        if window is None:
+            window = LatencyWindow(settings.AI_HEDGING_LATENCY_WINDOW)
+            self._latency[provider] = window
+        return window
+
+    def _hedge_delay(self, provider: str) -> float:
+        """
+        ヘッジ発火までの待ち時間（秒）を求める
+
+        直近の応答時間が AI_HEDGING_MIN_SAMPLES 件以上ある場合はその
+        AI_HEDGING_PERCENTILE パーセンタイル値、不足している場合は
+        AI_HEDGING_DEFAULT_DELAY_SECONDS を使い、AI_HEDGING_MIN_DELAY_SECONDS 以上に丸める
+        （平常時の応答にまでヘッジが発火し、課金が倍増するのを防ぐ）。
+        """
+        window = self._latency_window(provider)
+        delay = None
+        if len(window) >= settings.AI_HEDGING_MIN_SAMPLES:
+            delay = window.percentile(settings.AI_HEDGING_PERCENTILE)
+        if delay is None:
+            delay = settings.AI_HEDGING_DEFAULT_DELAY_SECONDS
+        return max(delay, settings.AI_HEDGING_MIN_DELAY_SECONDS)
+
+    async def _convert_hedged(
+        self,
+        input_text: str,
+        politeness_level: PolitenessLevel,
+        primary: str,
+        secondary: str,
+    ) -> tuple[str, int, str]:
+        """
+        ヘッジ付き変換（テールレイテンシ対策）
+
+        【実装方針】:
+          - まずプライマリへ送信し、_hedge_delay() 秒以内に完了すればその結果（例外を含む）を返す
+          - 完了しない場合はセカンダリへ同じプロンプトを送信し、先に成功した方を採用して
+            もう一方をキャンセルする（キャンセルにより不要な課金呼び出しを打ち切る）
+          - 両方が失敗した場合はプライマリの例外を送出する
+          - 呼び出し元がキャンセルされた場合も、実行中の呼び出しはすべてキャンセルする
+          - キャンセルした呼び出しは終了まで待つ（サーキットブレーカー・同時実行数制限の
+            後処理を返却前に終え、失敗した呼び出しの例外も回収する）
+        """
+        primary_task = asyncio.ensure_future(
+            self._convert_with(input_text, politeness_level, primary)
+        )
+        tasks = {primary_task}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary))
+            if done:
+                return primary_task.result()
+
+            self.hedged_calls += 1
+            logger.info(f"Hedging AI conversion: {primary} is slow, also sending to {secondary}")
+            tasks.add(
+                asyncio.ensure_future(self._convert_with(input_text, politeness_level, secondary))
+            )
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary_task:
+                            self.hedge_wins += 1
+                        return task.result()
+
+            # すべて失敗: プライマリの例外を優先して伝播する
+            return primary_task.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stream_convert_text(
+        self,
+        input_text: str,
+        politeness_level: PolitenessLevel,
+        provider: str | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        AI変換（ストリーミング）
+
+        【機能概要】: プロバイダーのストリーミングAPIを使用し、生成されたテキスト断片を
+                      順次返す。端末の読み上げを全文生成の完了前に開始できるようにする
+        【実装方針】:
+          - プロンプトは convert_text と同一（変換結果キャッシュを共有できる）
+          - ストリームの開始（接続確立）のみ _call_with_retry で再試行する
+            （断片を返し始めた後は再試行すると出力が重複するため再試行しない）
+          - AI_CALL_DEADLINE_SECONDS（端末のデッドラインの方が短い場合はその残り時間）を
+            ストリーム全体（開始〜最終断片）に適用し、超過時は AITimeoutException を送出する
+          - 終了時（正常終了・例外・呼び出し元の中断）は必ずストリームをクローズする
+          - プロバイダーの同時実行数制限の枠はストリームの終了まで保持し、結果（所要時間は
+            ストリーム全体）を上限の調整とサーキットブレーカーに記録する。サーキットが open の
+            場合は convert_text と同様にもう一方のプロバイダーへ切り替える
+            （実際に応答したプロバイダーは consume_served_provider() で取得できる）
+
+        Args:
+            input_text: 変換対象のテキスト
+            politeness_level: 丁寧さレベル
+            provider: 使用するプロバイダー（"anthropic" or "openai"）
+
+        Yields:
+            str: 変換後テキストの断片
+
+        Raises:
+            AIProviderException: 無効なプロバイダー指定時、APIキー未設定時
+            AITimeoutException: APIタイムアウト・デッドライン超過時
+            AIRateLimitException: レート制限超過時
+            AIConversionException: 空の出力、その他の変換エラー
+        """
+        provider = provider or settings.DEFAULT_AI_PROVIDER
+        if provider in SUPPORTED_PROVIDERS:
+            provider = self._route_around_open_circuit(provider)
+        prompt = self._build_conversion_prompt(input_text)
+        provider_label, open_stream, extract_delta = self._streaming_request(
+            provider, politeness_level, prompt
+        )
+
+        deadline = time.monotonic() + remaining_seconds(settings.AI_CALL_DEADLINE_SECONDS)
+        breaker = self.circuit_breaker(provider) if settings.AI_CIRCUIT_BREAKER_ENABLED else None
+        if breaker is not None and not breaker.acquire():
+            raise AIProviderException(f"{provider} circuit breaker is open")
+        _SERVED_PROVIDER.set(provider)
+
+        start_time = time.monotonic()
+        try:
+            # 同時実行数の枠はストリームの開始から終了（クローズ）まで保持する
+            async with (
+                self._concurrency_slot(provider, deadline),
+                aclosing(
+                    self._stream_deltas(
+                        provider, provider_label, open_stream, extract_delta, deadline
+                    )
+                ) as deltas,
+            ):
+                async for delta in deltas:
+                    yield delta
+        except (asyncio.CancelledError, GeneratorExit, AIProviderException):
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception as e:
+            if breaker is not None:
+                if _is_local_overload(e):
+                    breaker.release()
+                else:
+                    breaker.record_failure(time.monotonic() - start_time)
+            raise
+        if breaker is not None:
+            breaker.record_success(time.monotonic() - start_time)
+
+    async def _stream_deltas(
+        self,
+        provider: str,
+        provider_label: str,
+        open_stream: Callable[[], Awaitable[object]],
+        extract_delta: Callable[[object], str],
+        deadline: float,
+    ) -> AsyncIterator[str]:
+        """
+        ストリームを開始し、終了するまでテキスト断片を返す（終了時は必ずクローズする）
+
+        Args:
+            provider: AIプロバイダー名
+            provider_label: ログ用プロバイダー名
+            open_stream: ストリームを開始する 0 引数 callable
+            extract_delta: 断片抽出関数
+            deadline: ストリーム全体のデッドライン（time.monotonic() の値）
+
+        Yields:
+            str: 変換後テキストの断片
+        """
+        try:
+            # 同時実行数の枠は呼び出し元（stream_convert_text）が保持している
+            stream = await self._call_with_retry(
+                open_stream, provider=provider, limit_concurrency=False
+            )
+        except Exception as e:
+            logger.error(f"{provider_label} streaming API error: {e}")
+            raise _map_provider_exception(e, provider_label) from e
+
+        iterator = stream.__aiter__()
+        emitted = False
+        try:
+            while True:
+                try:
+                    event = await _next_stream_event(iterator, deadline - time.monotonic())
+                except StopAsyncIteration:
+                    break
+
+                _record_stream_usage(provider, event)
+                delta = extract_delta(event)
+                if delta:
+                    emitted = True
+                    yield delta
+
+            if not emitted:
+                raise AIConversionException(f"{provider_label} API returned empty stream")
+
+        except (
+            AIProviderException,
+            AITimeoutException,
+            AIRateLimitException,
+            AIConversionException,
+        ):
+            raise
+        except Exception as e:
+            logger.error(f"{provider_label} streaming API error: {e}")
+            raise _map_provider_exception(e, provider_label) from e
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                try:
+                    await close()
+                except Exception as e:  # クローズ失敗はログのみ（変換結果には影響しない）
+                    logger.warning(f"Failed to close {provider_label} stream: {e}")
+
+    def _streaming_request(
+        self, provider: str, politeness_level: PolitenessLevel, prompt: str
+    ) -> tuple[str, Callable[[], Awaitable[object]], Callable[[object], str]]:
+        """
+        プロバイダーごとのストリーミング呼び出しを組み立てる
+
+        Args:
+            provider: AIプロバイダー名
+            politeness_level: 丁寧さレベル
+            prompt: 送信するユーザーメッセージ
+
+        Returns:
+            (ログ用プロバイダー名, ストリームを開始する 0 引数 callable, 断片抽出関数)
+
+        Raises:
+            AIProviderException: 無効なプロバイダー指定時、APIキー未設定時
+        """
+        if provider == "anthropic":
+            if not self.anthropic_client:
+                raise AIProviderException("Anthropic API key is not configured")
+            request = self._anthropic_request(politeness_level, prompt, stream=True)
+            return (
+                "Claude",
+                lambda: self.anthropic_client.messages.create(**request),
+                _extract_anthropic_stream_delta,
+            )
+
+        if provider == "openai":
+            if not self.openai_client:
+                raise AIProviderException("OpenAI API key is not configured")
+            # 最後のチャンクで usage（キャッシュから読み込んだトークン数を含む）を受け取る
+            request = self._openai_request(
+                politeness_level,
+                prompt,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            return (
+                "OpenAI",
+                lambda: self.openai_client.chat.completions.create(**request),
+                _extract_openai_stream_delta,
+            )
+
+        raise AIProviderException(f"Unknown AI provider: {provider}")
 
     async def regenerate_text(
         self,
@@ -515,27 +1622,25 @@ class AIClient:
 
         start_time = time.time()
 
-        instruction = self._get_politeness_instruction(politeness_level)
-        prompt = f"""以下の日本語文を{instruction}
+        prompt = f"""以下の日本語文を変換してください。
 
 元の入力文: {input_text}
 前回の変換結果: {previous_result}
 
 前回と**異なる表現**で変換してください。意味は同じでも、言い回しを変えてください。
-変換後の文のみを出力してください。説明や追加情報は不要です。"""
+{_OUTPUT_SENTENCE_ONLY}"""
 
         try:
             if provider == "anthropic":
                 if not self.anthropic_client:
                     raise AIProviderException("Anthropic API key is not configured")
 
+                request = self._anthropic_request(politeness_level, prompt)
                 response = await self._call_with_retry(
-                    lambda: self.anthropic_client.messages.create(
-                        model=settings.ANTHROPIC_MODEL,
-                        max_tokens=1024,
-                        messages=[{"role": "user", "content": prompt}],
-                    )
+                    lambda: self.anthropic_client.messages.create(**request),
+                    provider="anthropic",
                 )
+                _record_usage("anthropic", getattr(response, "usage", None))
 
                 converted_text = _extract_anthropic_text(response)
 
@@ -543,20 +1648,13 @@ class AIClient:
                 if not self.openai_client:
                     raise AIProviderException("OpenAI API key is not configured")
 
+                # temperature を高めにして多様性を高める
+                request = self._openai_request(politeness_level, prompt, temperature=0.9)
                 response = await self._call_with_retry(
-                    lambda: self.openai_client.chat.completions.create(
-                        model=settings.OPENAI_MODEL,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "あなたは日本語の文章を適切な丁寧さレベルに変換する専門家です。",
-                            },
-                            {"role": "user", "content": prompt},
-                        ],
-                        max_tokens=1024,
-                        temperature=0.9,  # 多様性を高める
-                    )
+                    lambda: self.openai_client.chat.completions.create(**request),
+                    provider="openai",
                 )
+                _record_usage("openai", getattr(response, "usage", None))
 
                 converted_text = _extract_openai_text(response)
 
@@ -583,12 +1681,234 @@ class AIClient:
             logger.error(f"AI regeneration error: {e}")
             raise _map_provider_exception(e, "AI") from e
 
-    async def _call_with_retry(self, factory: Callable[[], Awaitable[_T]]) -> _T:
+    async def generate_variants(
+        self,
+        input_text: str,
+        politeness_level: PolitenessLevel,
+        count: int,
+        previous_result: str | None = None,
+        provider: str | None = None,
+    ) -> tuple[list[str], int]:
+        """
+        AI変換候補の一括生成（1回のAPI呼び出しで複数候補）
+
+        【機能概要】: 再変換（/regenerate）を繰り返す代わりに、互いに異なる変換候補を
+                      まとめて生成する。クライアントは追加の待ち時間なしに候補を切り替えられる
+        【実装方針】:
+          - OpenAI: n=count で1回の呼び出しから count 個の choices を得る
+          - Anthropic: count 個の候補をJSON配列で返すよう指示し、サーバー側で解釈する
+          - 表記ゆれを無視して重複除去し、previous_result と同じ候補も除外する
+          - 重複除去の結果、返却件数が count を下回る場合がある（最低1件）
+
+        Args:
+            input_text: 変換対象のテキスト
+            politeness_level: 丁寧さレベル
+            count: 生成する候補数
+            previous_result: 候補から除外する前回の変換結果（任意）
+            provider: 使用するプロバイダー（"anthropic" or "openai"）
+
+        Returns:
+            tuple[list[str], int]: (変換候補のリスト, 処理時間ミリ秒)
+
+        Raises:
+            AIProviderException: 無効なプロバイダー指定時
+            AITimeoutException: APIタイムアウト時
+            AIRateLimitException: レート制限超過時
+            AIConversionException: 有効な候補が1件も得られない場合、その他の変換エラー
+        """
+        provider = provider or settings.DEFAULT_AI_PROVIDER
+
+        start_time = time.time()
+
+        avoid_line = f"前回の変換結果: {previous_result}\n" if previous_result else ""
+
+        try:
+            if provider == "anthropic":
+                if not self.anthropic_client:
+                    raise AIProviderException("Anthropic API key is not configured")
+
+                prompt = f"""以下の日本語文を変換してください。
+
+入力文: {input_text}
+{avoid_line}
+意味は同じで言い回しが互いに異なる変換候補を{count}個作成してください。
+候補のみをJSON形式の文字列配列（例: ["候補1", "候補2"]）で出力してください。説明や追加情報は不要です。"""
+
+                request = self._anthropic_request(politeness_level, prompt)
+                response = await self._call_with_retry(
+                    lambda: self.anthropic_client.messages.create(**request),
+                    provider="anthropic",
+                )
+                _record_usage("anthropic", getattr(response, "usage", None))
+                candidates = _parse_variant_list(_extract_anthropic_text(response))
+
+            elif provider == "openai":
+                if not self.openai_client:
+                    raise AIProviderException("OpenAI API key is not configured")
+
+                prompt = f"""以下の日本語文を変換してください。
+
+入力文: {input_text}
+{avoid_line}
+{_OUTPUT_SENTENCE_ONLY}"""
+
+                # temperature を高めにして多様性を高める
+                request = self._openai_request(politeness_level, prompt, temperature=0.9, n=count)
+                response = await self._call_with_retry(
+                    lambda: self.openai_client.chat.completions.create(**request),
+                    provider="openai",
+                )
+                _record_usage("openai", getattr(response, "usage", None))
+                candidates = [
+                    content.strip()
+                    for choice in (getattr(response, "choices", None) or [])
+                    if isinstance(
+                        content := getattr(getattr(choice, "message", None), "content", None),
+                        str,
+                    )
+                ]
+
+            else:
+                raise AIProviderException(f"Unknown AI provider: {provider}")
+
+            variants = _dedupe_variants(candidates, exclude=previous_result)[:count]
+            if not variants:
+                raise AIConversionException("AI API returned no usable variants")
+
+            conversion_time_ms = int((time.time() - start_time) * 1000)
+
+            logger.info(
+                f"AI variants generated in {conversion_time_ms}ms: "
+                f"input_length={len(input_text)}, requested={count}, returned={len(variants)}"
+            )
+
+            return variants, conversion_time_ms
+
+        except (
+            AIProviderException,
+            AITimeoutException,
+            AIRateLimitException,
+            AIConversionException,
+        ):
+            raise
+        except Exception as e:
+            logger.error(f"AI variants error: {e}")
+            raise _map_provider_exception(e, "AI") from e
+
+    async def convert_texts_packed(
+        self,
+        input_texts: list[str],
+        politeness_level: PolitenessLevel,
+        provider: str | None = None,
+    ) -> tuple[list[str], int]:
+        """
+        複数テキストの一括AI変換（1回のAPI呼び出しで複数項目）
+
+        【機能概要】: 同じ丁寧さレベルの複数の入力文を1つのプロンプトにまとめて変換する。
+                      文字盤の定型文など短い項目が多い場合にAPI呼び出し回数を減らす
+        【実装方針】:
+          - 入力文に番号を付けて列挙し、同じ順序・同じ件数のJSON文字列配列で出力させる
+          - 応答の件数が入力と一致しない場合は AIConversionException とする
+            （呼び出し元は項目ごとの convert_text に切り替える）
+          - サーキットが open のプロバイダーは convert_text と同様に避ける
+          - 実際に応答したプロバイダーは consume_served_provider() で取得できる
+
+        Args:
+            input_texts: 変換対象のテキスト（1件以上）
+            politeness_level: 丁寧さレベル
+            provider: 使用するプロバイダー（"anthropic" or "openai"）
+
+        Returns:
+            tuple[list[str], int]: (入力と同じ順序の変換後テキスト, 処理時間ミリ秒)
+
+        Raises:
+            AIProviderException: 無効なプロバイダー指定時、APIキー未設定時
+            AITimeoutException: APIタイムアウト時
+            AIRateLimitException: レート制限超過時
+            AIConversionException: 応答を入力と対応付けられない場合、その他の変換エラー
+        """
+        provider = provider or settings.DEFAULT_AI_PROVIDER
+        if provider not in SUPPORTED_PROVIDERS:
+            raise AIProviderException(f"Unknown AI provider: {provider}")
+        provider = self._route_around_open_circuit(provider)
+
+        start_time = time.time()
+
+        numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(input_texts, start=1))
+        prompt = f"""以下の{len(input_texts)}個の日本語文をそれぞれ変換してください。
+
+入力文:
+{numbered}
+
+変換後の文を入力と同じ順序で{len(input_texts)}個、JSON形式の文字列配列（例: ["文1", "文2"]）で出力してください。説明や追加情報は不要です。"""
+        max_tokens = min(4096, 256 * len(input_texts))
+
+        try:
+            if provider == "anthropic":
+                if not self.anthropic_client:
+                    raise AIProviderException("Anthropic API key is not configured")
+
+                request = self._anthropic_request(politeness_level, prompt, max_tokens)
+                response = await self._call_with_retry(
+                    lambda: self.anthropic_client.messages.create(**request),
+                    provider="anthropic",
+                )
+                _record_usage("anthropic", getattr(response, "usage", None))
+                converted_texts = _parse_variant_list(_extract_anthropic_text(response))
+
+            else:
+                if not self.openai_client:
+                    raise AIProviderException("OpenAI API key is not configured")
+
+                request = self._openai_request(politeness_level, prompt, max_tokens)
+                response = await self._call_with_retry(
+                    lambda: self.openai_client.chat.completions.create(**request),
+                    provider="openai",
+                )
+                _record_usage("openai", getattr(response, "usage", None))
+                converted_texts = _parse_variant_list(_extract_openai_text(response))
+
+            if len(converted_texts) != len(input_texts):
+                raise AIConversionException(
+                    f"AI API returned {len(converted_texts)} results for "
+                    f"{len(input_texts)} packed inputs"
+                )
+
+            conversion_time_ms = int((time.time() - start_time) * 1000)
+
+            logger.info(
+                f"AI packed conversion completed in {conversion_time_ms}ms: "
+                f"items={len(input_texts)}, provider={provider}"
+            )
+
+            _SERVED_PROVIDER.set(provider)
+            return converted_texts, conversion_time_ms
+
+        except (
+            AIProviderException,
+            AITimeoutException,
+            AIRateLimitException,
+            AIConversionException,
+        ):
+            raise
+        except Exception as e:
+            logger.error(f"AI packed conversion error: {e}")
+            raise _map_provider_exception(e, "AI") from e
+
+    async def _call_with_retry(
+        self,
+        factory: Callable[[], Awaitable[_T]],
+        provider: str | None = None,
+        limit_concurrency: bool = True,
+    ) -> _T:
         """デッドライン・リトライ付き API 呼び出し。
 
         接続エラー（タイムアウトを除く）とレート制限エラーのみを
-        settings.AI_MAX_RETRIES 回まで指数バックオフで再試行する
+        settings.AI_MAX_RETRIES 回まで指数バックオフ（full jitter）で再試行する
         （settings.AI_MAX_RETRIES は「初回に加えて許容する再試行回数」）。
+        再試行はプロセス内で共有するリトライ予算（_retry_allowed）の範囲内でのみ行い、
+        予算を超える場合はその時点の例外を自プロセスの制限による打ち切りとして印を付けて
+        （_mark_local_overload）再 raise する。
         API タイムアウトやその他のリトライ対象外の例外は即座に伝播させる。
         リトライを使い切った場合は最後の例外を再 raise し、呼び出し元の
         ``except Exception`` ブロックに処理させる。
@@ -596,12 +1916,21 @@ class AIClient:
         呼び出し全体（初回 + 全リトライ試行）に settings.AI_CALL_DEADLINE_SECONDS の
         デッドラインを設ける。フロントエンド（Dio）のconnect/receiveタイムアウト
         （各10秒）と整合させ、クライアントが待受を諦めた後もバックエンドがAI APIへの
-        課金呼び出しを継続する事態を防ぐ。デッドライン超過時は「timeout」を含む
+        課金呼び出しを継続する事態を防ぐ。端末がデッドライン（X-Request-Deadline-Ms）を
+        指定した場合は、その残り時間が短ければそちらを適用し、既に期限切れの場合は
+        呼び出さない。デッドライン超過時は「timeout」を含む
         メッセージの TimeoutError を送出し、呼び出し元の _map_provider_exception に
         より AITimeoutException（504）へマッピングされる。
 
+        provider を指定した場合は、各試行をプロバイダーの同時実行数制限
+        （_call_limited）の枠内で実行し、呼び出し全体の所要時間とリトライ回数を
+        メトリクス（app.utils.metrics）に記録する。
+
         Args:
             factory: 呼び出しごとに新しい awaitable を返す 0 引数 callable。
+            provider: 呼び出し先のプロバイダー名（メトリクスのラベル）。
+            limit_concurrency: False の場合は各試行で同時実行数の枠を確保しない
+                （呼び出し元が _concurrency_slot で枠を保持している場合）。
 
         Returns:
             API レスポンス。
@@ -611,30 +1940,173 @@ class AIClient:
             またはデッドライン超過時の TimeoutError。
         """
 
+        budget = remaining_seconds(settings.AI_CALL_DEADLINE_SECONDS)
+        if budget <= 0:
+            raise TimeoutError("AI call timeout: client deadline already exceeded")
+        retries = 0
+        deadline = time.monotonic() + budget
+        self.retry_budget.record_request()
+
         async def _run_with_retries() -> _T:
+            nonlocal retries
             total_attempts = 1 + max(0, settings.AI_MAX_RETRIES)
             last_exc: BaseException | None = None
 
             for attempt in range(total_attempts):
                 try:
-                    return await factory()
+                    return await self._call_limited(factory, provider, deadline, limit_concurrency)
                 except Exception as exc:
                     if not _is_retryable_exception(exc):
                         raise
                     last_exc = exc
                     if attempt < total_attempts - 1:
-                        await asyncio.sleep(0.5 * (2**attempt))
+                        if not self._retry_allowed(provider):
+                            _mark_local_overload(exc)
+                            raise
+                        retries += 1
+                        await asyncio.sleep(_backoff_delay(attempt))
 
             raise last_exc  # type: ignore[misc]
 
+        start = time.perf_counter()
+        succeeded = False
         try:
-            return await asyncio.wait_for(
-                _run_with_retries(), timeout=settings.AI_CALL_DEADLINE_SECONDS
-            )
+            result = await asyncio.wait_for(_run_with_retries(), timeout=budget)
+            succeeded = True
+            return result
         except asyncio.TimeoutError as exc:
-            raise TimeoutError(
-                f"AI call timeout: deadline of {settings.AI_CALL_DEADLINE_SECONDS}s exceeded"
-            ) from exc
+            raise TimeoutError(f"AI call timeout: deadline of {budget:g}s exceeded") from exc
+        finally:
+            if provider is not None:
+                duration, retry_count = self._call_metrics(provider, succeeded)
+                duration.observe(time.perf_counter() - start)
+                retry_count.observe(retries)
+
+    def _retry_allowed(self, provider: str | None) -> bool:
+        """リトライ予算の範囲内か判定する（予算を超えた場合は拒否した回数を記録する）"""
+        if not settings.AI_RETRY_BUDGET_ENABLED or self.retry_budget.try_acquire_retry():
+            return True
+        metrics.ai_retry_budget_denied.labels(provider or "unknown").inc()
+        logger.warning("Retry budget exhausted; not retrying %s call", provider or "AI")
+        return False
+
+    async def _call_limited(
+        self,
+        factory: Callable[[], Awaitable[_T]],
+        provider: str | None,
+        deadline: float,
+        limit_concurrency: bool = True,
+    ) -> _T:
+        """プロバイダーの同時実行数制限の枠内で1回呼び出し、結果を上限の調整に反映する。
+
+        呼び出し前にプロバイダーのレート制限予算を予約する（_wait_for_rate_limit_budget）。
+        枠は処理中のリクエストの優先度（app.utils.request_priority）の順に割り当てられる。
+        枠を得られない（デッドラインまでに完了する見込みがない・待ち行列が満杯）場合は
+        プロバイダーを呼び出さずに AILocalOverloadException を送出する。レート制限は上限を大きく、
+        タイムアウトは応答時間の悪化として上限を小さく減らす。その他の例外とキャンセルは
+        上限の調整に使わない。
+
+        Args:
+            factory: 呼び出しごとに新しい awaitable を返す 0 引数 callable。
+            provider: 呼び出し先のプロバイダー名（None または制限が無効な場合は制限しない）。
+            deadline: 呼び出し全体のデッドライン（time.monotonic() の値）。
+            limit_concurrency: False の場合は同時実行数の枠を確保しない
+                （呼び出し元が _concurrency_slot で枠を保持している場合）。
+
+        Returns:
+            API レスポンス。
+        """
+        if provider is None:
+            return await factory()
+        if settings.AI_RATE_LIMIT_BUDGET_ENABLED:
+            await self._wait_for_rate_limit_budget(provider, deadline)
+        if not limit_concurrency:
+            return await factory()
+        async with self._concurrency_slot(provider, deadline):
+            return await factory()
+
+    @asynccontextmanager
+    async def _concurrency_slot(self, provider: str, deadline: float) -> AsyncIterator[None]:
+        """プロバイダーの同時実行数制限の枠を確保し、ブロックの結果を上限の調整に反映する。
+
+        ストリーミングのように呼び出しの開始後も処理が続く場合は、完了までこの枠を保持する。
+        枠を得られない場合は AILocalOverloadException を送出する。自プロセスの制限による
+        打ち切り（_is_local_overload）・キャンセルは上限の調整に使わない。
+
+        Args:
+            provider: 呼び出し先のプロバイダー名。
+            deadline: 呼び出し全体のデッドライン（time.monotonic() の値）。
+        """
+        if not settings.AI_CONCURRENCY_LIMIT_ENABLED:
+            yield
+            return
+
+        limiter = self.concurrency_limiter(provider)
+        try:
+            acquired_at = await limiter.acquire(deadline, current_priority())
+        except ConcurrencyLimitExceeded as exc:
+            raise AILocalOverloadException(str(exc)) from exc
+
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            timeout_types, _ = _provider_exception_types()
+            if _is_local_overload(exc):
+                limiter.release(acquired_at)
+            elif _is_rate_limit_exception(exc):
+                limiter.record_rate_limited(acquired_at)
+            elif isinstance(exc, AITimeoutException) or (
+                timeout_types and isinstance(exc, timeout_types)
+            ):
+                limiter.record_timeout(acquired_at)
+            else:
+                limiter.release(acquired_at)
+            raise
+        except BaseException:
+            limiter.release(acquired_at)
+            raise
+        limiter.record_success(acquired_at, time.perf_counter() - start)
+
+    async def _wait_for_rate_limit_budget(self, provider: str, deadline: float) -> None:
+        """レート制限予算を予約し、枯渇しそうな場合は回復するまで待つ。
+
+        待ち時間が settings.AI_RATE_LIMIT_MAX_WAIT_SECONDS またはデッドラインまでの
+        残り時間を超える場合は、429 になる見込みの呼び出しを送らずに
+        AILocalOverloadException を送出する。
+
+        Args:
+            provider: 呼び出し先のプロバイダー名。
+            deadline: 呼び出し全体のデッドライン（time.monotonic() の値）。
+        """
+        max_wait = min(settings.AI_RATE_LIMIT_MAX_WAIT_SECONDS, deadline - time.monotonic())
+        wait = self.rate_limit_budget(provider).reserve(
+            settings.AI_RATE_LIMIT_ESTIMATED_TOKENS, max_wait
+        )
+        if wait is None:
+            metrics.ai_rate_limit_pacing.labels(provider, "rejected").inc()
+            raise AILocalOverloadException(f"{provider} rate limit budget exhausted")
+        if wait > 0:
+            metrics.ai_rate_limit_pacing.labels(provider, "paced").inc()
+            await asyncio.sleep(wait)
+
+    def _call_metrics(
+        self, provider: str, succeeded: bool
+    ) -> tuple[metrics.HistogramChild, metrics.HistogramChild]:
+        """プロバイダー呼び出しのメトリクス（所要時間・リトライ回数）を返す"""
+        key = (provider, succeeded)
+        bound = self._bound_call_metrics.get(key)
+        if bound is None:
+            bound = (
+                metrics.ai_provider_call_duration.labels(
+                    provider,
+                    model_for_provider(provider),
+                    "success" if succeeded else "error",
+                ),
+                metrics.ai_provider_call_retries.labels(provider),
+            )
+            self._bound_call_metrics[key] = bound
+        return bound
 
     async def aclose(self) -> None:
         """保持しているHTTPクライアントを明示的にクローズする。
@@ -651,14 +2123,18 @@ class AIClient:
             finally:
                 self._anthropic_http_client = None
 
-        if self.openai_client is not None:
-            close = getattr(self.openai_client, "close", None)
+        # 未生成のクライアントは生成せずに済ませる
+        if self._openai_client not in (None, _NOT_BUILT):
+            close = getattr(self._openai_client, "close", None)
             if callable(close):
                 try:
                     await close()
                 except Exception as e:
                     logger.warning(f"Failed to close OpenAI client: {e}")
 
+        # SDKに渡した接続プールをまとめてクローズする（クローズ済みのものは何もしない）
+        await self._transport.aclose()
+
 
 # シングルトンインスタンス
 ai_client = AIClient()
@@ -0,0 +1,175 @@
+"""
+サーキットブレーカーモジュール
+
+【機能概要】: AIプロバイダーごとの障害を検知し、障害中のプロバイダーへの呼び出しを即座に
+              遮断する（リトライとデッドライン待ちでワーカーの接続を占有し続けることを防ぐ）
+【実装方針】:
+  - 状態は closed（通常）/ open（遮断）/ half_open（試行）の3つ
+  - closed: 直近の呼び出し結果をローリングウィンドウに記録し、最小件数以上で
+    エラー率または低速呼び出し率がしきい値以上になったら open に遷移する
+  - open: 一定時間（open_seconds）すべての呼び出しを拒否し、経過後に half_open に遷移する
+  - half_open: 同時に half_open_max_calls 件までの試行を許可し、試行が成功すれば closed、
+    失敗（または低速）なら再び open に遷移する
+  - open 中に完了した呼び出し（遮断前に開始したもの）の結果は判定に使わない
+  - イベントループ上でのみ操作されるためロックは不要
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """サーキットブレーカーの状態"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    """サーキットブレーカーの判定パラメータ"""
+
+    # 判定に使う直近の呼び出し件数
+    window_size: int = 20
+    # 判定を行う最小の呼び出し件数（これ未満では open にしない）
+    min_calls: int = 5
+    # open に遷移するエラー率（0.0〜1.0）
+    failure_rate_threshold: float = 0.5
+    # 低速とみなす所要時間（秒）
+    slow_call_seconds: float = 8.0
+    # open に遷移する低速呼び出し率（0.0〜1.0）
+    slow_call_rate_threshold: float = 0.8
+    # open を維持する時間（秒）
+    open_seconds: float = 30.0
+    # half_open 中に同時に許可する試行数
+    half_open_max_calls: int = 1
+
+
+class CircuitBreaker:
+    """プロバイダー1つ分のサーキットブレーカー"""
+
+    def __init__(self, name: str, config: CircuitBreakerConfig) -> None:
+        self.name = name
+        self.config = config
+        self._state = CircuitState.CLOSED
+        # (失敗したか, 低速だったか) のローリングウィンドウ
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=max(1, config.window_size))
+        self._opened_at = 0.0
+        self._trial_calls = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """現在の状態（open の維持時間が経過していれば half_open に遷移する）"""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.config.open_seconds
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def allows_requests(self) -> bool:
+        """呼び出しを受け付けられる状態か（状態の参照のみで試行枠は消費しない）"""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN:
+            return self._trial_calls < max(1, self.config.half_open_max_calls)
+        return False
+
+    def acquire(self) -> bool:
+        """
+        呼び出しの許可を得る
+
+        Returns:
+            bool: 呼び出してよい場合True（half_open 中は試行枠を1つ消費する）。
+                  True を受け取った呼び出し元は、結果に応じて record_success /
+                  record_failure / release のいずれかを必ず1回呼び出すこと。
+        """
+        if not self.allows_requests:
+            return False
+        if self._state is CircuitState.HALF_OPEN:
+            self._trial_calls += 1
+        return True
+
+    def record_success(self, duration_seconds: float) -> None:
+        """成功した呼び出しを記録する（低速な成功は half_open の判定では失敗扱い）"""
+        self._record(failed=False, slow=duration_seconds >= self.config.slow_call_seconds)
+
+    def record_failure(self, duration_seconds: float) -> None:
+        """失敗した呼び出しを記録する"""
+        self._record(failed=True, slow=duration_seconds >= self.config.slow_call_seconds)
+
+    def release(self) -> None:
+        """結果を判定に使わずに許可を返却する（呼び出しのキャンセル時など）"""
+        if self._state is CircuitState.HALF_OPEN and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    def reset(self) -> None:
+        """closed 状態に戻し、記録をすべて破棄する"""
+        self._transition(CircuitState.CLOSED)
+
+    def describe(self) -> dict[str, object]:
+        """ヘルスチェック用に状態と直近の判定値を返す"""
+        failure_rate, slow_call_rate = self._rates()
+        return {
+            "state": self.state.value,
+            "calls": len(self._outcomes),
+            "failure_rate": round(failure_rate, 4),
+            "slow_call_rate": round(slow_call_rate, 4),
+        }
+
+    def _record(self, *, failed: bool, slow: bool) -> None:
+        state = self.state
+        if state is CircuitState.OPEN:
+            # 遮断前に開始した呼び出しの結果は判定に使わない
+            return
+
+        if state is CircuitState.HALF_OPEN:
+            if self._trial_calls > 0:
+                self._trial_calls -= 1
+            if failed or slow:
+                self._transition(CircuitState.OPEN)
+            else:
+                self._transition(CircuitState.CLOSED)
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.config.min_calls:
+            return
+        failure_rate, slow_call_rate = self._rates()
+        if (
+            failure_rate >= self.config.failure_rate_threshold
+            or slow_call_rate >= self.config.slow_call_rate_threshold
+        ):
+            self._transition(CircuitState.OPEN)
+
+    def _rates(self) -> tuple[float, float]:
+        if not self._outcomes:
+            return 0.0, 0.0
+        total = len(self._outcomes)
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        return failures / total, slow_calls / total
+
+    def _transition(self, new_state: CircuitState) -> None:
+        if new_state is not self._state:
+            log = logger.warning if new_state is CircuitState.OPEN else logger.info
+            log(
+                "Circuit breaker for %s: %s -> %s",
+                self.name,
+                self._state.value,
+                new_state.value,
+            )
+        self._state = new_state
+        self._trial_calls = 0
+        if new_state is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        elif new_state is CircuitState.CLOSED:
+            self._outcomes.clear()
@@ -0,0 +1,244 @@
+"""
+適応的同時実行数制限モジュール
+
+【機能概要】: AIプロバイダーごとに同時に実行するAPI呼び出し数を制限し、その上限を
+              プロバイダーの応答（レート制限・応答時間）に応じて自動で調整する
+              （過負荷のプロバイダーに呼び出しとリトライを送り続けて悪化させることを防ぐ）
+【実装方針】:
+  - 上限は AIMD で調整する。成功した呼び出しごとに 1/上限 ずつ増やし（上限分の呼び出しが
+    成功するとおよそ1増える）、レート制限（429）を受けたら rate_limit_backoff 倍、
+    応答時間の悪化（基準応答時間の latency_tolerance 倍超、またはタイムアウト）を
+    検知したら latency_backoff 倍に減らす
+  - 基準応答時間は、応答時間の最小値を少しずつ直近の値に近づけたもの（Vegas方式の
+    「混雑していないときの応答時間」の近似）
+  - 同じ過負荷で同時に失敗した呼び出しによって上限が何度も縮まないよう、上限を減らすのは
+    前回減らした時点より後に開始した呼び出しの結果を受けた場合のみとする
+  - 上限に達している場合は呼び出しを待ち行列に入れ、空いた枠は優先度（値が小さいほど先）、
+    同じ優先度の中ではデッドラインの早い順に割り当てる（デッドラインのない呼び出しは最後、
+    同じデッドラインは到着順）
+  - デッドラインまでに呼び出しが完了する見込みがない（残り時間が基準応答時間未満になる）
+    場合と、待ち行列が満杯の場合は ConcurrencyLimitExceeded を送出する。待ち行列の中で
+    見込みがなくなった呼び出しも、枠を割り当てる時点で取り除いて同じ例外で終了させる
+  - 使われていない枠を根拠に上限が増え続けないよう、上限を増やすのは
+    上限の半分以上が使われているとき（または待ち行列があるとき）のみとする
+  - イベントループ上でのみ操作されるためロックは不要
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import NoReturn
+
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# 基準応答時間を直近の応答時間に近づける割合（プロバイダーの恒常的な応答時間の変化に追従する）
+_BASELINE_DRIFT = 0.01
+
+
+class ConcurrencyLimitExceeded(Exception):  # noqa: N818
+    """同時実行数の上限に達しており、デッドラインまでに呼び出しを開始できない"""
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimiterConfig:
+    """同時実行数の調整パラメータ"""
+
+    # 初期の上限
+    initial_limit: int = 8
+    # 上限の下限・上限
+    min_limit: int = 1
+    max_limit: int = 64
+    # レート制限を受けたときに上限に掛ける係数
+    rate_limit_backoff: float = 0.5
+    # 応答時間の悪化を検知したときに上限に掛ける係数
+    latency_backoff: float = 0.9
+    # 基準応答時間の何倍を超えたら悪化とみなすか
+    latency_tolerance: float = 2.5
+    # 応答時間の悪化を判定する最小のサンプル数
+    min_latency_samples: int = 10
+    # 待ち行列に入れられる呼び出し数の上限
+    max_queue: int = 100
+
+
+@dataclass(order=True)
+class _Waiter:
+    """待ち行列の呼び出し（優先度・デッドライン・到着順で並べる）"""
+
+    priority: int
+    deadline: float
+    sequence: int
+    future: "asyncio.Future[None]" = field(compare=False)
+
+
+class AdaptiveConcurrencyLimiter:
+    """プロバイダー1つ分の適応的な同時実行数制限"""
+
+    def __init__(self, name: str, config: ConcurrencyLimiterConfig) -> None:
+        self.name = name
+        self.config = config
+        self._limit = float(min(max(config.initial_limit, config.min_limit), config.max_limit))
+        self._in_flight = 0
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+        self._baseline: float | None = None
+        self._samples = 0
+        self._last_decrease_at = float("-inf")
+        self._queue_wait = metrics.ai_concurrency_queue_wait.labels(name)
+
+    @property
+    def limit(self) -> int:
+        """現在の同時実行数の上限"""
+        return max(self.config.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """実行中の呼び出し数"""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """待ち行列の呼び出し数"""
+        return len(self._waiters)
+
+    async def acquire(self, deadline: float | None = None, priority: int = 0) -> float:
+        """
+        呼び出しの枠を得る（上限に達している場合は空くまで待つ）
+
+        Args:
+            deadline: 呼び出しを完了させる期限（time.monotonic() の値。Noneの場合は無期限に待つ）
+            priority: 優先度（値が小さいほど先に枠を割り当てる）
+
+        Returns:
+            float: 枠を得た時刻（time.monotonic() の値）。受け取った呼び出し元は、結果に応じて
+                   record_success / record_rate_limited / record_timeout / release の
+                   いずれかにこの値を渡して必ず1回呼び出すこと
+
+        Raises:
+            ConcurrencyLimitExceeded: 待ち行列が満杯の場合、またはデッドラインまでに
+                                      呼び出しを完了できる見込みがない場合
+        """
+        if self._in_flight < self.limit and not self.queue_depth:
+            self._in_flight += 1
+            return time.monotonic()
+        if self.queue_depth >= self.config.max_queue:
+            self._reject("queue is full")
+
+        budget = None
+        if deadline is not None:
+            budget = deadline - time.monotonic() - (self._baseline or 0.0)
+            if budget <= 0:
+                self._reject("deadline would be exceeded")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = _Waiter(
+            priority, math.inf if deadline is None else deadline, next(self._sequence), waiter
+        )
+        heapq.heappush(self._waiters, entry)
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout=budget)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            self._discard(entry)
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # 枠の割り当てとタイムアウト（キャンセル）が重なった場合は枠を返す
+                self.release(queued_at)
+            if isinstance(exc, asyncio.TimeoutError):
+                self._reject("deadline would be exceeded")
+            raise
+        finally:
+            self._queue_wait.observe(time.monotonic() - queued_at)
+        return time.monotonic()
+
+    def record_success(self, acquired_at: float, duration_seconds: float) -> None:
+        """成功した呼び出しを記録して枠を返す（応答時間が悪化していれば上限を減らす）"""
+        utilized = self._in_flight * 2 >= self.limit or bool(self.queue_depth)
+        self._in_flight -= 1
+        if self._observe_latency(duration_seconds):
+            self._decrease(acquired_at, self.config.latency_backoff, "latency")
+        elif utilized:
+            self._limit = min(float(self.config.max_limit), self._limit + 1 / self._limit)
+        self._wake()
+
+    def record_rate_limited(self, acquired_at: float) -> None:
+        """レート制限を受けた呼び出しを記録して枠を返す"""
+        self._in_flight -= 1
+        self._decrease(acquired_at, self.config.rate_limit_backoff, "rate limit")
+        self._wake()
+
+    def record_timeout(self, acquired_at: float) -> None:
+        """タイムアウトした呼び出しを記録して枠を返す（応答時間の悪化として扱う）"""
+        self._in_flight -= 1
+        self._decrease(acquired_at, self.config.latency_backoff, "timeout")
+        self._wake()
+
+    def release(self, acquired_at: float) -> None:
+        """結果を上限の調整に使わずに枠を返す（その他のエラーやキャンセル時など）"""
+        self._in_flight -= 1
+        self._wake()
+
+    def describe(self) -> dict[str, int]:
+        """ヘルスチェック用に上限・実行中の呼び出し数・待ち行列の長さを返す"""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+        }
+
+    def _observe_latency(self, duration_seconds: float) -> bool:
+        """応答時間を基準応答時間に反映し、悪化しているか（基準の許容倍率超か）を返す"""
+        duration = max(0.0, duration_seconds)
+        baseline = self._baseline
+        self._samples += 1
+        if baseline is None or duration < baseline:
+            self._baseline = duration
+            return False
+        self._baseline = baseline + (duration - baseline) * _BASELINE_DRIFT
+        return (
+            self._samples >= self.config.min_latency_samples
+            and duration > baseline * self.config.latency_tolerance
+        )
+
+    def _decrease(self, acquired_at: float, factor: float, reason: str) -> None:
+        if acquired_at < self._last_decrease_at:
+            # 前回上限を減らす前に開始した呼び出し（同じ過負荷による失敗）
+            return
+        previous = self.limit
+        self._limit = max(float(self.config.min_limit), self._limit * factor)
+        self._last_decrease_at = time.monotonic()
+        if self.limit != previous:
+            logger.warning(
+                "Concurrency limit for %s: %d -> %d (%s)", self.name, previous, self.limit, reason
+            )
+
+    def _wake(self) -> None:
+        now = time.monotonic()
+        while self._waiters and self._in_flight < self.limit:
+            entry = heapq.heappop(self._waiters)
+            if entry.future.done():
+                continue
+            if entry.deadline - now < (self._baseline or 0.0):
+                # 今から呼び出してもデッドラインまでに完了する見込みがない
+                entry.future.set_exception(self._rejection("deadline would be exceeded"))
+                continue
+            entry.future.set_result(None)
+            self._in_flight += 1
+
+    def _discard(self, entry: _Waiter) -> None:
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+
+    def _reject(self, reason: str) -> NoReturn:
+        raise self._rejection(reason)
+
+    def _rejection(self, reason: str) -> ConcurrencyLimitExceeded:
+        metrics.ai_concurrency_rejections.labels(self.name).inc()
+        return ConcurrencyLimitExceeded(
+            f"{self.name} concurrency limit ({self.limit}) reached: {reason}"
+        )
@@ -0,0 +1,301 @@
+"""
+AI変換結果キャッシュモジュール
+
+【機能概要】: 同一入力・同一丁寧さレベルのAI変換結果を再利用し、AI API呼び出し
+              （1〜3秒の往復と課金）を省略する
+【実装方針】:
+  - キャッシュキーは (正規化した入力文字列, 丁寧さレベル, プロバイダー, モデル,
+    プロンプトバージョン) から生成したSHA-256ハッシュ（入力文字列を平文でキーに残さない）
+  - 既定はプロセス内メモリ（LRU + TTL）。CONVERSION_CACHE_STORAGE_URI に
+    RATE_LIMIT_STORAGE_URI と同形式のURI（例: "redis://host:6379"）を指定すると
+    ワーカー/インスタンス間で共有するストレージを使用する
+  - キャッシュの障害（Redis接続断等）は変換処理を妨げない（ミスとして扱い警告ログのみ）
+  - ヒット/ミス件数を保持し、ヘルスチェックから節約効果を確認できるようにする
+"""
+
+import asyncio
+import hashlib
+import importlib
+import logging
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 共有ストレージ（Redis）操作1回あたりの許容時間（秒）。
+# キャッシュはあくまで高速化のための仕組みであり、ストレージの遅延が変換応答を
+# 遅らせないよう短い上限で打ち切ってミス扱いにする。
+SHARED_STORAGE_TIMEOUT_SECONDS: float = 0.5
+
+# 共有ストレージに保存する際のキー接頭辞（他用途のキーとの衝突防止）
+SHARED_STORAGE_KEY_PREFIX = "kotonoha:conversion:"
+
+# 共有ストレージとして解釈するURIスキーム
+_REDIS_SCHEMES = ("redis://", "rediss://", "unix://")
+
+
+def normalize_input_text(text: str) -> str:
+    """キャッシュキー用に入力文字列を正規化する。
+
+    NFKC正規化で全角/半角の表記ゆれを吸収し、連続する空白を1つにまとめて
+    前後の空白を除去する。変換結果に影響しない差異だけを吸収する。
+
+    Args:
+        text: 入力文字列
+
+    Returns:
+        str: 正規化後の文字列
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def build_cache_key(
+    input_text: str,
+    politeness_level: str,
+    provider: str,
+    model: str,
+    prompt_version: str,
+) -> str:
+    """変換結果キャッシュのキーを生成する。
+
+    プロバイダー・モデル・プロンプトバージョンをキーに含めることで、
+    設定変更やプロンプト改訂の後に古い変換結果が返らないようにする。
+
+    Args:
+        input_text: 入力文字列（正規化前）
+        politeness_level: 丁寧さレベル
+        provider: AIプロバイダー名
+        model: モデル名
+        prompt_version: プロンプトバージョン
+
+    Returns:
+        str: 64文字の16進数文字列（SHA-256）
+    """
+    material = "\x1f".join(
+        (normalize_input_text(input_text), politeness_level, provider, model, prompt_version)
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """キャッシュのヒット/ミス統計"""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率（0.0〜1.0、参照がない場合は0.0）"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, int | float]:
+        """統計を辞書形式で返す（ヒット率を含む）"""
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class ConversionCache(ABC):
+    """
+    AI変換結果キャッシュの基底クラス
+
+    【機能概要】: 統計の記録と障害の吸収を共通化し、保存先ごとの処理をサブクラスに委ねる
+    【実装方針】: サブクラスは `_get` `_set` `_clear` を実装する。公開メソッドは
+                  例外を送出せず、失敗時はミスとして扱う。
+    """
+
+    backend_name = "base"
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> str | None:
+        """キャッシュから変換結果を取得する（失敗時・未登録時はNone）"""
+        try:
+            value = await self._get(key)
+        except Exception:
+            self.stats.errors += 1
+            self.stats.misses += 1
+            logger.warning("Conversion cache lookup failed (%s)", self.backend_name, exc_info=True)
+            return None
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """変換結果をキャッシュに保存する（失敗しても例外を送出しない）"""
+        try:
+            await self._set(key, value)
+        except Exception:
+            self.stats.errors += 1
+            logger.warning("Conversion cache store failed (%s)", self.backend_name, exc_info=True)
+            return
+        self.stats.stores += 1
+
+    async def clear(self) -> None:
+        """保存済みの変換結果と統計をすべて破棄する"""
+        await self._clear()
+        self.stats = CacheStats()
+
+    def describe(self) -> dict[str, object]:
+        """ヘルスチェック用にバックエンド名と統計を返す"""
+        return {"backend": self.backend_name, **self.stats.as_dict()}
+
+    @abstractmethod
+    async def _get(self, key: str) -> str | None:
+        """キーに対応する変換結果を返す（存在しない・期限切れの場合は None）"""
+
+    @abstractmethod
+    async def _set(self, key: str, value: str) -> None:
+        """変換結果を保存する"""
+
+    @abstractmethod
+    async def _clear(self) -> None:
+        """保存済みの変換結果をすべて破棄する"""
+
+
+class InMemoryConversionCache(ConversionCache):
+    """
+    プロセス内メモリのLRU + TTLキャッシュ
+
+    【実装方針】: OrderedDictで参照順を管理し、上限件数を超えたら最も古く参照された
+                  エントリから破棄する。期限切れエントリは参照時に破棄する。
+                  イベントループ上でのみ操作されるためロックは不要。
+    """
+
+    backend_name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        super().__init__()
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def _set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisConversionCache(ConversionCache):
+    """
+    共有ストレージ（Redis）のTTLキャッシュ
+
+    【実装方針】: 有効期限はRedisのEXに委ね、件数上限はRedis側のmaxmemory-policyで管理する。
+                  操作は SHARED_STORAGE_TIMEOUT_SECONDS で打ち切る。
+    """
+
+    backend_name = "redis"
+
+    def __init__(self, storage_uri: str, ttl_seconds: float) -> None:
+        super().__init__()
+        redis_asyncio = importlib.import_module("redis.asyncio")
+        self.ttl_seconds = ttl_seconds
+        self._client = redis_asyncio.from_url(storage_uri, decode_responses=True)
+
+    async def _get(self, key: str) -> str | None:
+        return await asyncio.wait_for(
+            self._client.get(SHARED_STORAGE_KEY_PREFIX + key),
+            timeout=SHARED_STORAGE_TIMEOUT_SECONDS,
+        )
+
+    async def _set(self, key: str, value: str) -> None:
+        await asyncio.wait_for(
+            self._client.set(
+                SHARED_STORAGE_KEY_PREFIX + key, value, ex=max(1, int(self.ttl_seconds))
+            ),
+            timeout=SHARED_STORAGE_TIMEOUT_SECONDS,
+        )
+
+    async def _clear(self) -> None:
+        async for key in self._client.scan_iter(match=SHARED_STORAGE_KEY_PREFIX + "*"):
+            await self._client.delete(key)
+
+
+class ConversionCacheStorageError(RuntimeError):
+    """変換結果キャッシュのストレージ構築に失敗した場合の例外。
+
+    CONVERSION_CACHE_STORAGE_URIが未対応のスキームであったり、スキームが要求する
+    依存パッケージがインストールされていない場合に送出する。
+    """
+
+
+def resolve_cache_storage_uri() -> str | None:
+    """設定値から変換結果キャッシュのストレージURIを解決する。
+
+    settings.CONVERSION_CACHE_STORAGE_URI が空文字列（デフォルト）の場合は None を返し、
+    プロセス内メモリを使用させる。
+
+    Returns:
+        str | None: ストレージURI（未設定時はNone）。
+    """
+    return settings.CONVERSION_CACHE_STORAGE_URI or None
+
+
+def _build_conversion_cache(storage_uri: str | None) -> ConversionCache:
+    """ストレージURIに応じた変換結果キャッシュを構築する。
+
+    Args:
+        storage_uri: resolve_cache_storage_uri()で解決したURI
+            （Noneまたは"memory://"の場合はプロセス内メモリ）。
+
+    Returns:
+        ConversionCache: 構築されたキャッシュ。
+
+    Raises:
+        ConversionCacheStorageError: 未対応スキーム、または依存パッケージ不足の場合。
+    """
+    ttl_seconds = settings.CONVERSION_CACHE_TTL_SECONDS
+    if storage_uri is None or storage_uri.startswith("memory://"):
+        return InMemoryConversionCache(settings.CONVERSION_CACHE_MAX_ENTRIES, ttl_seconds)
+
+    if storage_uri.startswith(_REDIS_SCHEMES):
+        try:
+            return RedisConversionCache(storage_uri, ttl_seconds)
+        except Exception as exc:
+            message = (
+                "変換結果キャッシュのストレージ初期化に失敗しました "
+                f"(CONVERSION_CACHE_STORAGE_URI={storage_uri!r})。"
+                "'redis'パッケージのインストール状況とURIの形式を確認してください。"
+            )
+            logger.error(message, exc_info=exc)
+            raise ConversionCacheStorageError(message) from exc
+
+    message = (
+        "変換結果キャッシュのストレージURIのスキームが未対応です "
+        f"(CONVERSION_CACHE_STORAGE_URI={storage_uri!r})。"
+        "memory:// または redis:// 系のURIを指定してください。"
+    )
+    logger.error(message)
+    raise ConversionCacheStorageError(message)
+
+
+# 変換結果キャッシュのインスタンス
+conversion_cache = _build_conversion_cache(resolve_cache_storage_uri())
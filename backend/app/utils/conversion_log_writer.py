@@ -0,0 +1,225 @@
+"""
+AI変換ログ一括書き込みモジュール
+
+【機能概要】: AI変換ログ（ai_conversion_logs）をプロセス内のキューに積み、バックグラウンドの
+              書き込みタスクがまとめて1回の複数行INSERTで書き込む。リクエストごとの
+              セッション取得・INSERT・refresh・commit（接続プールの占有とDB往復）を省く
+【実装方針】:
+  - キューは上限付き（CONVERSION_LOG_QUEUE_MAX_SIZE）。上限に達した場合は新しいログを
+    破棄して件数のみ記録する（DB障害時にメモリを使い切らず、変換処理も妨げない）
+  - 書き込みタスクは CONVERSION_LOG_BATCH_SIZE 件たまるか、最初の1件から
+    CONVERSION_LOG_FLUSH_INTERVAL_MS ミリ秒経過した時点でまとめて書き込む
+  - 書き込みの失敗・タイムアウトは警告ログと件数の記録のみとし、再試行しない
+    （ログは変換結果の返却後に記録される補助情報のため）
+  - アプリの lifespan で start / stop する。stop はキューに残ったログを書き込んでから終了する
+  - 開始していない場合（テストの ASGITransport 等 lifespan を経由しない場合）は
+    running が False となり、呼び出し元は従来どおり1件ずつ書き込む
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.crud.crud_ai_conversion import ConversionLogEntry, bulk_create_conversion_logs
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# メトリクス（キュー名 "conversion_logs" で事前に取得しておく）
+_QUEUE_LATENCY = metrics.log_queue_latency.labels("conversion_logs")
+_WRITE_FAILURES = metrics.log_write_failures.labels("conversion_logs")
+_DROPPED = metrics.log_dropped.labels("conversion_logs")
+
+# 一括書き込み1回あたりの許容時間（秒）。
+# 接続プール待ちやcommitのハングで書き込みタスクが無期限に止まることを防ぐ。
+WRITE_TIMEOUT_SECONDS: float = 5.0
+
+# 停止時にキューの残りを書き込むまで待つ時間の上限（秒）
+STOP_TIMEOUT_SECONDS: float = 10.0
+
+# 書き込みタスクに停止を伝える番兵
+_STOP = object()
+
+
+@dataclass
+class ConversionLogWriterStats:
+    """一括書き込みの累計件数"""
+
+    # キューに積んだ件数
+    enqueued: int = 0
+    # DBに書き込んだ件数
+    written: int = 0
+    # キューが上限に達したため破棄した件数
+    dropped: int = 0
+    # 書き込みの失敗・タイムアウトで失われた件数
+    failed: int = 0
+    # 一括書き込みの回数
+    batches: int = 0
+
+
+class ConversionLogWriter:
+    """AI変換ログのバッファ付き一括書き込み"""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[object] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._batch_size = 1
+        self._flush_interval = 0.0
+        self.stats = ConversionLogWriterStats()
+
+    @property
+    def running(self) -> bool:
+        """書き込みタスクが動作中か（False の場合、呼び出し元は直接書き込む）"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        """キューで書き込みを待っている件数"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """
+        書き込みタスクを開始する（動作中の場合は何もしない）
+
+        Args:
+            session_factory: 書き込みごとに独立したセッションを生成するファクトリ
+        """
+        if self.running:
+            return
+        self._batch_size = max(1, settings.CONVERSION_LOG_BATCH_SIZE)
+        self._flush_interval = max(0, settings.CONVERSION_LOG_FLUSH_INTERVAL_MS) / 1000
+        self._queue = asyncio.Queue(maxsize=max(1, settings.CONVERSION_LOG_QUEUE_MAX_SIZE))
+        self._task = asyncio.create_task(
+            self._run(self._queue, session_factory), name="conversion-log-writer"
+        )
+
+    async def stop(self) -> None:
+        """キューに残ったログを書き込んでから書き込みタスクを停止する"""
+        task, queue = self._task, self._queue
+        if task is None or queue is None:
+            return
+        try:
+            if not task.done():
+                await asyncio.wait_for(queue.put(_STOP), timeout=STOP_TIMEOUT_SECONDS)
+                await asyncio.wait_for(asyncio.shield(task), timeout=STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Conversion log writer did not finish within %ss; dropping %d pending entries.",
+                STOP_TIMEOUT_SECONDS,
+                queue.qsize(),
+            )
+            task.cancel()
+        finally:
+            self._task = None
+            self._queue = None
+
+    def submit(self, entry: ConversionLogEntry) -> bool:
+        """
+        ログをキューに積む（待たずに戻る）
+
+        Args:
+            entry: 書き込むログエントリ
+
+        Returns:
+            bool: キューに積めた場合True。動作中でない場合、またはキューが上限に
+                  達していて破棄した場合はFalse
+        """
+        if not self.running or self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait((time.monotonic(), entry))
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            _DROPPED.inc()
+            # 障害中に大量の警告を出さないよう、破棄が始まった時点と以降100件ごとに記録する
+            if self.stats.dropped % 100 == 1:
+                logger.warning(
+                    "Conversion log queue is full; dropped %d entries so far.",
+                    self.stats.dropped,
+                )
+            return False
+        self.stats.enqueued += 1
+        return True
+
+    async def _run(
+        self,
+        queue: "asyncio.Queue[object]",
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        while True:
+            batch, oldest_enqueued_at, stopping = await self._next_batch(queue)
+            if batch:
+                await self._write(session_factory, batch, oldest_enqueued_at)
+            if stopping:
+                return
+
+    async def _next_batch(
+        self, queue: "asyncio.Queue[object]"
+    ) -> tuple[list[ConversionLogEntry], float, bool]:
+        """
+        次に書き込むログをまとめて取り出す
+
+        Returns:
+            tuple[list[ConversionLogEntry], float, bool]:
+                (書き込むログ, 先頭のログをキューに積んだ時刻, 停止が要求されたか)
+        """
+        first = await queue.get()
+        if first is _STOP:
+            return [], 0.0, True
+
+        oldest_enqueued_at, first_entry = first  # type: ignore[misc]
+        batch: list[ConversionLogEntry] = [first_entry]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._flush_interval
+        while len(batch) < self._batch_size:
+            remaining = deadline - loop.time()
+            try:
+                if remaining > 0:
+                    item = await asyncio.wait_for(queue.get(), timeout=remaining)
+                else:
+                    item = queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+            if item is _STOP:
+                return batch, oldest_enqueued_at, True
+            batch.append(item[1])  # type: ignore[index]
+        return batch, oldest_enqueued_at, False
+
+    async def _write(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch: list[ConversionLogEntry],
+        oldest_enqueued_at: float,
+    ) -> None:
+        """ログを1回の複数行INSERTで書き込む（失敗時は警告ログのみ）"""
+
+        async def _write_batch() -> None:
+            session = session_factory()
+            try:
+                await bulk_create_conversion_logs(session, batch)
+                await session.commit()
+            finally:
+                await session.close()
+
+        try:
+            await asyncio.wait_for(_write_batch(), timeout=WRITE_TIMEOUT_SECONDS)
+        except Exception:
+            self.stats.failed += len(batch)
+            _WRITE_FAILURES.inc(len(batch))
+            logger.warning(
+                "Failed to write %d AI conversion logs; dropping these log entries.",
+                len(batch),
+                exc_info=True,
+            )
+            return
+        self.stats.written += len(batch)
+        self.stats.batches += 1
+        _QUEUE_LATENCY.observe(time.monotonic() - oldest_enqueued_at)
+
+
+# シングルトンインスタンス
+conversion_log_writer = ConversionLogWriter()
@@ -0,0 +1,229 @@
+"""
+エラーログ非同期書き込みモジュール
+
+【機能概要】: 例外ハンドラーが記録するエラーログ（error_logs）をメモリ上に溜め、
+              バックグラウンドタスクが一定間隔でまとめて書き込む。例外ハンドラーは
+              DB書き込みを待たずにエラー応答を返せる（DB障害時に応答が遅くなることを防ぐ）
+【実装方針】:
+  - ERROR_LOG_FLUSH_INTERVAL_SECONDS ごとに、溜まったログを1回の複数行INSERTで書き込む
+  - 同じ (エラータイプ, エンドポイント, HTTPメソッド, エラーコード) のログは1回の書き込み間隔
+    あたり ERROR_LOG_SAMPLES_PER_INTERVAL 件まで記録し、それを超えた分は件数のみ数えて
+    「同種のエラーを省略した」旨の1行にまとめる（障害時の同一エラーの大量発生への対策）
+  - 溜めるログは ERROR_LOG_BUFFER_MAX_ENTRIES 件までとし、超過分は破棄して件数のみ記録する
+  - 書き込みの失敗・タイムアウトは警告ログと件数の記録のみとし、再試行しない
+  - アプリの lifespan で start / stop する。stop は溜まっているログを書き込んでから終了する
+  - 開始していない場合は submit が False を返し、呼び出し元は従来どおり直接書き込む
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, replace
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.crud.crud_error_log import ErrorLogEntry, bulk_create_error_logs
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# メトリクス（キュー名 "error_logs" で事前に取得しておく）
+_QUEUE_LATENCY = metrics.log_queue_latency.labels("error_logs")
+_WRITE_FAILURES = metrics.log_write_failures.labels("error_logs")
+_DROPPED = metrics.log_dropped.labels("error_logs")
+
+# 一括書き込み1回あたりの許容時間（秒）
+WRITE_TIMEOUT_SECONDS: float = 5.0
+
+# 停止時に残りのログを書き込むまで待つ時間の上限（秒）
+STOP_TIMEOUT_SECONDS: float = 10.0
+
+# エラーメッセージの最大文字数（app.core.exceptions の制限と同じ）
+_MAX_ERROR_MESSAGE_LENGTH = 500
+
+_ErrorKey = tuple[str, str | None, str | None, str | None]
+
+
+@dataclass
+class ErrorLogSinkStats:
+    """エラーログ書き込みの累計件数"""
+
+    # 書き込み対象として受け付けた件数
+    accepted: int = 0
+    # 同種のエラーとして省略した件数
+    suppressed: int = 0
+    # 溜めるログの上限を超えたため破棄した件数
+    dropped: int = 0
+    # DBに書き込んだ行数（省略件数をまとめた行を含む）
+    written: int = 0
+    # 書き込みの失敗・タイムアウトで失われた行数
+    failed: int = 0
+
+
+class ErrorLogSink:
+    """エラーログのバッファ付き一括書き込み"""
+
+    def __init__(self) -> None:
+        self._entries: list[ErrorLogEntry] = []
+        # 書き込みを待っているうち最も古いログ（省略した同種のエラーを含む）を受け付けた時刻
+        # （書き込み待ちのログがない場合はNone）
+        self._oldest_at: float | None = None
+        # 今回の書き込み間隔で受け付けた件数（同種のエラーごと）
+        self._counts: dict[_ErrorKey, int] = {}
+        # 今回の書き込み間隔で省略した件数と、省略したうち最後のログ（同種のエラーごと）
+        self._suppressed: dict[_ErrorKey, tuple[ErrorLogEntry, int]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._stop_event: asyncio.Event | None = None
+        self.stats = ErrorLogSinkStats()
+
+    @property
+    def running(self) -> bool:
+        """書き込みタスクが動作中か"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        """書き込みを待っている件数"""
+        return len(self._entries)
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """
+        書き込みタスクを開始する（動作中の場合は何もしない）
+
+        Args:
+            session_factory: 書き込みごとに独立したセッションを生成するファクトリ
+        """
+        if self.running:
+            return
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(
+            self._run(session_factory, self._stop_event), name="error-log-sink"
+        )
+
+    async def stop(self) -> None:
+        """溜まっているログを書き込んでから書き込みタスクを停止する"""
+        task, stop_event = self._task, self._stop_event
+        if task is None or stop_event is None:
+            return
+        stop_event.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Error log sink did not finish within %ss; dropping %d pending entries.",
+                STOP_TIMEOUT_SECONDS,
+                len(self._entries),
+            )
+            task.cancel()
+        finally:
+            self._task = None
+            self._stop_event = None
+
+    def submit(self, entry: ErrorLogEntry) -> bool:
+        """
+        エラーログを書き込み対象に加える（待たずに戻る）
+
+        Args:
+            entry: 書き込むエラーログ
+
+        Returns:
+            bool: 受け付けた場合True（同種のエラーとして省略した場合・上限超過で破棄した場合を
+                  含む）。動作中でない場合はFalse（呼び出し元が直接書き込む）
+        """
+        if not self.running:
+            return False
+
+        if self._oldest_at is None:
+            self._oldest_at = time.monotonic()
+        key = (entry.error_type, entry.endpoint, entry.http_method, entry.error_code)
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        if count > max(1, settings.ERROR_LOG_SAMPLES_PER_INTERVAL):
+            _, suppressed = self._suppressed.get(key, (entry, 0))
+            self._suppressed[key] = (entry, suppressed + 1)
+            self.stats.suppressed += 1
+            return True
+
+        if len(self._entries) >= max(1, settings.ERROR_LOG_BUFFER_MAX_ENTRIES):
+            self.stats.dropped += 1
+            _DROPPED.inc()
+            return True
+
+        self._entries.append(entry)
+        self.stats.accepted += 1
+        return True
+
+    async def flush(self, session_factory: async_sessionmaker[AsyncSession]) -> int:
+        """
+        溜まっているログを1回の複数行INSERTで書き込む（失敗時は警告ログのみ）
+
+        Args:
+            session_factory: 独立したセッションを生成するファクトリ
+
+        Returns:
+            int: 書き込んだ行数
+        """
+        oldest_at = self._oldest_at
+        entries = self._take_entries()
+        if not entries or oldest_at is None:
+            return 0
+
+        async def _write() -> None:
+            session = session_factory()
+            try:
+                await bulk_create_error_logs(session, entries)
+                await session.commit()
+            finally:
+                await session.close()
+
+        try:
+            await asyncio.wait_for(_write(), timeout=WRITE_TIMEOUT_SECONDS)
+        except Exception:
+            self.stats.failed += len(entries)
+            _WRITE_FAILURES.inc(len(entries))
+            logger.warning(
+                "Failed to write %d error logs to database; dropping these log entries.",
+                len(entries),
+                exc_info=True,
+            )
+            return 0
+        self.stats.written += len(entries)
+        _QUEUE_LATENCY.observe(time.monotonic() - oldest_at)
+        return len(entries)
+
+    def _take_entries(self) -> list[ErrorLogEntry]:
+        """書き込むログを取り出し、今回の書き込み間隔の記録と最も古いログの時刻をリセットする"""
+        entries = self._entries
+        for entry, suppressed in self._suppressed.values():
+            message = f"[{suppressed} similar errors suppressed] {entry.error_message}"
+            entries.append(
+                replace(
+                    entry,
+                    error_message=message[:_MAX_ERROR_MESSAGE_LENGTH],
+                    stack_trace=None,
+                )
+            )
+        self._entries = []
+        self._counts = {}
+        self._suppressed = {}
+        self._oldest_at = None
+        return entries
+
+    async def _run(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        stop_event: asyncio.Event,
+    ) -> None:
+        interval = max(0.01, settings.ERROR_LOG_FLUSH_INTERVAL_SECONDS)
+        while not stop_event.is_set():
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                await self.flush(session_factory)
+        # 停止要求時に残っているログを書き込む
+        await self.flush(session_factory)
+
+
+# シングルトンインスタンス
+error_log_sink = ErrorLogSink()
@@ -115,6 +115,17 @@ class AIRateLimitException(AIConversionException):
         AppException.__init__(self, message, status_code=429)
 
 
+class AILocalOverloadException(AIRateLimitException):
+    """
+    【機能概要】: AI呼び出しの自プロセス側での打ち切り例外
+    【実装方針】: 同時実行数制限・レート制限予算によりプロバイダーを呼び出さずに
+                  打ち切った場合に使用する。応答は AIRateLimitException と同じだが、
+                  プロバイダーの障害ではないためサーキットブレーカーの判定には含めない
+
+    HTTPステータスコード: 429 Too Many Requests
+    """
+
+
 class AIProviderException(AIConversionException):
     """
     【機能概要】: AIプロバイダーエラー例外
@@ -126,3 +137,16 @@ class AIProviderException(AIConversionException):
 
     def __init__(self, message: str = "AI provider error") -> None:
         AppException.__init__(self, message, status_code=503)
+
+
+class ClientDisconnectedException(AppException):
+    """
+    【機能概要】: クライアント切断例外
+    【実装方針】: 応答前に端末が接続を切断し、処理中のAI API呼び出しを中止した場合に使用
+                  （応答は端末に届かないため、ログ・メトリクス上で区別するためのもの）
+
+    HTTPステータスコード: 499 Client Closed Request
+    """
+
+    def __init__(self, message: str = "Client disconnected") -> None:
+        super().__init__(message, status_code=499)
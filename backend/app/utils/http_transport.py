@@ -0,0 +1,180 @@
+"""
+AI API用HTTPトランスポート管理モジュール
+
+【機能概要】: Anthropic / OpenAI のSDKクライアントに渡す httpx.AsyncClient を生成・保持し、
+              接続プールの上限、キープアライブ、HTTP/2 を設定ファイルから一元的に調整する
+【実装方針】:
+  - プロバイダーごとに1つの httpx.AsyncClient（= 1つの接続プール）を初回要求時に生成し、
+    以降は同じクライアントを再利用する（バースト時に毎回TLS接続を張り直さない）
+  - HTTP/2 は h2 パッケージが利用可能な場合のみ有効にし、未インストールの場合は
+    警告ログを出して HTTP/1.1 で接続する
+  - クライアントのクローズは所有者（AIClient.aclose）から aclose() で行う
+  - 接続プールの状態（接続数・アイドル接続数・送信リクエスト数）をプロバイダーごとに返す
+  - warm() は認証不要の軽量なリクエストでTLS接続を確立し、接続プールに保持させる
+    （起動時のウォームアップと、アイドル接続が切れないようにするキープウォームで使用）
+  - on_response を指定した場合は、プロバイダーからの応答ごとに（本文の受信前に）
+    プロバイダー名と応答を渡して呼び出す（レート制限ヘッダーの読み取りに使用）
+  - httpx はクライアントの初回生成時に読み込む（アプリのimport時間を増やさない）
+"""
+
+import importlib.util
+import logging
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import httpcore
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 に必要な h2 パッケージがインストールされているか"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPTransportManager:
+    """プロバイダーごとの httpx.AsyncClient（接続プール）の生成・統計・クローズ"""
+
+    def __init__(self, on_response: Callable[[str, "httpx.Response"], None] | None = None) -> None:
+        self._on_response = on_response
+        self._clients: dict[str, "httpx.AsyncClient"] = {}
+        self._http2: dict[str, bool] = {}
+        # プロバイダーごとの送信リクエスト数と、最後に送信した時刻
+        self._requests: dict[str, int] = {}
+        self._last_used: dict[str, float] = {}
+
+    def client_for(self, provider: str, timeout: float) -> "httpx.AsyncClient":
+        """
+        プロバイダー用の httpx.AsyncClient を返す（初回のみ生成する）
+
+        Args:
+            provider: プロバイダー名（"anthropic" / "openai"）
+            timeout: 1試行あたりのタイムアウト秒数
+
+        Returns:
+            httpx.AsyncClient: 接続プールの設定を適用したクライアント
+        """
+        client = self._clients.get(provider)
+        if client is not None and not client.is_closed:
+            return client
+
+        import httpx
+
+        use_http2 = settings.AI_HTTP2_ENABLED
+        if use_http2 and not http2_available():
+            logger.warning(
+                "AI_HTTP2_ENABLED is set but the h2 package is not installed; "
+                "using HTTP/1.1 for %s.",
+                provider,
+            )
+            use_http2 = False
+
+        self._requests[provider] = 0
+        self._last_used[provider] = time.monotonic()
+
+        async def _count_request(request: "httpx.Request") -> None:
+            self._requests[provider] = self._requests.get(provider, 0) + 1
+            self._last_used[provider] = time.monotonic()
+
+        event_hooks: dict[str, list[Callable]] = {"request": [_count_request]}
+        on_response = self._on_response
+        if on_response is not None:
+
+            async def _observe_response(response: "httpx.Response") -> None:
+                on_response(provider, response)
+
+            event_hooks["response"] = [_observe_response]
+
+        client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            http2=use_http2,
+            event_hooks=event_hooks,
+        )
+        self._clients[provider] = client
+        self._http2[provider] = use_http2
+        return client
+
+    def idle_seconds(self, provider: str) -> float:
+        """
+        プロバイダーへ最後にリクエストを送信してからの経過秒数を返す
+
+        Args:
+            provider: プロバイダー名
+
+        Returns:
+            float: 経過秒数（クライアント未生成の場合は無限大）
+        """
+        if provider not in self._clients:
+            return float("inf")
+        return time.monotonic() - self._last_used.get(provider, 0.0)
+
+    async def warm(self, provider: str, url: str) -> bool:
+        """
+        軽量なHEADリクエストを送信し、プロバイダーへの接続を確立しておく
+
+        応答のステータスコードは問わない（認証エラー等でも接続は接続プールに残る）。
+
+        Args:
+            provider: プロバイダー名（client_for で生成済みであること）
+            url: 接続先のURL（SDKクライアントの base_url）
+
+        Returns:
+            bool: 接続できた場合True（クライアント未生成・接続失敗はFalse）
+        """
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            return False
+        import httpx
+
+        try:
+            await client.head(url)
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to warm {provider} connection: {e}")
+            return False
+        return True
+
+    def describe(self) -> dict[str, dict[str, object]]:
+        """
+        プロバイダーごとの接続プールの状態を返す
+
+        Returns:
+            dict[str, dict[str, object]]: プロバイダー名 → 状態
+                （http2, connections, idle_connections, requests）
+        """
+        stats: dict[str, dict[str, object]] = {}
+        for provider, client in self._clients.items():
+            connections = _pool_connections(client)
+            stats[provider] = {
+                "http2": self._http2.get(provider, False),
+                "connections": len(connections),
+                "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+                "requests": self._requests.get(provider, 0),
+            }
+        return stats
+
+    async def aclose(self) -> None:
+        """生成したすべてのクライアントをクローズする（失敗はログのみ）"""
+        clients, self._clients = self._clients, {}
+        for provider, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:  # クローズ失敗はログのみ（shutdownを阻害しない）
+                logger.warning(f"Failed to close {provider} HTTP client: {e}")
+
+
+def _pool_connections(
+    client: "httpx.AsyncClient",
+) -> list["httpcore.AsyncConnectionInterface"]:
+    """クライアントの接続プールが保持している接続の一覧を返す（取得できない場合は空）"""
+    pool = getattr(client._transport, "_pool", None)
+    return list(getattr(pool, "connections", ()))
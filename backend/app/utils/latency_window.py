@@ -0,0 +1,45 @@
+"""
+レイテンシ計測ウィンドウ
+
+【機能概要】: 直近N件の所要時間を保持し、パーセンタイルを求める
+【実装方針】: 固定長のdequeで古いサンプルから破棄する。サンプル数は数百件程度を想定し、
+              パーセンタイルは参照のたびにソートして最近傍順位法で求める。
+              イベントループ上でのみ操作されるためロックは不要。
+"""
+
+import math
+from collections import deque
+
+
+class LatencyWindow:
+    """直近の所要時間（秒）のローリングウィンドウ"""
+
+    def __init__(self, max_samples: int) -> None:
+        self._samples: deque[float] = deque(maxlen=max(1, max_samples))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """所要時間を1件記録する（負値は0として扱う）"""
+        self._samples.append(max(0.0, seconds))
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        パーセンタイル値を返す
+
+        Args:
+            percent: パーセンタイル（0〜100）
+
+        Returns:
+            float | None: 所要時間（秒）。サンプルがない場合はNone
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = math.ceil(min(max(percent, 0.0), 100.0) / 100 * len(ordered))
+        return ordered[max(rank, 1) - 1]
+
+    def clear(self) -> None:
+        """保持しているサンプルをすべて破棄する"""
+        self._samples.clear()
@@ -0,0 +1,165 @@
+"""
+ローカル変換モジュール
+
+【機能概要】: 定型句や短い依頼文など、決まった変換で十分な入力をAI APIを呼び出さずに
+              辞書と語尾の規則で変換する（数秒かかるAI変換をマイクロ秒単位で返す）
+【実装方針】:
+  - 変換結果には確信度（0.0〜1.0）を付け、呼び出し側が
+    LOCAL_CONVERSION_MIN_CONFIDENCE 以上の場合だけ採用する（それ以外はAIで変換する）
+  - 定型句辞書との完全一致は確信度 1.0、語尾の規則による変換はより低い確信度とする
+  - 辞書はいずれかの丁寧さレベルの表記に一致すれば引けるようにする
+    （「ありがとうございます」を casual 指定で「ありがとう」に戻す等）
+  - 判断に迷う入力（疑問文・読点や空白を含む文・長い文）は変換せずAIに任せる
+"""
+
+import re
+from dataclasses import dataclass
+
+from app.utils.conversion_cache import normalize_input_text
+
+# 定型句の各丁寧さレベルの表記 (casual, normal, polite)。
+# 文脈によって意味が変わる語（「すみません」等）は含めない。
+PHRASES: tuple[tuple[str, str, str], ...] = (
+    ("ありがとう", "ありがとうございます", "誠にありがとうございます"),
+    ("おはよう", "おはようございます", "おはようございます"),
+    ("こんにちは", "こんにちは", "こんにちは"),
+    ("こんばんは", "こんばんは", "こんばんは"),
+    ("おやすみ", "おやすみなさい", "おやすみなさいませ"),
+    ("ごめん", "ごめんなさい", "申し訳ございません"),
+    ("はい", "はい", "はい"),
+    ("いいえ", "いいえ", "いいえ"),
+    ("わかった", "わかりました", "承知いたしました"),
+    ("わからない", "わかりません", "わかりかねます"),
+    ("大丈夫", "大丈夫です", "問題ございません"),
+    ("よろしく", "よろしくお願いします", "よろしくお願いいたします"),
+    ("お願い", "お願いします", "お願いいたします"),
+    ("いってきます", "いってきます", "行ってまいります"),
+    ("ただいま", "ただいま", "ただいま戻りました"),
+    ("おかえり", "おかえりなさい", "おかえりなさいませ"),
+    ("いただきます", "いただきます", "いただきます"),
+    ("ごちそうさま", "ごちそうさまでした", "ごちそうさまでした"),
+    ("痛い", "痛いです", "痛みがあります"),
+    ("寒い", "寒いです", "寒く感じます"),
+    ("暑い", "暑いです", "暑く感じます"),
+    ("眠い", "眠いです", "眠気があります"),
+    ("疲れた", "疲れました", "疲れてしまいました"),
+    ("お腹すいた", "お腹がすきました", "お腹がすいてまいりました"),
+    ("トイレに行きたい", "トイレに行きたいです", "お手洗いに行かせていただけますか"),
+    ("ちょっと待って", "少し待ってください", "少々お待ちいただけますか"),
+    ("もう一回言って", "もう一度言ってください", "もう一度おっしゃっていただけますか"),
+    ("助けて", "助けてください", "助けていただけますか"),
+    ("手伝って", "手伝ってください", "お手伝いいただけますか"),
+    ("来て", "来てください", "来ていただけますか"),
+)
+
+# 丁寧さレベル → PHRASES の列番号
+LEVEL_INDEX: dict[str, int] = {"casual": 0, "normal": 1, "polite": 2}
+
+# 確信度
+PHRASE_CONFIDENCE = 1.0
+# 「名詞 + ほしい / ください」（名詞をそのまま埋め込むだけの変換）
+NOUN_REQUEST_CONFIDENCE = 0.9
+# 「動詞て形」の依頼（て形の判定が表記に依存し、「困って」等の依頼でない文も
+# 一致するため、既定の閾値では採用されない値にする）
+TE_FORM_REQUEST_CONFIDENCE = 0.8
+
+# 規則の対象とする名詞・動詞句（空白・句読点・助詞の混ざった長い句は対象外）
+# （「行ってほしい」「見てください」等の動詞て形は名詞として扱わない）
+_NOUN = r"(?P<noun>[ぁ-んァ-ー一-鿿]{1,8}?)(?<![てで])"
+_NOUN_WANT = re.compile(_NOUN + r"(?:が|を)?(?:ほしい|欲しい)(?:です)?")
+_NOUN_PLEASE = re.compile(_NOUN + r"(?:を)?(?:ください|下さい|ちょうだい)")
+# 名詞として扱わない句:
+#   - お/ご + 動詞の連用形（「お待ち」「お休み」等。「お待ちください」は依頼ではなく勧め）
+#   - 名詞ではない定型の句（「ご覧」「ごめん」）
+#   - 疑問詞で始まる句（「何がほしい」は依頼ではなく質問）
+_NOT_A_NOUN = re.compile(
+    r"[おご][一-鿿]+[ぁ-ん]+|ご覧|ご免|ごめん"
+    r"|(?:何|なに|なん|どれ|どこ|どっち|どちら|どの|どんな|いつ|いくつ|いくら|誰|だれ).*"
+)
+_TE_FORM = re.compile(
+    r"(?P<verb>[一-鿿]{1,3}[ぁ-ん]{0,3}?(?:って|いて|いで|んで|して|えて|べて|けて|めて|れて))"
+    r"(?:ください|下さい)?"
+)
+
+# 規則の適用対象とする語尾に付いた句読点・記号
+_TRAILING_MARKS = "。．.！!"
+
+
+@dataclass(frozen=True)
+class LocalConversion:
+    """ローカル変換の結果"""
+
+    converted_text: str
+    confidence: float
+    # 適用した規則（"phrase", "noun_want", "noun_please", "te_form"）
+    rule: str
+
+
+def _strip_trailing_marks(text: str) -> str:
+    return text.rstrip(_TRAILING_MARKS)
+
+
+def _noun_match(pattern: re.Pattern[str], text: str) -> re.Match[str] | None:
+    """名詞の依頼の規則に一致し、名詞の部分が名詞として扱える場合のみ一致を返す"""
+    match = pattern.fullmatch(text)
+    if match is None or _NOT_A_NOUN.fullmatch(match["noun"]):
+        return None
+    return match
+
+
+class LocalConverter:
+    """定型句辞書と語尾の規則によるローカル変換エンジン"""
+
+    def __init__(self, phrases: tuple[tuple[str, str, str], ...] = PHRASES) -> None:
+        # いずれかのレベルの表記 → 全レベルの表記
+        self._phrases: dict[str, tuple[str, str, str]] = {}
+        for forms in phrases:
+            for form in forms:
+                self._phrases.setdefault(form, forms)
+
+    def convert(self, input_text: str, politeness_level: str) -> LocalConversion | None:
+        """
+        入力文字列をローカルで変換する
+
+        Args:
+            input_text: 入力文字列
+            politeness_level: 丁寧さレベル（casual, normal, polite）
+
+        Returns:
+            LocalConversion | None: 変換結果（ローカルで変換できない場合はNone）
+        """
+        index = LEVEL_INDEX.get(politeness_level)
+        if index is None:
+            return None
+        text = _strip_trailing_marks(normalize_input_text(input_text))
+        if not text or " " in text or "、" in text:
+            return None
+
+        forms = self._phrases.get(text)
+        if forms is not None:
+            return LocalConversion(forms[index], PHRASE_CONFIDENCE, "phrase")
+        return self._convert_by_rules(text, index)
+
+    def _convert_by_rules(self, text: str, index: int) -> LocalConversion | None:
+        match = _noun_match(_NOUN_WANT, text)
+        if match:
+            noun = match["noun"]
+            forms = (f"{noun}がほしい", f"{noun}がほしいです", f"{noun}をいただけますか")
+            return LocalConversion(forms[index], NOUN_REQUEST_CONFIDENCE, "noun_want")
+
+        match = _noun_match(_NOUN_PLEASE, text)
+        if match:
+            noun = match["noun"]
+            forms = (f"{noun}ちょうだい", f"{noun}をください", f"{noun}をいただけますか")
+            return LocalConversion(forms[index], NOUN_REQUEST_CONFIDENCE, "noun_please")
+
+        match = _TE_FORM.fullmatch(text)
+        if match:
+            verb = match["verb"]
+            forms = (verb, f"{verb}ください", f"{verb}いただけますか")
+            return LocalConversion(forms[index], TE_FORM_REQUEST_CONFIDENCE, "te_form")
+        return None
+
+
+# シングルトンインスタンス
+local_converter = LocalConverter()
@@ -0,0 +1,385 @@
+"""
+メトリクスモジュール
+
+【機能概要】: Prometheusのテキスト形式（text/plain; version=0.0.4）で公開するカウンタと
+              ヒストグラムを提供し、リクエスト・AIプロバイダー呼び出し・ログ書き込み・
+              DB接続プールの所要時間を計測する
+【実装方針】:
+  - 追加の依存パッケージを使わない最小限の実装（Counter / Histogram のみ）
+  - ラベル値の組ごとの子メトリクスは初回に生成してキャッシュし、以降は同じオブジェクトを
+    再利用する。計測箇所では事前に取得した子メトリクスを保持し、リクエストごとに
+    ラベルの辞書を生成しない
+  - イベントループ（および同期コード）から操作される単純な加算のみで、ロックは使わない
+    （GILにより値が壊れることはなく、計測値のわずかな取りこぼしは許容する）
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from typing import TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# 所要時間（秒）のヒストグラムの既定バケット
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# リトライ回数のヒストグラムのバケット
+RETRY_COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5)
+
+# 類似度（0.0〜1.0）のヒストグラムのバケット
+SIMILARITY_BUCKETS: tuple[float, ...] = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 1.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    """ラベル値の組ごとに子メトリクスを保持するメトリクスの基底クラス"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str) -> object:
+        """ラベル値に対応する子メトリクスを返す（初回のみ生成する）"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects {len(self.labelnames)} label values, got {len(values)}"
+                )
+            child = self._new_child()
+            self._children[values] = child
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> object:
+        """ラベル値の組に対応する子メトリクスを新たに生成する"""
+
+    def render(self) -> Iterable[str]:
+        """テキスト形式の行を返す"""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        for values, child in self._children.items():
+            yield from self._render_child(values, child)
+
+    @abstractmethod
+    def _render_child(self, values: tuple[str, ...], child: object) -> Iterable[str]:
+        """子メトリクスのテキスト形式の行を返す"""
+
+
+class CounterChild:
+    """ラベル値を固定したカウンタ"""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """カウンタを加算する"""
+        self.value += amount
+
+
+class Counter(_Metric):
+    """単調増加するカウンタ"""
+
+    type_name = "counter"
+
+    def labels(self, *values: str) -> CounterChild:  # type: ignore[override]
+        """ラベル値に対応するカウンタを返す"""
+        return super().labels(*values)  # type: ignore[return-value]
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _render_child(self, values: tuple[str, ...], child: object) -> Iterable[str]:
+        labels = _format_labels(self.labelnames, values)
+        yield f"{self.name}_total{labels} {_format_value(child.value)}"  # type: ignore[attr-defined]
+
+
+class HistogramChild:
+    """ラベル値を固定したヒストグラム"""
+
+    __slots__ = ("_upper_bounds", "bucket_counts", "sum", "count")
+
+    def __init__(self, upper_bounds: tuple[float, ...]) -> None:
+        self._upper_bounds = upper_bounds
+        # 各バケット（上限以下）に入った件数（累積ではない。最後の要素は +Inf）
+        self.bucket_counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """値を1件記録する"""
+        self.bucket_counts[bisect_left(self._upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """バケット別の件数と合計値を保持するヒストグラム"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(float(bound) for bound in buckets))
+
+    def labels(self, *values: str) -> HistogramChild:  # type: ignore[override]
+        """ラベル値に対応するヒストグラムを返す"""
+        return super().labels(*values)  # type: ignore[return-value]
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.upper_bounds)
+
+    def _render_child(self, values: tuple[str, ...], child: object) -> Iterable[str]:
+        histogram: HistogramChild = child  # type: ignore[assignment]
+        cumulative = 0
+        bounds = (*self.upper_bounds, math.inf)
+        for bound, bucket_count in zip(bounds, histogram.bucket_counts, strict=True):
+            cumulative += bucket_count
+            labels = _format_labels((*self.labelnames, "le"), (*values, _format_value(bound)))
+            yield f"{self.name}_bucket{labels} {cumulative}"
+        labels = _format_labels(self.labelnames, values)
+        yield f"{self.name}_sum{labels} {_format_value(histogram.sum)}"
+        yield f"{self.name}_count{labels} {histogram.count}"
+
+
+_M = TypeVar("_M", bound=_Metric)
+
+
+class MetricsRegistry:
+    """公開するメトリクスの一覧"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """カウンタを登録して返す"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """ヒストグラムを登録して返す"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric: _M) -> _M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """すべてのメトリクスをテキスト形式で返す"""
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+# シングルトンインスタンス
+registry = MetricsRegistry()
+
+# ============================================================================
+# アプリケーションのメトリクス
+# ============================================================================
+
+http_request_duration = registry.histogram(
+    "kotonoha_http_request_duration_seconds",
+    "Total request latency per endpoint.",
+    ("method", "endpoint"),
+)
+
+ai_provider_call_duration = registry.histogram(
+    "kotonoha_ai_provider_call_duration_seconds",
+    "AI provider call latency including retries.",
+    ("provider", "model", "outcome"),
+)
+
+ai_provider_call_retries = registry.histogram(
+    "kotonoha_ai_provider_call_retries",
+    "Number of retries per AI provider call.",
+    ("provider",),
+    buckets=RETRY_COUNT_BUCKETS,
+)
+
+ai_retry_budget_denied = registry.counter(
+    "kotonoha_ai_retry_budget_denied",
+    "AI provider call retries skipped because the process-wide retry budget was exhausted.",
+    ("provider",),
+)
+
+ai_tokens = registry.counter(
+    "kotonoha_ai_tokens",
+    "Tokens reported in AI provider usage by kind "
+    "(input excludes cache_read and cache_write tokens).",
+    ("provider", "kind"),
+)
+
+ai_concurrency_queue_wait = registry.histogram(
+    "kotonoha_ai_concurrency_queue_wait_seconds",
+    "Time AI provider calls waited for a slot under the adaptive concurrency limit.",
+    ("provider",),
+)
+
+ai_concurrency_rejections = registry.counter(
+    "kotonoha_ai_concurrency_rejections",
+    "AI provider calls rejected because no slot was expected to free up before the deadline.",
+    ("provider",),
+)
+
+ai_client_disconnects = registry.counter(
+    "kotonoha_ai_client_disconnects",
+    "AI conversions cancelled because the client disconnected before the response.",
+    ("endpoint",),
+)
+
+ai_rate_limit_pacing = registry.counter(
+    "kotonoha_ai_rate_limit_pacing",
+    "AI provider calls delayed (paced) or rejected locally because the rate limit budget "
+    "reported by the provider's headers was exhausted.",
+    ("provider", "outcome"),
+)
+
+local_conversions = registry.counter(
+    "kotonoha_local_conversions",
+    "Local (rule-based) conversion attempts by outcome " "(hit, low_confidence or miss).",
+    ("outcome",),
+)
+
+similarity_lookups = registry.counter(
+    "kotonoha_similarity_lookups",
+    "Near-duplicate index lookups by outcome (hit, below_threshold or miss).",
+    ("outcome",),
+)
+
+similarity_best_score = registry.histogram(
+    "kotonoha_similarity_best_score",
+    "Similarity of the closest indexed input for lookups that found a candidate.",
+    buckets=SIMILARITY_BUCKETS,
+)
+
+rate_limit_rejections = registry.counter(
+    "kotonoha_rate_limit_rejections",
+    "Requests rejected by the rate limiter.",
+    ("endpoint",),
+)
+
+log_queue_latency = registry.histogram(
+    "kotonoha_log_queue_latency_seconds",
+    "Time the oldest entry of a written batch waited in the log queue.",
+    ("queue",),
+)
+
+log_write_failures = registry.counter(
+    "kotonoha_log_write_failures",
+    "Log entries lost because a batch write failed.",
+    ("queue",),
+)
+
+log_dropped = registry.counter(
+    "kotonoha_log_dropped",
+    "Log entries dropped because the log buffer was full.",
+    ("queue",),
+)
+
+db_pool_checkout_wait = registry.histogram(
+    "kotonoha_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the database pool.",
+)
+
+
+# ルーティングに一致しなかったリクエストのエンドポイントラベル
+# （存在しないパスごとに子メトリクスが増え続けることを防ぐ）
+UNMATCHED_ENDPOINT = "unmatched"
+
+# 標準のHTTPメソッド以外のメソッドラベル
+# （クライアントが任意のメソッド名を送るたびに子メトリクスが増え続けることを防ぐ）
+OTHER_METHOD = "other"
+_HTTP_METHODS = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "DELETE", "CONNECT", "OPTIONS", "TRACE", "PATCH"}
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    リクエスト全体の所要時間をエンドポイントごとに計測するASGIミドルウェア
+
+    エンドポイントのラベルには実際のパスではなくルートのパステンプレート
+    （FastAPIがルーティング時に scope["route"] に設定する）を使う。
+    BaseHTTPMiddleware を使わず、レスポンス本体をラップしない。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            http_request_duration.labels(method_label(scope), route_label(scope)).observe(
+                time.perf_counter() - start
+            )
+
+
+def method_label(scope: Scope) -> str:
+    """リクエストのメソッドラベルを返す（標準のHTTPメソッド以外は OTHER_METHOD）"""
+    method = scope["method"]
+    return method if method in _HTTP_METHODS else OTHER_METHOD
+
+
+def route_label(scope: Scope) -> str:
+    """リクエストのエンドポイントラベル（ルートのパステンプレート）を返す"""
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ENDPOINT
@@ -0,0 +1,163 @@
+"""
+定型文変換テーブルモジュール
+
+【機能概要】: 事前にAIで生成した定型文の変換結果（phrase_table_entries）をメモリ上の
+              ハッシュ索引に読み込み、該当する入力にはAI APIを呼び出さずに応答する
+【実装方針】:
+  - 索引のキーは正規化した入力文字列の64bitハッシュ、値は丁寧さレベルごとの変換結果の
+    タプルとし、定型文1件あたり1エントリに収める
+  - 起動時（lifespan）に公開済みの最新バージョンを読み込み、以降は
+    PHRASE_TABLE_RELOAD_INTERVAL_SECONDS ごとに公開バージョンを確認して、
+    変わっていれば読み込み直す（索引は作り直してから差し替えるため、
+    読み込み中のリクエストは旧バージョンで応答する）
+  - 読み込みの失敗（DB障害等）は変換処理を妨げない（警告ログのみ。旧バージョンを使い続ける）
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.crud.crud_phrase_table import (
+    PhraseTableRow,
+    get_phrase_table_rows,
+    get_published_phrase_table_version,
+)
+from app.utils.conversion_cache import normalize_input_text
+
+logger = logging.getLogger(__name__)
+
+# 索引の値（タプル）における丁寧さレベルの並び
+POLITENESS_LEVELS: tuple[str, ...] = ("casual", "normal", "polite")
+_LEVEL_INDEX = {level: index for index, level in enumerate(POLITENESS_LEVELS)}
+
+
+def _index_key(normalized_text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(normalized_text.encode(), digest_size=8).digest(), "big")
+
+
+class PhraseTable:
+    """公開済みの定型文変換テーブルを保持するメモリ上の索引"""
+
+    def __init__(self) -> None:
+        self._version: int | None = None
+        self._index: dict[int, tuple[str | None, ...]] = {}
+        self._reload_task: asyncio.Task[None] | None = None
+
+    @property
+    def version(self) -> int | None:
+        """読み込み済みのバージョン（未読み込みの場合はNone）"""
+        return self._version
+
+    def describe(self) -> dict[str, int | None]:
+        """
+        読み込み済みのバージョンと定型文の件数を返す
+
+        Returns:
+            dict[str, int | None]: version, phrases
+        """
+        return {"version": self._version, "phrases": len(self._index)}
+
+    def lookup(self, input_text: str, politeness_level: str) -> str | None:
+        """
+        入力文字列に対応する変換結果を返す
+
+        Args:
+            input_text: 入力文字列（正規化前）
+            politeness_level: 丁寧さレベル
+
+        Returns:
+            str | None: 変換結果（テーブルにない場合はNone）
+        """
+        level_index = _LEVEL_INDEX.get(politeness_level)
+        if level_index is None or not self._index:
+            return None
+        forms = self._index.get(_index_key(normalize_input_text(input_text)))
+        return forms[level_index] if forms is not None else None
+
+    def replace(self, version: int | None, rows: Iterable[PhraseTableRow]) -> None:
+        """
+        索引を作り直して差し替える
+
+        Args:
+            version: バージョン番号
+            rows: 変換結果
+        """
+        forms: dict[int, list[str | None]] = {}
+        for row in rows:
+            level_index = _LEVEL_INDEX.get(row.politeness_level)
+            if level_index is None:
+                continue
+            key = _index_key(normalize_input_text(row.input_text))
+            forms.setdefault(key, [None] * len(POLITENESS_LEVELS))[level_index] = row.converted_text
+        self._index = {key: tuple(values) for key, values in forms.items()}
+        self._version = version
+
+    async def reload(self, session_factory: async_sessionmaker[AsyncSession]) -> bool:
+        """
+        公開済みの最新バージョンが読み込み済みのものと異なれば読み込む
+
+        Args:
+            session_factory: 読み込みに使うセッションのファクトリ
+
+        Returns:
+            bool: 索引を差し替えたか
+        """
+        async with session_factory() as session:
+            version = await get_published_phrase_table_version(session)
+            if version == self._version:
+                return False
+            rows = await get_phrase_table_rows(session, version) if version is not None else []
+        self.replace(version, rows)
+        logger.info("Loaded phrase table version %s (%d phrases)", version, len(self._index))
+        return True
+
+    async def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """
+        最新バージョンを読み込み、定期的な再読み込みを開始する
+        （PHRASE_TABLE_ENABLED が無効な場合・動作中の場合は何もしない）
+
+        Args:
+            session_factory: 読み込みに使うセッションのファクトリ
+        """
+        if not settings.PHRASE_TABLE_ENABLED or self._reload_task is not None:
+            return
+        await self._try_reload(session_factory)
+        interval = settings.PHRASE_TABLE_RELOAD_INTERVAL_SECONDS
+        if interval > 0:
+            self._reload_task = asyncio.create_task(
+                self._reload_loop(session_factory, interval), name="phrase-table-reload"
+            )
+
+    async def stop(self) -> None:
+        """定期的な再読み込みを停止する"""
+        task, self._reload_task = self._reload_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _try_reload(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        try:
+            await asyncio.wait_for(
+                self.reload(session_factory), timeout=settings.PHRASE_TABLE_LOAD_TIMEOUT_SECONDS
+            )
+        except Exception:
+            logger.warning("Failed to load phrase table", exc_info=True)
+
+    async def _reload_loop(
+        self, session_factory: async_sessionmaker[AsyncSession], interval: float
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self._try_reload(session_factory)
+
+
+# シングルトンインスタンス
+phrase_table = PhraseTable()
@@ -0,0 +1,192 @@
+"""
+プロバイダーのレート制限予算モジュール
+
+【機能概要】: Anthropic / OpenAI が応答ごとに返すレート制限ヘッダー（残りリクエスト数・
+              残りトークン数とリセット時刻）から、プロバイダーごとの残り予算を
+              トークンバケットとして保持し、呼び出し前に予算を予約する
+              （429を受けてから再試行するのではなく、枯渇する前に呼び出しの間隔を空け、
+              明らかに予算が足りない呼び出しはネットワークに送らずに拒否する）
+【実装方針】:
+  - バケットはリクエスト数・トークン数の2つ。ヘッダーを受け取るたびに残量を上書きし、
+    リセット時刻に上限まで回復するように一定の速度で補充する
+  - 予約は「先に消費して、残量が負なら回復するまで待つ」方式とし、同時に待つ呼び出しが
+    同じ残量を奪い合わないようにする。待ち時間が上限を超える場合は何も消費せずに拒否する
+  - 他のワーカーの送信中の呼び出し分として、上限の headroom_ratio を残量から差し引く
+  - 429 の retry-after を受けた場合は、その時刻まですべての呼び出しを待たせる
+  - ヘッダーを一度も受け取っていない場合は制限しない
+  - イベントループ上でのみ操作されるためロックは不要
+"""
+
+import math
+import re
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+# (リクエスト数, トークン数) それぞれの (上限, 残り, リセット) ヘッダー名
+_ANTHROPIC_HEADERS = {
+    "requests": (
+        "anthropic-ratelimit-requests-limit",
+        "anthropic-ratelimit-requests-remaining",
+        "anthropic-ratelimit-requests-reset",
+    ),
+    "tokens": (
+        "anthropic-ratelimit-tokens-limit",
+        "anthropic-ratelimit-tokens-remaining",
+        "anthropic-ratelimit-tokens-reset",
+    ),
+}
+_OPENAI_HEADERS = {
+    "requests": (
+        "x-ratelimit-limit-requests",
+        "x-ratelimit-remaining-requests",
+        "x-ratelimit-reset-requests",
+    ),
+    "tokens": (
+        "x-ratelimit-limit-tokens",
+        "x-ratelimit-remaining-tokens",
+        "x-ratelimit-reset-tokens",
+    ),
+}
+
+# OpenAI のリセットまでの時間（例: "1s", "6m0s", "20ms", "1h2m3.5s"）
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_seconds(value: str, now: datetime | None = None) -> float | None:
+    """
+    リセットヘッダーの値を、リセットまでの秒数に変換する
+
+    Args:
+        value: RFC 3339 の時刻（Anthropic）または "6m0s" 形式の時間（OpenAI）
+        now: 現在時刻（テスト用。省略時は現在のUTC時刻）
+
+    Returns:
+        float | None: リセットまでの秒数（解釈できない場合はNone）
+    """
+    value = value.strip()
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_at - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+@dataclass
+class _Bucket:
+    """ヘッダーから復元したトークンバケット"""
+
+    limit: float
+    remaining: float
+    refill_per_second: float
+    observed_at: float
+
+    def available(self, now: float) -> float:
+        refilled = self.remaining + self.refill_per_second * (now - self.observed_at)
+        return min(self.limit, refilled)
+
+    def seconds_until(self, amount: float, now: float) -> float:
+        """amount 分の予約で残量が負になる場合、0に回復するまでの秒数（回復しない場合は無限大）"""
+        shortage = amount - self.available(now)
+        if shortage <= 0:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return math.inf
+        return shortage / self.refill_per_second
+
+    def consume(self, amount: float, now: float) -> None:
+        self.remaining = self.available(now) - amount
+        self.observed_at = now
+
+
+class RateLimitBudget:
+    """プロバイダー1つ分のレート制限予算"""
+
+    def __init__(self, name: str, headroom_ratio: float = 0.0) -> None:
+        self.name = name
+        self.headroom_ratio = max(0.0, headroom_ratio)
+        self._headers = _OPENAI_HEADERS if name == "openai" else _ANTHROPIC_HEADERS
+        self._buckets: dict[str, _Bucket] = {}
+        self._blocked_until = 0.0
+
+    def update(self, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """
+        応答のレート制限ヘッダーを残り予算に反映する（該当ヘッダーがない応答は無視する）
+
+        Args:
+            headers: 応答ヘッダー（大文字小文字を区別しないマッピング）
+            status_code: 応答のステータスコード（429の場合は retry-after まで呼び出しを止める）
+        """
+        now = time.monotonic()
+        for kind, names in self._headers.items():
+            bucket = _parse_bucket(headers, names, self.headroom_ratio, now)
+            if bucket is not None:
+                self._buckets[kind] = bucket
+        if status_code == 429:
+            retry_after = _retry_after_seconds(headers)
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def reserve(self, tokens: int, max_wait_seconds: float) -> float | None:
+        """
+        1回の呼び出し分（リクエスト1件と tokens トークン）の予算を予約する
+
+        Args:
+            tokens: 呼び出し1回で消費する見込みのトークン数
+            max_wait_seconds: 予算の回復を待てる秒数の上限
+
+        Returns:
+            float | None: 呼び出し前に待つ秒数（0なら即時）。待ち時間が上限を超える場合は
+                          予約せずにNone
+        """
+        now = time.monotonic()
+        amounts = {"requests": 1.0, "tokens": float(tokens)}
+        wait = max(0.0, self._blocked_until - now)
+        for kind, bucket in self._buckets.items():
+            wait = max(wait, bucket.seconds_until(amounts[kind], now))
+        if wait > max_wait_seconds:
+            return None
+        for kind, bucket in self._buckets.items():
+            bucket.consume(amounts[kind], now)
+        return wait
+
+
+def _parse_bucket(
+    headers: Mapping[str, str], names: tuple[str, str, str], headroom_ratio: float, now: float
+) -> _Bucket | None:
+    limit_name, remaining_name, reset_name = names
+    try:
+        limit = float(headers[limit_name])
+        remaining = float(headers[remaining_name])
+    except (KeyError, ValueError):
+        return None
+    reset_seconds = parse_reset_seconds(headers.get(reset_name, ""))
+    # リセット時刻が不明・残量が満量の場合は、1分あたり上限分の速度で回復するとみなす
+    refill = limit / 60.0
+    if reset_seconds == 0.0:
+        remaining = limit
+    elif reset_seconds is not None and remaining < limit:
+        refill = (limit - remaining) / reset_seconds
+    headroom = limit * headroom_ratio
+    return _Bucket(
+        limit=limit - headroom,
+        remaining=remaining - headroom,
+        refill_per_second=refill,
+        observed_at=now,
+    )
+
+
+def _retry_after_seconds(headers: Mapping[str, str]) -> float | None:
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return max(0.0, float(headers[name]) * scale)
+        except (KeyError, ValueError):
+            continue
+    return None
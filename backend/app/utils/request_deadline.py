@@ -0,0 +1,71 @@
+"""
+リクエストデッドラインモジュール
+
+【機能概要】: 端末が応答を待つ残り時間（X-Request-Deadline-Ms ヘッダー）を、リクエストを
+              処理しているコンテキストに記録する。AIClient は AI_CALL_DEADLINE_SECONDS と
+              この残り時間の短い方を呼び出し全体（リトライ・枠待ちを含む）とSDKの
+              タイムアウトに適用し、端末が待受を諦めた後にAI APIを呼び出し続けない
+【実装方針】:
+  - ヘッダーの値は絶対時刻ではなく残りミリ秒とする（端末とサーバーの時計のずれの影響を
+    受けない）。受信時に time.monotonic() 基準のデッドラインへ変換して保持する
+  - 値は ContextVar に保持し、呼び出し元の関数の引数を変えずに AIClient まで伝える
+    （app.utils.request_priority と同じ方式）
+"""
+
+import time
+from contextvars import ContextVar
+
+# 端末の残り待ち時間（ミリ秒）を指定するHTTPヘッダー名
+DEADLINE_HEADER_NAME = "X-Request-Deadline-Ms"
+
+_CURRENT_DEADLINE: ContextVar[float | None] = ContextVar("ai_request_deadline", default=None)
+
+
+def parse_deadline(header_value: str | None, now: float | None = None) -> float | None:
+    """
+    X-Request-Deadline-Ms ヘッダーの値をデッドラインに変換する
+
+    Args:
+        header_value: ヘッダーの値（残りミリ秒。未指定の場合None）
+        now: 基準時刻（time.monotonic() の値。省略時は現在時刻）
+
+    Returns:
+        float | None: デッドライン（time.monotonic() の値）。未指定・解釈できない値の場合None
+                      （0以下の値は既に期限切れとして扱う）
+    """
+    if header_value is None:
+        return None
+    try:
+        remaining_ms = float(header_value.strip())
+    except ValueError:
+        return None
+    if remaining_ms != remaining_ms:  # NaN
+        return None
+    now = time.monotonic() if now is None else now
+    return now + max(0.0, remaining_ms) / 1000
+
+
+def current_deadline() -> float | None:
+    """処理中のリクエストのデッドラインを返す（未設定の場合None）"""
+    return _CURRENT_DEADLINE.get()
+
+
+def set_deadline(deadline: float | None) -> None:
+    """処理中のリクエストのデッドラインを設定する"""
+    _CURRENT_DEADLINE.set(deadline)
+
+
+def remaining_seconds(limit: float) -> float:
+    """
+    処理中のリクエストに使える残り時間を返す
+
+    Args:
+        limit: サーバー側の上限（秒）
+
+    Returns:
+        float: limit とデッドラインまでの残り時間の短い方（期限切れの場合は0以下）
+    """
+    deadline = _CURRENT_DEADLINE.get()
+    if deadline is None:
+        return limit
+    return min(limit, deadline - time.monotonic())
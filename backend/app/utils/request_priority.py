@@ -0,0 +1,65 @@
+"""
+リクエスト優先度モジュール
+
+【機能概要】: AI変換リクエストの優先度（会話中の変換 / 再変換 / 一括変換）を、
+              リクエストを処理しているコンテキストに記録する。AIClient はこの優先度で
+              プロバイダーの同時実行数の枠を待つ順序を決める
+              （相手が発話を待っている変換を、介護者の一括変換より先に処理する）
+【実装方針】:
+  - 優先度はエンドポイントごとの既定値とし、X-Request-Priority ヘッダーで下げることだけを
+    許可する（一括変換のクライアントが会話中の変換を装って割り込むことを防ぐ）
+  - 値は ContextVar に保持し、呼び出し元の関数の引数を変えずに AIClient まで伝える
+"""
+
+from contextvars import ContextVar
+from enum import IntEnum
+
+
+class RequestPriority(IntEnum):
+    """AI呼び出しの優先度（値が小さいほど先に処理する）"""
+
+    INTERACTIVE = 0
+    REGENERATE = 1
+    BULK = 2
+
+
+# 優先度を指定するHTTPヘッダー名と、その値
+PRIORITY_HEADER_NAME = "X-Request-Priority"
+_HEADER_VALUES = {
+    "interactive": RequestPriority.INTERACTIVE,
+    "regenerate": RequestPriority.REGENERATE,
+    "bulk": RequestPriority.BULK,
+}
+
+_CURRENT_PRIORITY: ContextVar[RequestPriority] = ContextVar(
+    "ai_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+def resolve_priority(default: RequestPriority, header_value: str | None) -> RequestPriority:
+    """
+    エンドポイントの既定の優先度とヘッダーの値から、リクエストの優先度を決める
+
+    Args:
+        default: エンドポイントの既定の優先度
+        header_value: X-Request-Priority ヘッダーの値（未指定の場合None）
+
+    Returns:
+        RequestPriority: 既定値とヘッダーの値のうち低い方（解釈できない値は無視する）
+    """
+    if header_value is None:
+        return default
+    requested = _HEADER_VALUES.get(header_value.strip().lower())
+    if requested is None:
+        return default
+    return max(default, requested)
+
+
+def current_priority() -> RequestPriority:
+    """処理中のリクエストの優先度を返す（未設定の場合は INTERACTIVE）"""
+    return _CURRENT_PRIORITY.get()
+
+
+def set_priority(priority: RequestPriority) -> None:
+    """処理中のリクエストの優先度を設定する"""
+    _CURRENT_PRIORITY.set(priority)
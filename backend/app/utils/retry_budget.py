@@ -0,0 +1,54 @@
+"""
+リトライ予算モジュール
+
+【機能概要】: プロセス内のすべてのAI API呼び出しで共有するリトライの予算を管理する
+              （プロバイダーの障害時に全リクエストがリトライし、送信量が倍増して障害を
+              悪化させることを防ぐ。リトライ自体は無効にせず、量だけを抑える）
+【実装方針】:
+  - 直近 window_seconds 秒間の呼び出し数とリトライ数をスライディングウィンドウで数え、
+    リトライ数が「呼び出し数 × ratio」未満の間だけリトライを許可する
+  - 呼び出しの少ない時間帯にリトライがまったくできなくならないよう、ウィンドウ内で
+    min_retries 回までは比率に関係なく許可する
+  - イベントループ上でのみ操作されるためロックは不要
+"""
+
+import time
+from collections import deque
+
+
+class RetryBudget:
+    """呼び出し数に対するリトライ数の比率で上限を設けるリトライ予算"""
+
+    def __init__(self, ratio: float, window_seconds: float, min_retries: int) -> None:
+        self.ratio = max(0.0, ratio)
+        self.window_seconds = max(0.0, window_seconds)
+        self.min_retries = max(0, min_retries)
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+    def record_request(self) -> None:
+        """呼び出しを1件記録する（リトライは含めない）"""
+        now = time.monotonic()
+        self._requests.append(now)
+        self._expire(now)
+
+    def try_acquire_retry(self) -> bool:
+        """
+        リトライしてよいか判定し、よい場合はリトライを1件記録する
+
+        Returns:
+            bool: リトライを許可する場合True
+        """
+        now = time.monotonic()
+        self._expire(now)
+        allowed = max(float(self.min_retries), len(self._requests) * self.ratio)
+        if len(self._retries) >= allowed:
+            return False
+        self._retries.append(now)
+        return True
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        for samples in (self._requests, self._retries):
+            while samples and samples[0] < cutoff:
+                samples.popleft()
@@ -0,0 +1,219 @@
+"""
+類似入力索引モジュール
+
+【機能概要】: 過去に変換した入力の索引を持ち、句点・全角/半角・空白・「ね」と「ねー」等の
+              わずかな違いしかない入力に、保存済みの変換結果を再利用する
+              （完全一致の変換結果キャッシュでヒットしない入力のAI API呼び出しを省略する）
+【実装方針】:
+  - 入力は normalize_input_text で正規化し、空白と末尾の句読点・長音記号を除いてから
+    文字2-gramの集合にする。類似度は2-gram集合のJaccard係数
+  - 候補の検索は MinHash（32個のハッシュ関数）を8バンドに分けたLSHで行い、候補ごとに
+    保存した2-gram集合で正確な類似度を計算する
+  - 類似度が閾値以上でも、入力に含まれる数字が異なる場合（「9時」と「10時」等）や、
+    文末の「か」「?」「の」が異なる場合（「行きます」と「行きますか」等。平叙文と疑問文）は
+    採用しない
+  - 丁寧さレベル（とプロバイダー・モデル・プロンプトバージョン）が異なる入力とは照合しない
+  - 入力文字列そのものは保持しない（2-gramのハッシュ値のみ）。件数の上限を超えた場合は
+    最も古く参照されたものから破棄する
+  - 照合結果（ヒット/閾値未満/候補なし）と最も類似した候補の類似度をメトリクスに記録し、
+    閾値の調整に使えるようにする
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.utils import metrics
+from app.utils.conversion_cache import normalize_input_text
+
+# 文字n-gramの長さ
+SHINGLE_SIZE = 2
+# MinHash の署名の長さ（= バンド数 × バンドあたりの行数）
+NUM_BANDS = 8
+ROWS_PER_BAND = 4
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+
+# 類似度の計算前に末尾から取り除く文字（意味を変えない句読点・長音記号等）
+_TRAILING_NOISE = "。．.、,，！!ー〜～…・"
+_NUMBER = re.compile(r"\d+")
+# 疑問文を示す文末の文字（NFKC正規化後のため全角の「？」は「?」になる）
+_SENTENCE_FINAL = "か?の"
+
+# MinHash の各ハッシュ関数は、2-gramのハッシュ値と固定のマスクのXORで近似する
+# （LSHは候補の絞り込みにのみ使い、採否は正確な類似度で判断するため近似で十分）。
+# 2-gramのハッシュ値は文字コードを並べた整数に奇数の定数を掛けて求める（組み込みの hash() は
+# プロセスごとに値が変わり、同じ入力でも候補が見つかるかどうかが起動ごとに変わってしまうため）
+_HASH_MASK = (1 << 64) - 1
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_SHINGLE_CODE_MASK = (1 << (21 * SHINGLE_SIZE)) - 1
+
+
+def _mask(label: str) -> int:
+    return int.from_bytes(hashlib.blake2b(label.encode(), digest_size=8).digest(), "big")
+
+
+_PERMUTATION_MASKS: tuple[int, ...] = tuple(_mask(f"minhash-{i}") for i in range(NUM_PERMUTATIONS))
+
+_BEST_SCORE = metrics.similarity_best_score.labels()
+
+
+@dataclass(frozen=True)
+class SimilarMatch:
+    """類似入力の照合結果"""
+
+    converted_text: str
+    similarity: float
+
+
+@dataclass(frozen=True)
+class _Fingerprint:
+    shingles: frozenset[int]
+    numbers: tuple[str, ...]
+    ending: str
+    band_keys: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    scope: str
+    fingerprint: _Fingerprint
+    converted_text: str
+
+
+def _fingerprint(input_text: str) -> _Fingerprint | None:
+    canonical = normalize_input_text(input_text).replace(" ", "").rstrip(_TRAILING_NOISE)
+    if not canonical:
+        return None
+    shingles = frozenset(
+        (code * _HASH_MULTIPLIER) & _HASH_MASK for code in _shingle_codes(canonical)
+    )
+    signature = [min(map(mask.__xor__, shingles)) for mask in _PERMUTATION_MASKS]
+    band_keys = tuple(
+        hash(tuple(signature[i : i + ROWS_PER_BAND]))
+        for i in range(0, NUM_PERMUTATIONS, ROWS_PER_BAND)
+    )
+    ending = canonical[len(canonical.rstrip(_SENTENCE_FINAL)) :]
+    return _Fingerprint(shingles, tuple(_NUMBER.findall(canonical)), ending, band_keys)
+
+
+def _shingle_codes(canonical: str) -> list[int]:
+    """文字n-gramごとに、文字コード（21bit）を並べた整数を返す（入力がn文字未満の場合は全体で1つ）"""
+    codes: list[int] = []
+    code = 0
+    for index, char in enumerate(canonical):
+        code = ((code << 21) | ord(char)) & _SHINGLE_CODE_MASK
+        if index >= SHINGLE_SIZE - 1:
+            codes.append(code)
+    return codes or [code]
+
+
+def _jaccard(a: frozenset[int], b: frozenset[int]) -> float:
+    return len(a & b) / len(a | b)
+
+
+class SimilarityIndex:
+    """変換済み入力の類似検索索引（プロセス内メモリ、LRU）"""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._buckets: dict[tuple[str, int, int], set[int]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self, input_text: str, politeness_level: str, threshold: float, scope: str = ""
+    ) -> SimilarMatch | None:
+        """
+        類似度が閾値以上の変換済み入力を探し、その変換結果を返す
+
+        Args:
+            input_text: 入力文字列
+            politeness_level: 丁寧さレベル
+            threshold: 採用する類似度の下限（0.0〜1.0）
+            scope: 照合の範囲（プロバイダー・モデル等。異なる範囲の入力とは照合しない）
+
+        Returns:
+            SimilarMatch | None: 最も類似した入力の変換結果（閾値未満・候補なしの場合はNone）
+        """
+        fingerprint = _fingerprint(input_text)
+        if fingerprint is None:
+            return None
+        best = self._best_candidate(f"{politeness_level}:{scope}", fingerprint)
+        if best is None:
+            metrics.similarity_lookups.labels("miss").inc()
+            return None
+        entry_id, similarity = best
+        _BEST_SCORE.observe(similarity)
+        if similarity < threshold:
+            metrics.similarity_lookups.labels("below_threshold").inc()
+            return None
+        metrics.similarity_lookups.labels("hit").inc()
+        self._entries.move_to_end(entry_id)
+        return SimilarMatch(self._entries[entry_id].converted_text, similarity)
+
+    def add(
+        self, input_text: str, politeness_level: str, converted_text: str, scope: str = ""
+    ) -> None:
+        """
+        変換済みの入力を索引に追加する（同じ入力が登録済みの場合は変換結果を置き換える）
+
+        Args:
+            input_text: 入力文字列
+            politeness_level: 丁寧さレベル
+            converted_text: 変換結果
+            scope: 照合の範囲
+        """
+        fingerprint = _fingerprint(input_text)
+        if fingerprint is None:
+            return
+        entry_scope = f"{politeness_level}:{scope}"
+        best = self._best_candidate(entry_scope, fingerprint)
+        if best is not None and best[1] == 1.0:
+            self._remove(best[0])
+        while len(self._entries) >= self._max_entries:
+            self._remove(next(iter(self._entries)))
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(entry_scope, fingerprint, converted_text)
+        for band, key in enumerate(fingerprint.band_keys):
+            self._buckets.setdefault((entry_scope, band, key), set()).add(entry_id)
+
+    def clear(self) -> None:
+        """索引を空にする"""
+        self._entries.clear()
+        self._buckets.clear()
+
+    def _best_candidate(self, scope: str, fingerprint: _Fingerprint) -> tuple[int, float] | None:
+        candidates: set[int] = set()
+        for band, key in enumerate(fingerprint.band_keys):
+            candidates |= self._buckets.get((scope, band, key), set())
+        best: tuple[int, float] | None = None
+        for entry_id in candidates:
+            stored = self._entries[entry_id].fingerprint
+            if stored.numbers != fingerprint.numbers or stored.ending != fingerprint.ending:
+                continue
+            similarity = _jaccard(stored.shingles, fingerprint.shingles)
+            if best is None or similarity > best[1]:
+                best = (entry_id, similarity)
+        return best
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        for band, key in enumerate(entry.fingerprint.band_keys):
+            bucket_key = (entry.scope, band, key)
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                continue
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+
+# シングルトンインスタンス
+similarity_index = SimilarityIndex(settings.SIMILARITY_INDEX_MAX_ENTRIES)
@@ -0,0 +1,147 @@
+"""
+ウォームアップモジュール
+
+【機能概要】: 起動時（lifespan）にDB接続プールとAIプロバイダーへの接続を事前に確立し、
+              デプロイ・スケールアウト直後の最初のリクエストがTLSハンドシェイクや
+              DB接続の確立を待たないようにする。起動後はキープウォームで接続を保つ
+【実装方針】:
+  - ウォームアップは WARMUP_TIMEOUT_SECONDS 以内で打ち切り、失敗しても起動は継続する
+    （失敗は警告ログのみ。接続は最初のリクエストで従来どおり確立される）
+  - ウォームアップが終わるまでレディネス（/api/v1/health/ready）は準備中を返す
+  - キープウォームは KEEP_WARM_INTERVAL_SECONDS ごとに、その間リクエストがなかった
+    プロバイダーへの接続とDB接続プールを再確立する（0以下で無効）
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.utils import ai_client as ai_client_module
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_database(engine: AsyncEngine, connections: int) -> int:
+    """
+    DB接続を同時に確立してから返却し、接続プールに保持させる
+
+    Args:
+        engine: 非同期エンジン
+        connections: 確立する接続数
+
+    Returns:
+        int: 確立できた接続数
+    """
+    pending = [engine.connect() for _ in range(max(0, connections))]
+    results = await asyncio.gather(
+        *(connection.start() for connection in pending), return_exceptions=True
+    )
+    opened = 0
+    for connection, result in zip(pending, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning(f"Failed to open database connection during warm-up: {result}")
+            continue
+        await connection.close()
+        opened += 1
+    return opened
+
+
+class Warmup:
+    """起動時のウォームアップとキープウォームの状態"""
+
+    def __init__(self) -> None:
+        self._ready = False
+        self._database_connections = 0
+        self._providers: dict[str, bool] = {}
+        self._keep_warm_task: asyncio.Task[None] | None = None
+
+    @property
+    def ready(self) -> bool:
+        """ウォームアップが完了したか（失敗した場合も完了として扱う）"""
+        return self._ready
+
+    def describe(self) -> dict[str, object]:
+        """
+        レディネス用に、ウォームアップの結果を返す
+
+        Returns:
+            dict[str, object]: ready, database_connections,
+                providers（プロバイダー名 → 接続できたか）
+        """
+        return {
+            "ready": self._ready,
+            "database_connections": self._database_connections,
+            "providers": dict(self._providers),
+        }
+
+    async def run(self, engine: AsyncEngine) -> None:
+        """
+        ウォームアップを実行する（WARMUP_ENABLED が無効な場合は即座に完了とする）
+
+        Args:
+            engine: 接続を確立するDBの非同期エンジン
+        """
+        if settings.WARMUP_ENABLED:
+            try:
+                await asyncio.wait_for(self._warm(engine), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Warm-up did not finish within %ss; continuing startup.",
+                    settings.WARMUP_TIMEOUT_SECONDS,
+                )
+            except Exception:
+                logger.warning("Warm-up failed; continuing startup.", exc_info=True)
+        self._ready = True
+
+    async def _warm(self, engine: AsyncEngine) -> None:
+        self._database_connections, self._providers = await asyncio.gather(
+            warm_database(engine, settings.WARMUP_DB_CONNECTIONS),
+            ai_client_module.ai_client.warm_up(),
+        )
+        logger.info(
+            "Warm-up finished: %d database connections, providers %s",
+            self._database_connections,
+            self._providers,
+        )
+
+    def start_keep_warm(self, engine: AsyncEngine) -> None:
+        """
+        キープウォームを開始する（無効な場合・動作中の場合は何もしない）
+
+        Args:
+            engine: 接続を保つDBの非同期エンジン
+        """
+        interval = settings.KEEP_WARM_INTERVAL_SECONDS
+        if interval <= 0 or self._keep_warm_task is not None:
+            return
+        self._keep_warm_task = asyncio.create_task(
+            self._keep_warm(engine, interval), name="keep-warm"
+        )
+
+    async def stop(self) -> None:
+        """キープウォームを停止する"""
+        task, self._keep_warm_task = self._keep_warm_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _keep_warm(self, engine: AsyncEngine, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.gather(
+                    warm_database(engine, settings.WARMUP_DB_CONNECTIONS),
+                    ai_client_module.ai_client.warm_connections(min_idle_seconds=interval),
+                )
+            except Exception:
+                logger.warning("Keep-warm failed", exc_info=True)
+
+
+# シングルトンインスタンス
+warmup = Warmup()
@@ -0,0 +1,5 @@
+"""
+ベンチマーク パッケージ
+
+pytest の単体テストとは別に、`python -m benchmarks.<名前>` で実行する性能計測を提供する。
+"""
@@ -0,0 +1,420 @@
+"""
+負荷試験（HTTPスタック全体）
+
+【機能概要】: 実際のアプリケーション（uvicorn・1ワーカー）を疑似AIプロバイダー
+              （app.cli.fake_provider）に向けて起動し、シナリオごとに同時実行数を段階的に
+              上げながら、スループット・応答時間の分位点・エラー率・イベントループの遅延・
+              メモリ使用量を計測する。結果はJSONに保存し、基準の結果と比較できる
+【実装方針】:
+  - シナリオごとに疑似プロバイダーとアプリケーションを子プロセスとして起動し直す
+    （サーキットブレーカー・同時実行数制限等の状態をシナリオ間で持ち越さない）
+  - 変換結果キャッシュ・類似入力索引・ローカル変換・定型文変換テーブルは無効にし、
+    すべてのリクエストがAIプロバイダーの呼び出し経路を通るようにする
+    （IPごとのレート制限も計測の妨げにならない値にする）
+  - 負荷は同時実行数と同数のクライアントがそれぞれ応答を待ってから次を送る閉ループで
+    かける。各段階の最初の warmup 秒は集計から除く
+  - DBは POSTGRES_* の接続先に接続できる場合はそれを使い、接続できない場合は
+    DBなしで計測する（ログの書き込みは失敗して破棄される。結果の "database" に記録する）
+  - 基準の結果（--baseline）と比較し、スループットの低下または p99 の悪化が
+    --tolerance を超えた段階があれば終了コード1を返す
+【使い方】:
+  python -m benchmarks.load_test --concurrency 1 8 32 --duration 20
+  python -m benchmarks.load_test --scenarios convert --baseline benchmarks/results/base.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.serve import STATS_PATH, percentile
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+
+# 負荷試験中のアプリケーションに設定する端末APIキー
+_API_KEY = "benchmark-api-key"
+
+# 通常時のAIプロバイダーの応答時間（中央値800ms・対数正規分布）
+_NORMAL_PROVIDER = ("--latency", "lognormal", "--median-ms", "800", "--sigma", "0.4")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """負荷試験のシナリオ（送信先のエンドポイントと疑似プロバイダーの設定）"""
+
+    name: str
+    description: str
+    path: str
+    provider_args: tuple[str, ...]
+
+    def payload(self, sequence: int) -> dict[str, str]:
+        """リクエスト本文（入力文はリクエストごとに変え、同一入力の集約を避ける）"""
+        body = {
+            "input_text": f"ベンチマーク{sequence}番の文を送ります",
+            "politeness_level": "polite",
+        }
+        if self.path.endswith("/regenerate"):
+            body["previous_result"] = f"ベンチマーク{sequence}番の文をお送りします。"
+        return body
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            "convert",
+            "通常変換（プロバイダーの応答は中央値800msの対数正規分布）",
+            "/api/v1/ai/convert",
+            _NORMAL_PROVIDER,
+        ),
+        Scenario(
+            "regenerate",
+            "再変換（プロバイダーの応答は convert と同じ）",
+            "/api/v1/ai/regenerate",
+            _NORMAL_PROVIDER,
+        ),
+        Scenario(
+            "rate_limited",
+            "プロバイダーのレート制限（600回/分を超えると retry-after 付きの429）",
+            "/api/v1/ai/convert",
+            (*_NORMAL_PROVIDER, "--requests-per-minute", "600", "--retry-after", "1"),
+        ),
+        Scenario(
+            "degraded",
+            "プロバイダーの劣化（10%が中央値4秒、2%が無応答、2%が接続エラー）",
+            "/api/v1/ai/convert",
+            (
+                "--latency",
+                "bimodal",
+                "--median-ms",
+                "800",
+                "--sigma",
+                "0.4",
+                "--slow-ratio",
+                "0.1",
+                "--slow-median-ms",
+                "4000",
+                "--timeout-ratio",
+                "0.02",
+                "--hang-seconds",
+                "30",
+                "--connection-error-ratio",
+                "0.02",
+            ),
+        ),
+    )
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _database_reachable() -> bool:
+    """POSTGRES_* の接続先にTCP接続できるか"""
+    from app.core.config import settings
+
+    try:
+        with socket.create_connection((settings.POSTGRES_HOST, settings.POSTGRES_PORT), 1):
+            return True
+    except OSError:
+        return False
+
+
+def _app_environment(provider_url: str, log_dir: Path) -> dict[str, str]:
+    """負荷試験用のアプリケーションの環境変数"""
+    return {
+        **os.environ,
+        "ENVIRONMENT": "development",
+        "API_KEYS": _API_KEY,
+        "ANTHROPIC_API_KEY": "benchmark",
+        "ANTHROPIC_BASE_URL": provider_url,
+        "DEFAULT_AI_PROVIDER": "anthropic",
+        "RATE_LIMIT_TIMES": "1000000",
+        "RATE_LIMIT_SECONDS": "1",
+        "CONVERSION_CACHE_ENABLED": "false",
+        "SIMILARITY_INDEX_ENABLED": "false",
+        "LOCAL_CONVERSION_ENABLED": "false",
+        "PHRASE_TABLE_ENABLED": "false",
+        "WARMUP_TIMEOUT_SECONDS": "3",
+        "LOG_LEVEL": "WARNING",
+        "LOG_FILE_PATH": str(log_dir / "app.log"),
+    }
+
+
+@contextmanager
+def _process(args: Sequence[str], env: dict[str, str], log_path: Path) -> Iterator[None]:
+    """子プロセスを起動し、終了時に停止する（出力は log_path に書き出す）"""
+    with log_path.open("wb") as log:
+        process = subprocess.Popen(  # noqa: S603
+            [sys.executable, *args], cwd=BACKEND_DIR, env=env, stdout=log, stderr=log
+        )
+        try:
+            yield
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+async def _wait_until_ready(url: str, log_path: Path, timeout: float = 30.0) -> None:
+    """url が200を返すまで待つ"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready (see {log_path})")
+
+
+async def _wait_for_port(port: int, log_path: Path, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.2)
+            continue
+        writer.close()
+        return
+    raise RuntimeError(f"port {port} did not open (see {log_path})")
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> dict[str, object]:
+    """
+    1段階（1つの同時実行数）の負荷をかけて集計する
+
+    Args:
+        client: アプリケーションに接続するHTTPクライアント
+        scenario: シナリオ
+        concurrency: 同時実行数（閉ループのクライアント数）
+        duration: 集計する時間（秒）
+        warmup: 集計から除く最初の時間（秒）
+
+    Returns:
+        dict[str, object]: 段階の結果
+    """
+    sequence = itertools.count()
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+    start = time.perf_counter()
+    measure_from = start + warmup
+    end = measure_from + duration
+    last_completed = measure_from
+
+    async def worker() -> None:
+        nonlocal last_completed
+        while time.perf_counter() < end:
+            sent_at = time.perf_counter()
+            try:
+                response = await client.post(scenario.path, json=scenario.payload(next(sequence)))
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            completed_at = time.perf_counter()
+            if sent_at >= measure_from:
+                latencies.append(completed_at - sent_at)
+                statuses[status] += 1
+                last_completed = max(last_completed, completed_at)
+
+    async def reset_server_stats() -> None:
+        await asyncio.sleep(warmup)
+        await client.get(STATS_PATH)
+
+    await asyncio.gather(reset_server_stats(), *(worker() for _ in range(concurrency)))
+    server_stats = (await client.get(STATS_PATH)).json()
+
+    elapsed = max(last_completed - measure_from, 1e-9)
+    succeeded = statuses.get("200", 0)
+    total = len(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "rps": round(total / elapsed, 2),
+        "success_rps": round(succeeded / elapsed, 2),
+        "error_rate": round(1 - succeeded / total, 4) if total else 0.0,
+        "latency_ms": {
+            name: round(percentile(latencies, ratio) * 1000, 1)
+            for name, ratio in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+        },
+        "status_counts": dict(statuses),
+        **server_stats,
+    }
+
+
+async def run_scenario(
+    scenario: Scenario,
+    levels: Sequence[int],
+    duration: float,
+    warmup: float,
+    log_dir: Path,
+) -> list[dict[str, object]]:
+    """疑似プロバイダーとアプリケーションを起動し、各段階の負荷をかける"""
+    provider_port, app_port = _free_port(), _free_port()
+    provider_log = log_dir / f"{scenario.name}-provider.log"
+    app_log = log_dir / f"{scenario.name}-app.log"
+    provider_args = ["-m", "app.cli.fake_provider", "--port", str(provider_port), "--seed", "1"]
+    app_env = _app_environment(f"http://127.0.0.1:{provider_port}", log_dir)
+
+    with (
+        _process([*provider_args, *scenario.provider_args], dict(os.environ), provider_log),
+        _process(["-m", "benchmarks.serve", "--port", str(app_port)], app_env, app_log),
+    ):
+        await _wait_for_port(provider_port, provider_log)
+        base_url = f"http://127.0.0.1:{app_port}"
+        await _wait_until_ready(f"{base_url}/api/v1/health/ready", app_log)
+
+        results = []
+        for concurrency in levels:
+            async with httpx.AsyncClient(
+                base_url=base_url,
+                headers={"X-API-Key": _API_KEY},
+                timeout=60,
+                limits=httpx.Limits(
+                    max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1
+                ),
+            ) as client:
+                level = await run_level(client, scenario, concurrency, duration, warmup)
+            results.append(level)
+            _print_level(scenario.name, level)
+        return results
+
+
+def _print_level(scenario: str, level: dict[str, object]) -> None:
+    latency = level["latency_ms"]
+    print(  # noqa: T201
+        f"{scenario:<13} c={level['concurrency']:<4} rps={level['rps']:<8} "
+        f"p50={latency['p50']:<8} p95={latency['p95']:<8} p99={latency['p99']:<8} "  # type: ignore[index]
+        f"err={float(level['error_rate']) * 100:.1f}% "  # type: ignore[arg-type]
+        f"lag_p99={level['loop_lag_p99_ms']}ms rss={level['rss_mb']}MB",
+        flush=True,
+    )
+
+
+def compare_with_baseline(
+    current: dict[str, object], baseline: dict[str, object], tolerance: float
+) -> list[str]:
+    """
+    基準の結果と比較し、悪化した段階を返す
+
+    Args:
+        current: 今回の結果
+        baseline: 基準の結果
+        tolerance: 許容する悪化の割合（0.1 で10%）
+
+    Returns:
+        list[str]: スループットの低下または p99 の悪化が tolerance を超えた段階の説明
+    """
+    regressions = []
+    for name, scenario in current["scenarios"].items():  # type: ignore[attr-defined]
+        base_scenario = baseline["scenarios"].get(name)  # type: ignore[attr-defined]
+        if base_scenario is None:
+            continue
+        base_levels = {level["concurrency"]: level for level in base_scenario["levels"]}
+        for level in scenario["levels"]:
+            base = base_levels.get(level["concurrency"])
+            if base is None:
+                continue
+            label = f"{name} c={level['concurrency']}"
+            if base["rps"] and level["rps"] < base["rps"] * (1 - tolerance):
+                regressions.append(f"{label}: rps {base['rps']} -> {level['rps']}")
+            base_p99, p99 = base["latency_ms"]["p99"], level["latency_ms"]["p99"]
+            if base_p99 and p99 > base_p99 * (1 + tolerance):
+                regressions.append(f"{label}: p99 {base_p99}ms -> {p99}ms")
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> int:
+    started_at = datetime.now(timezone.utc)
+    result: dict[str, object] = {
+        "started_at": started_at.isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": "postgres" if _database_reachable() else "unavailable",
+        "duration_seconds": args.duration,
+        "warmup_seconds": args.warmup,
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="kotonoha-bench-") as log_dir:
+        for name in args.scenarios:
+            scenario = SCENARIOS[name]
+            levels = await run_scenario(
+                scenario, args.concurrency, args.duration, args.warmup, Path(log_dir)
+            )
+            result["scenarios"][name] = {  # type: ignore[index]
+                "description": scenario.description,
+                "levels": levels,
+            }
+
+    output = args.output or RESULTS_DIR / f"{started_at:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"Saved results to {output}")  # noqa: T201
+
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare_with_baseline(result, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")  # noqa: T201
+    return 1 if regressions else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32, 128])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds measured per level")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds excluded per level")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+"""
+リクエスト処理のホットパスのマイクロベンチマーク
+
+【機能概要】: 全リクエストで呼ばれる補助関数（クライアントIPの取得・APIキーの照合・
+              入力文の検証・変換ログの作成・エラー応答の生成）の1回あたりの処理時間を計測し、
+              保存した基準値と比較して悪化を検出する
+【実装方針】:
+  - 各ケースは timeit で number 回の呼び出しを repeat 回計測し、最小値を1回あたりの
+    時間（ns）とする（他プロセスの影響による外れ値を除く）
+  - 計算機の速さ・負荷の違いを吸収するため、ケースごとに純Pythonの固定処理（較正処理）を
+    交互に計測し、比較は較正処理に対する比（relative）で行う
+  - APIキーは5件設定し、照合するキーは最後の1件（全件と比較するため最も遅い場合）とする
+【使い方】:
+  python -m benchmarks.microbench                     # 基準値と比較（悪化があれば終了コード1）
+  python -m benchmarks.microbench --update-baseline   # 基準値を更新
+"""
+
+import argparse
+import json
+import platform
+import timeit
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "microbench.json"
+
+# 設定するAPIキー（照合は最後のキーで行う）
+_API_KEYS = [f"device-key-{index:04d}-0123456789abcdef" for index in range(5)]
+
+_INPUT_TEXT = "  水をください。少し寒いので毛布もお願いします  "
+
+
+def _calibration() -> None:
+    """較正処理（計算機の速さの目安とする純Pythonの固定処理）"""
+    total = 0
+    for index in range(200):
+        total += index * index
+    "".join(str(total) for _ in range(10))
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    """
+    計測するケースを作る
+
+    Returns:
+        dict[str, Callable[[], object]]: ケース名と、1回の処理を行う引数なしの関数
+    """
+    from starlette.requests import Request
+
+    from app.api.v1.endpoints.ai import ERROR_DEFINITIONS, _create_error_response
+    from app.core.config import settings
+    from app.core.rate_limit import get_client_ip
+    from app.core.security import is_valid_api_key
+    from app.models.ai_conversion_logs import AIConversionLog
+    from app.schemas.ai_conversion import validate_input_text
+    from app.utils.exceptions import AITimeoutException
+
+    settings.API_KEYS = ",".join(_API_KEYS)
+    settings.TRUSTED_PROXY_COUNT = 1
+
+    def request(headers: list[tuple[bytes, bytes]]) -> Request:
+        return Request({"type": "http", "headers": headers, "client": ("10.0.0.1", 50000)})
+
+    direct = request([])
+    forwarded = request([(b"x-forwarded-for", b"203.0.113.7, 198.51.100.2, 10.0.0.2")])
+    error_info = ERROR_DEFINITIONS[AITimeoutException]
+
+    return {
+        "get_client_ip": lambda: get_client_ip(direct),
+        "get_client_ip_forwarded": lambda: get_client_ip(forwarded),
+        "api_keys_list": lambda: settings.API_KEYS_LIST,
+        "is_valid_api_key": lambda: is_valid_api_key(_API_KEYS[-1]),
+        "is_valid_api_key_rejected": lambda: is_valid_api_key("device-key-unknown"),
+        "validate_input_text": lambda: validate_input_text(_INPUT_TEXT),
+        "hash_text": lambda: AIConversionLog.hash_text(_INPUT_TEXT),
+        "create_log": lambda: AIConversionLog.create_log(
+            input_text=_INPUT_TEXT,
+            output_text="お水をいただけますか。",
+            politeness_level="polite",
+            conversion_time_ms=812,
+        ),
+        "create_error_response": lambda: _create_error_response(error_info),
+    }
+
+
+def measure(func: Callable[[], object], number: int, repeat: int) -> tuple[float, float]:
+    """
+    func と較正処理の1回あたりの処理時間（ns）を返す
+
+    【実装方針】: 計算機の負荷の変動が両者に同じように及ぶよう、func と較正処理を
+                  交互に repeat 回ずつ計測し、それぞれの最小値を採る
+
+    Args:
+        func: 計測する関数
+        number: 1回の計測での呼び出し回数
+        repeat: 計測の回数
+
+    Returns:
+        tuple[float, float]: func の処理時間と較正処理の処理時間（ns）
+    """
+    case_timer, calibration_timer = timeit.Timer(func), timeit.Timer(_calibration)
+    case_seconds, calibration_seconds = [], []
+    for _ in range(repeat):
+        case_seconds.append(case_timer.timeit(number))
+        calibration_seconds.append(calibration_timer.timeit(max(1, number // 20)))
+    return (
+        min(case_seconds) / number * 1e9,
+        min(calibration_seconds) / max(1, number // 20) * 1e9,
+    )
+
+
+def run(names: Sequence[str] | None, number: int, repeat: int) -> dict[str, object]:
+    """
+    各ケースを計測する
+
+    Args:
+        names: 計測するケース名（None の場合は全ケース）
+        number: 1回の計測での呼び出し回数
+        repeat: 計測の回数
+
+    Returns:
+        dict[str, object]: ケースごとの処理時間（ns）・較正処理の処理時間（ns）・較正処理に対する比
+    """
+    cases = build_cases()
+    results = {}
+    for name in names or cases:
+        ns, calibration_ns = measure(cases[name], number, repeat)
+        results[name] = {
+            "ns": round(ns, 1),
+            "calibration_ns": round(calibration_ns, 1),
+            "relative": round(ns / calibration_ns, 4),
+        }
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": results,
+    }
+
+
+def compare(current: dict[str, object], baseline: dict[str, object], threshold: float) -> list[str]:
+    """
+    基準値と比較し、悪化したケースを返す
+
+    Args:
+        current: 今回の結果
+        baseline: 基準値
+        threshold: 許容する悪化の割合（0.3 で30%）
+
+    Returns:
+        list[str]: 較正処理に対する比が threshold を超えて大きくなったケースの説明
+    """
+    regressions = []
+    for name, case in current["cases"].items():  # type: ignore[attr-defined]
+        base = baseline["cases"].get(name)  # type: ignore[attr-defined]
+        if base is None:
+            continue
+        if case["relative"] > base["relative"] * (1 + threshold):
+            change = case["relative"] / base["relative"] - 1
+            regressions.append(
+                f"{name}: {base['ns']}ns -> {case['ns']}ns "
+                f"(relative {base['relative']} -> {case['relative']}, +{change:.0%})"
+            )
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.microbench")
+    parser.add_argument("--cases", nargs="+", default=None)
+    parser.add_argument("--number", type=int, default=20000, help="calls per measurement")
+    parser.add_argument("--repeat", type=int, default=7, help="measurements per case")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="save the results as the new baseline"
+    )
+    args = parser.parse_args(argv)
+
+    result = run(args.cases, args.number, args.repeat)
+    baseline = (
+        json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else None
+    )
+    for name, case in result["cases"].items():  # type: ignore[attr-defined]
+        base = baseline["cases"].get(name) if baseline else None
+        reference = f"  (baseline {base['ns']:>9}ns)" if base else ""
+        print(f"{name:<28}{case['ns']:>10}ns{reference}")  # noqa: T201
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.baseline}")  # noqa: T201
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline")  # noqa: T201
+        return 0
+
+    regressions = compare(result, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")  # noqa: T201
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""
+負荷試験用のアプリケーションサーバー
+
+【機能概要】: app.main:app を uvicorn で起動し、負荷試験の計測値（イベントループの遅延・
+              メモリ使用量）を返す /__bench__/stats を追加する。benchmarks.load_test が
+              シナリオごとに子プロセスとして起動する
+【実装方針】:
+  - イベントループの遅延は、一定間隔で sleep するタスクの起床の遅れとして計測する
+    （リクエスト処理がループを占有している時間の目安）
+  - /__bench__/stats は前回の取得以降の値を返し、計測値をリセットする
+    （同時実行数の段階ごとに区切って集計するため）
+  - 本番と同じく uvloop がインストールされていれば uvloop で動かす
+【使い方】:
+  python -m benchmarks.serve --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+STATS_PATH = "/__bench__/stats"
+
+# イベントループの遅延の計測間隔（秒）
+_LAG_INTERVAL_SECONDS = 0.01
+
+
+def percentile(samples: Sequence[float], ratio: float) -> float:
+    """
+    サンプルの分位点を返す（最近傍法）
+
+    Args:
+        samples: サンプル（並び順は問わない）
+        ratio: 0〜1 の分位（0.99 で p99）
+
+    Returns:
+        float: 分位点（サンプルがない場合は0）
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(ratio * len(ordered)) - 1))
+    return ordered[index]
+
+
+def memory_usage() -> dict[str, float]:
+    """
+    プロセスのメモリ使用量（MB）を返す
+
+    Returns:
+        dict[str, float]: rss_mb（現在値。/proc がない環境では peak と同じ）と peak_rss_mb
+    """
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    rss_mb = peak_mb
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                rss_mb = int(line.split()[1]) / 1024
+                break
+    return {"rss_mb": round(rss_mb, 1), "peak_rss_mb": round(peak_mb, 1)}
+
+
+class LoopLagProbe:
+    """イベントループの遅延（sleep の起床の遅れ）を計測する"""
+
+    def __init__(self, interval: float = _LAG_INTERVAL_SECONDS) -> None:
+        self.interval = interval
+        self._samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def snapshot(self) -> dict[str, float]:
+        """前回の取得以降の遅延（ミリ秒）の分位点を返し、計測値をリセットする"""
+        samples, self._samples = self._samples, []
+        return {
+            "loop_lag_p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "loop_lag_p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "loop_lag_max_ms": round(max(samples, default=0.0) * 1000, 2),
+        }
+
+
+class BenchmarkApp:
+    """計測用エンドポイントを追加するASGIラッパー"""
+
+    def __init__(self, app: ASGIApp, probe: LoopLagProbe) -> None:
+        self.app = app
+        self.probe = probe
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] == STATS_PATH:
+            body = json.dumps({**self.probe.snapshot(), **memory_usage()}).encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"application/json")],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+        await self.app(scope, receive, send)
+
+
+async def serve(host: str, port: int) -> None:
+    """アプリケーションを起動し、終了シグナルを受けるまで待つ"""
+    import uvicorn
+
+    from app.main import app
+
+    probe = LoopLagProbe()
+    probe.start()
+    config = uvicorn.Config(
+        BenchmarkApp(app, probe), host=host, port=port, log_level="warning", access_log=False
+    )
+    await uvicorn.Server(config).serve()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(serve(args.host, args.port))
+    else:
+        uvloop.run(serve(args.host, args.port))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
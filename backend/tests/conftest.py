@@ -28,7 +28,39 @@ TEST_DATABASE_URL = os.getenv(
 
 # 【テーブル名定義】: TRUNCATE対象のアプリケーションテーブル（alembic_versionは除く）
 # 🔵 test_migration_execution.py が alembic_version を参照するため TRUNCATE 対象から除外
-_APP_TABLES = ["ai_conversion_logs", "error_logs"]
+_APP_TABLES = ["ai_conversion_logs", "error_logs", "phrase_table_entries", "phrase_table_versions"]
+
+
+@pytest.fixture(autouse=True)
+async def reset_conversion_cache():
+    """
+    各テストの前後でAI変換結果キャッシュと類似入力索引を空にする
+
+    【実装方針】: 同一（類似）入力を用いる別テストの変換結果がキャッシュから返り、
+                  AIクライアントのモックが呼ばれなくなることを防ぐ
+    """
+    from app.utils.conversion_cache import conversion_cache
+    from app.utils.similarity_index import similarity_index
+
+    await conversion_cache.clear()
+    similarity_index.clear()
+    yield
+    await conversion_cache.clear()
+    similarity_index.clear()
+
+
+@pytest.fixture(autouse=True)
+def disable_local_conversion(monkeypatch):
+    """
+    ローカル変換（定型句辞書・語尾の規則）を既定で無効にする
+
+    【実装方針】: 「ありがとう」等の定型句を入力とするテストでAIクライアントのモックが
+                  呼ばれなくなることを防ぐ。ローカル変換のテストでは
+                  settings.LOCAL_CONVERSION_ENABLED を明示的に有効にする
+    """
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "LOCAL_CONVERSION_ENABLED", False)
 
 
 @pytest.fixture(scope="session")
@@ -215,3 +215,13 @@ class TestIsValidApiKey:
         """許可リストが空の場合は常にFalseを返す"""
         monkeypatch.setattr(settings, "API_KEYS", "")
         assert is_valid_api_key("any-key") is False
+
+    def test_changing_api_keys_takes_effect_immediately(self, monkeypatch):
+        """照合用に変換したキーは再利用されるが、API_KEYS の変更には追従する"""
+        monkeypatch.setattr(settings, "API_KEYS", "device-key-aaaa")
+        assert is_valid_api_key("device-key-aaaa") is True
+
+        monkeypatch.setattr(settings, "API_KEYS", "device-key-bbbb")
+        assert is_valid_api_key("device-key-aaaa") is False
+        assert is_valid_api_key("device-key-bbbb") is True
+        assert settings.API_KEYS_LIST == ["device-key-bbbb"]
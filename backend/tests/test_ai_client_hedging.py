@@ -0,0 +1,209 @@
+"""
+AI変換ヘッジ（テールレイテンシ対策）テスト
+
+【テスト目的】: プライマリの応答が遅い場合にセカンダリへ同時送信し、先に成功した結果を
+               採用してもう一方をキャンセルすること、応答したプロバイダーが記録されることを検証
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.main import app
+from app.utils.ai_client import AIClient, consume_served_provider
+from app.utils.exceptions import AIConversionException, AITimeoutException
+from app.utils.latency_window import LatencyWindow
+
+
+@pytest.fixture
+def hedging(monkeypatch):
+    """ヘッジを有効化し、待ち時間を短くする"""
+    monkeypatch.setattr(settings, "AI_HEDGING_ENABLED", True)
+    monkeypatch.setattr(settings, "AI_HEDGING_DEFAULT_DELAY_SECONDS", 0.02)
+    monkeypatch.setattr(settings, "AI_HEDGING_MIN_DELAY_SECONDS", 0.0)
+
+
+def _hedging_client(anthropic_behaviour, openai_behaviour) -> AIClient:
+    """プロバイダーごとの変換処理を差し替えたクライアントを作る"""
+    client = AIClient()
+    client.anthropic_client = object()
+    client.openai_client = object()
+    client.convert_text_anthropic = AsyncMock(side_effect=anthropic_behaviour)
+    client.convert_text_openai = AsyncMock(side_effect=openai_behaviour)
+    return client
+
+
+async def _slow(*_args):
+    await asyncio.sleep(10)
+    return "遅い結果", 10000
+
+
+async def _fast(*_args):
+    return "速い結果", 5
+
+
+class TestLatencyWindow:
+    def test_percentile_uses_nearest_rank(self):
+        window = LatencyWindow(max_samples=100)
+        for value in range(1, 101):
+            window.record(value / 100)
+        assert window.percentile(95) == 0.95
+        assert window.percentile(50) == 0.5
+
+    def test_oldest_samples_are_discarded(self):
+        window = LatencyWindow(max_samples=2)
+        for value in (9.0, 1.0, 2.0):
+            window.record(value)
+        assert len(window) == 2
+        assert window.percentile(100) == 2.0
+
+    def test_empty_window_has_no_percentile(self):
+        assert LatencyWindow(max_samples=5).percentile(95) is None
+
+
+class TestHedgedConversion:
+    @pytest.mark.asyncio
+    async def test_secondary_wins_when_primary_is_slow(self, hedging):
+        cancelled = asyncio.Event()
+
+        async def slow_primary(*_args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        client = _hedging_client(slow_primary, _fast)
+
+        result = await client.convert_text("ありがとう", "polite", "anthropic")
+
+        assert result == ("速い結果", 5)
+        assert consume_served_provider() == "openai"
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert client.hedged_calls == 1
+        assert client.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loser_finishes_before_the_call_returns(self, hedging):
+        cleaned_up = False
+
+        async def slow_primary(*_args):
+            nonlocal cleaned_up
+            try:
+                await asyncio.sleep(10)
+            finally:
+                # キャンセル後の後処理（ブレーカー・同時実行数制限の解放に相当）
+                await asyncio.sleep(0.05)
+                cleaned_up = True
+
+        client = _hedging_client(slow_primary, _fast)
+
+        assert await client.convert_text("ありがとう", "polite", "anthropic") == ("速い結果", 5)
+        assert cleaned_up
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_does_not_hedge(self, hedging):
+        client = _hedging_client(_fast, _slow)
+
+        assert await client.convert_text("ありがとう", "polite", "anthropic") == ("速い結果", 5)
+        assert consume_served_provider() == "anthropic"
+        client.convert_text_openai.assert_not_called()
+        assert client.hedged_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_primary_error_is_raised_when_both_fail(self, hedging):
+        async def slow_timeout(*_args):
+            await asyncio.sleep(0.05)
+            raise AITimeoutException("primary timeout")
+
+        async def failing(*_args):
+            raise AIConversionException("secondary error")
+
+        client = _hedging_client(slow_timeout, failing)
+
+        with pytest.raises(AITimeoutException):
+            await client.convert_text("ありがとう", "polite", "anthropic")
+
+    @pytest.mark.asyncio
+    async def test_secondary_failure_falls_back_to_primary_result(self, hedging):
+        async def slowish(*_args):
+            await asyncio.sleep(0.05)
+            return "プライマリ", 50
+
+        async def failing(*_args):
+            raise AIConversionException("secondary error")
+
+        client = _hedging_client(slowish, failing)
+
+        assert await client.convert_text("ありがとう", "polite", "anthropic") == ("プライマリ", 50)
+        assert client.hedge_wins == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        client = _hedging_client(_fast, _fast)
+
+        await client.convert_text("ありがとう", "polite", "anthropic")
+
+        client.convert_text_openai.assert_not_called()
+
+    def test_delay_uses_percentile_once_enough_samples(self, hedging, monkeypatch):
+        monkeypatch.setattr(settings, "AI_HEDGING_MIN_SAMPLES", 3)
+        client = _hedging_client(_fast, _fast)
+        assert client._hedge_delay("anthropic") == 0.02
+
+        for seconds in (0.5, 1.0, 1.5):
+            client._latency_window("anthropic").record(seconds)
+        assert client._hedge_delay("anthropic") == 1.5
+
+
+class TestServedProviderLogging:
+    @pytest.mark.asyncio
+    async def test_conversion_log_records_winning_provider(self, hedging):
+        limiter.reset()
+        client = _hedging_client(_slow, _fast)
+
+        with (
+            patch("app.utils.ai_client.ai_client", client),
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as http:
+                response = await http.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "ありがとう", "politeness_level": "polite"},
+                )
+
+        limiter.reset()
+        assert response.status_code == 200
+        assert response.json()["converted_text"] == "速い結果"
+        assert log.await_args.kwargs["ai_provider"] == "openai"
+
+    @pytest.mark.asyncio
+    async def test_answer_from_the_other_provider_is_not_cached(self, hedging):
+        limiter.reset()
+        client = _hedging_client(_slow, _fast)
+
+        with (
+            patch("app.utils.ai_client.ai_client", client),
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as http:
+                for _ in range(2):
+                    limiter.reset()
+                    response = await http.post(
+                        "/api/v1/ai/convert",
+                        json={"input_text": "ありがとう", "politeness_level": "polite"},
+                    )
+                    assert response.status_code == 200
+
+        limiter.reset()
+        # 既定プロバイダー（anthropic）のキーにセカンダリの結果が保存されていれば、
+        # 2回目はキャッシュから返りAIを呼び出さない
+        assert client.convert_text_openai.await_count == 2
@@ -0,0 +1,138 @@
+"""
+プロンプトキャッシュテスト
+
+【テスト目的】: 丁寧さレベルごとの固定のシステムプロンプトがリクエストの先頭に置かれ、
+               OpenAI では prompt_cache_key が付くこと（Anthropic ではシステムプロンプトが
+               キャッシュの最小長に満たないため cache_control を付けないこと）、
+               usage のキャッシュから読み込んだトークン数がメトリクスに記録されることを検証
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.config import settings
+from app.utils import metrics
+from app.utils.ai_client import AIClient, _record_stream_usage
+
+
+def _anthropic_client(usage: object = None) -> AIClient:
+    client = AIClient()
+    client.anthropic_client = MagicMock()
+    client.anthropic_client.messages.create = AsyncMock(
+        return_value=SimpleNamespace(content=[SimpleNamespace(text="お水をください")], usage=usage)
+    )
+    return client
+
+
+def _openai_client(usage: object = None) -> AIClient:
+    client = AIClient()
+    client.openai_client = MagicMock()
+    message = SimpleNamespace(content="お水をください")
+    client.openai_client.chat.completions.create = AsyncMock(
+        return_value=SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+    )
+    return client
+
+
+class TestStaticSystemPrefix:
+    @pytest.mark.asyncio
+    async def test_anthropic_system_prompt_is_independent_of_input(self):
+        client = _anthropic_client()
+
+        await client.convert_text_anthropic("水", "polite")
+        await client.convert_text_anthropic("ありがとう", "polite")
+
+        first, second = (
+            call.kwargs for call in client.anthropic_client.messages.create.await_args_list
+        )
+        assert first["system"] == second["system"]
+        assert "cache_control" not in first["system"][0]
+        assert "敬語" in first["system"][0]["text"]
+        assert "水" not in first["system"][0]["text"]
+        assert "入力文: 水" in first["messages"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_openai_puts_system_prompt_first_with_cache_key(self):
+        client = _openai_client()
+
+        await client.convert_text_openai("水", "casual")
+
+        kwargs = client.openai_client.chat.completions.create.await_args.kwargs
+        assert kwargs["messages"][0] == {
+            "role": "system",
+            "content": client._system_prompt("casual"),
+        }
+        assert kwargs["messages"][1]["role"] == "user"
+        assert kwargs["prompt_cache_key"].endswith("-casual")
+
+    def test_system_prompt_differs_per_level_and_falls_back_to_normal(self):
+        client = AIClient()
+        prompts = {level: client._system_prompt(level) for level in ("casual", "normal", "polite")}
+
+        assert len(set(prompts.values())) == 3
+        assert client._system_prompt("invalid") == prompts["normal"]
+
+    def test_cache_hints_can_be_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_PROMPT_CACHE_ENABLED", False)
+        client = AIClient()
+
+        openai_request = client._openai_request("normal", "入力文: 水")
+
+        assert "prompt_cache_key" not in openai_request
+
+
+class TestUsageMetrics:
+    @pytest.mark.asyncio
+    async def test_anthropic_cache_reads_are_counted(self):
+        cache_read = metrics.ai_tokens.labels("anthropic", "cache_read")
+        uncached = metrics.ai_tokens.labels("anthropic", "input")
+        before_read, before_input = cache_read.value, uncached.value
+        usage = SimpleNamespace(
+            input_tokens=12,
+            cache_read_input_tokens=1100,
+            cache_creation_input_tokens=0,
+            output_tokens=8,
+        )
+
+        await _anthropic_client(usage).convert_text_anthropic("水", "polite")
+
+        assert cache_read.value == before_read + 1100
+        assert uncached.value == before_input + 12
+
+    @pytest.mark.asyncio
+    async def test_openai_cached_tokens_are_split_from_prompt_tokens(self):
+        cache_read = metrics.ai_tokens.labels("openai", "cache_read")
+        uncached = metrics.ai_tokens.labels("openai", "input")
+        before_read, before_input = cache_read.value, uncached.value
+        usage = SimpleNamespace(
+            prompt_tokens=1200,
+            completion_tokens=10,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+        )
+
+        await _openai_client(usage).convert_text_openai("水", "polite")
+
+        assert cache_read.value == before_read + 1024
+        assert uncached.value == before_input + 176
+
+    def test_anthropic_stream_usage_is_taken_from_message_start(self):
+        cache_write = metrics.ai_tokens.labels("anthropic", "cache_write")
+        output = metrics.ai_tokens.labels("anthropic", "output")
+        before_write, before_output = cache_write.value, output.value
+        start_usage = SimpleNamespace(
+            input_tokens=5, cache_creation_input_tokens=900, output_tokens=1
+        )
+
+        _record_stream_usage(
+            "anthropic",
+            SimpleNamespace(type="message_start", message=SimpleNamespace(usage=start_usage)),
+        )
+        _record_stream_usage(
+            "anthropic",
+            SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=7)),
+        )
+
+        assert cache_write.value == before_write + 900
+        assert output.value == before_output + 7
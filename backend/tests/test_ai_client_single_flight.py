@@ -0,0 +1,254 @@
+"""
+AI変換 single-flight（同時呼び出し集約）テスト
+
+【テスト目的】: 同一 (入力, 丁寧さレベル, プロバイダー, 優先度) の同時変換が1回のAPI呼び出しに
+               集約されること、共有呼び出しが最初の呼び出し元のデッドラインを引き継がないこと、
+               キャンセル・例外が正しく扱われることを検証
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.config import settings
+from app.utils.ai_client import AIClient, _SingleFlight
+from app.utils.exceptions import AITimeoutException
+from app.utils.request_deadline import current_deadline, set_deadline
+from app.utils.request_priority import RequestPriority, current_priority, set_priority
+
+
+def _client_with_slow_anthropic(gate: asyncio.Event) -> AIClient:
+    """gate がセットされるまで応答しない Anthropic モックを持つクライアントを作る"""
+
+    async def create(**_kwargs):
+        await gate.wait()
+        return SimpleNamespace(content=[SimpleNamespace(text="ありがとうございます")])
+
+    client = AIClient()
+    client.anthropic_client = AsyncMock()
+    client.anthropic_client.messages.create = AsyncMock(side_effect=create)
+    return client
+
+
+class TestConvertTextSingleFlight:
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_requests_share_one_call(self):
+        gate = asyncio.Event()
+        client = _client_with_slow_anthropic(gate)
+
+        tasks = [
+            asyncio.create_task(client.convert_text("ありがとう", "polite", "anthropic"))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*tasks)
+
+        assert client.anthropic_client.messages.create.await_count == 1
+        assert {text for text, _ in results} == {"ありがとうございます"}
+        assert client._single_flight.coalesced_calls == 4
+        assert len(client._single_flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_different_politeness_levels_are_not_coalesced(self):
+        gate = asyncio.Event()
+        client = _client_with_slow_anthropic(gate)
+
+        tasks = [
+            asyncio.create_task(client.convert_text("ありがとう", level, "anthropic"))
+            for level in ("casual", "normal", "polite")
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+
+        assert client.anthropic_client.messages.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_shared_call_does_not_inherit_the_first_callers_deadline(self):
+        gate = asyncio.Event()
+        client = _client_with_slow_anthropic(gate)
+        seen: list[tuple[float | None, RequestPriority]] = []
+        create = client.anthropic_client.messages.create.side_effect
+
+        async def recording_create(**kwargs):
+            seen.append((current_deadline(), current_priority()))
+            return await create(**kwargs)
+
+        client.anthropic_client.messages.create.side_effect = recording_create
+
+        async def convert(deadline: float | None):
+            set_deadline(deadline)
+            return await client.convert_text("ありがとう", "polite", "anthropic")
+
+        tasks = [
+            asyncio.create_task(convert(deadline)) for deadline in (time.monotonic() + 0.5, None)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+
+        assert seen == [(None, RequestPriority.INTERACTIVE)]
+
+    @pytest.mark.asyncio
+    async def test_each_caller_waits_only_until_its_own_deadline(self):
+        gate = asyncio.Event()
+        client = _client_with_slow_anthropic(gate)
+
+        async def convert(deadline: float | None):
+            set_deadline(deadline)
+            return await client.convert_text("ありがとう", "polite", "anthropic")
+
+        short = asyncio.create_task(convert(time.monotonic() + 0.05))
+        long = asyncio.create_task(convert(None))
+
+        with pytest.raises(AITimeoutException):
+            await short
+        gate.set()
+
+        assert (await long)[0] == "ありがとうございます"
+        assert client.anthropic_client.messages.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_different_priorities_are_not_coalesced(self):
+        gate = asyncio.Event()
+        client = _client_with_slow_anthropic(gate)
+
+        async def convert(priority: RequestPriority):
+            set_priority(priority)
+            return await client.convert_text("ありがとう", "polite", "anthropic")
+
+        tasks = [
+            asyncio.create_task(convert(priority))
+            for priority in (RequestPriority.BULK, RequestPriority.INTERACTIVE)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+
+        assert client.anthropic_client.messages.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_can_be_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_SINGLE_FLIGHT_ENABLED", False)
+        gate = asyncio.Event()
+        client = _client_with_slow_anthropic(gate)
+
+        tasks = [
+            asyncio.create_task(client.convert_text("ありがとう", "polite", "anthropic"))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+
+        assert client.anthropic_client.messages.create.await_count == 2
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_error_is_propagated_to_every_waiter(self):
+        flight = _SingleFlight()
+        gate = asyncio.Event()
+        calls = 0
+
+        async def failing():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            raise AITimeoutException("timeout")
+
+        tasks = [asyncio.create_task(flight.do("k", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert calls == 1
+        assert all(isinstance(result, AITimeoutException) for result in results)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_one_waiter_cancelling_does_not_affect_others(self):
+        flight = _SingleFlight()
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return "結果"
+
+        leaving = asyncio.create_task(flight.do("k", work))
+        staying = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await staying == "結果"
+        assert leaving.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_shared_call_is_cancelled_when_last_waiter_leaves(self):
+        flight = _SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert len(flight) == 0
+
+        # 中止後の同一キー呼び出しは新規に実行される
+        async def fresh():
+            return "新規"
+
+        assert await flight.do("k", fresh) == "新規"
+
+    @pytest.mark.asyncio
+    async def test_waiter_stops_waiting_at_its_own_timeout(self):
+        flight = _SingleFlight()
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return "結果"
+
+        impatient = asyncio.create_task(flight.do("k", work, timeout=0.01))
+        patient = asyncio.create_task(flight.do("k", work))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        gate.set()
+
+        assert await patient == "結果"
+
+    @pytest.mark.asyncio
+    async def test_shared_call_is_cancelled_when_the_last_waiter_times_out(self):
+        flight = _SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def hanging():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("k", hanging, timeout=0.01)
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert len(flight) == 0
@@ -0,0 +1,267 @@
+"""
+AI一括変換エンドポイントテスト（POST /api/v1/ai/convert/batch）
+
+【テストファイル目的】: 項目ごとの結果・エラー、同時実行数の制限、まとめ変換とその切り替え、
+                        項目数によるレート制限、ログの一括記録、AIClient側のまとめ変換を検証
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.main import app
+from app.utils import ai_client as ai_client_module
+from app.utils.ai_client import AIClient
+from app.utils.exceptions import AIConversionException, AITimeoutException
+
+BATCH_URL = "/api/v1/ai/convert/batch"
+
+
+@pytest.fixture(autouse=True)
+async def reset_limiter():
+    """各テスト実行前にリミッターのストレージをリセット"""
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+def _items(*pairs: tuple[str, str]) -> list[dict[str, str]]:
+    return [{"input_text": text, "politeness_level": level} for text, level in pairs]
+
+
+async def _post(body: dict) -> object:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post(BATCH_URL, json=body)
+
+
+# ================================================================================
+# エンドポイント
+# ================================================================================
+
+
+class TestConvertBatchEndpoint:
+    @pytest.mark.asyncio
+    async def test_returns_per_item_results_and_errors(self):
+        async def fake_convert(input_text, politeness_level):
+            if input_text == "失敗する":
+                raise AITimeoutException("timeout")
+            return f"{input_text}（{politeness_level}）", 100
+
+        body = {
+            "items": _items(
+                ("水 ぬるく", "polite"), ("失敗する", "polite"), ("ありがとう", "casual")
+            )
+        }
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch(
+                "app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock
+            ) as log,
+        ):
+            mock_ai_client.convert_text = AsyncMock(side_effect=fake_convert)
+            response = await _post(body)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 2
+        assert data["failed"] == 1
+        results = data["results"]
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert results[0]["converted_text"] == "水 ぬるく（polite）"
+        assert results[1]["converted_text"] is None
+        assert results[1]["error"]["code"] == "AI_API_TIMEOUT"
+        assert results[1]["error"]["status_code"] == 504
+        assert results[2]["error"] is None
+
+        log.assert_awaited_once()
+        entries = log.await_args.args[1]
+        assert [entry.is_success for entry in entries] == [True, False, True]
+        assert len({entry.session_id for entry in entries}) == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_items_are_converted_once(self):
+        body = {"items": _items(("ありがとう", "polite"), ("ありがとう", "polite"))}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("ありがとうございます", 50))
+            response = await _post(body)
+
+        assert response.json()["succeeded"] == 2
+        mock_ai_client.convert_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_items_answered_by_another_provider_are_not_cached(self):
+        body = {"items": _items(("おはよう", "polite"), ("おやすみ", "polite"))}
+        fallback = "openai" if settings.DEFAULT_AI_PROVIDER == "anthropic" else "anthropic"
+
+        async def fake_convert(input_text, politeness_level):
+            if input_text == "おやすみ":
+                # サーキットブレーカーにより切り替え先のプロバイダーが応答した
+                ai_client_module.set_served_provider(fallback)
+            return f"{input_text}（変換）", 10
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(side_effect=fake_convert)
+            first = await _post(body)
+            limiter.reset()
+            second = await _post(body)
+
+        assert first.json()["succeeded"] == second.json()["succeeded"] == 2
+        converted = [
+            call.kwargs["input_text"] for call in mock_ai_client.convert_text.await_args_list
+        ]
+        assert sorted(converted) == ["おはよう", "おやすみ", "おやすみ"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_BATCH_CONCURRENCY", 2)
+        running = 0
+        peak = 0
+
+        async def fake_convert(input_text, politeness_level):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return input_text, 10
+
+        body = {"items": _items(*((f"定型文{i}", "normal") for i in range(6)))}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(side_effect=fake_convert)
+            response = await _post(body)
+
+        assert response.json()["succeeded"] == 6
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_packed_mode_groups_items_by_level(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_BATCH_PACK_SIZE", 2)
+
+        async def fake_packed(input_texts, politeness_level):
+            return [f"{text}!" for text in input_texts], 300
+
+        body = {
+            "items": _items(("あ い", "polite"), ("う え", "casual"), ("お か", "polite")),
+            "pack": True,
+        }
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_texts_packed = AsyncMock(side_effect=fake_packed)
+            mock_ai_client.convert_text = AsyncMock()
+            response = await _post(body)
+
+        results = response.json()["results"]
+        assert [r["converted_text"] for r in results] == ["あ い!", "う え!", "お か!"]
+        calls = [c.kwargs for c in mock_ai_client.convert_texts_packed.await_args_list]
+        assert {"input_texts": ["あ い", "お か"], "politeness_level": "polite"} in calls
+        assert {"input_texts": ["う え"], "politeness_level": "casual"} in calls
+        mock_ai_client.convert_text.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_packed_failure_falls_back_to_per_item(self):
+        body = {"items": _items(("あ い", "polite"), ("う え", "polite")), "pack": True}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_texts_packed = AsyncMock(
+                side_effect=AIConversionException("count mismatch")
+            )
+            mock_ai_client.convert_text = AsyncMock(return_value=("変換結果", 80))
+            response = await _post(body)
+
+        assert response.json()["succeeded"] == 2
+        assert mock_ai_client.convert_text.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_item_count_is_charged_against_batch_limit(self):
+        body = {"items": _items(*((f"定型文{i}", "normal") for i in range(100)))}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("変換結果", 10))
+            first = await _post(body)
+            second = await _post(body)
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        # 超過した一括変換用の制限の値を返す（/convert の制限の値ではない）
+        assert second.headers["Retry-After"] == str(settings.BATCH_RATE_LIMIT_SECONDS)
+        assert second.headers["X-RateLimit-Limit"] == str(settings.BATCH_RATE_LIMIT_ITEMS)
+        assert second.json()["error"]["retry_after"] == settings.BATCH_RATE_LIMIT_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_each_request_is_charged_its_own_item_count(self):
+        count = settings.BATCH_RATE_LIMIT_ITEMS * 2 // 5
+        body = {"items": _items(*((f"定型文{i}", "normal") for i in range(count)))}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("変換結果", 10))
+            statuses = [(await _post(body)).status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+
+    @pytest.mark.asyncio
+    async def test_empty_items_are_rejected(self):
+        response = await _post({"items": []})
+        assert response.status_code == 422
+
+
+# ================================================================================
+# AIClient.convert_texts_packed
+# ================================================================================
+
+
+class TestConvertTextsPacked:
+    @pytest.mark.asyncio
+    async def test_parses_json_array_in_order(self):
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(
+                content=[SimpleNamespace(text='["お水をください", "ありがとうございます"]')]
+            )
+        )
+
+        texts, _ = await client.convert_texts_packed(["水", "ありがとう"], "polite", "anthropic")
+
+        assert texts == ["お水をください", "ありがとうございます"]
+        prompt = client.anthropic_client.messages.create.await_args.kwargs["messages"][0]["content"]
+        assert "1. 水" in prompt and "2. ありがとう" in prompt
+
+    @pytest.mark.asyncio
+    async def test_count_mismatch_raises(self):
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(content=[SimpleNamespace(text='["お水をください"]')])
+        )
+
+        with pytest.raises(AIConversionException):
+            await client.convert_texts_packed(["水", "ありがとう"], "polite", "anthropic")
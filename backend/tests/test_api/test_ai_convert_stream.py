@@ -0,0 +1,273 @@
+"""
+AI変換ストリーミングエンドポイントテスト（POST /api/v1/ai/convert/stream）
+
+【テストファイル目的】: テキスト断片のSSE転送、完了時のログ記録、デッドライン、
+                        AIClient側のストリーミングAPI利用（同時実行数の枠をストリームの終了まで
+                        保持し、結果をサーキットブレーカーに記録すること）を検証
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.main import app
+from app.utils.ai_client import AIClient, consume_served_provider
+from app.utils.exceptions import (
+    AIConversionException,
+    AIRateLimitException,
+    AITimeoutException,
+)
+
+
+@pytest.fixture(autouse=True)
+async def reset_limiter():
+    """各テスト実行前にリミッターのストレージをリセット"""
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    """SSE応答本文を (イベント名, データ) のリストに変換する"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class _FakeStream:
+    """プロバイダーSDKのストリームを模したオブジェクト"""
+
+    def __init__(self, events, delay: float = 0.0):
+        self._events = list(events)
+        self._delay = delay
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._events:
+            raise StopAsyncIteration
+        await asyncio.sleep(self._delay)
+        return self._events.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+def _anthropic_delta(text: str) -> SimpleNamespace:
+    return SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text=text))
+
+
+# ================================================================================
+# エンドポイント
+# ================================================================================
+
+
+class TestConvertStreamEndpoint:
+    @pytest.mark.asyncio
+    async def test_forwards_deltas_and_logs_full_text(self):
+        async def fake_stream(**_kwargs):
+            for delta in ("お水を", "ぬるめで", "お願いします"):
+                yield delta
+
+        request_body = {"input_text": "水 ぬるく", "politeness_level": "polite"}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            mock_ai_client.stream_convert_text = fake_stream
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post("/api/v1/ai/convert/stream", json=request_body)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_events(response.text)
+        assert [name for name, _ in events] == ["delta", "delta", "delta", "done"]
+        assert events[-1][1]["converted_text"] == "お水をぬるめでお願いします"
+
+        log.assert_awaited_once()
+        kwargs = log.await_args.kwargs
+        assert kwargs["is_success"] is True
+        assert kwargs["output_text"] == "お水をぬるめでお願いします"
+        assert kwargs["conversion_time_ms"] == events[-1][1]["processing_time_ms"]
+
+    @pytest.mark.asyncio
+    async def test_error_is_sent_as_event_and_logged(self):
+        async def failing_stream(**_kwargs):
+            yield "途中"
+            raise AIRateLimitException("rate limited")
+
+        request_body = {"input_text": "ありがとう", "politeness_level": "normal"}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            mock_ai_client.stream_convert_text = failing_stream
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post("/api/v1/ai/convert/stream", json=request_body)
+
+        events = _parse_events(response.text)
+        assert events[-1] == (
+            "error",
+            {
+                "code": "AI_RATE_LIMIT",
+                "message": "AI変換APIのレート制限に達しました。しばらく待ってから再度お試しください。",
+                "status_code": 429,
+            },
+        )
+        assert log.await_args.kwargs["is_success"] is False
+
+    @pytest.mark.asyncio
+    async def test_result_is_shared_with_conversion_cache(self):
+        async def fake_stream(**_kwargs):
+            yield "ありがとうございます"
+
+        request_body = {"input_text": "ありがとう", "politeness_level": "polite"}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            mock_ai_client.stream_convert_text = fake_stream
+            mock_ai_client.convert_text = AsyncMock()
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                await client.post("/api/v1/ai/convert/stream", json=request_body)
+                limiter.reset()
+                response = await client.post("/api/v1/ai/convert", json=request_body)
+
+        assert response.json()["converted_text"] == "ありがとうございます"
+        mock_ai_client.convert_text.assert_not_called()
+
+
+# ================================================================================
+# AIClient.stream_convert_text
+# ================================================================================
+
+
+class TestStreamConvertText:
+    @pytest.mark.asyncio
+    async def test_anthropic_yields_text_deltas_and_closes_stream(self):
+        stream = _FakeStream(
+            [
+                SimpleNamespace(type="message_start"),
+                _anthropic_delta("ありがとう"),
+                _anthropic_delta("ございます"),
+                SimpleNamespace(type="message_stop"),
+            ]
+        )
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(return_value=stream)
+
+        deltas = [d async for d in client.stream_convert_text("ありがとう", "polite", "anthropic")]
+
+        assert deltas == ["ありがとう", "ございます"]
+        assert client.anthropic_client.messages.create.await_args.kwargs["stream"] is True
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_openai_yields_content_deltas(self):
+        chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+            for text in ("ありがと", "ね", None)
+        ]
+        client = AIClient()
+        client.openai_client = AsyncMock()
+        client.openai_client.chat.completions.create = AsyncMock(return_value=_FakeStream(chunks))
+
+        deltas = [d async for d in client.stream_convert_text("ありがとう", "casual", "openai")]
+
+        assert deltas == ["ありがと", "ね"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_applies_to_whole_stream(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_CALL_DEADLINE_SECONDS", 0.05)
+        stream = _FakeStream([_anthropic_delta("あ"), _anthropic_delta("い")], delay=0.04)
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(return_value=stream)
+
+        received = []
+        with pytest.raises(AITimeoutException):
+            async for delta in client.stream_convert_text("ありがとう", "polite", "anthropic"):
+                received.append(delta)
+
+        assert received == ["あ"]
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_concurrency_slot_is_held_until_the_stream_ends(self):
+        stream = _FakeStream([_anthropic_delta("あ"), _anthropic_delta("い")])
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(return_value=stream)
+        limiter_ = client.concurrency_limiter("anthropic")
+
+        deltas = client.stream_convert_text("ありがとう", "polite", "anthropic")
+        assert await anext(deltas) == "あ"
+        assert limiter_.in_flight == 1
+
+        assert [d async for d in deltas] == ["い"]
+        assert limiter_.in_flight == 0
+        assert client.circuit_breaker("anthropic").describe()["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_releases_its_slot_without_a_breaker_result(self):
+        stream = _FakeStream([_anthropic_delta("あ"), _anthropic_delta("い")])
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(return_value=stream)
+
+        deltas = client.stream_convert_text("ありがとう", "polite", "anthropic")
+        assert await anext(deltas) == "あ"
+        await deltas.aclose()
+
+        assert stream.closed
+        assert client.concurrency_limiter("anthropic").in_flight == 0
+        assert client.circuit_breaker("anthropic").describe()["calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_failures_are_recorded_and_open_the_circuit(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_CIRCUIT_MIN_CALLS", 2)
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(
+            side_effect=lambda **_: _FakeStream([SimpleNamespace(type="message_stop")])
+        )
+        client.openai_client = AsyncMock()
+        client.openai_client.chat.completions.create = AsyncMock(
+            return_value=_FakeStream(
+                [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="ね"))])]
+            )
+        )
+
+        for _ in range(2):
+            with pytest.raises(AIConversionException, match="empty stream"):
+                async for _delta in client.stream_convert_text("ありがとう", "casual", "anthropic"):
+                    pass
+        assert not client.circuit_breaker("anthropic").allows_requests
+
+        deltas = [d async for d in client.stream_convert_text("ありがとう", "casual", "anthropic")]
+
+        assert deltas == ["ね"]
+        assert consume_served_provider() == "openai"
@@ -0,0 +1,163 @@
+"""
+AI変換候補一括生成エンドポイントテスト（POST /api/v1/ai/variants）
+
+【テストファイル目的】: 1回のAI呼び出しで複数候補を返すエンドポイントと、
+                        AIClient側の候補解釈・重複除去を検証
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.rate_limit import limiter
+from app.main import app
+from app.utils.ai_client import AIClient, _dedupe_variants, _parse_variant_list
+from app.utils.exceptions import AIConversionException, AITimeoutException
+
+
+@pytest.fixture(autouse=True)
+async def reset_limiter():
+    """各テスト実行前にリミッターのストレージをリセット"""
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+# ================================================================================
+# エンドポイント
+# ================================================================================
+
+
+class TestAIVariantsEndpoint:
+    @pytest.mark.asyncio
+    async def test_returns_variants_from_single_call(self):
+        request_body = {"input_text": "ありがとう", "politeness_level": "polite", "count": 3}
+        variants = ["ありがとうございます", "感謝いたします", "お礼申し上げます"]
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            mock_ai_client.generate_variants = AsyncMock(return_value=(variants, 1800))
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post("/api/v1/ai/variants", json=request_body)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["variants"] == variants
+        assert body["original_text"] == "ありがとう"
+        assert body["politeness_level"] == "polite"
+        assert body["processing_time_ms"] == 1800
+        mock_ai_client.generate_variants.assert_awaited_once_with(
+            input_text="ありがとう", politeness_level="polite", count=3, previous_result=None
+        )
+        assert log.await_args.kwargs["output_text"] == "ありがとうございます"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("count", [1, 6])
+    async def test_count_out_of_range_is_rejected(self, count):
+        request_body = {"input_text": "ありがとう", "politeness_level": "polite", "count": count}
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/api/v1/ai/variants", json=request_body)
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_504(self):
+        request_body = {"input_text": "ありがとう", "politeness_level": "normal"}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            mock_ai_client.generate_variants = AsyncMock(side_effect=AITimeoutException("t"))
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post("/api/v1/ai/variants", json=request_body)
+
+        assert response.status_code == 504
+        assert response.json()["error"]["code"] == "AI_API_TIMEOUT"
+
+
+# ================================================================================
+# 候補の解釈・重複除去
+# ================================================================================
+
+
+class TestVariantParsing:
+    def test_parses_json_array_with_surrounding_text(self):
+        text = '候補です:\n```json\n["ありがとうございます", "感謝いたします"]\n```'
+        assert _parse_variant_list(text) == ["ありがとうございます", "感謝いたします"]
+
+    def test_falls_back_to_numbered_lines(self):
+        text = "1. ありがとうございます\n2) 「感謝いたします」\n・お礼申し上げます"
+        assert _parse_variant_list(text) == [
+            "ありがとうございます",
+            "感謝いたします",
+            "お礼申し上げます",
+        ]
+
+    def test_dedupe_ignores_width_and_whitespace_and_excludes_previous(self):
+        candidates = ["ありがとう ございます", "ありがとう　ございます", "感謝いたします", "どうも"]
+        assert _dedupe_variants(candidates, exclude="どうも") == [
+            "ありがとう ございます",
+            "感謝いたします",
+        ]
+
+
+class TestGenerateVariants:
+    @pytest.mark.asyncio
+    async def test_openai_uses_n_choices(self):
+        client = AIClient()
+        client.openai_client = AsyncMock()
+        client.openai_client.chat.completions.create = AsyncMock(
+            return_value=SimpleNamespace(
+                choices=[
+                    SimpleNamespace(message=SimpleNamespace(content=text))
+                    for text in ("ありがとね", "ありがとね", "サンキュー")
+                ]
+            )
+        )
+
+        variants, _ = await client.generate_variants("ありがとう", "casual", 3, provider="openai")
+
+        assert variants == ["ありがとね", "サンキュー"]
+        assert client.openai_client.chat.completions.create.await_args.kwargs["n"] == 3
+
+    @pytest.mark.asyncio
+    async def test_anthropic_parses_structured_answer(self):
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(
+                content=[SimpleNamespace(text='["ありがとうございます", "感謝いたします", "x"]')]
+            )
+        )
+
+        variants, _ = await client.generate_variants(
+            "ありがとう", "polite", 2, previous_result="x", provider="anthropic"
+        )
+
+        assert variants == ["ありがとうございます", "感謝いたします"]
+        assert client.anthropic_client.messages.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_no_usable_variant_raises(self):
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(content=[SimpleNamespace(text='["前回"]')])
+        )
+
+        with pytest.raises(AIConversionException):
+            await client.generate_variants(
+                "ありがとう", "polite", 3, previous_result="前回", provider="anthropic"
+            )
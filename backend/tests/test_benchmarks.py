@@ -0,0 +1,128 @@
+"""
+負荷試験ハーネステスト
+
+【テスト目的】: benchmarks の集計（分位点・イベントループの遅延・計測用エンドポイント）と
+               基準の結果との比較（負荷試験・マイクロベンチマーク）が、悪化したものだけを
+               回帰として報告すること、マイクロベンチマークで最適化した補助関数の結果が
+               変わらないことを検証
+"""
+
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.v1.endpoints.ai import DEFAULT_ERROR, ERROR_DEFINITIONS, _create_error_response
+from app.utils.exceptions import AITimeoutException
+from benchmarks import microbench
+from benchmarks.load_test import SCENARIOS, compare_with_baseline
+from benchmarks.serve import STATS_PATH, BenchmarkApp, LoopLagProbe, percentile
+
+
+def _result(rps: float, p99: float, concurrency: int = 8) -> dict[str, object]:
+    level = {"concurrency": concurrency, "rps": rps, "latency_ms": {"p99": p99}}
+    return {"scenarios": {"convert": {"levels": [level]}}}
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        samples = [float(value) for value in range(100, 0, -1)]
+
+        assert percentile(samples, 0.50) == 50.0
+        assert percentile(samples, 0.99) == 99.0
+        assert percentile(samples, 1.0) == 100.0
+        assert percentile([], 0.99) == 0.0
+
+
+class TestCompareWithBaseline:
+    def test_changes_within_tolerance_are_not_regressions(self):
+        assert compare_with_baseline(_result(95, 1080), _result(100, 1000), 0.1) == []
+
+    def test_lower_throughput_and_higher_p99_are_reported(self):
+        regressions = compare_with_baseline(_result(80, 1500), _result(100, 1000), 0.1)
+
+        assert regressions == [
+            "convert c=8: rps 100 -> 80",
+            "convert c=8: p99 1000ms -> 1500ms",
+        ]
+
+    def test_levels_missing_from_the_baseline_are_skipped(self):
+        assert (
+            compare_with_baseline(_result(1, 9999, concurrency=64), _result(100, 1000), 0.1) == []
+        )
+
+
+class TestMicrobenchCompare:
+    @staticmethod
+    def _result(relative: float) -> dict[str, object]:
+        return {"cases": {"is_valid_api_key": {"ns": relative * 100, "relative": relative}}}
+
+    def test_only_slowdowns_beyond_the_threshold_are_reported(self):
+        baseline = self._result(10.0)
+
+        assert microbench.compare(self._result(12.5), baseline, 0.3) == []
+        assert microbench.compare(self._result(2.0), baseline, 0.3) == []
+        assert microbench.compare(self._result(14.0), baseline, 0.3) == [
+            "is_valid_api_key: 1000.0ns -> 1400.0ns (relative 10.0 -> 14.0, +40%)"
+        ]
+
+    def test_stored_baseline_covers_every_case(self):
+        baseline = json.loads(microbench.BASELINE_PATH.read_text(encoding="utf-8"))
+
+        assert set(baseline["cases"]) == {
+            "get_client_ip",
+            "get_client_ip_forwarded",
+            "api_keys_list",
+            "is_valid_api_key",
+            "is_valid_api_key_rejected",
+            "validate_input_text",
+            "hash_text",
+            "create_log",
+            "create_error_response",
+        }
+
+
+@pytest.mark.parametrize(
+    "error_info", [ERROR_DEFINITIONS[AITimeoutException], DEFAULT_ERROR], ids=["timeout", "default"]
+)
+def test_prerendered_error_response_matches_json_response(error_info):
+    # エラー応答の本文はレンダリング済みのものを再利用するが、内容は JSONResponse と同じ
+    response = _create_error_response(error_info)
+
+    assert response.status_code == error_info.status_code
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == {
+        "success": False,
+        "data": None,
+        "error": {
+            "code": error_info.code,
+            "message": error_info.message,
+            "status_code": error_info.status_code,
+        },
+    }
+
+
+class TestBenchmarkApp:
+    @pytest.mark.asyncio
+    async def test_stats_endpoint_is_served_by_the_wrapper(self):
+        async def app(scope, receive, send):
+            raise AssertionError("stats must not reach the application")
+
+        probe = LoopLagProbe(interval=0.001)
+        probe.start()
+        await asyncio.sleep(0.05)
+
+        async with AsyncClient(
+            transport=ASGITransport(app=BenchmarkApp(app, probe)), base_url="http://test"
+        ) as client:
+            stats = (await client.get(STATS_PATH)).json()
+
+        assert stats["loop_lag_max_ms"] >= stats["loop_lag_p99_ms"] >= 0
+        probe.stop()
+        assert stats["rss_mb"] > 0
+
+
+def test_regenerate_payload_carries_the_previous_result():
+    assert "previous_result" in SCENARIOS["regenerate"].payload(1)
+    assert "previous_result" not in SCENARIOS["convert"].payload(1)
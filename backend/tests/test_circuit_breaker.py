@@ -0,0 +1,187 @@
+"""
+サーキットブレーカー・プロバイダーフェイルオーバーテスト
+
+【テスト目的】: app.utils.circuit_breaker の状態遷移、AIClient.convert_text の
+               フェイルオーバー／即時失敗、ヘルスチェックへの状態表示を検証
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_db_session
+from app.main import app
+from app.utils.ai_client import AIClient, consume_served_provider
+from app.utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+from app.utils.exceptions import AIProviderException, AITimeoutException
+
+CONFIG = CircuitBreakerConfig(
+    window_size=4,
+    min_calls=2,
+    failure_rate_threshold=0.5,
+    slow_call_seconds=5.0,
+    slow_call_rate_threshold=1.0,
+    open_seconds=30.0,
+    half_open_max_calls=1,
+)
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(CONFIG.min_calls):
+        assert breaker.acquire()
+        breaker.record_failure(0.1)
+
+
+# ============================================================
+# 状態遷移
+# ============================================================
+
+
+class TestCircuitBreaker:
+    def test_opens_when_failure_rate_reaches_threshold(self):
+        breaker = CircuitBreaker("anthropic", CONFIG)
+        breaker.record_success(0.1)
+        breaker.record_failure(0.1)
+
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.acquire()
+
+    def test_does_not_open_before_min_calls(self):
+        breaker = CircuitBreaker("anthropic", CONFIG)
+        breaker.record_failure(0.1)
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_opens_on_slow_calls(self):
+        breaker = CircuitBreaker("anthropic", CONFIG)
+        breaker.record_success(6.0)
+        breaker.record_success(7.0)
+        assert breaker.state is CircuitState.OPEN
+
+    def test_half_open_allows_one_trial_and_closes_on_success(self):
+        breaker = CircuitBreaker("anthropic", CONFIG)
+        with patch("app.utils.circuit_breaker.time.monotonic", return_value=100.0):
+            _open(breaker)
+        with patch("app.utils.circuit_breaker.time.monotonic", return_value=131.0):
+            assert breaker.state is CircuitState.HALF_OPEN
+            assert breaker.acquire()
+            assert not breaker.acquire()
+            breaker.record_success(0.1)
+            assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_reopens_on_failure(self):
+        breaker = CircuitBreaker("anthropic", CONFIG)
+        with patch("app.utils.circuit_breaker.time.monotonic", return_value=100.0):
+            _open(breaker)
+        with patch("app.utils.circuit_breaker.time.monotonic", return_value=131.0):
+            assert breaker.acquire()
+            breaker.record_failure(0.1)
+            assert breaker.state is CircuitState.OPEN
+
+    def test_release_returns_trial_slot(self):
+        breaker = CircuitBreaker("anthropic", CONFIG)
+        with patch("app.utils.circuit_breaker.time.monotonic", return_value=100.0):
+            _open(breaker)
+        with patch("app.utils.circuit_breaker.time.monotonic", return_value=131.0):
+            assert breaker.acquire()
+            breaker.release()
+            assert breaker.acquire()
+
+
+# ============================================================
+# AIClient のフェイルオーバー
+# ============================================================
+
+
+def _client(anthropic_result, openai_result) -> AIClient:
+    client = AIClient()
+    client.anthropic_client = object()
+    client.openai_client = object()
+    client.convert_text_anthropic = AsyncMock(side_effect=anthropic_result)
+    client.convert_text_openai = AsyncMock(side_effect=openai_result)
+    return client
+
+
+class TestProviderFailover:
+    @pytest.mark.asyncio
+    async def test_routes_to_other_provider_when_primary_circuit_is_open(self):
+        client = _client([("Claude", 10)], [("GPT", 10)])
+        client.circuit_breaker("anthropic")._transition(CircuitState.OPEN)
+
+        result = await client.convert_text("ありがとう", "polite", "anthropic")
+
+        assert result == ("GPT", 10)
+        assert consume_served_provider() == "openai"
+        client.convert_text_anthropic.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fails_fast_without_fallback(self):
+        client = _client([("Claude", 10)], [("GPT", 10)])
+        client.openai_client = None
+        client.circuit_breaker("anthropic")._transition(CircuitState.OPEN)
+
+        with pytest.raises(AIProviderException):
+            await client.convert_text("ありがとう", "polite", "anthropic")
+        client.convert_text_anthropic.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_provider_failures_open_the_circuit(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "AI_CIRCUIT_MIN_CALLS", 2)
+        client = _client(AITimeoutException("timeout"), [("GPT", 10)])
+
+        for _ in range(2):
+            with pytest.raises(AITimeoutException):
+                await client.convert_text("ありがとう", "polite", "anthropic")
+
+        assert client.circuit_breaker("anthropic").state is CircuitState.OPEN
+        assert await client.convert_text("ありがとう", "polite", "anthropic") == ("GPT", 10)
+
+    @pytest.mark.asyncio
+    async def test_missing_api_key_does_not_count_as_failure(self):
+        client = _client(AIProviderException("not configured"), [("GPT", 10)])
+
+        with pytest.raises(AIProviderException):
+            await client.convert_text("ありがとう", "polite", "anthropic")
+
+        assert client.circuit_breaker("anthropic").describe()["calls"] == 0
+
+
+# ============================================================
+# ヘルスチェック
+# ============================================================
+
+
+class _FakeSession:
+    async def execute(self, _statement):
+        return None
+
+
+@pytest.fixture
+def health_app():
+    async def override_get_db():
+        yield _FakeSession()
+
+    app.dependency_overrides[get_db_session] = override_get_db
+    yield app
+    app.dependency_overrides.pop(get_db_session, None)
+
+
+class TestHealthCircuitStatus:
+    @pytest.mark.asyncio
+    async def test_open_circuit_is_reported_as_degraded(self, health_app):
+        client = _client([], [])
+        client.circuit_breaker("anthropic")._transition(CircuitState.OPEN)
+
+        with patch("app.utils.ai_client.ai_client", client):
+            async with AsyncClient(
+                transport=ASGITransport(app=health_app), base_url="http://test"
+            ) as http:
+                response = await http.get("/api/v1/health")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "degraded"
+        assert body["ai_providers"]["anthropic"]["state"] == "open"
+        assert body["ai_providers"]["openai"]["state"] == "closed"
@@ -0,0 +1,255 @@
+"""
+適応的同時実行数制限テスト
+
+【テスト目的】: app.utils.concurrency_limiter の上限の調整（成功での増加、レート制限・応答時間の
+               悪化での減少、同じ過負荷による重複した減少の抑止）、待ち行列（到着順の割り当て、
+               デッドライン・満杯での拒否、キャンセル時の枠の返却）と、AIClient の呼び出しが
+               プロバイダーの429で上限を縮め、枠を得られない呼び出しを429で拒否すること、
+               その拒否がサーキットブレーカーのエラーに数えられないことを検証
+"""
+
+import asyncio
+import time
+
+import anthropic
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.utils import metrics
+from app.utils.ai_client import AIClient
+from app.utils.circuit_breaker import CircuitState
+from app.utils.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterConfig,
+    ConcurrencyLimitExceeded,
+)
+from app.utils.exceptions import AILocalOverloadException, AIRateLimitException
+
+
+def _limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    config = {"initial_limit": 4, "min_limit": 1, "max_limit": 8, "min_latency_samples": 3}
+    config.update(overrides)
+    return AdaptiveConcurrencyLimiter("anthropic", ConcurrencyLimiterConfig(**config))
+
+
+def _rate_limit_error() -> anthropic.RateLimitError:
+    request = httpx.Request("POST", "http://limiter-test")
+    return anthropic.RateLimitError(
+        "rate limited", response=httpx.Response(429, request=request), body=None
+    )
+
+
+class TestLimitAdjustment:
+    @pytest.mark.asyncio
+    async def test_successes_grow_the_limit_while_it_is_in_use(self):
+        limiter = _limiter()
+
+        async def saturate(rounds: int) -> None:
+            for _ in range(rounds):
+                permits = [await limiter.acquire() for _ in range(limiter.limit)]
+                for permit in permits:
+                    limiter.record_success(permit, 0.1)
+
+        await saturate(3)
+        assert 4 < limiter.limit < 8
+        await saturate(30)
+        assert limiter.describe() == {"limit": 8, "in_flight": 0, "queue_depth": 0}
+
+    @pytest.mark.asyncio
+    async def test_idle_capacity_does_not_grow_the_limit(self):
+        limiter = _limiter()
+
+        for _ in range(20):
+            limiter.record_success(await limiter.acquire(), 0.1)
+
+        assert limiter.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_the_limit_once_per_overload(self):
+        limiter = _limiter()
+        permits = [await limiter.acquire() for _ in range(4)]
+
+        for permit in permits:
+            limiter.record_rate_limited(permit)
+        assert limiter.limit == 2
+
+        limiter.record_rate_limited(await limiter.acquire())
+        assert limiter.limit == 1
+        limiter.record_rate_limited(await limiter.acquire())
+        assert limiter.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_inflation_and_timeouts_shrink_the_limit(self):
+        limiter = _limiter(initial_limit=8, latency_backoff=0.5)
+        for _ in range(3):
+            limiter.record_success(await limiter.acquire(), 0.1)
+
+        limiter.record_success(await limiter.acquire(), 1.0)
+        assert limiter.limit == 4
+        limiter.record_timeout(await limiter.acquire())
+        assert limiter.limit == 2
+
+
+class TestQueue:
+    @pytest.mark.asyncio
+    async def test_excess_callers_wait_in_arrival_order(self):
+        limiter = _limiter(initial_limit=1)
+        first = await limiter.acquire()
+        order: list[int] = []
+
+        async def call(number: int) -> None:
+            permit = await limiter.acquire()
+            order.append(number)
+            limiter.release(permit)
+
+        waiters = [asyncio.create_task(call(number)) for number in range(3)]
+        await asyncio.sleep(0)
+        assert limiter.describe() == {"limit": 1, "in_flight": 1, "queue_depth": 3}
+
+        limiter.release(first)
+        await asyncio.gather(*waiters)
+
+        assert order == [0, 1, 2]
+        assert (limiter.in_flight, limiter.queue_depth) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_callers_that_cannot_finish_before_the_deadline_are_rejected(self):
+        limiter = _limiter(initial_limit=1, max_queue=1)
+        rejections = metrics.ai_concurrency_rejections.labels("anthropic")
+        before = rejections.value
+        held = await limiter.acquire()
+
+        with pytest.raises(ConcurrencyLimitExceeded):
+            await limiter.acquire(deadline=time.monotonic() + 0.01)
+        with pytest.raises(ConcurrencyLimitExceeded):
+            await limiter.acquire(deadline=time.monotonic() - 1)
+
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(ConcurrencyLimitExceeded, match="queue is full"):
+            await limiter.acquire()
+
+        assert rejections.value == before + 3
+        limiter.release(held)
+        limiter.release(await queued)
+        assert (limiter.in_flight, limiter.queue_depth) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        limiter = _limiter(initial_limit=1)
+        held = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release(held)
+
+        assert (limiter.in_flight, limiter.queue_depth) == (0, 0)
+
+
+class TestAIClientConcurrencyLimit:
+    @pytest.mark.asyncio
+    async def test_provider_rate_limit_shrinks_the_limit(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 0)
+        client = AIClient()
+        initial = client.concurrency_limiter("anthropic").limit
+
+        async def rate_limited() -> None:
+            raise _rate_limit_error()
+
+        with pytest.raises(anthropic.RateLimitError):
+            await client._call_with_retry(rate_limited, provider="anthropic")
+
+        limiter = client.concurrency_limiter("anthropic")
+        assert limiter.limit == initial // 2
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_call_without_a_slot_before_the_deadline_is_rejected_as_rate_limit(
+        self, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "AI_CONCURRENCY_INITIAL_LIMIT", 1)
+        monkeypatch.setattr(settings, "AI_CONCURRENCY_MAX_LIMIT", 1)
+        monkeypatch.setattr(settings, "AI_CALL_DEADLINE_SECONDS", 0.05)
+        client = AIClient()
+        limiter = client.concurrency_limiter("anthropic")
+        # 基準応答時間が0.03秒のため、デッドラインまでの残りが0.03秒を切る前に拒否される
+        limiter.record_success(await limiter.acquire(), 0.03)
+        release = asyncio.Event()
+        called = 0
+
+        async def slow() -> str:
+            nonlocal called
+            called += 1
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(client._call_with_retry(slow, provider="anthropic"))
+        await asyncio.sleep(0)
+        with pytest.raises(AIRateLimitException):
+            await client._call_with_retry(slow, provider="anthropic")
+        release.set()
+
+        assert await first == "ok"
+        assert called == 1
+
+    @pytest.mark.asyncio
+    async def test_saturated_limiter_does_not_open_the_circuit(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_CONCURRENCY_INITIAL_LIMIT", 1)
+        monkeypatch.setattr(settings, "AI_CONCURRENCY_MAX_LIMIT", 1)
+        monkeypatch.setattr(settings, "AI_CONCURRENCY_MAX_QUEUE", 0)
+        monkeypatch.setattr(settings, "AI_CIRCUIT_MIN_CALLS", 2)
+        client = AIClient()
+        release = asyncio.Event()
+
+        async def slow() -> str:
+            await release.wait()
+            return "ok"
+
+        async def convert(input_text, politeness_level):
+            return await client._call_with_retry(slow, provider="anthropic"), 10
+
+        client.convert_text_anthropic = convert
+        first = asyncio.create_task(client._convert_with("おはよう", "normal", "anthropic"))
+        await asyncio.sleep(0)
+        for _ in range(5):
+            with pytest.raises(AILocalOverloadException):
+                await client._convert_with("こんにちは", "normal", "anthropic")
+        release.set()
+
+        assert await first == ("ok", 10, "anthropic")
+        breaker = client.circuit_breaker("anthropic")
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.describe()["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_calls_are_not_limited_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_CONCURRENCY_LIMIT_ENABLED", False)
+        monkeypatch.setattr(settings, "AI_CONCURRENCY_INITIAL_LIMIT", 1)
+        client = AIClient()
+        release = asyncio.Event()
+
+        async def slow() -> str:
+            await release.wait()
+            return "ok"
+
+        calls = [
+            asyncio.create_task(client._call_with_retry(slow, provider="anthropic"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        assert client.concurrency_limiter("anthropic").in_flight == 0
+        release.set()
+
+        assert await asyncio.gather(*calls) == ["ok", "ok", "ok"]
+
+
+def test_local_overload_is_answered_like_a_provider_rate_limit():
+    from app.api.v1.endpoints.ai import _get_error_info
+
+    error_info = _get_error_info(AILocalOverloadException("anthropic concurrency limit"))
+
+    assert (error_info.code, error_info.status_code) == ("AI_RATE_LIMIT", 429)
@@ -0,0 +1,218 @@
+"""
+AI変換結果キャッシュテスト
+
+【テスト目的】: app.utils.conversion_cache と /api/v1/ai/convert のキャッシュ連携を検証
+【テスト範囲】: キー生成・正規化、LRU/TTL破棄、統計、ストレージURI解決、エンドポイントでの再利用
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.main import app
+from app.utils.conversion_cache import (
+    ConversionCacheStorageError,
+    InMemoryConversionCache,
+    RedisConversionCache,
+    _build_conversion_cache,
+    build_cache_key,
+    conversion_cache,
+    normalize_input_text,
+)
+
+
+@pytest.fixture(autouse=True)
+async def reset_limiter():
+    """各テスト実行前にリミッターのストレージをリセット"""
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+# ============================================================
+# キー生成・正規化
+# ============================================================
+
+
+class TestCacheKey:
+    def test_normalize_absorbs_width_and_whitespace(self):
+        assert normalize_input_text("  ＡＢＣ　ありがとう  ") == "ABC ありがとう"
+
+    def test_key_is_stable_for_equivalent_inputs(self):
+        key1 = build_cache_key("水　ぬるく", "normal", "anthropic", "m", "1")
+        key2 = build_cache_key(" 水 ぬるく ", "normal", "anthropic", "m", "1")
+        assert key1 == key2
+        assert len(key1) == 64
+
+    @pytest.mark.parametrize(
+        "changed",
+        [
+            ("水 ぬるく", "polite", "anthropic", "m", "1"),
+            ("水 ぬるく", "normal", "openai", "m", "1"),
+            ("水 ぬるく", "normal", "anthropic", "other-model", "1"),
+            ("水 ぬるく", "normal", "anthropic", "m", "2"),
+        ],
+    )
+    def test_key_differs_per_component(self, changed):
+        base = build_cache_key("水 ぬるく", "normal", "anthropic", "m", "1")
+        assert build_cache_key(*changed) != base
+
+    def test_key_does_not_contain_plaintext(self):
+        assert "ありがとう" not in build_cache_key("ありがとう", "normal", "anthropic", "m", "1")
+
+
+# ============================================================
+# プロセス内メモリキャッシュ
+# ============================================================
+
+
+class TestInMemoryConversionCache:
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_are_counted(self):
+        cache = InMemoryConversionCache(max_entries=10, ttl_seconds=60)
+        assert await cache.get("k") is None
+        await cache.set("k", "値")
+        assert await cache.get("k") == "値"
+
+        stats = cache.stats.as_dict()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["stores"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self):
+        cache = InMemoryConversionCache(max_entries=2, ttl_seconds=60)
+        await cache.set("a", "A")
+        await cache.set("b", "B")
+        await cache.get("a")  # aを最近参照済みにする
+        await cache.set("c", "C")
+
+        assert len(cache) == 2
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "A"
+        assert await cache.get("c") == "C"
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_not_returned(self):
+        cache = InMemoryConversionCache(max_entries=10, ttl_seconds=60)
+        with patch("app.utils.conversion_cache.time.monotonic", return_value=1000.0):
+            await cache.set("k", "値")
+        with patch("app.utils.conversion_cache.time.monotonic", return_value=1061.0):
+            assert await cache.get("k") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_clear_resets_entries_and_stats(self):
+        cache = InMemoryConversionCache(max_entries=10, ttl_seconds=60)
+        await cache.set("k", "値")
+        await cache.get("k")
+        await cache.clear()
+        assert len(cache) == 0
+        assert cache.stats.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_is_treated_as_miss(self):
+        cache = InMemoryConversionCache(max_entries=10, ttl_seconds=60)
+        with patch.object(cache, "_get", AsyncMock(side_effect=ConnectionError("down"))):
+            assert await cache.get("k") is None
+        assert cache.stats.errors == 1
+        assert cache.stats.misses == 1
+
+
+# ============================================================
+# ストレージURI解決
+# ============================================================
+
+
+class TestBuildConversionCache:
+    def test_empty_uri_uses_memory(self):
+        assert isinstance(_build_conversion_cache(None), InMemoryConversionCache)
+        assert isinstance(_build_conversion_cache("memory://"), InMemoryConversionCache)
+
+    def test_redis_uri_uses_shared_storage(self):
+        cache = _build_conversion_cache("redis://localhost:6379/0")
+        assert isinstance(cache, RedisConversionCache)
+
+    def test_unsupported_scheme_raises(self):
+        with pytest.raises(ConversionCacheStorageError):
+            _build_conversion_cache("memcached://localhost:11211")
+
+
+# ============================================================
+# エンドポイント連携
+# ============================================================
+
+
+class TestConvertEndpointCache:
+    @pytest.mark.asyncio
+    async def test_second_identical_request_is_served_from_cache(self):
+        """同一入力の2回目はAIClientを呼ばずキャッシュから応答し、ログのプロバイダーはcacheになる"""
+        request_body = {"input_text": "ありがとう", "politeness_level": "polite"}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("ありがとうございます", 1500))
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                first = await client.post("/api/v1/ai/convert", json=request_body)
+                limiter.reset()
+                second = await client.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "ありがとう　", "politeness_level": "polite"},
+                )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json()["converted_text"] == "ありがとうございます"
+        assert mock_ai_client.convert_text.await_count == 1
+        assert log.await_args_list[-1].kwargs["ai_provider"] == "cache"
+        assert conversion_cache.stats.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_conversion_is_not_cached(self):
+        from app.utils.exceptions import AITimeoutException
+
+        request_body = {"input_text": "トイレに行きたい", "politeness_level": "normal"}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(side_effect=AITimeoutException("timeout"))
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post("/api/v1/ai/convert", json=request_body)
+
+        assert response.status_code == 504
+        assert conversion_cache.stats.stores == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_can_be_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "CONVERSION_CACHE_ENABLED", False)
+        request_body = {"input_text": "ありがとう", "politeness_level": "casual"}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("ありがと", 900))
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                await client.post("/api/v1/ai/convert", json=request_body)
+                limiter.reset()
+                await client.post("/api/v1/ai/convert", json=request_body)
+
+        assert mock_ai_client.convert_text.await_count == 2
+        assert conversion_cache.stats.hits == 0
@@ -0,0 +1,159 @@
+"""
+AI変換ログ一括書き込みテスト
+
+【テスト目的】: app.utils.conversion_log_writer のまとめ書き込み（件数・時間）、
+               キュー上限での破棄、停止時の書き込み、書き込み失敗時の記録、
+               エンドポイントからのキュー投入を検証
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.crud.crud_ai_conversion import ConversionLogEntry
+from app.main import app
+from app.utils.conversion_log_writer import ConversionLogWriter
+
+
+def _entry(text: str = "ありがとう") -> ConversionLogEntry:
+    return ConversionLogEntry(
+        input_text=text,
+        output_text="ありがとうございます",
+        politeness_level="polite",
+        conversion_time_ms=100,
+        session_id=uuid.uuid4(),
+    )
+
+
+@pytest.fixture
+def session_factory():
+    """commit / close を記録するだけのセッションを返すファクトリ"""
+    return MagicMock(return_value=AsyncMock())
+
+
+@pytest.fixture
+def bulk_insert():
+    with patch(
+        "app.utils.conversion_log_writer.bulk_create_conversion_logs", new_callable=AsyncMock
+    ) as mock:
+        yield mock
+
+
+def _batch_sizes(bulk_insert: AsyncMock) -> list[int]:
+    return [len(call.args[1]) for call in bulk_insert.await_args_list]
+
+
+class TestConversionLogWriter:
+    @pytest.mark.asyncio
+    async def test_writes_full_batches_in_one_insert(
+        self, monkeypatch, session_factory, bulk_insert
+    ):
+        monkeypatch.setattr(settings, "CONVERSION_LOG_BATCH_SIZE", 3)
+        monkeypatch.setattr(settings, "CONVERSION_LOG_FLUSH_INTERVAL_MS", 10_000)
+        writer = ConversionLogWriter()
+        writer.start(session_factory)
+
+        for i in range(6):
+            assert writer.submit(_entry(f"定型文{i}"))
+        await asyncio.sleep(0.05)
+
+        assert _batch_sizes(bulk_insert) == [3, 3]
+        assert writer.stats.written == 6
+        assert session_factory.return_value.commit.await_count == 2
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_is_flushed_after_interval(
+        self, monkeypatch, session_factory, bulk_insert
+    ):
+        monkeypatch.setattr(settings, "CONVERSION_LOG_BATCH_SIZE", 100)
+        monkeypatch.setattr(settings, "CONVERSION_LOG_FLUSH_INTERVAL_MS", 20)
+        writer = ConversionLogWriter()
+        writer.start(session_factory)
+
+        writer.submit(_entry())
+        writer.submit(_entry())
+        await asyncio.sleep(0.1)
+
+        assert _batch_sizes(bulk_insert) == [2]
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_entries(self, monkeypatch, session_factory, bulk_insert):
+        monkeypatch.setattr(settings, "CONVERSION_LOG_FLUSH_INTERVAL_MS", 10_000)
+        writer = ConversionLogWriter()
+        writer.start(session_factory)
+
+        writer.submit(_entry())
+        writer.submit(_entry())
+        await writer.stop()
+
+        assert _batch_sizes(bulk_insert) == [2]
+        assert not writer.running
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_and_counts(self, monkeypatch, session_factory, bulk_insert):
+        monkeypatch.setattr(settings, "CONVERSION_LOG_QUEUE_MAX_SIZE", 2)
+        writer = ConversionLogWriter()
+        writer.start(session_factory)
+
+        results = [writer.submit(_entry()) for _ in range(3)]
+
+        assert results == [True, True, False]
+        assert writer.stats.dropped == 1
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_write_failure_is_counted_and_writer_keeps_running(
+        self, monkeypatch, session_factory, bulk_insert
+    ):
+        monkeypatch.setattr(settings, "CONVERSION_LOG_FLUSH_INTERVAL_MS", 0)
+        bulk_insert.side_effect = [Exception("database is down"), 1]
+        writer = ConversionLogWriter()
+        writer.start(session_factory)
+
+        writer.submit(_entry())
+        await asyncio.sleep(0.02)
+        writer.submit(_entry())
+        await asyncio.sleep(0.02)
+
+        assert writer.stats.failed == 1
+        assert writer.stats.written == 1
+        assert writer.running
+        await writer.stop()
+
+    def test_submit_without_start_is_rejected(self):
+        assert ConversionLogWriter().submit(_entry()) is False
+
+
+class TestEndpointUsesWriter:
+    @pytest.mark.asyncio
+    async def test_conversion_log_is_queued_when_writer_is_running(self):
+        limiter.reset()
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai.conversion_log_writer") as writer,
+            patch("app.api.v1.endpoints.ai.create_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            writer.running = True
+            mock_ai_client.convert_text = AsyncMock(return_value=("変換結果", 900))
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "キュー投入テスト", "politeness_level": "normal"},
+                )
+
+        limiter.reset()
+        assert response.status_code == 200
+        entry = writer.submit.call_args.args[0]
+        assert entry.input_text == "キュー投入テスト"
+        assert entry.output_text == "変換結果"
+        log.assert_not_called()
@@ -0,0 +1,174 @@
+"""
+エラーログ非同期書き込みテスト
+
+【テスト目的】: app.utils.error_log_sink の定期的な一括書き込み、同種エラーの省略、
+               上限超過時の破棄、停止時の書き込み、例外ハンドラーがDB書き込みを
+               待たずに応答することを検証
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.crud.crud_error_log import ErrorLogEntry
+from app.utils import metrics
+from app.utils.error_log_sink import ErrorLogSink
+
+
+def _entry(endpoint: str = "/api/v1/ai/convert", message: str = "boom") -> ErrorLogEntry:
+    return ErrorLogEntry(
+        error_type="RuntimeError",
+        error_message=message,
+        error_code="INTERNAL_ERROR",
+        endpoint=endpoint,
+        http_method="POST",
+        stack_trace="Traceback ...",
+    )
+
+
+@pytest.fixture
+def session_factory():
+    """commit / close を記録するだけのセッションを返すファクトリ"""
+    return MagicMock(return_value=AsyncMock())
+
+
+@pytest.fixture
+def bulk_insert():
+    with patch("app.utils.error_log_sink.bulk_create_error_logs", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+def _written(bulk_insert: AsyncMock) -> list[ErrorLogEntry]:
+    return [entry for call in bulk_insert.await_args_list for entry in call.args[1]]
+
+
+class TestErrorLogSink:
+    @pytest.mark.asyncio
+    async def test_flushes_periodically_in_one_insert(
+        self, monkeypatch, session_factory, bulk_insert
+    ):
+        monkeypatch.setattr(settings, "ERROR_LOG_FLUSH_INTERVAL_SECONDS", 0.02)
+        sink = ErrorLogSink()
+        sink.start(session_factory)
+
+        sink.submit(_entry("/a"))
+        sink.submit(_entry("/b"))
+        await asyncio.sleep(0.1)
+
+        assert bulk_insert.await_count == 1
+        assert [entry.endpoint for entry in _written(bulk_insert)] == ["/a", "/b"]
+        assert sink.stats.written == 2
+        await sink.stop()
+
+    @pytest.mark.asyncio
+    async def test_identical_bursts_are_sampled_and_summarised(
+        self, monkeypatch, session_factory, bulk_insert
+    ):
+        monkeypatch.setattr(settings, "ERROR_LOG_FLUSH_INTERVAL_SECONDS", 60)
+        monkeypatch.setattr(settings, "ERROR_LOG_SAMPLES_PER_INTERVAL", 2)
+        sink = ErrorLogSink()
+        sink.start(session_factory)
+
+        for _ in range(10):
+            sink.submit(_entry())
+        sink.submit(_entry("/other"))
+        await sink.stop()
+
+        messages = [entry.error_message for entry in _written(bulk_insert)]
+        assert messages == ["boom", "boom", "boom", "[8 similar errors suppressed] boom"]
+        assert sink.stats.suppressed == 8
+        assert _written(bulk_insert)[-1].stack_trace is None
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_bounded(self, monkeypatch, session_factory, bulk_insert):
+        monkeypatch.setattr(settings, "ERROR_LOG_FLUSH_INTERVAL_SECONDS", 60)
+        monkeypatch.setattr(settings, "ERROR_LOG_BUFFER_MAX_ENTRIES", 2)
+        sink = ErrorLogSink()
+        sink.start(session_factory)
+
+        for i in range(3):
+            assert sink.submit(_entry(f"/{i}"))
+
+        assert sink.pending == 2
+        assert sink.stats.dropped == 1
+        await sink.stop()
+
+    @pytest.mark.asyncio
+    async def test_write_failure_is_counted(self, monkeypatch, session_factory, bulk_insert):
+        monkeypatch.setattr(settings, "ERROR_LOG_FLUSH_INTERVAL_SECONDS", 60)
+        bulk_insert.side_effect = Exception("database is down")
+        sink = ErrorLogSink()
+        sink.start(session_factory)
+
+        sink.submit(_entry())
+        await sink.stop()
+
+        assert sink.stats.failed == 1
+        assert sink.stats.written == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_latency_is_measured_from_the_first_row_after_a_flush(
+        self, monkeypatch, session_factory, bulk_insert
+    ):
+        monkeypatch.setattr(settings, "ERROR_LOG_FLUSH_INTERVAL_SECONDS", 60)
+        monkeypatch.setattr(settings, "ERROR_LOG_SAMPLES_PER_INTERVAL", 1)
+        latency = metrics.log_queue_latency.labels("error_logs")
+        sink = ErrorLogSink()
+        sink.start(session_factory)
+
+        with patch("app.utils.error_log_sink.time.monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            sink.submit(_entry())
+            sink.submit(_entry())
+            monotonic.return_value = 101.0
+            await sink.flush(session_factory)
+
+            before = (latency.count, latency.sum)
+            monotonic.return_value = 500.0
+            sink.submit(_entry())
+            monotonic.return_value = 500.5
+            await sink.flush(session_factory)
+
+        assert (latency.count, latency.sum) == (before[0] + 1, before[1] + 0.5)
+        await sink.stop()
+
+    def test_submit_without_start_is_rejected(self):
+        assert ErrorLogSink().submit(_entry()) is False
+
+
+class TestExceptionHandlerUsesSink:
+    @pytest.mark.asyncio
+    async def test_handler_does_not_wait_for_database(self):
+        from app.core.exceptions import global_exception_handler
+
+        mock_request = MagicMock()
+        mock_request.url.path = "/api/v1/test"
+        mock_request.method = "POST"
+
+        with (
+            patch("app.core.exceptions.error_log_sink") as sink,
+            patch("app.core.exceptions.log_error_to_db", new_callable=AsyncMock) as direct,
+        ):
+            sink.submit.return_value = True
+            response = await global_exception_handler(mock_request, RuntimeError("boom"))
+
+        assert response.status_code == 500
+        entry = sink.submit.call_args.args[0]
+        assert entry.error_type == "RuntimeError"
+        assert entry.endpoint == "/api/v1/test"
+        direct.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_handler_falls_back_to_direct_write_when_sink_is_stopped(self):
+        from app.core.exceptions import global_exception_handler
+
+        mock_request = MagicMock()
+        mock_request.url.path = "/api/v1/test"
+        mock_request.method = "POST"
+
+        with patch("app.core.exceptions.log_error_to_db", new_callable=AsyncMock) as direct:
+            await global_exception_handler(mock_request, RuntimeError("boom"))
+
+        direct.assert_awaited_once()
@@ -0,0 +1,195 @@
+"""
+疑似AIプロバイダーサーバーテスト
+
+【テスト目的】: app.cli.fake_provider の応答時間の分布・疑似変換結果の生成と、
+               AIClient を実際のSDK・httpx経由で疑似プロバイダーに向けた場合に
+               通常変換・ストリーミング・一括変換・複数候補が動作し、注入した障害
+               （429・タイムアウト・接続エラー）とレート制限ヘッダーが
+               AIClient の例外・レート制限予算に反映されることを検証
+"""
+
+import json
+import random
+import statistics
+
+import httpx
+import pytest
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+
+from app.cli.fake_provider import (
+    FakeProviderApp,
+    FakeProviderConfig,
+    LatencyProfile,
+    fake_conversion,
+)
+from app.core.config import settings
+from app.utils.ai_client import AIClient
+from app.utils.exceptions import (
+    AIConversionException,
+    AIRateLimitException,
+    AITimeoutException,
+)
+
+_FAST = LatencyProfile(distribution="fixed", median_ms=1)
+
+
+async def _client_for(fake: FakeProviderApp) -> AIClient:
+    """疑似プロバイダーに接続する AIClient を作る（SDK・httpx は実物を使う）"""
+    client = AIClient()
+
+    def http_client(provider: str) -> httpx.AsyncClient:
+        # 応答ヘッダーをレート制限予算に反映する（HTTPTransportManager と同じ経路）
+        async def observe(response: httpx.Response) -> None:
+            client._observe_rate_limit_headers(provider, response)
+
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=fake), event_hooks={"response": [observe]}
+        )
+
+    client.anthropic_client = AsyncAnthropic(
+        api_key="fake", base_url="http://fake", http_client=http_client("anthropic"), max_retries=0
+    )
+    client.openai_client = AsyncOpenAI(
+        api_key="fake", base_url="http://fake/v1", http_client=http_client("openai"), max_retries=0
+    )
+    return client
+
+
+class TestLatencyProfile:
+    def test_fixed_latency(self):
+        profile = LatencyProfile(distribution="fixed", median_ms=250)
+
+        assert profile.sample(random.Random(0)) == 0.25  # noqa: S311
+
+    def test_lognormal_latency_has_the_configured_median(self):
+        rng = random.Random(0)  # noqa: S311
+        profile = LatencyProfile(distribution="lognormal", median_ms=800, sigma=0.5)
+
+        samples = [profile.sample(rng) for _ in range(4000)]
+
+        assert statistics.median(samples) == pytest.approx(0.8, rel=0.05)
+        assert max(samples) > 2 * min(samples)
+
+    def test_bimodal_latency_sends_a_fraction_of_calls_to_the_slow_mode(self):
+        rng = random.Random(0)  # noqa: S311
+        profile = LatencyProfile(
+            distribution="bimodal", median_ms=500, sigma=0.1, slow_ratio=0.2, slow_median_ms=5000
+        )
+
+        samples = [profile.sample(rng) for _ in range(4000)]
+
+        slow = sum(1 for sample in samples if sample > 2.0) / len(samples)
+        assert slow == pytest.approx(0.2, abs=0.03)
+
+
+class TestFakeConversion:
+    def test_politeness_suffix_follows_the_system_prompt(self):
+        prompt = "以下の日本語文を変換してください。\n\n入力文: ありがとう\n\n"
+
+        assert fake_conversion("カジュアルで親しみやすい表現", prompt) == ["ありがとうだよ。"]
+        assert fake_conversion("非常に丁寧で敬意を込めた", prompt) == ["ありがとうでございます。"]
+        assert fake_conversion("標準的な", prompt, n=2) == [
+            "ありがとうです。",
+            "ありがとうです。（2）",
+        ]
+
+    def test_packed_prompt_is_answered_with_a_json_array(self):
+        prompt = "入力文:\n1. おはよう\n2. おやすみ\n\nJSON形式の文字列配列で出力してください。"
+
+        assert json.loads(fake_conversion("", prompt)[0]) == ["おはようです。", "おやすみです。"]
+
+
+class TestAIClientAgainstFakeProvider:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("provider", ["anthropic", "openai"])
+    async def test_conversion_paths_use_the_real_sdks(self, provider):
+        client = await _client_for(FakeProviderApp(FakeProviderConfig(latency=_FAST)))
+
+        converted, _ = await client.convert_text("ありがとう", "normal", provider=provider)
+        deltas = [
+            delta
+            async for delta in client.stream_convert_text("おやすみなさい", "polite", provider)
+        ]
+        packed, _ = await client.convert_texts_packed(
+            ["おはよう", "こんにちは"], "casual", provider=provider
+        )
+        variants, _ = await client.generate_variants(
+            "ありがとう", "normal", count=3, provider=provider
+        )
+
+        assert converted == "ありがとうです。"
+        assert len(deltas) > 1 and "".join(deltas) == "おやすみなさいでございます。"
+        assert packed == ["おはようだよ。", "こんにちはだよ。"]
+        assert len(variants) == 3
+
+    @pytest.mark.asyncio
+    async def test_injected_rate_limits_surface_as_rate_limit_errors(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 0)
+        fake = FakeProviderApp(FakeProviderConfig(latency=_FAST, rate_limit_ratio=1.0))
+        client = await _client_for(fake)
+
+        with pytest.raises(AIRateLimitException):
+            await client.convert_text("ありがとう", "normal", provider="openai")
+
+        # retry-after により、以降の呼び出しはプロバイダーに送らずに拒否される
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_MAX_WAIT_SECONDS", 0.0)
+        with pytest.raises(AIRateLimitException, match="budget"):
+            await client.convert_text("ありがとう", "normal", provider="openai")
+        assert fake.request_count == 1
+
+    @pytest.mark.asyncio
+    async def test_injected_timeouts_hit_the_call_deadline(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_CALL_DEADLINE_SECONDS", 0.2)
+        fake = FakeProviderApp(FakeProviderConfig(timeout_ratio=1.0, hang_seconds=5))
+        client = await _client_for(fake)
+
+        with pytest.raises(AITimeoutException):
+            await client.convert_text("ありがとう", "normal", provider="anthropic")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stream", [False, True])
+    async def test_injected_connection_errors_fail_the_call(self, monkeypatch, stream):
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 0)
+        fake = FakeProviderApp(FakeProviderConfig(latency=_FAST, connection_error_ratio=1.0))
+        client = await _client_for(fake)
+
+        with pytest.raises(AIConversionException):
+            if stream:
+                async for _ in client.stream_convert_text("ありがとう", "normal", "anthropic"):
+                    pass
+            else:
+                await client.convert_text("ありがとう", "normal", provider="anthropic")
+
+    @pytest.mark.asyncio
+    async def test_requests_per_minute_limit_is_reported_in_headers(self):
+        fake = FakeProviderApp(FakeProviderConfig(latency=_FAST, requests_per_minute=2))
+        body = {
+            "model": "m",
+            "max_tokens": 10,
+            "messages": [{"role": "user", "content": "入力文: a"}],
+        }
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=fake), base_url="http://fake"
+        ) as http:
+            responses = [await http.post("/v1/messages", json=body) for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert [r.headers["anthropic-ratelimit-requests-remaining"] for r in responses] == [
+            "1",
+            "0",
+            "0",
+        ]
+        assert responses[2].headers["retry-after"] == "1"
+
+
+def test_base_url_settings_point_the_sdks_at_the_fake_provider(monkeypatch):
+    monkeypatch.setattr(settings, "ANTHROPIC_API_KEY", "fake")
+    monkeypatch.setattr(settings, "ANTHROPIC_BASE_URL", "http://127.0.0.1:8900")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "fake")
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", "http://127.0.0.1:8900/v1")
+    client = AIClient()
+
+    assert str(client.anthropic_client.base_url) == "http://127.0.0.1:8900"
+    assert str(client.openai_client.base_url) == "http://127.0.0.1:8900/v1/"
@@ -0,0 +1,104 @@
+"""
+AI API用HTTPトランスポート管理テスト
+
+【テスト目的】: app.utils.http_transport の接続プール設定の適用、クライアントの再利用、
+               h2 未インストール時の HTTP/1.1 へのフォールバック、統計、クローズと、
+               両プロバイダーのSDKクライアントが管理下のクライアントを使うことを検証
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.utils import http_transport
+from app.utils.ai_client import AIClient
+from app.utils.http_transport import HTTPTransportManager
+
+
+class TestHTTPTransportManager:
+    @pytest.mark.asyncio
+    async def test_client_is_created_once_with_pool_limits(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_HTTP_MAX_CONNECTIONS", 7)
+        monkeypatch.setattr(settings, "AI_HTTP_MAX_KEEPALIVE_CONNECTIONS", 3)
+        monkeypatch.setattr(settings, "AI_HTTP_KEEPALIVE_EXPIRY_SECONDS", 15.0)
+        manager = HTTPTransportManager()
+
+        client = manager.client_for("anthropic", 8)
+        pool = client._transport._pool
+
+        assert manager.client_for("anthropic", 8) is client
+        assert manager.client_for("openai", 8) is not client
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 15.0
+        assert client.timeout.read == 8
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_when_h2_is_missing(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_HTTP2_ENABLED", True)
+        monkeypatch.setattr(http_transport, "http2_available", lambda: False)
+        manager = HTTPTransportManager()
+
+        with patch.object(http_transport.logger, "warning") as warning:
+            client = manager.client_for("openai", 8)
+
+        assert client._transport._pool._http2 is False
+        assert manager.describe()["openai"]["http2"] is False
+        warning.assert_called_once()
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_describe_counts_requests_per_provider(self, monkeypatch):
+        # h2 がインストールされている環境でも結果が変わらないよう HTTP/2 を無効にする
+        monkeypatch.setattr(settings, "AI_HTTP2_ENABLED", False)
+        manager = HTTPTransportManager()
+        client = manager.client_for("anthropic", 8)
+        client._transport = httpx.MockTransport(lambda request: httpx.Response(200))
+
+        await client.get("https://api.anthropic.com/v1/models")
+        await client.get("https://api.anthropic.com/v1/models")
+
+        assert manager.describe() == {
+            "anthropic": {"http2": False, "connections": 0, "idle_connections": 0, "requests": 2}
+        }
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_every_client(self):
+        manager = HTTPTransportManager()
+        clients = [manager.client_for("anthropic", 8), manager.client_for("openai", 8)]
+
+        await manager.aclose()
+
+        assert all(client.is_closed for client in clients)
+        assert manager.describe() == {}
+        # 2回目のクローズも例外を投げない
+        await manager.aclose()
+
+
+class TestAIClientUsesManagedTransport:
+    @pytest.mark.asyncio
+    async def test_both_sdk_clients_share_the_manager_and_close_with_aclose(self):
+        with (
+            patch.object(settings, "ANTHROPIC_API_KEY", "test-anthropic-key"),
+            patch.object(settings, "OPENAI_API_KEY", "test-openai-key"),
+        ):
+            client = AIClient()
+            # SDKクライアントは初回参照時に生成される
+            assert client._transport.describe() == {}
+            assert client.anthropic_client is not None
+            assert client.openai_client is not None
+
+        anthropic_http = client._transport.client_for("anthropic", settings.AI_API_TIMEOUT)
+        openai_http = client._transport.client_for("openai", settings.AI_API_TIMEOUT)
+        assert client.anthropic_client._client is anthropic_http
+        assert client.openai_client._client is openai_http
+        assert set(client.describe_http_pools()) == {"anthropic", "openai"}
+
+        await client.aclose()
+
+        assert anthropic_http.is_closed
+        assert openai_http.is_closed
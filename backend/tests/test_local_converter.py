@@ -0,0 +1,259 @@
+"""
+ローカル変換テスト
+
+【テスト目的】: app.utils.local_converter の定型句辞書・語尾の規則による変換と確信度、
+               /convert・/convert/stream・/convert/batch が確信度が閾値以上の入力を
+               AIClientを呼ばずに応答し、ログの ai_provider に "local" を記録することを検証。
+               あわせて代表的な入力でのヒット率と変換時間を計測する（ベンチマーク）
+【実行方法】: make bench-local（ベンチマークのみを結果表示付きで実行する）
+"""
+
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.main import app
+from app.utils import metrics
+from app.utils.local_converter import (
+    NOUN_REQUEST_CONFIDENCE,
+    PHRASE_CONFIDENCE,
+    TE_FORM_REQUEST_CONFIDENCE,
+    LocalConverter,
+)
+
+# ベンチマーク用の入力（端末から送られる典型的な入力。定型句・依頼・自由文を含む）
+BENCHMARK_INPUTS: tuple[str, ...] = (
+    "ありがとう",
+    "おはよう",
+    "痛い",
+    "トイレに行きたい",
+    "水がほしい",
+    "お茶ください",
+    "ちょっと待って",
+    "わかった",
+    "疲れた",
+    "テレビ消して",
+    "窓を開けて",
+    "水 ぬるく",
+    "背中 かゆい 右",
+    "明日 病院 何時",
+    "娘に電話したい",
+    "昨日はよく眠れなかった",
+)
+
+# ベンチマークの1入力あたりの変換時間の予算（マイクロ秒）
+LOCAL_LATENCY_BUDGET_US = 200.0
+
+
+@pytest.fixture(autouse=True)
+async def enable_local_conversion(monkeypatch):
+    """ローカル変換を有効にし、各テスト実行前にリミッターをリセット"""
+    monkeypatch.setattr(settings, "LOCAL_CONVERSION_ENABLED", True)
+    monkeypatch.setattr(settings, "LOCAL_CONVERSION_MIN_CONFIDENCE", 0.9)
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+class TestLocalConverter:
+    @pytest.mark.parametrize(
+        ("level", "expected"),
+        [
+            ("casual", "ありがとう"),
+            ("normal", "ありがとうございます"),
+            ("polite", "誠にありがとうございます"),
+        ],
+    )
+    def test_stock_phrase_is_converted_with_full_confidence(self, level, expected):
+        result = LocalConverter().convert("ありがとう", level)
+
+        assert result.converted_text == expected
+        assert result.confidence == PHRASE_CONFIDENCE
+        assert result.rule == "phrase"
+
+    def test_any_level_form_and_trailing_marks_are_accepted(self):
+        converter = LocalConverter()
+
+        assert converter.convert("ありがとうございます。", "casual").converted_text == "ありがとう"
+        assert converter.convert("痛い！", "normal").converted_text == "痛いです"
+
+    def test_noun_requests_keep_the_noun(self):
+        converter = LocalConverter()
+
+        want = converter.convert("水がほしい", "polite")
+        please = converter.convert("コーヒーちょうだい", "normal")
+
+        assert want.converted_text == "水をいただけますか"
+        assert please.converted_text == "コーヒーをください"
+        assert want.confidence == please.confidence == NOUN_REQUEST_CONFIDENCE
+
+    @pytest.mark.parametrize(
+        "input_text",
+        [
+            "お待ちください",
+            "ご覧ください",
+            "お休みください",
+            "ごめんください",
+            "何がほしい",
+            "どれがほしい",
+            "どっちがほしい",
+            "いつがほしい",
+        ],
+    )
+    def test_non_noun_phrases_are_not_treated_as_requests(self, input_text):
+        assert LocalConverter().convert(input_text, "polite") is None
+
+    def test_honorific_prefixed_nouns_are_still_requests(self):
+        result = LocalConverter().convert("お水ください", "polite")
+
+        assert result.converted_text == "お水をいただけますか"
+
+    def test_te_form_request_has_lower_confidence(self):
+        result = LocalConverter().convert("電気消して", "normal")
+
+        assert result.converted_text == "電気消してください"
+        assert result.confidence == TE_FORM_REQUEST_CONFIDENCE
+
+    @pytest.mark.parametrize(
+        "input_text",
+        ["水 ぬるく", "何時？", "今日は、暑い", "行ってほしい", "見てください", ""],
+    )
+    def test_ambiguous_inputs_are_left_to_ai(self, input_text):
+        assert LocalConverter().convert(input_text, "normal") is None
+
+    def test_unknown_level_is_not_converted(self):
+        assert LocalConverter().convert("ありがとう", "invalid") is None
+
+
+class TestConvertEndpointsUseLocalConversion:
+    @pytest.mark.asyncio
+    async def test_convert_answers_locally_and_logs_local_provider(self):
+        hits = metrics.local_conversions.labels("hit")
+        before = hits.value
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("AIの結果", 1500))
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "ありがとう", "politeness_level": "polite"},
+                )
+
+        assert response.status_code == 200
+        assert response.json()["converted_text"] == "誠にありがとうございます"
+        mock_ai_client.convert_text.assert_not_awaited()
+        assert log.await_args.kwargs["ai_provider"] == "local"
+        assert hits.value == before + 1
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_and_disabled_fall_back_to_ai(self, monkeypatch):
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("AIの結果", 1500))
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                low = await client.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "電気消して", "politeness_level": "normal"},
+                )
+                monkeypatch.setattr(settings, "LOCAL_CONVERSION_ENABLED", False)
+                limiter.reset()
+                disabled = await client.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "ありがとう", "politeness_level": "normal"},
+                )
+
+        assert low.json()["converted_text"] == "AIの結果"
+        assert disabled.json()["converted_text"] == "AIの結果"
+        assert mock_ai_client.convert_text.await_count == 2
+        assert all(call.kwargs["ai_provider"] != "local" for call in log.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_stream_sends_local_result_as_single_delta(self):
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/v1/ai/convert/stream",
+                    json={"input_text": "水がほしい", "politeness_level": "normal"},
+                )
+
+        events = [
+            json.loads(block.split("data: ", 1)[1]) for block in response.text.strip().split("\n\n")
+        ]
+        assert events[0] == {"text": "水がほしいです"}
+        assert events[-1]["converted_text"] == "水がほしいです"
+        mock_ai_client.stream_convert_text.assert_not_called()
+        assert log.await_args.kwargs["ai_provider"] == "local"
+
+    @pytest.mark.asyncio
+    async def test_batch_converts_only_remaining_items_with_ai(self):
+        items = [
+            {"input_text": "おはよう", "politeness_level": "normal"},
+            {"input_text": "水 ぬるく", "politeness_level": "normal"},
+        ]
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch(
+                "app.api.v1.endpoints.ai._persist_conversion_logs_bulk", new_callable=AsyncMock
+            ) as log,
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("ぬるい水をください", 1200))
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post("/api/v1/ai/convert/batch", json={"items": items})
+
+        results = response.json()["results"]
+        assert [r["converted_text"] for r in results] == [
+            "おはようございます",
+            "ぬるい水をください",
+        ]
+        mock_ai_client.convert_text.assert_awaited_once()
+        assert [entry.ai_provider for entry in log.await_args.args[1]][0] == "local"
+
+
+class TestBenchmark:
+    def test_hit_rate_and_latency(self):
+        """代表的な入力でのヒット率（閾値ごと）と1入力あたりの変換時間を計測する"""
+        converter = LocalConverter()
+        pairs = [(text, level) for text in BENCHMARK_INPUTS for level in ("casual", "polite")]
+        results = [converter.convert(text, level) for text, level in pairs]
+
+        hit_rates = {
+            threshold: sum(r is not None and r.confidence >= threshold for r in results)
+            / len(pairs)
+            for threshold in (0.8, 0.9, 1.0)
+        }
+
+        rounds = 200
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for text, level in pairs:
+                converter.convert(text, level)
+        latency_us = (time.perf_counter() - start) / (rounds * len(pairs)) * 1_000_000
+
+        print(f"\nlocal conversion: {latency_us:.1f} us/input ({len(pairs)} inputs)")
+        for threshold, rate in hit_rates.items():
+            print(f"  hit rate at min confidence {threshold}: {rate:.0%}")
+
+        assert hit_rates[0.9] >= 0.4
+        assert latency_us <= LOCAL_LATENCY_BUDGET_US
@@ -0,0 +1,146 @@
+"""
+メトリクステスト
+
+【テスト目的】: app.utils.metrics のテキスト形式の出力と子メトリクスの再利用、
+               /metrics エンドポイント、各計測箇所（リクエスト・プロバイダー呼び出し・
+               レート制限）での記録を検証
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.rate_limit import limiter
+from app.main import app
+from app.utils import metrics
+from app.utils.ai_client import AIClient
+from app.utils.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency.", ("endpoint",), (0.1, 1.0))
+        child = histogram.labels("/convert")
+        child.observe(0.05)
+        child.observe(0.5)
+        child.observe(3.0)
+
+        lines = registry.render().splitlines()
+
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{endpoint="/convert",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{endpoint="/convert",le="1"} 2' in lines
+        assert 'latency_seconds_bucket{endpoint="/convert",le="+Inf"} 3' in lines
+        assert 'latency_seconds_sum{endpoint="/convert"} 3.55' in lines
+        assert 'latency_seconds_count{endpoint="/convert"} 3' in lines
+
+    def test_counter_renders_total(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("rejections", "Rejections.", ("endpoint",))
+        counter.labels('/a"b').inc()
+        counter.labels('/a"b').inc(2)
+
+        assert 'rejections_total{endpoint="/a\\"b"} 3' in registry.render().splitlines()
+
+    def test_children_are_reused(self):
+        histogram = MetricsRegistry().histogram("h", "H.", ("provider",))
+        assert histogram.labels("anthropic") is histogram.labels("anthropic")
+
+    def test_label_count_is_validated(self):
+        counter = MetricsRegistry().counter("c", "C.", ("a", "b"))
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+    def test_duplicate_names_are_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter("c", "C.")
+        with pytest.raises(ValueError):
+            registry.counter("c", "C.")
+
+    def test_metric_without_child_rendering_cannot_be_created(self):
+        class Incomplete(metrics._Metric):
+            def _new_child(self) -> object:
+                return object()
+
+        with pytest.raises(TypeError):
+            Incomplete("i", "I.")
+
+
+class TestInstrumentation:
+    @pytest.mark.asyncio
+    async def test_nonstandard_methods_share_one_label(self):
+        other = metrics.http_request_duration.labels(metrics.OTHER_METHOD, "/")
+        before = other.count
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.request("FOO", "/")
+            await client.request("BAR", "/")
+
+        assert other.count == before + 2
+        assert ("FOO", "/") not in metrics.http_request_duration._children
+
+    @pytest.mark.asyncio
+    async def test_request_latency_uses_route_template(self):
+        child = metrics.http_request_duration.labels("GET", "/")
+        before = child.count
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/")
+            response = await client.get("/metrics")
+
+        assert child.count == before + 1
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'kotonoha_http_request_duration_seconds_count{method="GET",endpoint="/"}' in (
+            response.text
+        )
+
+    @pytest.mark.asyncio
+    async def test_provider_call_records_latency_and_retries(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 1)
+        monkeypatch.setattr("app.utils.ai_client.asyncio.sleep", AsyncMock())
+        duration = metrics.ai_provider_call_duration.labels(
+            "openai", settings.OPENAI_MODEL, "success"
+        )
+        retries = metrics.ai_provider_call_retries.labels("openai")
+        before_count, before_retries = duration.count, retries.sum
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise ConnectionError("connection reset")
+            return "ok"
+
+        with patch("app.utils.ai_client._is_retryable_exception", return_value=True):
+            assert await AIClient()._call_with_retry(flaky, provider="openai") == "ok"
+
+        assert duration.count == before_count + 1
+        assert retries.sum == before_retries + 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_rejection_is_counted(self):
+        limiter.reset()
+        counter = metrics.rate_limit_rejections.labels("/api/v1/ai/convert")
+        before = counter.value
+        body = {"input_text": "ありがとう", "politeness_level": "polite"}
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("ありがとうございます", 10))
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                await client.post("/api/v1/ai/convert", json=body)
+                response = await client.post("/api/v1/ai/convert", json=body)
+
+        limiter.reset()
+        assert response.status_code == 429
+        assert counter.value == before + 1
@@ -0,0 +1,196 @@
+"""
+定型文変換テーブルテスト
+
+【テスト目的】: app.utils.phrase_table の索引（正規化した入力での検索・丁寧さレベルごとの値）、
+               公開バージョンが変わった場合のみの再読み込みと読み込み失敗時の継続、
+               /convert がテーブルに該当する入力をAIClientを呼ばずに応答すること、
+               生成ジョブ（app.cli.phrase_table）の変換・公開の判断を検証
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.cli import phrase_table as phrase_table_cli
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.crud.crud_phrase_table import PhraseTableRow
+from app.main import app
+from app.utils import phrase_table as phrase_table_module
+from app.utils.exceptions import AITimeoutException
+from app.utils.phrase_table import PhraseTable
+from app.utils.request_priority import RequestPriority, current_priority
+
+ROWS = [
+    PhraseTableRow("テレビを消してください", "casual", "テレビ消して"),
+    PhraseTableRow("テレビを消してください", "normal", "テレビを消してください"),
+    PhraseTableRow("テレビを消してください", "polite", "テレビを消していただけますか"),
+    PhraseTableRow("お疲れさまです", "polite", "お疲れさまでございます"),
+]
+
+
+def _session_factory() -> MagicMock:
+    @asynccontextmanager
+    async def session():
+        yield AsyncMock()
+
+    return MagicMock(side_effect=session)
+
+
+class TestPhraseTableIndex:
+    def test_lookup_returns_level_specific_conversion_for_normalized_input(self):
+        table = PhraseTable()
+        table.replace(3, ROWS)
+
+        assert table.lookup("テレビを消してください", "casual") == "テレビ消して"
+        assert table.lookup(" テレビを消してください　", "polite") == "テレビを消していただけますか"
+        assert table.describe() == {"version": 3, "phrases": 2}
+
+    def test_missing_level_and_unknown_input_are_not_found(self):
+        table = PhraseTable()
+        table.replace(3, ROWS)
+
+        assert table.lookup("お疲れさまです", "casual") is None
+        assert table.lookup("水 ぬるく", "normal") is None
+        assert table.lookup("お疲れさまです", "invalid") is None
+
+
+class TestPhraseTableReload:
+    @pytest.mark.asyncio
+    async def test_reload_only_when_published_version_changes(self):
+        table = PhraseTable()
+        published = AsyncMock(side_effect=[1, 1, 2])
+        rows = AsyncMock(side_effect=[ROWS[:1], ROWS[1:2]])
+
+        with (
+            patch.object(phrase_table_module, "get_published_phrase_table_version", published),
+            patch.object(phrase_table_module, "get_phrase_table_rows", rows),
+        ):
+            assert await table.reload(_session_factory()) is True
+            assert await table.reload(_session_factory()) is False
+            assert await table.reload(_session_factory()) is True
+
+        assert table.version == 2
+        assert table.lookup("テレビを消してください", "casual") is None
+        assert table.lookup("テレビを消してください", "normal") == "テレビを消してください"
+        assert [call.args[1] for call in rows.await_args_list] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_background_reload_picks_up_new_version_and_survives_failures(self, monkeypatch):
+        monkeypatch.setattr(settings, "PHRASE_TABLE_RELOAD_INTERVAL_SECONDS", 0.01)
+        table = PhraseTable()
+        published = AsyncMock(side_effect=[OSError("connection refused"), 5, 5, 5, 5, 5])
+        rows = AsyncMock(return_value=ROWS)
+
+        with (
+            patch.object(phrase_table_module, "get_published_phrase_table_version", published),
+            patch.object(phrase_table_module, "get_phrase_table_rows", rows),
+        ):
+            await table.start(_session_factory())
+            assert table.version is None
+            await asyncio.sleep(0.05)
+            await table.stop()
+
+        assert table.version == 5
+        rows.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled_table_is_not_loaded(self, monkeypatch):
+        monkeypatch.setattr(settings, "PHRASE_TABLE_ENABLED", False)
+        factory = _session_factory()
+
+        await PhraseTable().start(factory)
+
+        factory.assert_not_called()
+
+
+class TestConvertEndpointUsesPhraseTable:
+    @pytest.mark.asyncio
+    async def test_table_entry_is_served_without_provider_call(self, monkeypatch):
+        table = PhraseTable()
+        table.replace(1, ROWS)
+        monkeypatch.setattr("app.api.v1.endpoints.ai.phrase_table", table)
+        limiter.reset()
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("AIの結果", 1500))
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "テレビを消してください", "politeness_level": "polite"},
+                )
+        limiter.reset()
+
+        assert response.status_code == 200
+        assert response.json()["converted_text"] == "テレビを消していただけますか"
+        mock_ai_client.convert_text.assert_not_awaited()
+        assert log.await_args.kwargs["ai_provider"] == "phrase_table"
+
+
+class TestPhraseTableJob:
+    def test_read_phrases_skips_comments_blank_lines_and_duplicates(self, tmp_path):
+        path = tmp_path / "phrases.txt"
+        path.write_text("# comment\nはい\n\nいいえ\nはい \n", encoding="utf-8")
+
+        assert phrase_table_cli.read_phrases(path) == ["はい", "いいえ"]
+
+    def test_shipped_phrase_list_is_readable(self):
+        from pathlib import Path
+
+        path = Path(phrase_table_cli.__file__).parents[1] / "data" / "preset_phrases.txt"
+
+        assert "トイレに行きたいです" in phrase_table_cli.read_phrases(path)
+
+    @pytest.mark.asyncio
+    async def test_failed_conversions_keep_the_new_version_unpublished(self, tmp_path):
+        path = tmp_path / "phrases.txt"
+        path.write_text("はい\n", encoding="utf-8")
+
+        async def fake_convert(input_text, politeness_level):
+            if politeness_level == "polite":
+                raise AITimeoutException("timeout")
+            return f"{input_text}（{politeness_level}）", 100
+
+        create = AsyncMock(return_value=MagicMock(id=7))
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch.object(phrase_table_cli, "create_phrase_table_version", create),
+            patch.object(phrase_table_cli, "async_session_maker", _session_factory()),
+        ):
+            mock_ai_client.convert_text = AsyncMock(side_effect=fake_convert)
+            exit_code = await phrase_table_cli.build(path, publish=True)
+
+        assert exit_code == 1
+        rows = create.await_args.args[1]
+        assert {row.politeness_level for row in rows} == {"casual", "normal"}
+        assert create.await_args.kwargs["publish"] is False
+
+    def test_build_command_calls_the_provider_at_bulk_priority(self, tmp_path):
+        path = tmp_path / "phrases.txt"
+        path.write_text("はい\n", encoding="utf-8")
+        priorities: list[RequestPriority] = []
+
+        async def fake_convert(input_text, politeness_level):
+            priorities.append(current_priority())
+            return input_text, 100
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch.object(phrase_table_cli, "engine", AsyncMock()),
+            patch.object(phrase_table_cli, "create_phrase_table_version", AsyncMock()),
+            patch.object(phrase_table_cli, "async_session_maker", _session_factory()),
+        ):
+            mock_ai_client.convert_text = AsyncMock(side_effect=fake_convert)
+            mock_ai_client.aclose = AsyncMock()
+            exit_code = phrase_table_cli.main(["build", str(path)])
+
+        assert exit_code == 0
+        assert priorities == [RequestPriority.BULK] * 3
@@ -0,0 +1,142 @@
+"""
+レート制限予算テスト
+
+【テスト目的】: app.utils.rate_limit_budget のリセットヘッダーの解釈（Anthropic の RFC 3339・
+               OpenAI の "6m0s" 形式）、残り予算の予約（回復待ち・上限超過時の拒否・
+               retry-after による停止・他ワーカー分の余裕）と、AIClient が応答ヘッダーを
+               予算に反映し、予算が尽きた呼び出しをAI APIに送らずに429で拒否することを検証
+"""
+
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.utils.ai_client import AIClient
+from app.utils.exceptions import AIRateLimitException
+from app.utils.rate_limit_budget import RateLimitBudget, parse_reset_seconds
+
+
+def _anthropic_headers(limit: int, remaining: int, reset_seconds: int = 60) -> dict[str, str]:
+    reset_at = datetime.fromtimestamp(
+        datetime.now(timezone.utc).timestamp() + reset_seconds, timezone.utc
+    )
+    reset = reset_at.isoformat().replace("+00:00", "Z")
+    return {
+        "anthropic-ratelimit-requests-limit": str(limit),
+        "anthropic-ratelimit-requests-remaining": str(remaining),
+        "anthropic-ratelimit-requests-reset": reset,
+    }
+
+
+class TestParseResetSeconds:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m3.5s", 3723.5)],
+    )
+    def test_openai_durations(self, value, expected):
+        assert parse_reset_seconds(value) == pytest.approx(expected)
+
+    def test_anthropic_timestamps(self):
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+        assert parse_reset_seconds("2026-01-01T00:00:30Z", now) == 30.0
+        assert parse_reset_seconds("2025-12-31T23:59:00Z", now) == 0.0
+
+    def test_unparsable_value(self):
+        assert parse_reset_seconds("soon") is None
+        assert parse_reset_seconds("") is None
+
+
+class TestRateLimitBudget:
+    def test_budget_is_unlimited_until_headers_are_received(self):
+        budget = RateLimitBudget("anthropic")
+
+        assert all(budget.reserve(400, max_wait_seconds=0) == 0 for _ in range(100))
+
+    def test_calls_are_paced_once_the_remaining_budget_is_used(self):
+        budget = RateLimitBudget("anthropic")
+        budget.update(_anthropic_headers(limit=60, remaining=2))
+
+        assert budget.reserve(0, max_wait_seconds=5) == 0
+        assert budget.reserve(0, max_wait_seconds=5) == 0
+        # 残り58件を60秒で回復する（約1秒に1件）
+        assert budget.reserve(0, max_wait_seconds=5) == pytest.approx(60 / 58, rel=0.05)
+        assert budget.reserve(0, max_wait_seconds=5) == pytest.approx(2 * 60 / 58, rel=0.05)
+
+    def test_call_that_would_wait_too_long_is_rejected_without_consuming(self):
+        budget = RateLimitBudget("anthropic")
+        budget.update(_anthropic_headers(limit=60, remaining=0))
+
+        assert budget.reserve(0, max_wait_seconds=0.5) is None
+        assert budget.reserve(0, max_wait_seconds=5) == pytest.approx(1.0, rel=0.05)
+
+    def test_token_budget_and_headroom_use_openai_headers(self):
+        budget = RateLimitBudget("openai", headroom_ratio=0.1)
+        budget.update(
+            {
+                "x-ratelimit-limit-tokens": "10000",
+                "x-ratelimit-remaining-tokens": "1400",
+                "x-ratelimit-reset-tokens": "6m0s",
+            }
+        )
+
+        # 上限の10%（1000トークン）を残すため、使えるのは400トークン
+        assert budget.reserve(400, max_wait_seconds=0) == 0
+        assert budget.reserve(400, max_wait_seconds=0) is None
+
+    def test_retry_after_on_429_blocks_every_call(self):
+        budget = RateLimitBudget("openai")
+        budget.update({"retry-after": "3"}, status_code=429)
+
+        assert budget.reserve(0, max_wait_seconds=1) is None
+        assert budget.reserve(0, max_wait_seconds=5) == pytest.approx(3.0, rel=0.05)
+
+
+class TestAIClientRateLimitBudget:
+    @pytest.mark.asyncio
+    async def test_response_headers_update_the_budget_through_the_http_client(self):
+        client = AIClient()
+        http_client = client._transport.client_for("anthropic", settings.AI_API_TIMEOUT)
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+        for hook in http_client.event_hooks["response"]:
+            await hook(httpx.Response(200, headers=_anthropic_headers(60, 0, 600), request=request))
+
+        assert client.rate_limit_budget("anthropic").reserve(0, max_wait_seconds=1) is None
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_rejects_locally_without_calling_the_provider(self):
+        client = AIClient()
+        client._observe_rate_limit_headers(
+            "anthropic",
+            httpx.Response(200, headers=_anthropic_headers(60, 0, 600)),
+        )
+        called = 0
+
+        async def call() -> str:
+            nonlocal called
+            called += 1
+            return "ok"
+
+        with pytest.raises(AIRateLimitException, match="rate limit budget"):
+            await client._call_with_retry(call, provider="anthropic")
+
+        assert called == 0
+        assert await client._call_with_retry(call, provider="openai") == "ok"
+
+    @pytest.mark.asyncio
+    async def test_budget_is_ignored_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_RATE_LIMIT_BUDGET_ENABLED", False)
+        client = AIClient()
+        client._observe_rate_limit_headers(
+            "anthropic",
+            httpx.Response(429, headers={"retry-after": "600"}),
+        )
+
+        async def call() -> str:
+            return "ok"
+
+        assert await client._call_with_retry(call, provider="anthropic") == "ok"
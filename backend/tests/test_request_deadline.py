@@ -0,0 +1,272 @@
+"""
+リクエストデッドラインテスト
+
+【テスト目的】: app.utils.request_deadline の X-Request-Deadline-Ms ヘッダーの解釈、
+               AIClient が端末のデッドラインを呼び出し全体とSDKのタイムアウトに適用し、
+               期限切れの呼び出しをAI APIに送らないこと、
+               端末が応答前に切断した場合にエンドポイントが処理中のAI呼び出しを
+               キャンセルすることを検証
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.requests import Request
+
+from app.api.v1.endpoints import ai as ai_endpoints
+from app.core.config import settings
+from app.core.rate_limit import limiter as rate_limiter
+from app.main import app
+from app.utils import ai_client as ai_client_module
+from app.utils import metrics
+from app.utils.ai_client import AIClient
+from app.utils.exceptions import ClientDisconnectedException
+from app.utils.request_deadline import (
+    current_deadline,
+    parse_deadline,
+    remaining_seconds,
+    set_deadline,
+)
+
+_CONVERT_BODY = {"input_text": "ありがと", "politeness_level": "normal"}
+
+
+@pytest.fixture
+def client_deadline():
+    """処理中のコンテキストに端末のデッドラインを設定する（テスト後に解除する）"""
+
+    def _set(seconds_from_now: float) -> None:
+        set_deadline(time.monotonic() + seconds_from_now)
+
+    yield _set
+    set_deadline(None)
+
+
+class TestParseDeadline:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("1500", 101.5), (" 250 ", 100.25), ("0", 100.0), ("-30", 100.0)],
+    )
+    def test_remaining_milliseconds_become_a_monotonic_deadline(self, value, expected):
+        assert parse_deadline(value, now=100.0) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "nan"])
+    def test_missing_or_unparsable_values_are_ignored(self, value):
+        assert parse_deadline(value, now=100.0) is None
+
+    def test_remaining_seconds_is_capped_by_the_server_limit(self, client_deadline):
+        assert current_deadline() is None
+        assert remaining_seconds(10.0) == 10.0
+        client_deadline(60)
+        assert remaining_seconds(10.0) == 10.0
+        client_deadline(2)
+        assert 1.5 < remaining_seconds(10.0) <= 2.0
+
+
+class TestAIClientDeadline:
+    @pytest.mark.asyncio
+    async def test_expired_client_deadline_is_not_sent_to_the_provider(self, client_deadline):
+        client_deadline(-1)
+        factory = AsyncMock(return_value="ok")
+
+        with pytest.raises(TimeoutError, match="timeout"):
+            await AIClient()._call_with_retry(factory, provider="anthropic")
+
+        factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_short_client_deadline_bounds_the_call(self, client_deadline):
+        client_deadline(0.05)
+        started = time.monotonic()
+
+        async def slow_call() -> str:
+            await asyncio.sleep(5)
+            return "ok"
+
+        with pytest.raises(TimeoutError, match="timeout"):
+            await AIClient()._call_with_retry(slow_call, provider="anthropic")
+
+        assert time.monotonic() - started < 1.0
+
+    def test_sdk_timeout_is_shortened_only_by_a_tighter_client_deadline(self, client_deadline):
+        client = AIClient()
+        assert "timeout" not in client._anthropic_request("normal", "prompt")
+
+        client_deadline(settings.AI_API_TIMEOUT + 30)
+        assert "timeout" not in client._openai_request("normal", "prompt")
+
+        client_deadline(1.5)
+        assert 1.0 < client._anthropic_request("normal", "prompt")["timeout"] <= 1.5
+        assert 1.0 < client._openai_request("normal", "prompt")["timeout"] <= 1.5
+
+
+class TestEndpointDeadline:
+    @pytest.mark.asyncio
+    async def test_header_deadline_reaches_the_ai_client(self):
+        seen: list[float | None] = []
+
+        async def fake_convert(**kwargs):
+            seen.append(remaining_seconds(settings.AI_CALL_DEADLINE_SECONDS))
+            return "ありがとうございます", 100
+
+        rate_limiter.reset()
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(side_effect=fake_convert)
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/v1/ai/convert",
+                    json=_CONVERT_BODY,
+                    headers={"X-Request-Deadline-Ms": "3000"},
+                )
+        rate_limiter.reset()
+
+        assert response.status_code == 200
+        assert len(seen) == 1 and 2.0 < seen[0] <= 3.0
+
+    @pytest.mark.asyncio
+    async def test_header_deadline_bounds_a_coalesced_conversion(self):
+        async def slow_create(**_kwargs):
+            await asyncio.sleep(2)
+            return SimpleNamespace(content=[SimpleNamespace(text="遅い結果")])
+
+        client = AIClient()
+        client.anthropic_client = AsyncMock()
+        client.anthropic_client.messages.create = AsyncMock(side_effect=slow_create)
+
+        rate_limiter.reset()
+        started = time.monotonic()
+        with (
+            patch("app.utils.ai_client.ai_client", client),
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as http:
+                response = await http.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "明日の予定を確認したい", "politeness_level": "polite"},
+                    headers={"X-Request-Deadline-Ms": "300"},
+                )
+        elapsed = time.monotonic() - started
+        rate_limiter.reset()
+
+        assert settings.AI_SINGLE_FLIGHT_ENABLED
+        assert response.status_code == 504
+        assert elapsed < 1.5
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_the_in_flight_ai_call(self):
+        cancelled = asyncio.Event()
+
+        async def hanging_convert(**kwargs):
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "ありがとうございます", 100
+
+        body = json.dumps(_CONVERT_BODY).encode()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive() -> dict[str, object]:
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(0.05)
+            return {"type": "http.disconnect"}
+
+        sent: list[dict[str, object]] = []
+
+        async def send(message: dict[str, object]) -> None:
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/v1/ai/convert",
+            "raw_path": b"/api/v1/ai/convert",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [
+                (b"host", b"test"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("test", 80),
+        }
+        disconnects = metrics.ai_client_disconnects.labels("/api/v1/ai/convert")
+        before = disconnects.value
+
+        rate_limiter.reset()
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch(
+                "app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock
+            ) as persist,
+        ):
+            mock_ai_client.convert_text = AsyncMock(side_effect=hanging_convert)
+            await asyncio.wait_for(app(scope, receive, send), timeout=5)
+        rate_limiter.reset()
+
+        assert cancelled.is_set()
+        assert sent[0]["status"] == 499
+        assert disconnects.value == before + 1
+        persist.assert_not_awaited()
+
+
+class TestCancelOnDisconnect:
+    @pytest.mark.asyncio
+    async def test_context_set_by_the_call_is_visible_to_the_caller(self):
+        async def receive() -> dict[str, object]:
+            await asyncio.sleep(30)
+            return {"type": "http.disconnect"}
+
+        request = Request({"type": "http", "headers": []}, receive)
+
+        async def convert() -> str:
+            ai_client_module._SERVED_PROVIDER.set("openai")
+            return "ok"
+
+        assert await ai_endpoints._cancel_on_disconnect(request, convert()) == "ok"
+        assert ai_client_module.consume_served_provider() == "openai"
+
+    @pytest.mark.asyncio
+    async def test_other_context_set_by_the_call_stays_in_the_call(self):
+        async def receive() -> dict[str, object]:
+            await asyncio.sleep(30)
+            return {"type": "http.disconnect"}
+
+        request = Request({"type": "http", "headers": []}, receive)
+        set_deadline(None)
+
+        async def convert() -> str:
+            set_deadline(time.monotonic() + 0.01)
+            return "ok"
+
+        assert await ai_endpoints._cancel_on_disconnect(request, convert()) == "ok"
+        assert current_deadline() is None
+        assert ai_client_module.consume_served_provider() is None
+
+    @pytest.mark.asyncio
+    async def test_disconnect_raises_client_disconnected(self):
+        async def receive() -> dict[str, object]:
+            return {"type": "http.disconnect"}
+
+        request = Request({"type": "http", "headers": []}, receive)
+
+        with pytest.raises(ClientDisconnectedException):
+            await ai_endpoints._cancel_on_disconnect(request, asyncio.sleep(30))
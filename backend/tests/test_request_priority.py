@@ -0,0 +1,125 @@
+"""
+リクエスト優先度テスト
+
+【テスト目的】: app.utils.request_priority の優先度の決定（ヘッダーでは下げることのみ可能）、
+               同時実行数制限の待ち行列が優先度・デッドラインの順に枠を割り当て、
+               デッドラインに間に合わなくなった呼び出しを取り除くこと、
+               エンドポイントとヘッダーから決めた優先度がAIClientの呼び出しまで伝わることを検証
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.rate_limit import limiter as rate_limiter
+from app.main import app
+from app.utils.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterConfig,
+    ConcurrencyLimitExceeded,
+)
+from app.utils.request_priority import RequestPriority, current_priority, resolve_priority
+
+
+class TestResolvePriority:
+    @pytest.mark.parametrize(
+        ("default", "header", "expected"),
+        [
+            (RequestPriority.INTERACTIVE, None, RequestPriority.INTERACTIVE),
+            (RequestPriority.INTERACTIVE, "bulk", RequestPriority.BULK),
+            (RequestPriority.INTERACTIVE, " Regenerate ", RequestPriority.REGENERATE),
+            (RequestPriority.BULK, "interactive", RequestPriority.BULK),
+            (RequestPriority.REGENERATE, "urgent", RequestPriority.REGENERATE),
+        ],
+    )
+    def test_header_can_only_lower_the_endpoint_priority(self, default, header, expected):
+        assert resolve_priority(default, header) == expected
+
+
+class TestPriorityQueue:
+    @pytest.mark.asyncio
+    async def test_slots_go_to_higher_priority_then_earlier_deadline(self):
+        limiter = AdaptiveConcurrencyLimiter("anthropic", ConcurrencyLimiterConfig(initial_limit=1))
+        held = await limiter.acquire()
+        now = time.monotonic()
+        order: list[str] = []
+
+        async def call(name: str, priority: RequestPriority, deadline: float | None) -> None:
+            permit = await limiter.acquire(deadline, priority)
+            order.append(name)
+            limiter.release(permit)
+
+        waiters = [
+            asyncio.create_task(call("bulk", RequestPriority.BULK, None)),
+            asyncio.create_task(call("interactive-late", RequestPriority.INTERACTIVE, now + 10)),
+            asyncio.create_task(call("regenerate", RequestPriority.REGENERATE, now + 1)),
+            asyncio.create_task(call("interactive-early", RequestPriority.INTERACTIVE, now + 5)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 4
+
+        limiter.release(held)
+        await asyncio.gather(*waiters)
+
+        assert order == ["interactive-early", "interactive-late", "regenerate", "bulk"]
+
+    @pytest.mark.asyncio
+    async def test_queued_call_that_can_no_longer_meet_its_deadline_is_dropped(self):
+        limiter = AdaptiveConcurrencyLimiter("anthropic", ConcurrencyLimiterConfig(initial_limit=1))
+        held = await limiter.acquire()
+        doomed = asyncio.create_task(limiter.acquire(time.monotonic() + 5))
+        patient = asyncio.create_task(limiter.acquire(None, RequestPriority.BULK))
+        await asyncio.sleep(0)
+
+        # 待っている間にプロバイダーの応答が遅くなり、デッドラインに間に合わなくなった
+        limiter._baseline = 10.0
+        limiter.release(held)
+
+        with pytest.raises(ConcurrencyLimitExceeded, match="deadline"):
+            await doomed
+        limiter.release(await patient)
+        assert (limiter.in_flight, limiter.queue_depth) == (0, 0)
+
+
+class TestEndpointPriority:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("url", "method", "headers", "expected"),
+        [
+            ("/api/v1/ai/convert", "convert_text", {}, RequestPriority.INTERACTIVE),
+            (
+                "/api/v1/ai/convert",
+                "convert_text",
+                {"X-Request-Priority": "bulk"},
+                RequestPriority.BULK,
+            ),
+            ("/api/v1/ai/regenerate", "regenerate_text", {}, RequestPriority.REGENERATE),
+        ],
+    )
+    async def test_priority_reaches_the_ai_client(self, url, method, headers, expected):
+        seen: list[RequestPriority] = []
+
+        async def fake_call(*args, **kwargs):
+            seen.append(current_priority())
+            return "ありがとうございます", 100
+
+        body = {"input_text": "ありがと", "politeness_level": "normal"}
+        if method == "regenerate_text":
+            body["previous_result"] = "ありがとう"
+        rate_limiter.reset()
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            setattr(mock_ai_client, method, AsyncMock(side_effect=fake_call))
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(url, json=body, headers=headers)
+        rate_limiter.reset()
+
+        assert response.status_code == 200
+        assert seen == [expected]
@@ -0,0 +1,137 @@
+"""
+リトライ予算テスト
+
+【テスト目的】: app.utils.retry_budget の比率による上限・最小リトライ回数・ウィンドウ外の記録の
+               破棄と、AIClient._call_with_retry が予算を超えるリトライを行わずに例外を伝播し
+               拒否回数をメトリクスに記録すること、バックオフが full jitter であることを検証
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import anthropic
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.utils import ai_client as ai_client_module
+from app.utils import metrics
+from app.utils import retry_budget as retry_budget_module
+from app.utils.ai_client import AIClient, _is_local_overload
+from app.utils.retry_budget import RetryBudget
+
+_REQUEST = httpx.Request("POST", "http://retry-budget-test")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(retry_budget_module.time, "monotonic", clock)
+    return clock
+
+
+class TestRetryBudget:
+    def test_retries_are_limited_to_a_fraction_of_requests(self, clock):
+        budget = RetryBudget(ratio=0.1, window_seconds=10, min_retries=1)
+        for _ in range(30):
+            budget.record_request()
+
+        assert [budget.try_acquire_retry() for _ in range(4)] == [True, True, True, False]
+
+    def test_min_retries_are_allowed_under_low_traffic(self, clock):
+        budget = RetryBudget(ratio=0.1, window_seconds=10, min_retries=2)
+        budget.record_request()
+
+        assert [budget.try_acquire_retry() for _ in range(3)] == [True, True, False]
+
+    def test_retries_outside_the_window_are_forgotten(self, clock):
+        budget = RetryBudget(ratio=0.0, window_seconds=10, min_retries=1)
+        assert budget.try_acquire_retry() is True
+        assert budget.try_acquire_retry() is False
+
+        clock.now += 10.5
+
+        assert budget.try_acquire_retry() is True
+
+
+class TestCallWithRetryBudget:
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_propagates_the_error_without_retrying(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 3)
+        monkeypatch.setattr(settings, "AI_RETRY_BUDGET_MIN_RETRIES", 1)
+        monkeypatch.setattr(settings, "AI_RETRY_BUDGET_RATIO", 0.0)
+        denied = metrics.ai_retry_budget_denied.labels("anthropic")
+        before = denied.value
+        calls = 0
+
+        async def always_fail() -> None:
+            nonlocal calls
+            calls += 1
+            raise anthropic.APIConnectionError(request=_REQUEST)
+
+        client = AIClient()
+        with patch("asyncio.sleep", AsyncMock()) as sleep_mock:
+            for _ in range(2):
+                with pytest.raises(anthropic.APIConnectionError):
+                    await client._call_with_retry(always_fail, provider="anthropic")
+
+        # 1回目の呼び出しは1回だけリトライでき、2回目の呼び出しはリトライしない
+        assert calls == 3
+        assert sleep_mock.await_count == 1
+        assert denied.value == before + 2
+
+    @pytest.mark.asyncio
+    async def test_error_without_an_allowed_retry_is_not_a_provider_failure(self, monkeypatch):
+        # 予算によりリトライしなかった呼び出しは、サーキットブレーカーのエラーに数えない
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 1)
+        monkeypatch.setattr(settings, "AI_RETRY_BUDGET_MIN_RETRIES", 0)
+        monkeypatch.setattr(settings, "AI_RETRY_BUDGET_RATIO", 0.0)
+
+        async def always_fail() -> None:
+            raise anthropic.APIConnectionError(request=_REQUEST)
+
+        with pytest.raises(anthropic.APIConnectionError) as exc_info:
+            await AIClient()._call_with_retry(always_fail, provider="anthropic")
+
+        assert _is_local_overload(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_budget_is_not_applied_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 2)
+        monkeypatch.setattr(settings, "AI_RETRY_BUDGET_ENABLED", False)
+        monkeypatch.setattr(settings, "AI_RETRY_BUDGET_MIN_RETRIES", 0)
+        monkeypatch.setattr(settings, "AI_RETRY_BUDGET_RATIO", 0.0)
+        calls = 0
+
+        async def always_fail() -> None:
+            nonlocal calls
+            calls += 1
+            raise anthropic.APIConnectionError(request=_REQUEST)
+
+        with patch("asyncio.sleep", AsyncMock()):
+            with pytest.raises(anthropic.APIConnectionError):
+                await AIClient()._call_with_retry(always_fail, provider="anthropic")
+
+        assert calls == 3
+
+
+class TestBackoffDelay:
+    @pytest.mark.parametrize("attempt", [0, 1, 2])
+    def test_delay_is_drawn_from_zero_to_the_exponential_cap(self, attempt):
+        with patch.object(ai_client_module.random, "uniform", return_value=0.3) as uniform:
+            assert ai_client_module._backoff_delay(attempt) == 0.3
+
+        uniform.assert_called_once_with(0, 0.5 * 2**attempt)
+
+    def test_delays_are_spread_out(self):
+        delays = {ai_client_module._backoff_delay(2) for _ in range(50)}
+
+        assert len(delays) > 1
+        assert all(0 <= delay <= 2.0 for delay in delays)
@@ -0,0 +1,148 @@
+"""
+類似入力索引テスト
+
+【テスト目的】: app.utils.similarity_index の表記ゆれ（句点・全角/半角・空白・長音）の吸収、
+               閾値・丁寧さレベル・照合範囲・数字・文末の疑問の違いによる不採用、
+               件数上限での破棄、
+               照合結果のメトリクスと、/convert が完全一致のキャッシュにヒットしない
+               類似入力をAIClientを呼ばずに応答することを検証
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.main import app
+from app.utils import metrics
+from app.utils.similarity_index import SimilarityIndex
+
+
+@pytest.fixture
+def index() -> SimilarityIndex:
+    index = SimilarityIndex(max_entries=16)
+    index.add("ありがとうね", "normal", "ありがとうございます")
+    index.add("明日の朝9時に病院に行きます", "normal", "明日の朝9時に病院へ参ります")
+    return index
+
+
+class TestSimilarityIndex:
+    @pytest.mark.parametrize("variant", ["ありがとうねー。", "ありがとうね！", " ありがとう ね "])
+    def test_small_differences_reuse_the_stored_conversion(self, index, variant):
+        match = index.lookup(variant, "normal", threshold=0.9)
+
+        assert match.converted_text == "ありがとうございます"
+        assert match.similarity == 1.0
+
+    def test_full_and_half_width_characters_are_equivalent(self):
+        index = SimilarityIndex(max_entries=4)
+        index.add("ＴＶを消して", "normal", "テレビを消してください")
+
+        assert index.lookup("TVを消して", "normal", threshold=0.9).similarity == 1.0
+
+    def test_other_level_scope_and_different_numbers_are_not_matched(self, index):
+        assert index.lookup("ありがとうね", "polite", threshold=0.0) is None
+        assert index.lookup("ありがとうね", "normal", threshold=0.0, scope="openai") is None
+        assert index.lookup("明日の朝10時に病院に行きます", "normal", threshold=0.0) is None
+
+    @pytest.mark.parametrize(
+        "question",
+        [
+            "明日の朝9時に病院に行きますか",
+            "明日の朝9時に病院に行きます?",
+            "明日の朝9時に病院に行きます？",
+        ],
+    )
+    def test_question_and_statement_are_not_matched(self, index, question):
+        assert index.lookup(question, "normal", threshold=0.0) is None
+
+        index.add(question, "normal", "明日の朝9時に病院へ参りますか")
+        assert (
+            index.lookup("明日の朝9時に病院に行きます。", "normal", threshold=0.0).similarity == 1.0
+        )
+        assert index.lookup(question + "。", "normal", threshold=0.0).similarity == 1.0
+
+    def test_threshold_rejects_less_similar_inputs_and_records_quality(self, index):
+        hits = metrics.similarity_lookups.labels("hit")
+        below = metrics.similarity_lookups.labels("below_threshold")
+        scores = metrics.similarity_best_score.labels()
+        before = (hits.value, below.value, scores.count)
+
+        query = "明日の朝9時に病院に行きません"
+        assert index.lookup(query, "normal", threshold=0.95) is None
+        assert index.lookup(query, "normal", threshold=0.5) is not None
+
+        assert (hits.value, below.value, scores.count) == (
+            before[0] + 1,
+            before[1] + 1,
+            before[2] + 2,
+        )
+
+    def test_same_input_replaces_and_oldest_entries_are_evicted(self):
+        index = SimilarityIndex(max_entries=2)
+        index.add("おはよう", "normal", "古い結果")
+        index.add("おはよう。", "normal", "おはようございます")
+        index.add("こんにちは", "normal", "こんにちは")
+        index.add("こんばんは", "normal", "こんばんは")
+
+        assert len(index) == 2
+        assert index.lookup("おはよう", "normal", threshold=0.9) is None
+        assert index.lookup("こんばんは", "normal", threshold=0.9) is not None
+        index.clear()
+        assert len(index) == 0
+
+
+class TestConvertEndpointUsesSimilarityIndex:
+    @pytest.mark.asyncio
+    async def test_near_duplicate_is_served_without_provider_call(self, monkeypatch):
+        monkeypatch.setattr(settings, "SIMILARITY_INDEX_THRESHOLD", 0.9)
+        limiter.reset()
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock) as log,
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("お水をください", 1500))
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                first = await client.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "水 ちょうだいね", "politeness_level": "normal"},
+                )
+                limiter.reset()
+                second = await client.post(
+                    "/api/v1/ai/convert",
+                    json={"input_text": "水ちょうだいねー。", "politeness_level": "normal"},
+                )
+        limiter.reset()
+
+        assert first.json()["converted_text"] == "お水をください"
+        assert second.json()["converted_text"] == "お水をください"
+        mock_ai_client.convert_text.assert_awaited_once()
+        assert log.await_args.kwargs["ai_provider"] == "similar"
+
+    @pytest.mark.asyncio
+    async def test_index_is_not_used_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "SIMILARITY_INDEX_ENABLED", False)
+        limiter.reset()
+
+        with (
+            patch("app.utils.ai_client.ai_client") as mock_ai_client,
+            patch("app.api.v1.endpoints.ai._persist_conversion_log", new_callable=AsyncMock),
+        ):
+            mock_ai_client.convert_text = AsyncMock(return_value=("お水をください", 1500))
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                for text in ("水 ちょうだいね", "水ちょうだいねー。"):
+                    limiter.reset()
+                    await client.post(
+                        "/api/v1/ai/convert",
+                        json={"input_text": text, "politeness_level": "normal"},
+                    )
+        limiter.reset()
+
+        assert mock_ai_client.convert_text.await_count == 2
@@ -0,0 +1,65 @@
+"""
+起動時間（import時間）テスト
+
+【テスト目的】: `python -X importtime -c "import app.main"` の計測結果から、
+               app.main のimport時間が予算内であることと、初回利用時に読み込む
+               重いパッケージ（AI SDK・httpx・jose・bcrypt・redis）がimport時に
+               読み込まれないことを検証する
+【実行方法】: make bench-startup（予算は環境変数 STARTUP_IMPORT_BUDGET_MS で変更できる）
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# app.main のimport時間の予算（ミリ秒）。CI等の遅い環境では環境変数で緩める
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", "2000"))
+
+# 初回利用時に読み込むため、app.main のimport時には読み込まれてはならないパッケージ
+DEFERRED_PACKAGES = frozenset({"anthropic", "openai", "httpx", "jose", "bcrypt", "redis"})
+
+# 計測のばらつきを抑えるための計測回数（最小値を採用する）
+MEASUREMENT_RUNS = 3
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """新しいインタプリタで module をimportし、モジュール名 → 累積import時間（μs）を返す"""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture(scope="module")
+def measurements() -> list[dict[str, int]]:
+    return [_import_times("app.main") for _ in range(MEASUREMENT_RUNS)]
+
+
+def test_heavy_packages_are_not_imported_at_startup(measurements):
+    loaded = DEFERRED_PACKAGES & set(measurements[-1])
+    assert not loaded, f"imported at startup: {sorted(loaded)}"
+
+
+def test_app_main_import_time_is_within_budget(measurements):
+    best_ms = min(times["app.main"] for times in measurements) / 1000
+    slowest = sorted(measurements[-1].items(), key=lambda item: item[1], reverse=True)[:10]
+    report = "\n".join(f"{us / 1000:8.1f} ms  {name}" for name, us in slowest)
+    print(f"\napp.main import time: {best_ms:.1f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+    print(report)
+    assert best_ms <= IMPORT_TIME_BUDGET_MS, f"app.main import took {best_ms:.1f} ms\n{report}"
@@ -0,0 +1,150 @@
+"""
+ウォームアップテスト
+
+【テスト目的】: app.utils.warmup のDB接続の事前確立、ウォームアップ完了後のレディネス、
+               タイムアウト時も起動を継続すること、キープウォームと、
+               AIClient がアイドル中のプロバイダーのみ接続を補充することを検証
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.main import app
+from app.utils.ai_client import AIClient
+from app.utils.warmup import Warmup, warm_database
+
+
+def _engine(failures: int = 0) -> MagicMock:
+    """connect() ごとに接続を返すエンジン（先頭 failures 件は接続に失敗する）"""
+    connections = []
+    for i in range(10):
+        connection = AsyncMock()
+        if i < failures:
+            connection.start.side_effect = OSError("connection refused")
+        connections.append(connection)
+    engine = MagicMock()
+    engine.connect.side_effect = connections
+    engine.connections = connections
+    return engine
+
+
+class TestWarmDatabase:
+    @pytest.mark.asyncio
+    async def test_opens_connections_and_returns_them_to_the_pool(self):
+        engine = _engine()
+
+        assert await warm_database(engine, 3) == 3
+
+        for connection in engine.connections[:3]:
+            connection.start.assert_awaited_once()
+            connection.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_connections_are_not_counted(self):
+        engine = _engine(failures=1)
+
+        assert await warm_database(engine, 2) == 1
+        engine.connections[0].close.assert_not_awaited()
+
+
+class TestWarmup:
+    @pytest.mark.asyncio
+    async def test_run_warms_database_and_providers_then_becomes_ready(self, monkeypatch):
+        monkeypatch.setattr(settings, "WARMUP_DB_CONNECTIONS", 2)
+        warmup = Warmup()
+
+        with patch("app.utils.ai_client.ai_client") as mock_ai_client:
+            mock_ai_client.warm_up = AsyncMock(return_value={"anthropic": True})
+            await warmup.run(_engine())
+
+        assert warmup.describe() == {
+            "ready": True,
+            "database_connections": 2,
+            "providers": {"anthropic": True},
+        }
+
+    @pytest.mark.asyncio
+    async def test_timeout_does_not_block_startup(self, monkeypatch):
+        monkeypatch.setattr(settings, "WARMUP_TIMEOUT_SECONDS", 0.01)
+        warmup = Warmup()
+
+        async def slow_warm_up():
+            await asyncio.sleep(1)
+
+        with patch("app.utils.ai_client.ai_client") as mock_ai_client:
+            mock_ai_client.warm_up = slow_warm_up
+            await warmup.run(_engine())
+
+        assert warmup.ready
+
+    @pytest.mark.asyncio
+    async def test_disabled_warmup_is_ready_immediately(self, monkeypatch):
+        monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+        warmup = Warmup()
+        engine = _engine()
+
+        await warmup.run(engine)
+
+        assert warmup.ready
+        engine.connect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_keep_warm_refreshes_idle_connections_until_stopped(self, monkeypatch):
+        monkeypatch.setattr(settings, "KEEP_WARM_INTERVAL_SECONDS", 0.01)
+        monkeypatch.setattr(settings, "WARMUP_DB_CONNECTIONS", 0)
+        warmup = Warmup()
+
+        with patch("app.utils.ai_client.ai_client") as mock_ai_client:
+            mock_ai_client.warm_connections = AsyncMock(return_value={})
+            warmup.start_keep_warm(_engine())
+            await asyncio.sleep(0.05)
+            await warmup.stop()
+
+        assert mock_ai_client.warm_connections.await_count >= 1
+        mock_ai_client.warm_connections.assert_awaited_with(min_idle_seconds=0.01)
+
+
+class TestReadiness:
+    @pytest.mark.asyncio
+    async def test_readiness_reports_warming_up_until_warmup_finishes(self):
+        warmup = Warmup()
+
+        with patch("app.api.v1.endpoints.health.warmup", warmup):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                before = await client.get("/api/v1/health/ready")
+                with patch.object(settings, "WARMUP_ENABLED", False):
+                    await warmup.run(MagicMock())
+                after = await client.get("/api/v1/health/ready")
+
+        assert before.status_code == 503
+        assert before.json()["status"] == "warming_up"
+        assert after.status_code == 200
+        assert after.json()["status"] == "ready"
+
+
+class TestAIClientWarmConnections:
+    @pytest.mark.asyncio
+    async def test_only_idle_providers_are_warmed(self):
+        with patch.object(settings, "ANTHROPIC_API_KEY", "test-anthropic-key"):
+            client = AIClient()
+        http_client = client._transport.client_for("anthropic", settings.AI_API_TIMEOUT)
+        requests: list[httpx.Request] = []
+        http_client._transport = httpx.MockTransport(
+            lambda request: requests.append(request) or httpx.Response(404)
+        )
+
+        assert await client.warm_up() == {"anthropic": True}
+        assert requests[0].method == "HEAD"
+        assert requests[0].url == httpx.URL(str(client.anthropic_client.base_url))
+        # 直後はアイドル時間が短いため対象外
+        assert await client.warm_connections(min_idle_seconds=60) == {}
+        assert len(requests) == 1
+
+        await client.aclose()